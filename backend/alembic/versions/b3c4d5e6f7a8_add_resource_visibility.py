@@ -0,0 +1,44 @@
+"""add resource_visibility table for materialized tag grants
+
+Revision ID: b3c4d5e6f7a8
+Revises: a1b2merge0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c4d5e6f7a8'
+down_revision: Union[str, None] = 'a1b2merge0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resource_visibility',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('resource_type', sa.String(length=50), nullable=False),
+        sa.Column('resource_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'resource_type', 'resource_id')
+    )
+    op.create_index('ix_resource_visibility_resource', 'resource_visibility', ['resource_type', 'resource_id'])
+
+    # Resolve grants for existing tags: each user sees the tagged resources
+    # that share at least one tag with their tag attributes
+    op.execute("""
+        INSERT INTO resource_visibility (user_id, resource_type, resource_id)
+        SELECT DISTINCT ua.user_id, rt.resource_type, rt.resource_id
+        FROM user_attributes ua
+        JOIN resource_tags rt ON rt.tag = ua.attribute_value
+        WHERE ua.attribute_type = 'tag'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resource_visibility_resource', table_name='resource_visibility')
+    op.drop_table('resource_visibility')
@@ -0,0 +1,34 @@
+"""add composite event_logs indexes for keyset pagination
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Newest-first paging per range / per VM seeks on (x, created_at, id)
+    op.create_index('ix_event_logs_range_created', 'event_logs', ['range_id', 'created_at', 'id'])
+    op.create_index('ix_event_logs_vm_created', 'event_logs', ['vm_id', 'created_at', 'id'])
+
+    # The single-column indexes are prefixes of the composite ones
+    op.drop_index('ix_event_logs_range_id', table_name='event_logs')
+    op.drop_index('ix_event_logs_vm_id', table_name='event_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_event_logs_vm_id', 'event_logs', ['vm_id'], unique=False)
+    op.create_index('ix_event_logs_range_id', 'event_logs', ['range_id'], unique=False)
+    op.drop_index('ix_event_logs_vm_created', table_name='event_logs')
+    op.drop_index('ix_event_logs_range_created', table_name='event_logs')
@@ -0,0 +1,36 @@
+"""add event_log_rollups table for event log retention
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_log_rollups',
+        sa.Column('range_id', sa.Uuid(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['range_id'], ['ranges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('range_id', 'day', 'event_type')
+    )
+    # Retention pruning walks the oldest rows first
+    op.create_index('ix_event_logs_created_at', 'event_logs', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_logs_created_at', table_name='event_logs')
+    op.drop_table('event_log_rollups')
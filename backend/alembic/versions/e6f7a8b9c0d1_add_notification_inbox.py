@@ -0,0 +1,77 @@
+"""add notification_inbox and notification_counters
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_inbox',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('notification_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'notification_id')
+    )
+    op.create_index('ix_notification_inbox_user_created', 'notification_inbox', ['user_id', 'created_at'])
+    op.create_index('ix_notification_inbox_notification', 'notification_inbox', ['notification_id'])
+
+    op.create_table('notification_counters',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('unread', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Deliver existing notifications to the users who could see them,
+    # carrying over the shared read flag
+    op.execute("""
+        INSERT INTO notification_inbox (user_id, notification_id, created_at, read_at)
+        SELECT r.user_id, n.id, n.created_at, n.read_at
+        FROM notifications n
+        JOIN (
+            SELECT id AS notification_id, user_id FROM notifications WHERE user_id IS NOT NULL
+            UNION
+            SELECT n.id, ua.user_id FROM notifications n
+            JOIN user_attributes ua ON ua.attribute_type = 'role' AND ua.attribute_value = n.target_role
+            UNION
+            SELECT n.id, rg.created_by FROM notifications n
+            JOIN ranges rg ON n.resource_type = 'range' AND rg.id = n.resource_id
+            UNION
+            SELECT n.id, rg.assigned_to_user_id FROM notifications n
+            JOIN ranges rg ON n.resource_type = 'range' AND rg.id = n.resource_id
+            WHERE rg.assigned_to_user_id IS NOT NULL
+            UNION
+            SELECT n.id, ep.user_id FROM notifications n
+            JOIN event_participants ep ON n.resource_type = 'event' AND ep.event_id = n.resource_id
+        ) r ON r.notification_id = n.id
+    """)
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread, total)
+        SELECT user_id, SUM(CASE WHEN read_at IS NULL THEN 1 ELSE 0 END), COUNT(*)
+        FROM notification_inbox
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('notification_counters')
+    op.drop_index('ix_notification_inbox_notification', table_name='notification_inbox')
+    op.drop_index('ix_notification_inbox_user_created', table_name='notification_inbox')
+    op.drop_table('notification_inbox')
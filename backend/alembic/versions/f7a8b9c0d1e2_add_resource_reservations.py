@@ -0,0 +1,38 @@
+"""add resource_reservations
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resource_reservations',
+        sa.Column('range_id', sa.Uuid(), nullable=False),
+        sa.Column('disk_gb', sa.Float(), nullable=False),
+        sa.Column('ram_mb', sa.Integer(), nullable=False),
+        sa.Column('vcpus', sa.Integer(), nullable=False),
+        sa.Column('dind', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['range_id'], ['ranges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('range_id')
+    )
+    op.create_index('ix_resource_reservations_expires_at', 'resource_reservations', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resource_reservations_expires_at', table_name='resource_reservations')
+    op.drop_table('resource_reservations')
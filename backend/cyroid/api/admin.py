@@ -8,7 +8,6 @@ like cleanup, diagnostics, and maintenance.
 import logging
 import os
 import platform
-import re
 import sys
 from datetime import datetime, timezone
 from typing import Annotated, Any, Dict, List, Optional
@@ -28,6 +27,8 @@ from cyroid.models.network import Network
 from cyroid.models.blueprint import RangeInstance
 from cyroid.services.docker_service import get_docker_service
 from cyroid.services.dind_service import get_dind_service
+from cyroid.services.principal_cache import get_principal_cache
+from cyroid.services.resource_ledger import ResourceLedger, host_capacity
 from cyroid.schemas.infrastructure import (
     ServiceHealth,
     InfrastructureServicesResponse,
@@ -43,6 +44,11 @@ from cyroid.schemas.infrastructure import (
     DatabaseMetrics,
     TaskQueueMetrics,
     StorageMetrics,
+    PrincipalCacheMetrics,
+    ResourceReservationMetrics,
+    TraefikRouteMetrics,
+    DinDClientPoolMetrics,
+    DockerExecutorMetrics,
     InfrastructureMetricsResponse,
     MigrationInfo,
     ConfigItem,
@@ -514,6 +520,26 @@ def get_infrastructure_services(admin_user: AdminUser):
     )
 
 
+def _service_log_buffer(service: str):
+    """Indexed log buffer of an infrastructure service, following its container."""
+    from cyroid.services.infrastructure_log_store import get_infrastructure_log_store
+
+    docker = get_docker_service()
+    return get_infrastructure_log_store().service(
+        service, lambda: _find_container_by_service(docker, service)
+    )
+
+
+def _parse_log_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 @router.get("/infrastructure/logs", response_model=ServiceLogsResponse)
 def get_infrastructure_logs(
     admin_user: AdminUser,
@@ -522,13 +548,20 @@ def get_infrastructure_logs(
     search: Optional[str] = Query(None, description="Search text in logs"),
     since: Optional[str] = Query(None, description="Start time (ISO format)"),
     until: Optional[str] = Query(None, description="End time (ISO format)"),
+    before: Optional[str] = Query(
+        None, pattern=r"^\d+-\d+$", description="Only lines older than this cursor (paging cursor)"
+    ),
     limit: int = Query(100, ge=1, le=1000, description="Number of log lines"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    offset: int = Query(0, ge=0, description="Offset for pagination, counting back from the newest match"),
 ):
     """
     Get logs for a CYROID infrastructure service.
 
-    Supports filtering by log level, text search, and time range.
+    Supports filtering by log level, text search, and time range. Lines are
+    served from an indexed buffer that follows the service's container, so
+    queries do not re-read container logs. Pages hold the newest matches,
+    oldest first; page backwards with `offset` or `before` (the first
+    entry's `cursor`, which is valid on every API worker). Live lines are streamed by /ws/infrastructure/logs/{service}.
     **Requires admin privileges.**
     """
     if service not in INFRASTRUCTURE_SERVICES:
@@ -537,124 +570,36 @@ def get_infrastructure_logs(
             detail=f"Invalid service. Must be one of: {', '.join(INFRASTRUCTURE_SERVICES.keys())}",
         )
 
-    docker = get_docker_service()
-    container = _find_container_by_service(docker, service)
-
-    if not container:
-        return ServiceLogsResponse(
-            service=service,
-            logs=[],
-            total_lines=0,
-            has_more=False,
-            filters_applied={"error": "Container not found"},
-        )
-
-    # Get logs from container
-    try:
-        # Calculate tail count (we need extra for filtering)
-        tail_count = (offset + limit) * 3 if (level or search) else (offset + limit + 100)
-        tail_count = min(tail_count, 5000)  # Cap at 5000 lines
-
-        since_dt = None
-        until_dt = None
-        if since:
-            try:
-                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-            except ValueError:
-                pass
-        if until:
-            try:
-                until_dt = datetime.fromisoformat(until.replace("Z", "+00:00"))
-            except ValueError:
-                pass
-
-        raw_logs = container.logs(
-            tail=tail_count,
-            timestamps=True,
-            since=since_dt,
-            until=until_dt,
-        ).decode("utf-8", errors="replace")
-
-        lines = raw_logs.strip().split("\n") if raw_logs.strip() else []
-
-        # Parse and filter logs
-        log_entries = []
-        level_pattern = re.compile(r"\b(ERROR|WARN(?:ING)?|INFO|DEBUG)\b", re.IGNORECASE)
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            # Parse timestamp (Docker format: 2024-01-18T14:32:01.123456789Z)
-            timestamp = None
-            message = line
-            try:
-                if len(line) > 30 and line[4] == "-" and line[10] == "T":
-                    ts_str = line[:30].split()[0]
-                    timestamp = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    message = line[31:].strip() if len(line) > 31 else line
-            except Exception:
-                pass
-
-            # Detect log level
-            detected_level = None
-            level_match = level_pattern.search(message[:100])
-            if level_match:
-                detected_level = level_match.group(1).upper()
-                if detected_level == "WARNING":
-                    detected_level = "WARN"
-
-            # Apply level filter
-            if level:
-                level_upper = level.upper()
-                if level_upper == "ERROR" and detected_level != "ERROR":
-                    continue
-                elif level_upper == "WARNING" and detected_level not in ["ERROR", "WARN"]:
-                    continue
-                elif level_upper == "INFO" and detected_level not in ["ERROR", "WARN", "INFO"]:
-                    continue
-                # DEBUG includes all
-
-            # Apply search filter
-            if search and search.lower() not in message.lower():
-                continue
-
-            log_entries.append(LogEntry(
-                timestamp=timestamp,
-                level=detected_level,
-                message=message,
-                raw=line,
-            ))
-
-        total_lines = len(log_entries)
-        # Apply pagination
-        paginated_entries = log_entries[offset:offset + limit]
-        has_more = (offset + limit) < total_lines
-
-        return ServiceLogsResponse(
-            service=service,
-            logs=paginated_entries,
-            total_lines=total_lines,
-            has_more=has_more,
-            filters_applied={
-                "level": level,
-                "search": search,
-                "since": since,
-                "until": until,
-                "limit": limit,
-                "offset": offset,
-            },
-        )
+    buffer = _service_log_buffer(service)
+    page = buffer.query(
+        level=level,
+        search=search,
+        since=_parse_log_time(since),
+        until=_parse_log_time(until),
+        before=before,
+        limit=limit,
+        offset=offset,
+    )
 
-    except Exception as e:
-        logger.error(f"Error getting logs for {service}: {e}")
-        return ServiceLogsResponse(
-            service=service,
-            logs=[],
-            total_lines=0,
-            has_more=False,
-            filters_applied={"error": str(e)},
-        )
+    filters_applied = {
+        "level": level,
+        "search": search,
+        "since": since,
+        "until": until,
+        "before": before,
+        "limit": limit,
+        "offset": offset,
+    }
+    if not page.total and not buffer.attached:
+        filters_applied["error"] = "Container not found"
+
+    return ServiceLogsResponse(
+        service=service,
+        logs=[LogEntry(**record.to_dict()) for record in page.records],
+        total_lines=page.total,
+        has_more=page.has_more,
+        filters_applied=filters_applied,
+    )
 
 
 @router.get("/infrastructure/docker", response_model=DockerOverviewResponse)
@@ -1047,11 +992,43 @@ def get_infrastructure_metrics(admin_user: AdminUser, db: DBSession):
     except Exception as e:
         logger.debug(f"Error getting MinIO metrics: {e}")
 
+    # Principal cache
+    principal_cache_metrics = PrincipalCacheMetrics(**get_principal_cache().stats())
+
+    # Deployment resource reservations
+    reservation_metrics = ResourceReservationMetrics()
+    try:
+        reservation_metrics = ResourceReservationMetrics(**ResourceLedger(db).snapshot(host_capacity()))
+    except Exception as e:
+        logger.error(f"Error getting resource reservations: {e}")
+
+    # VNC route writer
+    from cyroid.services.traefik_route_service import get_traefik_route_service
+    traefik_route_metrics = TraefikRouteMetrics(**get_traefik_route_service().stats())
+
+    # Range DinD client pool
+    dind_client_metrics = DinDClientPoolMetrics()
+    try:
+        dind_client_metrics = DinDClientPoolMetrics(**get_dind_service().client_pool.stats())
+    except Exception as e:
+        logger.error(f"Error getting DinD client pool metrics: {e}")
+
+    # Off-loop Docker calls and event-loop lag
+    from cyroid.services.docker_executor import get_docker_executor, get_loop_lag_monitor
+    docker_executor_metrics = DockerExecutorMetrics(
+        **get_docker_executor().stats(), loop_lag=get_loop_lag_monitor().stats()
+    )
+
     return InfrastructureMetricsResponse(
         host=host_metrics,
         database=db_metrics,
         task_queue=queue_metrics,
         storage=storage_metrics,
+        principal_cache=principal_cache_metrics,
+        reservations=reservation_metrics,
+        traefik_routes=traefik_route_metrics,
+        dind_clients=dind_client_metrics,
+        docker_executor=docker_executor_metrics,
         collected_at=now,
     )
 
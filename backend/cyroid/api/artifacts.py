@@ -43,7 +43,7 @@ def list_artifacts(db: DBSession, current_user: CurrentUser):
 
 
 @router.post("/upload", response_model=ArtifactResponse, status_code=status.HTTP_201_CREATED)
-async def upload_artifact(
+def upload_artifact(
     db: DBSession,
     current_user: CurrentUser,
     file: UploadFile = File(...),
@@ -54,7 +54,10 @@ async def upload_artifact(
     ttps: str = Form(None),
     tags: str = Form(None),
 ):
-    """Upload a new artifact."""
+    """Upload a new artifact.
+
+    A plain (threadpool) handler: the MinIO upload and database writes block.
+    """
     storage = get_storage_service()
 
     # Generate unique file path
@@ -6,6 +6,7 @@ from cyroid.api.deps import DBSession, CurrentUser
 from cyroid.models.user import User, UserRole, UserAttribute
 from cyroid.schemas.auth import LoginRequest, TokenResponse, PasswordChangeResponse
 from cyroid.schemas.user import UserCreate, UserResponse, PasswordChangeRequest
+from cyroid.services.principal_cache import get_principal_cache
 from cyroid.utils.security import verify_password, get_password_hash, create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -135,5 +136,6 @@ def change_password(password_data: PasswordChangeRequest, db: DBSession, current
     current_user.password_reset_required = False
 
     db.commit()
+    get_principal_cache().invalidate(current_user.id)
 
     return PasswordChangeResponse(message="Password changed successfully")
@@ -11,18 +11,24 @@ from pydantic import BaseModel
 
 from cyroid.api.deps import DBSession, CurrentUser, AdminUser, require_role
 from cyroid.services.docker_service import get_docker_service
-from cyroid.services.registry_service import get_registry_service, RegistryPushError
+from cyroid.services.image_job_registry import (
+    JOB_KIND_BUILD,
+    JOB_KIND_INGEST,
+    JOB_KIND_PULL,
+    get_image_job_registry,
+    image_job_key,
+)
+from cyroid.services.upload_ingest_service import (
+    IngestJob,
+    extract_iso_from_archive,
+    get_upload_ingest_service,
+    run_in_ingest_pool,
+)
 from cyroid.config import get_settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/cache", tags=["Image Cache"])
 
-# Track active Docker image pulls for progress reporting
-_active_docker_pulls: Dict[str, Dict[str, Any]] = {}
-
-# Track active Docker image builds for progress reporting
-_active_docker_builds: Dict[str, Dict[str, Any]] = {}
-
 # Supported compressed archive extensions for ISO downloads/uploads
 SUPPORTED_ARCHIVE_EXTENSIONS = (
     '.zip', '.7z', '.rar',  # Common archives
@@ -56,69 +62,6 @@ def get_archive_extension(path_or_url: str) -> Optional[str]:
     return None
 
 
-def extract_iso_from_archive(archive_path: str, dest_dir: str) -> str:
-    """
-    Extract an archive and find the ISO file inside.
-    Uses 7z which supports most archive formats.
-
-    Args:
-        archive_path: Path to the archive file
-        dest_dir: Directory to extract to
-
-    Returns:
-        Path to the extracted ISO file
-
-    Raises:
-        ValueError: If no ISO found or multiple ISOs found
-        RuntimeError: If extraction fails
-    """
-    import subprocess
-    import shutil
-    import tempfile
-
-    # Create a temporary extraction directory
-    extract_dir = tempfile.mkdtemp(prefix="iso_extract_", dir=dest_dir)
-
-    try:
-        # Use 7z for extraction - it handles most formats
-        # -y: assume Yes on all queries
-        # -o: output directory
-        result = subprocess.run(
-            ['7z', 'x', '-y', f'-o{extract_dir}', archive_path],
-            capture_output=True,
-            text=True,
-            timeout=3600  # 1 hour timeout for large archives
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to extract archive: {result.stderr}")
-
-        # Find all ISO files in the extracted content (recursive)
-        iso_files = []
-        for root, dirs, files in os.walk(extract_dir):
-            for f in files:
-                if f.lower().endswith('.iso'):
-                    iso_files.append(os.path.join(root, f))
-
-        if not iso_files:
-            raise ValueError("No ISO file found in archive")
-
-        if len(iso_files) > 1:
-            # If multiple ISOs, prefer the largest one (likely the main ISO)
-            iso_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
-            logger.warning(f"Multiple ISO files found in archive, using largest: {iso_files[0]}")
-
-        return iso_files[0]
-
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("Archive extraction timed out")
-    except Exception as e:
-        # Clean up on failure
-        if os.path.exists(extract_dir):
-            shutil.rmtree(extract_dir, ignore_errors=True)
-        raise
-
-
 def get_windows_iso_dir() -> str:
     """Get the Windows ISO cache directory path."""
     settings = get_settings()
@@ -251,258 +194,20 @@ class DockerPullRequest(BaseModel):
     image: str
 
 
-def _create_base_image_for_build(full_tag: str, image_id: str, image_project_name: str):
-    """
-    Create or update a BaseImage record after a successful Docker build.
-
-    Args:
-        full_tag: The full Docker image tag (e.g., cyroid/kali-attack:latest)
-        image_id: The Docker image ID (sha256 hash)
-        image_project_name: The Dockerfile project directory name (e.g., kali-attack)
-    """
-    try:
-        from cyroid.database import get_session_local
-        from cyroid.models.base_image import BaseImage
-
-        SessionLocal = get_session_local()
-        db = SessionLocal()
-        try:
-            # Check if BaseImage already exists for this tag
-            existing = db.query(BaseImage).filter(
-                BaseImage.docker_image_tag == full_tag
-            ).first()
-
-            if existing:
-                # Update existing record with new image ID and project name
-                existing.docker_image_id = image_id
-                existing.image_project_name = image_project_name
-                db.commit()
-                logger.info(f"Updated BaseImage record for {full_tag} with project_name={image_project_name}")
-            else:
-                # Create new BaseImage record
-                # Parse image name from tag for display
-                display_name = full_tag.split("/")[-1].split(":")[0]
-                base_image = BaseImage(
-                    name=display_name,
-                    description=f"Container image built from Dockerfile: {image_project_name}",
-                    image_type="container",
-                    docker_image_id=image_id,
-                    docker_image_tag=full_tag,
-                    image_project_name=image_project_name,
-                    os_type="linux",  # Default, can be updated later
-                    vm_type="container",
-                    is_global=True,
-                )
-                db.add(base_image)
-                db.commit()
-                logger.info(f"Created BaseImage record for {full_tag} with project_name={image_project_name}")
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning(f"Failed to create/update BaseImage record for {full_tag}: {e}")
-
-
-def _pull_docker_image_async(image: str):
-    """Background task to pull Docker image with progress tracking."""
-    import docker
-    import json
-
-    # Normalize image name for storage key
-    image_key = image.replace("/", "_").replace(":", "_")
-
-    _active_docker_pulls[image_key] = {
-        "status": "pulling",
-        "image": image,
-        "progress_percent": 0,
-        "current_layer": "",
-        "layers_total": 0,
-        "layers_completed": 0,
-        "cancelled": False,
-        "error": None,
-    }
-
-    try:
-        docker_service = get_docker_service()
-        client = docker_service.client
-
-        # Use low-level API to get streaming progress
-        api_client = client.api
-
-        # Track layer progress
-        layers = {}
-
-        for line in api_client.pull(image, stream=True, decode=True):
-            # Check for cancellation
-            if _active_docker_pulls.get(image_key, {}).get("cancelled"):
-                _active_docker_pulls[image_key]["status"] = "cancelled"
-                return
-
-            if "id" in line and "progressDetail" in line:
-                layer_id = line["id"]
-                progress_detail = line.get("progressDetail", {})
-                status_text = line.get("status", "")
-
-                if progress_detail:
-                    current = progress_detail.get("current", 0)
-                    total = progress_detail.get("total", 0)
-                    layers[layer_id] = {"current": current, "total": total, "status": status_text}
-                elif status_text in ["Pull complete", "Already exists"]:
-                    layers[layer_id] = {"current": 1, "total": 1, "status": status_text}
-
-                # Calculate overall progress
-                total_bytes = sum(l.get("total", 0) for l in layers.values())
-                current_bytes = sum(l.get("current", 0) for l in layers.values())
-                completed_layers = sum(1 for l in layers.values() if l.get("status") in ["Pull complete", "Already exists"])
-
-                if total_bytes > 0:
-                    progress = int((current_bytes / total_bytes) * 100)
-                else:
-                    progress = 0
-
-                _active_docker_pulls[image_key].update({
-                    "progress_percent": min(progress, 99),  # Don't show 100 until verified complete
-                    "current_layer": layer_id,
-                    "layers_total": len(layers),
-                    "layers_completed": completed_layers,
-                })
-            elif "status" in line:
-                # Handle status messages without layer ID
-                logger.debug(f"Docker pull status: {line.get('status')}")
-
-        # Verify image was pulled
-        try:
-            pulled_image = client.images.get(image)
-            image_id = pulled_image.id
-            size_bytes = pulled_image.attrs.get("Size", 0)
-            _active_docker_pulls[image_key].update({
-                "status": "completed",
-                "progress_percent": 100,
-                "image_id": image_id,
-                "size_bytes": size_bytes,
-            })
-
-            # Auto-create BaseImage record for the Image Library
-            try:
-                from cyroid.database import get_session_local
-                from cyroid.models.base_image import BaseImage
-
-                SessionLocal = get_session_local()
-                db = SessionLocal()
-                try:
-                    # Check if BaseImage already exists for this image
-                    existing = db.query(BaseImage).filter(
-                        BaseImage.docker_image_tag == image
-                    ).first()
-
-                    if not existing:
-                        # Create new BaseImage record
-                        # Parse image name for metadata
-                        image_name = image.split("/")[-1].split(":")[0]
-                        base_image = BaseImage(
-                            name=image_name,
-                            description=f"Container image pulled from registry: {image}",
-                            image_type="container",
-                            docker_image_id=image_id,
-                            docker_image_tag=image,
-                            os_type="linux",  # Default, can be updated later
-                            vm_type="container",
-                            size_bytes=size_bytes,
-                            is_global=True,
-                        )
-                        db.add(base_image)
-                        db.commit()
-                        logger.info(f"Created BaseImage record for {image}")
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.warning(f"Failed to create BaseImage record for {image}: {e}")
-
-            # Auto-push to local registry and cleanup host Docker
-            try:
-                import asyncio
-                registry = get_registry_service()
-
-                # Create event loop for async calls in this thread
-                loop = asyncio.new_event_loop()
-                try:
-                    # Check if registry is healthy
-                    is_healthy = loop.run_until_complete(registry.is_healthy())
-                    if not is_healthy:
-                        logger.warning(f"Registry not healthy, skipping push for {image}")
-                        _active_docker_pulls[image_key].update({
-                            "pushed_to_registry": False,
-                            "registry_error": "Registry not healthy",
-                        })
-                    else:
-                        # Update status to pushing
-                        _active_docker_pulls[image_key].update({
-                            "status": "pushing_to_registry",
-                        })
-
-                        # Push to registry and cleanup host
-                        loop.run_until_complete(registry.push_and_cleanup(image))
-
-                        _active_docker_pulls[image_key].update({
-                            "status": "completed",
-                            "pushed_to_registry": True,
-                        })
-                        logger.info(f"Pushed {image} to registry and cleaned up host")
-                finally:
-                    loop.close()
-
-            except RegistryPushError as e:
-                logger.error(f"Failed to push {image} to registry: {e}")
-                _active_docker_pulls[image_key].update({
-                    "status": "failed",
-                    "pushed_to_registry": False,
-                    "registry_error": str(e),
-                    "error": f"Registry push failed: {e}",
-                })
-                return
-            except Exception as e:
-                logger.error(f"Unexpected error pushing {image} to registry: {e}")
-                _active_docker_pulls[image_key].update({
-                    "status": "failed",
-                    "pushed_to_registry": False,
-                    "registry_error": str(e),
-                    "error": f"Registry push failed: {e}",
-                })
-                return
-
-        except Exception:
-            _active_docker_pulls[image_key].update({
-                "status": "completed",
-                "progress_percent": 100,
-            })
-
-    except Exception as e:
-        logger.error(f"Failed to pull Docker image {image}: {e}")
-        _active_docker_pulls[image_key].update({
-            "status": "failed",
-            "error": str(e),
-        })
-
-
 @router.post("/images/pull")
-def start_docker_pull(
-    request: DockerPullRequest,
-    background_tasks: BackgroundTasks,
-    current_user: AdminUser
-):
+def start_docker_pull(request: DockerPullRequest, current_user: AdminUser):
     """
     Start an async Docker image pull with progress tracking.
     Returns immediately and allows polling for status.
+
+    The pull runs on the task worker and its progress is shared through
+    Redis, so any API worker can answer status polls. Concurrent requests
+    for the same image attach to the existing pull.
     """
-    image = request.image
-    image_key = image.replace("/", "_").replace(":", "_")
+    from cyroid.tasks.image_jobs import pull_docker_image_task
 
-    # Check if already pulling
-    if image_key in _active_docker_pulls and _active_docker_pulls[image_key].get("status") == "pulling":
-        return {
-            "status": "already_pulling",
-            "image": image,
-            "message": "Image is already being pulled",
-        }
+    image = request.image
+    image_key = image_job_key(image)
 
     # Check if image already cached
     docker = get_docker_service()
@@ -517,28 +222,51 @@ def start_docker_pull(
     except Exception:
         pass  # Image not cached, proceed with pull
 
-    # Start background pull
-    background_tasks.add_task(_pull_docker_image_async, image)
+    jobs = get_image_job_registry()
+    if not jobs.claim(JOB_KIND_PULL, image_key, {
+        "image": image,
+        "current_layer": "",
+        "layers_total": 0,
+        "layers_completed": 0,
+    }):
+        return {
+            "status": "already_pulling",
+            "image": image,
+            "image_key": image_key,
+            "message": "Image is already being pulled",
+        }
+
+    try:
+        pull_docker_image_task.send(image)
+    except Exception as e:
+        jobs.finish(JOB_KIND_PULL, image_key, "failed", error=f"Failed to queue pull: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to queue image pull: {e}",
+        )
 
     return {
         "status": "pulling",
         "image": image,
+        "image_key": image_key,
         "message": f"Started pulling {image}",
     }
 
 
 @router.get("/images/pull/{image_key}/status")
 def get_docker_pull_status(image_key: str, current_user: CurrentUser):
-    """Get status of a Docker image pull in progress."""
-    # Check active pulls first
-    if image_key in _active_docker_pulls:
-        pull_info = _active_docker_pulls[image_key]
+    """Get status of a Docker image pull, including per-layer progress."""
+    pull_info = get_image_job_registry().get(JOB_KIND_PULL, image_key, include_layers=True)
+    if pull_info:
+        pull_status = pull_info.get("status", "unknown")
         return {
-            "status": pull_info.get("status", "unknown"),
+            # Queued pulls are reported as pulling; the UI treats both the same
+            "status": "pulling" if pull_status == "queued" else pull_status,
             "image": pull_info.get("image"),
             "progress_percent": pull_info.get("progress_percent", 0),
             "layers_total": pull_info.get("layers_total", 0),
             "layers_completed": pull_info.get("layers_completed", 0),
+            "layers": pull_info.get("layers", []),
             "error": pull_info.get("error"),
             "image_id": pull_info.get("image_id"),
             "size_bytes": pull_info.get("size_bytes"),
@@ -546,7 +274,7 @@ def get_docker_pull_status(image_key: str, current_user: CurrentUser):
             "registry_error": pull_info.get("registry_error"),
         }
 
-    # Not in active pulls - check if image exists (completed before tracking started)
+    # No tracked pull - check if image exists (completed before tracking started)
     docker = get_docker_service()
     try:
         # Convert key back to image name
@@ -575,19 +303,21 @@ def get_docker_pull_status(image_key: str, current_user: CurrentUser):
 @router.post("/images/pull/{image_key}/cancel")
 def cancel_docker_pull(image_key: str, current_user: AdminUser):
     """Cancel an active Docker image pull."""
-    if image_key not in _active_docker_pulls:
+    jobs = get_image_job_registry()
+    pull_info = jobs.get(JOB_KIND_PULL, image_key)
+    if pull_info is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No active pull found for {image_key}"
         )
 
-    if _active_docker_pulls[image_key].get("status") != "pulling":
+    if pull_info.get("status") not in ("queued", "pulling"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Pull is not in progress"
         )
 
-    _active_docker_pulls[image_key]["cancelled"] = True
+    jobs.request_cancel(JOB_KIND_PULL, image_key)
     return {
         "status": "cancelling",
         "image_key": image_key,
@@ -601,15 +331,14 @@ def get_active_docker_pulls(current_user: CurrentUser):
     return {
         "pulls": [
             {
-                "image_key": key,
+                "image_key": info["key"],
                 "image": info.get("image"),
-                "status": info.get("status"),
+                "status": "pulling" if info.get("status") == "queued" else info.get("status"),
                 "progress_percent": info.get("progress_percent", 0),
                 "layers_total": info.get("layers_total", 0),
                 "layers_completed": info.get("layers_completed", 0),
             }
-            for key, info in _active_docker_pulls.items()
-            if info.get("status") == "pulling"
+            for info in get_image_job_registry().list(JOB_KIND_PULL)
         ]
     }
 
@@ -704,270 +433,14 @@ def list_buildable_images(current_user: CurrentUser):
     }
 
 
-def _build_docker_image_async(image_name: str, tag: str, no_cache: bool):
-    """Background task to build a Docker image with progress tracking."""
-    build_key = f"{image_name}_{tag}"
-    image_path = os.path.join(IMAGES_DIR, image_name)
-    full_tag = f"cyroid/{image_name}:{tag}"
-
-    _active_docker_builds[build_key] = {
-        "status": "building",
-        "image_name": image_name,
-        "tag": tag,
-        "full_tag": full_tag,
-        "progress_percent": 0,
-        "current_step": 0,
-        "total_steps": 0,
-        "current_step_name": "Starting build...",
-        "logs": [],
-        "cancelled": False,
-    }
-
-    try:
-        docker = get_docker_service()
-        client = docker.client
-
-        # Build the image with streaming output
-        logger.info(f"Building Docker image {full_tag} from {image_path}")
-
-        # Use low-level API to get streaming output
-        build_output = client.api.build(
-            path=image_path,
-            tag=full_tag,
-            rm=True,  # Remove intermediate containers
-            nocache=no_cache,
-            decode=True,  # Decode JSON responses
-        )
-
-        step_pattern = r"Step (\d+)/(\d+)"
-        import re
-
-        for chunk in build_output:
-            # Check for cancellation
-            if _active_docker_builds[build_key].get("cancelled"):
-                _active_docker_builds[build_key].update({
-                    "status": "cancelled",
-                    "current_step_name": "Build cancelled by user",
-                })
-                return
-
-            if "stream" in chunk:
-                stream_line = chunk["stream"].strip()
-                if stream_line:
-                    # Add to logs (keep last 100 lines)
-                    logs = _active_docker_builds[build_key].get("logs", [])
-                    logs.append(stream_line)
-                    if len(logs) > 100:
-                        logs = logs[-100:]
-                    _active_docker_builds[build_key]["logs"] = logs
-
-                    # Parse step progress
-                    match = re.match(step_pattern, stream_line)
-                    if match:
-                        current_step = int(match.group(1))
-                        total_steps = int(match.group(2))
-                        progress = int((current_step / total_steps) * 100)
-
-                        _active_docker_builds[build_key].update({
-                            "current_step": current_step,
-                            "total_steps": total_steps,
-                            "progress_percent": min(progress, 99),
-                            "current_step_name": stream_line,
-                        })
-
-            elif "error" in chunk:
-                error_msg = chunk.get("error", "Unknown build error")
-                _active_docker_builds[build_key].update({
-                    "status": "failed",
-                    "error": error_msg,
-                    "current_step_name": f"Error: {error_msg}",
-                })
-                logger.error(f"Docker build failed: {error_msg}")
-                return
-
-            elif "message" in chunk:
-                # Docker returns parse errors and other messages in 'message' key
-                msg = chunk.get("message", "")
-                if "error" in msg.lower() or "unknown instruction" in msg.lower():
-                    _active_docker_builds[build_key].update({
-                        "status": "failed",
-                        "error": msg,
-                        "current_step_name": f"Error: {msg}",
-                    })
-                    logger.error(f"Docker build failed: {msg}")
-                    return
-                else:
-                    # Log non-error messages
-                    logs = _active_docker_builds[build_key].get("logs", [])
-                    logs.append(msg)
-                    _active_docker_builds[build_key]["logs"] = logs[-100:]
-
-            elif "aux" in chunk:
-                # Build complete - aux contains the image ID
-                image_id = chunk.get("aux", {}).get("ID", "")
-                _active_docker_builds[build_key].update({
-                    "status": "completed",
-                    "progress_percent": 100,
-                    "image_id": image_id,
-                    "current_step_name": "Build complete!",
-                })
-                logger.info(f"Docker build completed: {full_tag} ({image_id})")
-
-                # Create/update BaseImage record with image_project_name
-                _create_base_image_for_build(full_tag, image_id, image_name)
-
-                # Auto-push to local registry and cleanup host Docker
-                try:
-                    import asyncio
-                    registry = get_registry_service()
-
-                    # Create event loop for async calls in this thread
-                    loop = asyncio.new_event_loop()
-                    try:
-                        # Check if registry is healthy
-                        is_healthy = loop.run_until_complete(registry.is_healthy())
-                        if not is_healthy:
-                            logger.warning(f"Registry not healthy, skipping push for {full_tag}")
-                            _active_docker_builds[build_key].update({
-                                "status": "failed",
-                                "pushed_to_registry": False,
-                                "error": "Registry not healthy - image built but not pushed",
-                                "current_step_name": "Error: Registry not healthy",
-                            })
-                            return
-
-                        # Update status to pushing
-                        _active_docker_builds[build_key].update({
-                            "current_step_name": "Pushing to registry...",
-                        })
-
-                        # Push to registry and cleanup host
-                        loop.run_until_complete(registry.push_and_cleanup(full_tag))
-
-                        _active_docker_builds[build_key].update({
-                            "pushed_to_registry": True,
-                            "current_step_name": "Build complete and pushed to registry!",
-                        })
-                        logger.info(f"Pushed {full_tag} to registry and cleaned up host")
-                    finally:
-                        loop.close()
-
-                except RegistryPushError as e:
-                    logger.error(f"Failed to push {full_tag} to registry: {e}")
-                    _active_docker_builds[build_key].update({
-                        "status": "failed",
-                        "pushed_to_registry": False,
-                        "error": f"Registry push failed: {e}",
-                        "current_step_name": f"Error: Registry push failed - {e}",
-                    })
-                    return
-                except Exception as e:
-                    logger.error(f"Unexpected error pushing {full_tag} to registry: {e}")
-                    _active_docker_builds[build_key].update({
-                        "status": "failed",
-                        "pushed_to_registry": False,
-                        "error": f"Registry push failed: {e}",
-                        "current_step_name": f"Error: Registry push failed - {e}",
-                    })
-                    return
-
-                return
-
-        # If we get here without aux, check if image exists
-        try:
-            built_image = client.images.get(full_tag)
-            _active_docker_builds[build_key].update({
-                "status": "completed",
-                "progress_percent": 100,
-                "image_id": built_image.id,
-                "current_step_name": "Build complete!",
-            })
-            # Create/update BaseImage record with image_project_name
-            _create_base_image_for_build(full_tag, built_image.id, image_name)
-
-            # Auto-push to local registry and cleanup host Docker
-            try:
-                import asyncio
-                registry = get_registry_service()
-
-                # Create event loop for async calls in this thread
-                loop = asyncio.new_event_loop()
-                try:
-                    # Check if registry is healthy
-                    is_healthy = loop.run_until_complete(registry.is_healthy())
-                    if not is_healthy:
-                        logger.warning(f"Registry not healthy, skipping push for {full_tag}")
-                        _active_docker_builds[build_key].update({
-                            "status": "failed",
-                            "pushed_to_registry": False,
-                            "error": "Registry not healthy - image built but not pushed",
-                            "current_step_name": "Error: Registry not healthy",
-                        })
-                        return
-
-                    # Update status to pushing
-                    _active_docker_builds[build_key].update({
-                        "current_step_name": "Pushing to registry...",
-                    })
-
-                    # Push to registry and cleanup host
-                    loop.run_until_complete(registry.push_and_cleanup(full_tag))
-
-                    _active_docker_builds[build_key].update({
-                        "pushed_to_registry": True,
-                        "current_step_name": "Build complete and pushed to registry!",
-                    })
-                    logger.info(f"Pushed {full_tag} to registry and cleaned up host")
-                finally:
-                    loop.close()
-
-            except RegistryPushError as e:
-                logger.error(f"Failed to push {full_tag} to registry: {e}")
-                _active_docker_builds[build_key].update({
-                    "status": "failed",
-                    "pushed_to_registry": False,
-                    "error": f"Registry push failed: {e}",
-                    "current_step_name": f"Error: Registry push failed - {e}",
-                })
-                return
-            except Exception as e:
-                logger.error(f"Unexpected error pushing {full_tag} to registry: {e}")
-                _active_docker_builds[build_key].update({
-                    "status": "failed",
-                    "pushed_to_registry": False,
-                    "error": f"Registry push failed: {e}",
-                    "current_step_name": f"Error: Registry push failed - {e}",
-                })
-                return
-
-        except Exception as e:
-            # Image doesn't exist - build failed silently or was never completed
-            logger.error(f"Build verification failed for {full_tag}: {e}")
-            _active_docker_builds[build_key].update({
-                "status": "failed",
-                "error": f"Build failed - image not found: {e}",
-                "current_step_name": "Error: Build failed - image not created",
-            })
-
-    except Exception as e:
-        logger.error(f"Failed to build Docker image {image_name}: {e}")
-        _active_docker_builds[build_key].update({
-            "status": "failed",
-            "error": str(e),
-            "current_step_name": f"Error: {str(e)}",
-        })
-
-
 @router.post("/images/build")
-def start_docker_build(
-    request: DockerBuildRequest,
-    background_tasks: BackgroundTasks,
-    current_user: AdminUser
-):
+def start_docker_build(request: DockerBuildRequest, current_user: AdminUser):
     """
     Start an async Docker image build with progress tracking.
     Returns immediately and allows polling for status.
     """
+    from cyroid.tasks.image_jobs import build_docker_image_task
+
     image_name = request.image_name
     tag = request.tag
     build_key = f"{image_name}_{tag}"
@@ -982,34 +455,36 @@ def start_docker_build(
             detail=f"No Dockerfile found at {image_path}"
         )
 
-    # Check if already building
-    if build_key in _active_docker_builds and _active_docker_builds[build_key].get("status") == "building":
-        return {
-            "status": "already_building",
-            "image_name": image_name,
-            "tag": tag,
-            "message": "Image is already being built",
-        }
-
     full_tag = f"cyroid/{image_name}:{tag}"
 
-    # Initialize build status BEFORE starting background task to prevent race condition
-    # where frontend polls and gets stale "completed" status from a previous build
-    _active_docker_builds[build_key] = {
-        "status": "building",
+    # Claim the build slot BEFORE queueing the task so the frontend never
+    # polls a stale "completed" status from a previous build
+    jobs = get_image_job_registry()
+    if not jobs.claim(JOB_KIND_BUILD, build_key, {
         "image_name": image_name,
         "tag": tag,
         "full_tag": full_tag,
-        "progress_percent": 0,
         "current_step": 0,
         "total_steps": 0,
         "current_step_name": "Starting build...",
         "logs": [],
-        "cancelled": False,
-    }
+    }):
+        return {
+            "status": "already_building",
+            "image_name": image_name,
+            "tag": tag,
+            "build_key": build_key,
+            "message": "Image is already being built",
+        }
 
-    # Start background build
-    background_tasks.add_task(_build_docker_image_async, image_name, tag, request.no_cache)
+    try:
+        build_docker_image_task.send(build_key, image_name, image_path, tag, request.no_cache)
+    except Exception as e:
+        jobs.finish(JOB_KIND_BUILD, build_key, "failed", error=f"Failed to queue build: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to queue image build: {e}",
+        )
 
     return {
         "status": "building",
@@ -1020,20 +495,28 @@ def start_docker_build(
     }
 
 
+def _build_status_response(build_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Common build status fields. Queued builds are reported as building."""
+    status_value = build_info.get("status", "unknown")
+    return {
+        "status": "building" if status_value == "queued" else status_value,
+        "image_name": build_info.get("image_name"),
+        "tag": build_info.get("tag"),
+        "full_tag": build_info.get("full_tag"),
+        "progress_percent": build_info.get("progress_percent", 0),
+        "current_step": build_info.get("current_step", 0),
+        "total_steps": build_info.get("total_steps", 0),
+        "current_step_name": build_info.get("current_step_name", ""),
+    }
+
+
 @router.get("/images/build/{build_key}/status")
 def get_docker_build_status(build_key: str, current_user: CurrentUser):
     """Get status of a Docker image build in progress."""
-    if build_key in _active_docker_builds:
-        build_info = _active_docker_builds[build_key]
+    build_info = get_image_job_registry().get(JOB_KIND_BUILD, build_key)
+    if build_info:
         return {
-            "status": build_info.get("status", "unknown"),
-            "image_name": build_info.get("image_name"),
-            "tag": build_info.get("tag"),
-            "full_tag": build_info.get("full_tag"),
-            "progress_percent": build_info.get("progress_percent", 0),
-            "current_step": build_info.get("current_step", 0),
-            "total_steps": build_info.get("total_steps", 0),
-            "current_step_name": build_info.get("current_step_name", ""),
+            **_build_status_response(build_info),
             "error": build_info.get("error"),
             "image_id": build_info.get("image_id"),
             "pushed_to_registry": build_info.get("pushed_to_registry"),
@@ -1049,19 +532,21 @@ def get_docker_build_status(build_key: str, current_user: CurrentUser):
 @router.post("/images/build/{build_key}/cancel")
 def cancel_docker_build(build_key: str, current_user: AdminUser):
     """Cancel an active Docker image build."""
-    if build_key not in _active_docker_builds:
+    jobs = get_image_job_registry()
+    build_info = jobs.get(JOB_KIND_BUILD, build_key)
+    if build_info is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No active build found for {build_key}"
         )
 
-    if _active_docker_builds[build_key].get("status") != "building":
+    if build_info.get("status") not in ("queued", "building"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Build is not in progress"
         )
 
-    _active_docker_builds[build_key]["cancelled"] = True
+    jobs.request_cancel(JOB_KIND_BUILD, build_key)
     return {
         "status": "cancelling",
         "build_key": build_key,
@@ -1074,19 +559,8 @@ def get_active_docker_builds(current_user: CurrentUser):
     """Get all active Docker image builds."""
     return {
         "builds": [
-            {
-                "build_key": key,
-                "image_name": info.get("image_name"),
-                "tag": info.get("tag"),
-                "full_tag": info.get("full_tag"),
-                "status": info.get("status"),
-                "progress_percent": info.get("progress_percent", 0),
-                "current_step": info.get("current_step", 0),
-                "total_steps": info.get("total_steps", 0),
-                "current_step_name": info.get("current_step_name", ""),
-            }
-            for key, info in _active_docker_builds.items()
-            if info.get("status") == "building"
+            {"build_key": info["key"], **_build_status_response(info)}
+            for info in get_image_job_registry().list(JOB_KIND_BUILD)
         ]
     }
 
@@ -3449,12 +2923,14 @@ async def upload_custom_iso(
     Upload a custom ISO file or compressed archive containing an ISO to the cache.
     Supports: .iso, .zip, .7z, .rar, .tar, .tar.gz, .tgz, .tar.bz2, .gz, .bz2, .xz
     Admin only.
+
+    The upload is spooled to disk and the ISO extracted on the ingest thread
+    pool; progress can be polled at /cache/ingest/{filename}/status.
     """
     import os
     import re
     import json
     import shutil
-    import aiofiles
     from datetime import datetime
     from cyroid.config import get_settings
 
@@ -3495,22 +2971,29 @@ async def upload_custom_iso(
             detail=f"ISO '{safe_name}' already exists. Delete it first to replace."
         )
 
+    ingest = IngestJob(safe_name, filename=safe_name, source=file.filename)
+    if not ingest.owned:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"ISO '{safe_name}' is already being uploaded."
+        )
+
+    ingest_service = get_upload_ingest_service()
     temp_archive_path = None
     extract_dir = None
 
     try:
         if is_archive:
-            # Save archive to temp file first
+            # Spool archive to a temp file first
             archive_ext = get_archive_extension(file.filename) or '.archive'
             temp_archive_path = os.path.join(custom_iso_dir, f".tmp_upload_{safe_name}{archive_ext}")
+            await ingest_service.spool(file, temp_archive_path, ingest.stage("uploading"))
 
-            async with aiofiles.open(temp_archive_path, 'wb') as out_file:
-                while content := await file.read(1024 * 1024):  # 1MB chunks
-                    await out_file.write(content)
-
-            # Extract ISO from archive
+            # Extract only the ISO member from the archive
             logger.info(f"Extracting ISO from uploaded archive: {temp_archive_path}")
-            iso_path = extract_iso_from_archive(temp_archive_path, custom_iso_dir)
+            iso_path = await ingest_service.extract_iso(
+                temp_archive_path, custom_iso_dir, ingest.stage("extracting")
+            )
             extract_dir = os.path.dirname(iso_path)
 
             # Move extracted ISO to final destination
@@ -3525,9 +3008,7 @@ async def upload_custom_iso(
 
         else:
             # Direct ISO upload
-            async with aiofiles.open(filepath, 'wb') as out_file:
-                while content := await file.read(1024 * 1024):  # 1MB chunks
-                    await out_file.write(content)
+            await ingest_service.spool(file, filepath, ingest.stage("uploading"))
 
         file_size = os.path.getsize(filepath)
 
@@ -3549,6 +3030,7 @@ async def upload_custom_iso(
         with open(metadata_file, "w") as f:
             json.dump(metadata, f, indent=2)
 
+        ingest.finish("completed", progress_percent=100, size_bytes=file_size)
         return {
             "status": "uploaded",
             "name": name,
@@ -3558,32 +3040,70 @@ async def upload_custom_iso(
             "size_gb": round(file_size / (1024**3), 2),
             "extracted_from_archive": is_archive
         }
-    except ValueError as e:
-        # Clean up on failure (e.g., no ISO found in archive)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        if temp_archive_path and os.path.exists(temp_archive_path):
-            os.remove(temp_archive_path)
-        if extract_dir and os.path.exists(extract_dir):
-            shutil.rmtree(extract_dir, ignore_errors=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
     except Exception as e:
-        # Clean up on failure
+        # Clean up on failure (e.g., no ISO found in archive)
+        ingest.finish("failed", error=str(e))
         if os.path.exists(filepath):
             os.remove(filepath)
         if temp_archive_path and os.path.exists(temp_archive_path):
             os.remove(temp_archive_path)
         if extract_dir and os.path.exists(extract_dir):
             shutil.rmtree(extract_dir, ignore_errors=True)
+        if isinstance(e, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload ISO: {str(e)}"
         )
 
 
+@router.get("/ingest/{key}/status")
+def get_ingest_status(key: str, current_user: CurrentUser):
+    """Get spool/extraction progress of an upload being ingested."""
+    ingest_info = get_image_job_registry().get(JOB_KIND_INGEST, key)
+    if ingest_info is None:
+        return {
+            "status": "not_found",
+            "message": f"No upload found for {key}",
+        }
+    return {
+        "status": ingest_info.get("status", "unknown"),
+        "filename": ingest_info.get("filename"),
+        "progress_percent": ingest_info.get("progress_percent", 0),
+        "bytes_done": ingest_info.get("bytes_done", 0),
+        "bytes_total": ingest_info.get("bytes_total", 0),
+        "error": ingest_info.get("error"),
+    }
+
+
+@router.post("/ingest/{key}/cancel")
+def cancel_ingest(key: str, current_user: AdminUser):
+    """Cancel an upload that is waiting for or running a disk image conversion."""
+    jobs = get_image_job_registry()
+    ingest_info = jobs.get(JOB_KIND_INGEST, key)
+    if ingest_info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No active upload found for {key}"
+        )
+
+    if ingest_info.get("status") not in ("queued", "converting"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only image conversions can be cancelled"
+        )
+
+    jobs.request_cancel(JOB_KIND_INGEST, key)
+    return {
+        "status": "cancelling",
+        "key": key,
+        "message": "Cancellation requested",
+    }
+
+
 @router.post("/docker-images/upload", status_code=status.HTTP_201_CREATED)
 async def upload_docker_image(
     file: UploadFile = File(...),
@@ -3614,16 +3134,18 @@ async def upload_docker_image(
     docker = get_docker_service()
     temp_path = None
 
+    def _load(path: str):
+        with open(path, 'rb') as f:
+            return docker.client.images.load(f)
+
     try:
-        # Stream uploaded file to temp file (docker.images.load needs file handle)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.tar') as tmp:
-            temp_path = tmp.name
-            while content := await file.read(1024 * 1024):  # 1MB chunks
-                tmp.write(content)
+        # Spool uploaded file to temp file (docker.images.load needs file handle)
+        fd, temp_path = tempfile.mkstemp(suffix='.tar')
+        os.close(fd)
+        await get_upload_ingest_service().spool(file, temp_path)
 
-        # Load image into Docker daemon
-        with open(temp_path, 'rb') as f:
-            loaded_images = docker.client.images.load(f)
+        # Load image into Docker daemon off the event loop
+        loaded_images = await run_in_ingest_pool(_load, temp_path)
 
         # Collect info about loaded images
         image_tags = []
@@ -1,10 +1,11 @@
 # backend/cyroid/api/catalog.py
 """Catalog API endpoints for browsing, installing, and managing catalog sources."""
 import logging
+from dataclasses import asdict
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from cyroid.api.deps import AdminUser, CurrentUser, DBSession
@@ -23,6 +24,7 @@ from cyroid.schemas.catalog import (
     CatalogSourceUpdate,
 )
 from cyroid.services.catalog_service import CatalogService
+from cyroid.services.catalog_sync_scheduler import get_catalog_sync_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +46,7 @@ def _get_source_or_404(source_id: UUID, db: Session) -> CatalogSource:
     return source
 
 
-def _source_to_response(source: CatalogSource) -> CatalogSourceResponse:
+def _source_to_response(source: CatalogSource, last_sync: Optional[dict] = None) -> CatalogSourceResponse:
     """Convert a CatalogSource model to a CatalogSourceResponse schema."""
     return CatalogSourceResponse(
         id=source.id,
@@ -57,6 +59,7 @@ def _source_to_response(source: CatalogSource) -> CatalogSourceResponse:
         error_message=source.error_message,
         item_count=source.item_count,
         last_synced=source.updated_at,
+        last_sync=last_sync,
         created_by=source.created_by,
         created_at=source.created_at,
         updated_at=source.updated_at,
@@ -86,7 +89,8 @@ def _installed_to_response(item: CatalogInstalledItem) -> CatalogInstalledItemRe
 def list_sources(db: DBSession, current_user: CurrentUser):
     """List all catalog sources."""
     sources = db.query(CatalogSource).all()
-    return [_source_to_response(s) for s in sources]
+    service = _get_service(db)
+    return [_source_to_response(s, service.get_sync_stats(s)) for s in sources]
 
 
 @router.post("/sources", response_model=CatalogSourceResponse, status_code=status.HTTP_201_CREATED)
@@ -158,45 +162,87 @@ def sync_source(source_id: UUID, db: DBSession, admin_user: AdminUser):
         )
 
     db.refresh(source)
-    return _source_to_response(source)
+    return _source_to_response(source, service.get_sync_stats(source))
+
+
+@router.post("/sources/sync", response_model=List[CatalogSourceResponse])
+def sync_all_sources(db: DBSession, admin_user: AdminUser):
+    """Sync all enabled catalog sources concurrently (admin only).
+
+    Unchanged sources are skipped cheaply via conditional HTTP requests and
+    shallow git fetches. Per-source failures are reported in each source's
+    last_sync instead of failing the whole request.
+    """
+    results = get_catalog_sync_scheduler().sync_all()
+
+    responses = []
+    for result in results:
+        source = db.query(CatalogSource).filter(CatalogSource.id == UUID(result.source_id)).first()
+        if source:
+            db.refresh(source)
+            responses.append(_source_to_response(source, asdict(result)))
+    return responses
 
 
 # ============ Browsing Endpoints ============
 
 @router.get("/items", response_model=List[CatalogItemSummary])
 def list_items(
+    response: Response,
     db: DBSession,
     current_user: CurrentUser,
     source_id: Optional[UUID] = Query(None, description="Filter by catalog source"),
     item_type: Optional[CatalogItemType] = Query(None, description="Filter by item type"),
     search: Optional[str] = Query(None, description="Search text in name and description"),
     tags: Optional[str] = Query(None, description="Comma-separated tags to filter by"),
+    offset: int = Query(0, ge=0, description="Number of matching items to skip"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum items to return"),
 ):
-    """Browse catalog items across all enabled sources with optional filters."""
+    """Browse catalog items across all enabled sources with optional filters.
+
+    Results are ordered by source name then index order, so offset/limit pages
+    are stable between requests. The total match count is returned in the
+    X-Total-Count header.
+    """
     tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else None
 
     if source_id:
         sources = [_get_source_or_404(source_id, db)]
     else:
-        sources = db.query(CatalogSource).filter(CatalogSource.enabled == True).all()
+        sources = (
+            db.query(CatalogSource)
+            .filter(CatalogSource.enabled == True)
+            .order_by(CatalogSource.name, CatalogSource.id)
+            .all()
+        )
 
     service = _get_service(db)
     all_items: List[CatalogItemSummary] = []
+    total = 0
 
     for source in sources:
         try:
-            items = service.list_items(
+            matches = service.search_items(
                 source=source,
                 item_type=item_type,
                 search=search,
                 tags=tag_list,
             )
-            all_items.extend(items)
         except FileNotFoundError:
             logger.warning(f"No index found for source '{source.name}', skipping")
+            continue
         except Exception as e:
             logger.error(f"Error browsing source '{source.name}': {e}")
+            continue
+
+        # Only build summaries for the part of this source that falls in the page
+        start = max(0, offset - total)
+        end = len(matches) if limit is None else max(start, offset + limit - total)
+        total += len(matches)
+        if start < len(matches) and end > start:
+            all_items.extend(service.summarize_items(source, matches[start:end]))
 
+    response.headers["X-Total-Count"] = str(total)
     return all_items
 
 
@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, UploadFile, File, status
 from fastapi.responses import Response
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
@@ -26,6 +26,13 @@ from cyroid.schemas.content import (
     ContentImport,
 )
 from cyroid.models.catalog import CatalogInstalledItem
+from cyroid.services.content_render_cache import (
+    RENDER_HTML,
+    content_etag,
+    content_revision,
+    etag_matches,
+    get_content_render_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +110,66 @@ def render_walkthrough_to_html(walkthrough_data: dict) -> str:
     return '\n'.join(html_parts)
 
 
+def _render_content_html(content: Content) -> str:
+    """Render a content item as a standalone HTML document for export."""
+    # Render content - check for walkthrough data first, then fall back to body_markdown
+    if content.walkthrough_data:
+        # Render walkthrough structure
+        html_body = render_walkthrough_to_html(content.walkthrough_data)
+        # Also include body_markdown if present (for additional notes)
+        if content.body_markdown:
+            html_body += '<hr><div class="additional-content">'
+            html_body += render_markdown_to_html(content.body_markdown)
+            html_body += '</div>'
+    else:
+        # Regular markdown content
+        html_body = content.body_html or render_markdown_to_html(content.body_markdown or "")
+
+    # Description as subtitle if present
+    description_html = ""
+    if content.description:
+        description_html = f'<p class="description">{content.description}</p>'
+
+    full_html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{content.title}</title>
+    <style>
+        body {{ font-family: system-ui, sans-serif; max-width: 900px; margin: 0 auto; padding: 2rem; line-height: 1.6; }}
+        h1 {{ border-bottom: 2px solid #333; padding-bottom: 0.5rem; }}
+        .description {{ color: #666; font-style: italic; margin-bottom: 2rem; }}
+        .phase {{ margin: 2rem 0; padding: 1rem; background: #f9f9f9; border-radius: 8px; }}
+        .phase-name {{ color: #2563eb; margin-top: 0; }}
+        .step {{ margin: 1.5rem 0; padding: 1rem; background: white; border-left: 4px solid #2563eb; }}
+        .step-title {{ margin: 0 0 0.5rem 0; color: #1e40af; }}
+        .step-vm {{ color: #666; font-size: 0.9rem; margin: 0.5rem 0; }}
+        .step-content {{ margin: 1rem 0; }}
+        .hints {{ background: #fef3c7; padding: 0.75rem; border-radius: 4px; margin-top: 1rem; }}
+        .hints-label {{ margin: 0 0 0.5rem 0; }}
+        .hints-list {{ margin: 0; padding-left: 1.5rem; }}
+        pre {{ background: #1e293b; color: #e2e8f0; padding: 1rem; overflow-x: auto; border-radius: 4px; }}
+        code {{ background: #e2e8f0; padding: 0.2rem 0.4rem; border-radius: 3px; font-size: 0.9em; }}
+        pre code {{ background: none; padding: 0; }}
+        table {{ border-collapse: collapse; width: 100%; margin: 1rem 0; }}
+        th, td {{ border: 1px solid #ddd; padding: 0.75rem; text-align: left; }}
+        th {{ background: #f3f4f6; }}
+        hr {{ margin: 2rem 0; border: none; border-top: 1px solid #e5e7eb; }}
+        .meta {{ color: #666; font-size: 0.85rem; margin-top: 3rem; padding-top: 1rem; border-top: 1px solid #e5e7eb; }}
+    </style>
+</head>
+<body>
+<h1>{content.title}</h1>
+{description_html}
+{html_body}
+<div class="meta">
+    <p>Exported from CYROID &bull; Version {content.version} &bull; Type: {content.content_type.value}</p>
+</div>
+</body>
+</html>"""
+    return full_html
+
+
 # ============ Content CRUD ============
 
 @router.post("", response_model=ContentResponse, status_code=status.HTTP_201_CREATED)
@@ -258,6 +325,7 @@ def delete_content(
 
     db.delete(content)
     db.commit()
+    get_content_render_cache().invalidate(content_id)
 
     logger.info(f"Content deleted: {content.title} by {current_user.username}")
 
@@ -350,8 +418,41 @@ def export_content(
     db: DBSession,
     current_user: CurrentUser,
     format: str = Query("json", description="Export format: json, md, html"),
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Export content in various formats."""
+    """Export content in various formats.
+
+    HTML exports are cached per content revision and carry an ETag, so an
+    unchanged document is answered with 304 without loading its body.
+    """
+    if format == "html":
+        meta = (
+            db.query(Content.id, Content.title, Content.updated_at, Content.version)
+            .filter(Content.id == content_id)
+            .first()
+        )
+        if not meta:
+            raise HTTPException(status_code=404, detail="Content not found")
+
+        revision = content_revision(meta.updated_at, meta.version)
+        etag = content_etag(RENDER_HTML, meta.id, revision)
+        headers = {
+            "Content-Disposition": f'attachment; filename="{meta.title}.html"',
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        def render() -> Optional[str]:
+            content = db.query(Content).filter(Content.id == content_id).first()
+            return _render_content_html(content) if content else None
+
+        full_html = get_content_render_cache().get_or_render(RENDER_HTML, meta.id, revision, render)
+        if full_html is None:
+            raise HTTPException(status_code=404, detail="Content not found")
+        return Response(content=full_html, media_type="text/html", headers=headers)
+
     content = db.query(Content).filter(Content.id == content_id).first()
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
@@ -363,67 +464,6 @@ def export_content(
             media_type="text/markdown",
             headers={"Content-Disposition": f'attachment; filename="{content.title}.md"'},
         )
-    elif format == "html":
-        # Render content - check for walkthrough data first, then fall back to body_markdown
-        if content.walkthrough_data:
-            # Render walkthrough structure
-            html_body = render_walkthrough_to_html(content.walkthrough_data)
-            # Also include body_markdown if present (for additional notes)
-            if content.body_markdown:
-                html_body += '<hr><div class="additional-content">'
-                html_body += render_markdown_to_html(content.body_markdown)
-                html_body += '</div>'
-        else:
-            # Regular markdown content
-            html_body = content.body_html or render_markdown_to_html(content.body_markdown or "")
-
-        # Description as subtitle if present
-        description_html = ""
-        if content.description:
-            description_html = f'<p class="description">{content.description}</p>'
-
-        full_html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{content.title}</title>
-    <style>
-        body {{ font-family: system-ui, sans-serif; max-width: 900px; margin: 0 auto; padding: 2rem; line-height: 1.6; }}
-        h1 {{ border-bottom: 2px solid #333; padding-bottom: 0.5rem; }}
-        .description {{ color: #666; font-style: italic; margin-bottom: 2rem; }}
-        .phase {{ margin: 2rem 0; padding: 1rem; background: #f9f9f9; border-radius: 8px; }}
-        .phase-name {{ color: #2563eb; margin-top: 0; }}
-        .step {{ margin: 1.5rem 0; padding: 1rem; background: white; border-left: 4px solid #2563eb; }}
-        .step-title {{ margin: 0 0 0.5rem 0; color: #1e40af; }}
-        .step-vm {{ color: #666; font-size: 0.9rem; margin: 0.5rem 0; }}
-        .step-content {{ margin: 1rem 0; }}
-        .hints {{ background: #fef3c7; padding: 0.75rem; border-radius: 4px; margin-top: 1rem; }}
-        .hints-label {{ margin: 0 0 0.5rem 0; }}
-        .hints-list {{ margin: 0; padding-left: 1.5rem; }}
-        pre {{ background: #1e293b; color: #e2e8f0; padding: 1rem; overflow-x: auto; border-radius: 4px; }}
-        code {{ background: #e2e8f0; padding: 0.2rem 0.4rem; border-radius: 3px; font-size: 0.9em; }}
-        pre code {{ background: none; padding: 0; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 1rem 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 0.75rem; text-align: left; }}
-        th {{ background: #f3f4f6; }}
-        hr {{ margin: 2rem 0; border: none; border-top: 1px solid #e5e7eb; }}
-        .meta {{ color: #666; font-size: 0.85rem; margin-top: 3rem; padding-top: 1rem; border-top: 1px solid #e5e7eb; }}
-    </style>
-</head>
-<body>
-<h1>{content.title}</h1>
-{description_html}
-{html_body}
-<div class="meta">
-    <p>Exported from CYROID &bull; Version {content.version} &bull; Type: {content.content_type.value}</p>
-</div>
-</body>
-</html>"""
-        return Response(
-            content=full_html,
-            media_type="text/html",
-            headers={"Content-Disposition": f'attachment; filename="{content.title}.html"'},
-        )
     else:
         # Return JSON with metadata
         export_data = ContentExport(
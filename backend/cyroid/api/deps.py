@@ -4,14 +4,15 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from cyroid.database import get_db
+from cyroid.database import get_async_db, get_db
 from cyroid.models.user import User, UserRole
-from cyroid.models.resource_tag import ResourceTag
 from cyroid.models.event import EventParticipant, TrainingEvent
 from cyroid.models.range import Range
+from cyroid.services.principal_cache import get_principal_cache
+from cyroid.services.visibility_service import VisibilityService
 from cyroid.utils.security import decode_access_token
 
 security = HTTPBearer()
@@ -32,8 +33,39 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Eagerly load attributes to avoid N+1 queries
-    user = db.query(User).options(joinedload(User.attributes)).filter(User.id == user_id).first()
+    # Attributes are loaded with the user; served from the shared principal cache when possible
+    user = get_principal_cache().load_user(db, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is deactivated",
+        )
+
+    return user
+
+
+async def get_current_user_async(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> User:
+    """get_current_user() for async handlers; the user is attached to the request's AsyncSession."""
+    user_id = decode_access_token(credentials.credentials)
+
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = await get_principal_cache().load_user_async(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -180,30 +212,9 @@ def filter_by_visibility(
             return query.filter(model_class.id == None)
         return query.filter(model_class.id.in_(accessible_ids))
 
-    # Tag-based visibility for other users/resources
-    user_tags = current_user.tags
-
-    # Get all resource IDs that have ANY tags
-    tagged_resource_ids = db.query(ResourceTag.resource_id).filter(
-        ResourceTag.resource_type == resource_type
-    ).distinct().subquery()
-
-    if not user_tags:
-        # User has no tags - only see untagged resources
-        return query.filter(~model_class.id.in_(tagged_resource_ids))
-
-    # User has tags - get resources matching their tags
-    matching_resource_ids = db.query(ResourceTag.resource_id).filter(
-        ResourceTag.resource_type == resource_type,
-        ResourceTag.tag.in_(user_tags)
-    ).distinct().subquery()
-
-    # Return: untagged resources OR resources matching user's tags
+    # Tag-based visibility for other users/resources, from the materialized grants
     return query.filter(
-        or_(
-            ~model_class.id.in_(tagged_resource_ids),  # Untagged (public)
-            model_class.id.in_(matching_resource_ids)   # Matching tags
-        )
+        VisibilityService.visible_clause(resource_type, current_user.id, model_class.id)
     )
 
 
@@ -244,20 +255,8 @@ def check_resource_access(
             detail="You are not assigned to this lab",
         )
 
-    # Check resource tags (for non-student users or non-range resources)
-    resource_tags = db.query(ResourceTag.tag).filter(
-        ResourceTag.resource_type == resource_type,
-        ResourceTag.resource_id == resource_id
-    ).all()
-
-    tag_values = [t.tag for t in resource_tags]
-
-    # No tags = public
-    if not tag_values:
-        return True
-
-    # Check for matching tags
-    if current_user.has_any_tag(*tag_values):
+    # Untagged (public) or a matching tag, from the materialized grants
+    if VisibilityService(db).can_see(resource_type, resource_id, current_user.id):
         return True
 
     raise HTTPException(
@@ -271,6 +270,10 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 AdminUser = Annotated[User, Depends(require_admin())]
 DBSession = Annotated[Session, Depends(get_db)]
 
+# Async handlers: queries are awaited on the event loop instead of holding a threadpool worker
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
+AsyncDBSession = Annotated[AsyncSession, Depends(get_async_db)]
+
 
 def get_current_user_from_token_param(
     request: Request,
@@ -303,7 +306,7 @@ def get_current_user_from_token_param(
             detail="Invalid or expired token",
         )
 
-    user = db.query(User).options(joinedload(User.attributes)).filter(User.id == user_id).first()
+    user = get_principal_cache().load_user(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,59 +1,101 @@
 # backend/cyroid/api/events.py
+from datetime import date
 from uuid import UUID
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from cyroid.api.deps import get_db, get_current_user
+from cyroid.api.deps import AsyncCurrentUser, AsyncDBSession, get_db, get_current_user
 from cyroid.models.user import User
 from cyroid.models.range import Range
 from cyroid.models.vm import VM
 from cyroid.models.event_log import EventType
-from cyroid.schemas.event_log import EventLogResponse, EventLogList
-from cyroid.services.event_service import EventService
+from cyroid.schemas.event_log import EventDailyCount, EventLogResponse, EventLogList
+from cyroid.services.event_service import AsyncEventService, EventService
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
 @router.get("/{range_id}", response_model=EventLogList)
-def get_range_events(
+async def get_range_events(
     range_id: UUID,
+    db: AsyncDBSession,
+    current_user: AsyncCurrentUser,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Count all matching events (first page only)"),
     event_types: Optional[List[EventType]] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
 ):
-    range_obj = db.query(Range).filter(Range.id == range_id).first()
-    if not range_obj:
+    """
+    List a range's events, newest first.
+
+    Page with ``cursor`` (keyset, constant cost per page) rather than
+    ``offset``. The total is only counted for the first page.
+    """
+    created_by = await db.scalar(select(Range.created_by).where(Range.id == range_id))
+    if created_by is None:
         raise HTTPException(status_code=404, detail="Range not found")
-    if range_obj.created_by != current_user.id:
+    if created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    service = EventService(db)
-    events, total = service.get_events(range_id, limit, offset, event_types)
+    service = AsyncEventService(db)
+    total = None
+    if offset:
+        # Legacy OFFSET paging
+        events, total = await service.get_events(range_id, limit, offset, event_types, include_total)
+        next_cursor = None
+    else:
+        try:
+            events, next_cursor = await service.get_events_page(range_id, limit, cursor, event_types)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if include_total and not cursor:
+            total = await service.count_events(range_id, event_types)
 
     return EventLogList(
         events=[EventLogResponse.model_validate(e) for e in events],
-        total=total
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/vm/{vm_id}", response_model=List[EventLogResponse])
-def get_vm_events(
+async def get_vm_events(
     vm_id: UUID,
+    db: AsyncDBSession,
+    current_user: AsyncCurrentUser,
     limit: int = Query(50, ge=1, le=200),
+):
+    owner = (await db.execute(
+        select(VM.id, Range.created_by).join(Range, Range.id == VM.range_id).where(VM.id == vm_id)
+    )).first()
+    if not owner:
+        raise HTTPException(status_code=404, detail="VM not found")
+    if owner.created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    events = await AsyncEventService(db).get_vm_events(vm_id, limit)
+
+    return [EventLogResponse.model_validate(e) for e in events]
+
+
+@router.get("/{range_id}/daily", response_model=List[EventDailyCount])
+def get_range_daily_event_counts(
+    range_id: UUID,
+    since: Optional[date] = Query(None, description="First day to include"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    vm = db.query(VM).filter(VM.id == vm_id).first()
-    if not vm:
-        raise HTTPException(status_code=404, detail="VM not found")
+    """
+    Daily event counts per type for a range.
 
-    range_obj = db.query(Range).filter(Range.id == vm.range_id).first()
+    Counts remain available after the raw events are removed by retention.
+    """
+    range_obj = db.query(Range).filter(Range.id == range_id).first()
+    if not range_obj:
+        raise HTTPException(status_code=404, detail="Range not found")
     if range_obj.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    service = EventService(db)
-    events = service.get_vm_events(vm_id, limit)
-
-    return [EventLogResponse.model_validate(e) for e in events]
+    return EventService(db).get_daily_counts(range_id, since)
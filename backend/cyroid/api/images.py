@@ -575,6 +575,7 @@ async def import_golden_image(
     current_user: CurrentUser = None,
 ):
     """Import an OVA/QCOW2/VMDK file as a golden image."""
+    from cyroid.services.image_conversion_service import ConversionCancelled
     from cyroid.services.image_import_service import ImageImportService
 
     # Validate file extension
@@ -608,6 +609,11 @@ async def import_golden_image(
             db=db,
         )
         return golden_image
+    except ConversionCancelled as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Failed to import image: {e}")
         raise HTTPException(
@@ -7,7 +7,7 @@ from cyroid.api.deps import DBSession, CurrentUser
 from cyroid.models import Range, RangeBlueprint, RangeInstance
 from cyroid.schemas.blueprint import InstanceResponse, BlueprintConfig
 from cyroid.services.blueprint_service import create_range_from_blueprint
-from cyroid.tasks.deployment import deploy_range_task, teardown_range_task
+from cyroid.tasks.deployment import deploy_range_task, reset_range_task, teardown_range_task
 
 router = APIRouter(prefix="/instances", tags=["instances"])
 
@@ -32,12 +32,19 @@ def reset_instance(instance_id: UUID, db: DBSession, current_user: CurrentUser):
     blueprint = instance.blueprint
     range_obj = instance.range
 
-    # Teardown current range resources (async task)
-    teardown_range_task.send(str(range_obj.id))
-
     # Redeploy from same config
     config = BlueprintConfig.model_validate(blueprint.config)
 
+    # Fast path: recreate only the VM containers inside the running DinD
+    if _can_reset_in_place(
+        db, range_obj, config, blueprint.base_subnet_prefix, instance.subnet_offset
+    ):
+        reset_range_task.send(str(range_obj.id))
+        return _instance_to_response(instance, db)
+
+    # Teardown current range resources (async task)
+    teardown_range_task.send(str(range_obj.id))
+
     # Delete VMs and networks from range
     from cyroid.models import VM, Network
     db.query(VM).filter(VM.range_id == range_obj.id).delete()
@@ -67,12 +74,23 @@ def redeploy_instance(instance_id: UUID, db: DBSession, current_user: CurrentUse
     blueprint = instance.blueprint
     range_obj = instance.range
 
-    # Teardown first (sync for now to ensure cleanup before recreate)
-    teardown_range_task.send(str(range_obj.id))
-
     # Get LATEST config from blueprint
     config = BlueprintConfig.model_validate(blueprint.config)
 
+    # Fast path: the latest version has the same topology, so only the VM
+    # containers need recreating inside the running DinD
+    if _can_reset_in_place(
+        db, range_obj, config, blueprint.base_subnet_prefix, instance.subnet_offset
+    ):
+        instance.blueprint_version = blueprint.version
+        db.commit()
+        reset_range_task.send(str(range_obj.id))
+        db.refresh(instance)
+        return _instance_to_response(instance, db)
+
+    # Teardown first (sync for now to ensure cleanup before recreate)
+    teardown_range_task.send(str(range_obj.id))
+
     # Delete VMs and networks from range
     from cyroid.models import VM, Network
     db.query(VM).filter(VM.range_id == range_obj.id).delete()
@@ -157,6 +175,88 @@ def delete_instance(instance_id: UUID, db: DBSession, current_user: CurrentUser)
 
 # ============ Helper Functions ============
 
+def _can_reset_in_place(
+    db: Session, range_obj: Range, config: BlueprintConfig, base_prefix: str, offset: int
+) -> bool:
+    """Check whether a range can be reset without tearing down its DinD.
+
+    Requires a running deployment whose networks and VMs are exactly what
+    ``config`` would recreate, so only the VM containers need replacing.
+    Every field _recreate_range_contents writes is compared; any difference
+    means the full teardown and recreate.
+    """
+    from cyroid.models import Network, VM
+    from cyroid.models.range import RangeStatus
+    from cyroid.services.blueprint_service import apply_subnet_offset
+
+    if range_obj.status != RangeStatus.RUNNING or not range_obj.dind_container_id:
+        return False
+
+    expected_networks = {
+        (
+            net.name,
+            apply_subnet_offset(net.subnet, base_prefix, offset),
+            apply_subnet_offset(net.gateway, base_prefix, offset),
+            net.is_isolated,
+            net.internet_enabled,
+            net.dhcp_enabled,
+        )
+        for net in config.networks
+    }
+    networks = db.query(Network).filter(Network.range_id == range_obj.id).all()
+    actual_networks = {
+        (n.name, n.subnet, n.gateway, n.is_isolated, n.internet_enabled, n.dhcp_enabled)
+        for n in networks
+    }
+    if len(networks) != len(expected_networks) or actual_networks != expected_networks:
+        return False
+    network_names_by_id = {n.id: n.name for n in networks}
+
+    # Mirror _recreate_range_contents: VMs without a network or image are skipped
+    network_names = {net.name for net in config.networks}
+    expected_vms = set()
+    for vm_config in config.vms:
+        if vm_config.network_name not in network_names:
+            continue
+        base_image_id = getattr(vm_config, 'base_image_id', None)
+        golden_image_id = None if base_image_id else getattr(vm_config, 'golden_image_id', None)
+        snapshot_id = None if base_image_id or golden_image_id else getattr(vm_config, 'snapshot_id', None)
+        if not (base_image_id or golden_image_id or snapshot_id):
+            continue
+        expected_vms.add((
+            vm_config.hostname,
+            vm_config.network_name,
+            apply_subnet_offset(vm_config.ip_address, base_prefix, offset),
+            str(base_image_id) if base_image_id else None,
+            str(golden_image_id) if golden_image_id else None,
+            str(snapshot_id) if snapshot_id else None,
+            vm_config.cpu,
+            vm_config.ram_mb,
+            vm_config.disk_gb,
+            vm_config.position_x,
+            vm_config.position_y,
+        ))
+
+    vms = db.query(VM).filter(VM.range_id == range_obj.id).all()
+    actual_vms = {
+        (
+            vm.hostname,
+            network_names_by_id.get(vm.network_id),
+            vm.ip_address,
+            str(vm.base_image_id) if vm.base_image_id else None,
+            str(vm.golden_image_id) if vm.golden_image_id else None,
+            str(vm.snapshot_id) if vm.snapshot_id else None,
+            vm.cpu,
+            vm.ram_mb,
+            vm.disk_gb,
+            vm.position_x,
+            vm.position_y,
+        )
+        for vm in vms
+    }
+    return len(vms) == len(expected_vms) and actual_vms == expected_vms
+
+
 def _recreate_range_contents(
     db: Session, range_obj: Range, config: BlueprintConfig, base_prefix: str, offset: int
 ):
@@ -179,6 +279,8 @@ def _recreate_range_contents(
             subnet=adjusted_subnet,
             gateway=adjusted_gateway,
             is_isolated=net_config.is_isolated,
+            internet_enabled=net_config.internet_enabled,
+            dhcp_enabled=net_config.dhcp_enabled,
         )
         db.add(network)
         db.flush()
@@ -8,7 +8,10 @@ from fastapi import APIRouter, HTTPException, status
 from cyroid.api.deps import DBSession, CurrentUser
 from cyroid.models.network import Network
 from cyroid.models.range import Range
-from cyroid.schemas.network import NetworkCreate, NetworkUpdate, NetworkResponse
+from cyroid.schemas.network import (
+    NetworkCreate, NetworkUpdate, NetworkResponse, NetworkPolicyUpdate, NetworkPolicyChange,
+)
+from cyroid.services.network_policy_service import NetworkPolicy, get_network_policy_service
 
 logger = logging.getLogger(__name__)
 
@@ -183,15 +186,103 @@ def provision_network(network_id: UUID, db: DBSession, current_user: CurrentUser
     return network
 
 
-@router.post("/{network_id}/toggle-isolation", response_model=NetworkResponse)
-def toggle_network_isolation(network_id: UUID, db: DBSession, current_user: CurrentUser):
-    """Toggle network isolation on/off for a provisioned network."""
+def _apply_network_policy(db, network: Network, update: NetworkPolicyUpdate) -> NetworkResponse:
+    """
+    Apply policy flag changes to a network and, if its range is deployed, to
+    the iptables rules inside the range's DinD container.
+
+    All requested changes are applied with a single exec by the range's
+    network policy agent; the rule diff is returned in ``policy_change``.
+    Networks of ranges that are not deployed only have their flags saved,
+    for use at the next deployment.
+    """
+    policy = NetworkPolicy(
+        internet_enabled=network.internet_enabled if update.internet_enabled is None else update.internet_enabled,
+        is_isolated=network.is_isolated if update.is_isolated is None else update.is_isolated,
+        dhcp_enabled=network.dhcp_enabled if update.dhcp_enabled is None else update.dhcp_enabled,
+    )
+    isolation_changed = policy.is_isolated != network.is_isolated
+    change = None
+
+    range_obj = db.query(Range).filter(Range.id == network.range_id).first()
+    if network.docker_network_id and range_obj and range_obj.dind_container_id and range_obj.dind_docker_url:
+        change = get_network_policy_service().apply_policy(
+            range_id=str(range_obj.id),
+            dind_container_id=range_obj.dind_container_id,
+            network_name=network.name,
+            docker_network_id=network.docker_network_id,
+            policy=policy,
+        )
+        if change is None:
+            logger.debug("DinD container not found for range, saving flags only")
+    elif network.docker_network_id and isolation_changed:
+        # Network on the host Docker daemon (not inside DinD)
+        docker = get_docker_service()
+        if policy.is_isolated:
+            docker.connect_traefik_to_network(network.docker_network_id)
+            docker.setup_network_isolation(network.docker_network_id, network.subnet)
+        else:
+            docker.teardown_network_isolation(network.docker_network_id, network.subnet)
+
+    network.internet_enabled = policy.internet_enabled
+    network.is_isolated = policy.is_isolated
+    network.dhcp_enabled = policy.dhcp_enabled
+    db.commit()
+    db.refresh(network)
+
+    response = NetworkResponse.model_validate(network)
+    if change is not None:
+        response.policy_change = NetworkPolicyChange(**change.to_dict())
+    return response
+
+
+def _get_network_or_404(db, network_id: UUID) -> Network:
     network = db.query(Network).filter(Network.id == network_id).first()
     if not network:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Network not found",
         )
+    return network
+
+
+@router.post("/{network_id}/policy", response_model=NetworkResponse)
+def update_network_policy(
+    network_id: UUID,
+    policy_data: NetworkPolicyUpdate,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """
+    Change internet, isolation and DHCP flags of a network in one call.
+
+    If the range is deployed, the resulting iptables delta is applied live
+    and reported in ``policy_change``.
+    """
+    network = _get_network_or_404(db, network_id)
+
+    try:
+        response = _apply_network_policy(db, network, policy_data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to update policy for network {network_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update network policy: {str(e)}",
+        )
+
+    logger.info(
+        f"Updated policy for network {network.name} (internet={network.internet_enabled}, "
+        f"isolated={network.is_isolated}, dhcp={network.dhcp_enabled})"
+    )
+    return response
+
+
+@router.post("/{network_id}/toggle-isolation", response_model=NetworkResponse)
+def toggle_network_isolation(network_id: UUID, db: DBSession, current_user: CurrentUser):
+    """Toggle network isolation on/off for a provisioned network."""
+    network = _get_network_or_404(db, network_id)
 
     if not network.docker_network_id:
         raise HTTPException(
@@ -200,23 +291,12 @@ def toggle_network_isolation(network_id: UUID, db: DBSession, current_user: Curr
         )
 
     try:
-        docker = get_docker_service()
-
-        if network.is_isolated:
-            # Remove isolation
-            docker.teardown_network_isolation(network.docker_network_id, network.subnet)
-            network.is_isolated = False
-            logger.info(f"Removed isolation from network {network.name}")
-        else:
-            # Apply isolation
-            docker.connect_traefik_to_network(network.docker_network_id)
-            docker.setup_network_isolation(network.docker_network_id, network.subnet)
-            network.is_isolated = True
-            logger.info(f"Applied isolation to network {network.name}")
-
-        db.commit()
-        db.refresh(network)
-
+        response = _apply_network_policy(
+            db, network, NetworkPolicyUpdate(is_isolated=not network.is_isolated)
+        )
+        logger.info(f"{'Applied' if network.is_isolated else 'Removed'} isolation on network {network.name}")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to toggle isolation for network {network_id}: {e}")
         raise HTTPException(
@@ -224,7 +304,7 @@ def toggle_network_isolation(network_id: UUID, db: DBSession, current_user: Curr
             detail=f"Failed to toggle isolation: {str(e)}",
         )
 
-    return network
+    return response
 
 
 @router.post("/{network_id}/toggle-internet", response_model=NetworkResponse)
@@ -235,67 +315,13 @@ def toggle_network_internet(network_id: UUID, db: DBSession, current_user: Curre
     If the range is deployed (DinD running), applies iptables rules immediately.
     If not deployed yet, just toggles the DB flag for use at next deployment.
     """
-    network = db.query(Network).filter(Network.id == network_id).first()
-    if not network:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Network not found",
-        )
-
-    new_state = not network.internet_enabled
+    network = _get_network_or_404(db, network_id)
 
     try:
-        # If the range is deployed, apply iptables rules live
-        range_obj = db.query(Range).filter(Range.id == network.range_id).first()
-        if range_obj and range_obj.dind_docker_url and network.docker_network_id:
-            from cyroid.services.dind_service import get_dind_service
-            dind_service = get_dind_service()
-
-            range_id_str = str(range_obj.id)
-            dind_container = dind_service._find_container_by_range_id(range_id_str)
-
-            if dind_container:
-                range_client = dind_service.get_range_client(range_id_str, range_obj.dind_docker_url)
-                bridge_id = dind_service._get_network_bridge_id(range_client, network.name)
-
-                if bridge_id:
-                    # Detect the outbound interface (carries the default route)
-                    out_iface = dind_service._get_outbound_interface(dind_container)
-
-                    if new_state:
-                        # Enable internet — add FORWARD rule + ensure NAT/MASQUERADE
-                        rules = [
-                            f"iptables -A FORWARD -i br-{bridge_id} -o {out_iface} -j ACCEPT",
-                            f"iptables -C FORWARD -i {out_iface} -m state --state ESTABLISHED,RELATED -j ACCEPT "
-                            f"|| iptables -A FORWARD -i {out_iface} -m state --state ESTABLISHED,RELATED -j ACCEPT",
-                            f"iptables -t nat -C POSTROUTING -o {out_iface} -j MASQUERADE "
-                            f"|| iptables -t nat -A POSTROUTING -o {out_iface} -j MASQUERADE",
-                        ]
-                    else:
-                        # Disable internet — remove FORWARD rule for this bridge
-                        rules = [
-                            f"iptables -D FORWARD -i br-{bridge_id} -o {out_iface} -j ACCEPT",
-                        ]
-
-                    for rule in rules:
-                        exit_code, output = dind_container.exec_run(
-                            ["sh", "-c", rule], privileged=True
-                        )
-                        if exit_code != 0:
-                            output_str = output.decode() if isinstance(output, bytes) else str(output)
-                            logger.debug(f"iptables rule result: {rule} -> {output_str}")
-
-                    logger.info(f"Applied iptables rules for {'enabling' if new_state else 'disabling'} internet on {network.name}")
-                else:
-                    logger.warning(f"Could not resolve bridge ID for {network.name}, saving flag only")
-            else:
-                logger.debug(f"DinD container not found for range, saving flag only")
-
-        network.internet_enabled = new_state
-        db.commit()
-        db.refresh(network)
-        logger.info(f"{'Enabled' if new_state else 'Disabled'} internet for network {network.name}")
-
+        response = _apply_network_policy(
+            db, network, NetworkPolicyUpdate(internet_enabled=not network.internet_enabled)
+        )
+        logger.info(f"{'Enabled' if network.internet_enabled else 'Disabled'} internet for network {network.name}")
     except HTTPException:
         raise
     except Exception as e:
@@ -305,7 +331,7 @@ def toggle_network_internet(network_id: UUID, db: DBSession, current_user: Curre
             detail=f"Failed to toggle internet: {str(e)}",
         )
 
-    return network
+    return response
 
 
 @router.post("/{network_id}/toggle-dhcp", response_model=NetworkResponse)
@@ -316,18 +342,15 @@ def toggle_network_dhcp(network_id: UUID, db: DBSession, current_user: CurrentUs
     This sets the network's dhcp_enabled flag which is used during deployment
     to configure Docker network IPAM options.
     """
-    network = db.query(Network).filter(Network.id == network_id).first()
-    if not network:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Network not found",
-        )
+    network = _get_network_or_404(db, network_id)
 
     try:
-        network.dhcp_enabled = not network.dhcp_enabled
-        db.commit()
-        db.refresh(network)
+        response = _apply_network_policy(
+            db, network, NetworkPolicyUpdate(dhcp_enabled=not network.dhcp_enabled)
+        )
         logger.info(f"{'Enabled' if network.dhcp_enabled else 'Disabled'} DHCP for network {network.name}")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to toggle DHCP for network {network_id}: {e}")
         raise HTTPException(
@@ -335,7 +358,7 @@ def toggle_network_dhcp(network_id: UUID, db: DBSession, current_user: CurrentUs
             detail=f"Failed to toggle DHCP: {str(e)}",
         )
 
-    return network
+    return response
 
 
 @router.post("/{network_id}/teardown", response_model=NetworkResponse)
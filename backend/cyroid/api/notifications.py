@@ -5,7 +5,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
 
-from cyroid.api.deps import DBSession, CurrentUser
+from cyroid.api.deps import AsyncCurrentUser, AsyncDBSession, DBSession, CurrentUser
 from cyroid.models.notification import NotificationType, NotificationSeverity
 from cyroid.schemas.notification import (
     NotificationCreate,
@@ -13,28 +13,33 @@ from cyroid.schemas.notification import (
     NotificationList,
     NotificationMarkRead,
 )
-from cyroid.services.notification_service import NotificationService
+from cyroid.services.notification_service import AsyncNotificationService, NotificationService
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
+def _inbox_response(entry) -> NotificationResponse:
+    """A notification as seen by the inbox owner, with their own read state."""
+    return NotificationResponse.model_validate(entry.notification).model_copy(update={"read_at": entry.read_at})
+
+
 @router.get("", response_model=NotificationList)
-def get_notifications(
-    db: DBSession,
-    current_user: CurrentUser,
+async def get_notifications(
+    db: AsyncDBSession,
+    current_user: AsyncCurrentUser,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     unread_only: bool = Query(False),
 ):
-    """Get notifications visible to the current user.
+    """Get notifications delivered to the current user, newest first.
 
-    Returns notifications targeted to:
+    Notifications are delivered when created to users targeted by:
     - This specific user
     - Users with this user's role(s)
     - Resources the user has access to (ranges, events)
     """
-    service = NotificationService(db)
-    notifications, total, unread_count = service.get_user_notifications(
+    service = AsyncNotificationService(db)
+    notifications, total, unread_count = await service.get_user_notifications(
         user=current_user,
         limit=limit,
         offset=offset,
@@ -42,12 +47,18 @@ def get_notifications(
     )
 
     return NotificationList(
-        notifications=[NotificationResponse.model_validate(n) for n in notifications],
+        notifications=[_inbox_response(entry) for entry in notifications],
         total=total,
         unread_count=unread_count,
     )
 
 
+@router.get("/unread-count")
+async def get_unread_count(db: AsyncDBSession, current_user: AsyncCurrentUser):
+    """Unread badge count for the current user (a single primary-key lookup)."""
+    return {"unread_count": await AsyncNotificationService(db).get_unread_count(current_user)}
+
+
 @router.post("/read", status_code=status.HTTP_200_OK)
 def mark_notifications_read(
     data: NotificationMarkRead,
@@ -56,7 +67,7 @@ def mark_notifications_read(
 ):
     """Mark specific notifications as read.
 
-    Only marks notifications the user can actually see.
+    Only marks notifications in the user's own inbox; other recipients are unaffected.
     """
     service = NotificationService(db)
     count = service.mark_as_read(data.notification_ids, current_user)
@@ -123,26 +134,21 @@ def create_notification(
 
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
-def get_notification(
+async def get_notification(
     notification_id: UUID,
-    db: DBSession,
-    current_user: CurrentUser,
+    db: AsyncDBSession,
+    current_user: AsyncCurrentUser,
 ):
     """Get a specific notification by ID.
 
     Returns 404 if notification doesn't exist or user can't see it.
     """
-    service = NotificationService(db)
-
-    # Build query with user visibility filter
-    query = service._build_user_query(current_user)
-    from cyroid.models.notification import Notification
-    notification = query.filter(Notification.id == notification_id).first()
+    entry = await AsyncNotificationService(db).get_user_notification(current_user, notification_id)
 
-    if not notification:
+    if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found",
         )
 
-    return NotificationResponse.model_validate(notification)
+    return _inbox_response(entry)
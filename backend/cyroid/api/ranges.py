@@ -8,11 +8,11 @@ import logging
 import os
 
 from fastapi import APIRouter, HTTPException, status, Query, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from cyroid.config import get_settings
 
-from cyroid.api.deps import DBSession, CurrentUser, filter_by_visibility, check_resource_access, get_student_accessible_range_ids
+from cyroid.api.deps import AsyncCurrentUser, AsyncDBSession, DBSession, CurrentUser, filter_by_visibility, check_resource_access, get_student_accessible_range_ids
 from cyroid.database import get_db
 from cyroid.models.range import Range, RangeStatus
 from cyroid.models.network import Network
@@ -29,6 +29,7 @@ from cyroid.services.scenario_filesystem import get_scenario
 from cyroid.models.inject import Inject, InjectStatus
 from cyroid.models.blueprint import RangeInstance, RangeBlueprint
 from cyroid.services.event_service import EventService
+from cyroid.services.visibility_service import VisibilityService
 from cyroid.schemas.range import (
     RangeCreate, RangeUpdate, RangeResponse, RangeDetailResponse,
     RangeTemplateExport, RangeTemplateImport, NetworkTemplateData, VMTemplateData,
@@ -38,7 +39,8 @@ from cyroid.schemas.deployment_status import (
     DeploymentStatusResponse, DeploymentSummary, ResourceStatus, NetworkStatus, VMStatus as VMStatusSchema
 )
 from cyroid.schemas.scenario import ApplyScenarioRequest, ApplyScenarioResponse
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload, Session
 from cyroid.schemas.user import ResourceTagCreate, ResourceTagsResponse
 
 logger = logging.getLogger(__name__)
@@ -416,32 +418,106 @@ def delete_range(range_id: UUID, db: DBSession, current_user: CurrentUser):
 
 
 @router.get("/{range_id}/deployment-status", response_model=DeploymentStatusResponse)
-def get_deployment_status(
+async def get_deployment_status(
     range_id: UUID,
-    db: DBSession,
-    current_user: CurrentUser
+    db: AsyncDBSession,
+    current_user: AsyncCurrentUser
 ):
     """Get detailed per-resource deployment status."""
     from datetime import datetime, timedelta
     from cyroid.models.event_log import EventLog
 
-    range_obj = db.query(Range).options(
-        joinedload(Range.networks),
-        joinedload(Range.vms)
-    ).filter(Range.id == range_id).first()
+    # Polled while a deployment runs; queries are awaited rather than holding a worker thread
+    range_obj = await db.scalar(
+        select(Range).options(
+            selectinload(Range.networks),
+            selectinload(Range.vms)
+        ).where(Range.id == range_id)
+    )
 
     if not range_obj:
         raise HTTPException(status_code=404, detail="Range not found")
 
     # Get deployment events from last hour
-    events = db.query(EventLog).filter(
-        EventLog.range_id == range_id,
-        EventLog.created_at > datetime.utcnow() - timedelta(hours=1)
-    ).order_by(EventLog.created_at).all()
+    events = (await db.scalars(
+        select(EventLog).where(
+            EventLog.range_id == range_id,
+            EventLog.created_at > datetime.utcnow() - timedelta(hours=1)
+        ).order_by(EventLog.created_at)
+    )).all()
 
     return compute_deployment_status(range_obj, events)
 
 
+def _validation_response(result) -> dict:
+    """Serialize a DeploymentValidation for the validate endpoints."""
+    def entries(results):
+        return [
+            {
+                "message": r.message,
+                "vm_id": r.vm_id,
+                "details": r.details
+            }
+            for r in results
+        ]
+
+    return {
+        "valid": result.valid,
+        "errors": entries(result.errors),
+        "warnings": entries(result.warnings),
+        "info": entries(result.info),
+        "duration_ms": result.duration_ms,
+    }
+
+
+class BatchValidateRequest(BaseModel):
+    range_ids: List[UUID] = Field(..., min_length=1, max_length=200)
+
+
+@router.post("/validate")
+def validate_ranges_deployment(
+    data: BatchValidateRequest,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """
+    Validate many ranges at once, e.g. before a training event.
+
+    Runs the same checks as GET /ranges/{range_id}/validate for each range,
+    loading all ranges' VMs and images together and resolving each image
+    and the host disk state once. Also checks that the ranges' combined disk
+    requirement fits on the host.
+
+    Returns:
+        Overall validity and duration, batch-wide results, and per-range
+        validation results (each with its own duration)
+    """
+    from cyroid.services.deployment_validator import DeploymentValidator
+
+    ranges = db.query(Range).filter(Range.id.in_(data.range_ids)).all()
+    for range_obj in ranges:
+        check_resource_access('range', range_obj.id, current_user, db, range_obj.created_by)
+
+    docker = get_docker_service()
+    validator = DeploymentValidator(db, docker)
+    batch = asyncio.run(validator.validate_ranges(data.range_ids))
+
+    return {
+        "valid": batch.valid,
+        "duration_ms": batch.duration_ms,
+        "results": [
+            {
+                "valid": r.valid,
+                "severity": r.severity,
+                "message": r.message,
+                "details": r.details
+            }
+            for r in batch.results
+        ],
+        "ranges": {str(range_id): _validation_response(result) for range_id, result in batch.ranges.items()},
+    }
+
+
 @router.get("/{range_id}/validate")
 async def validate_range_deployment(
     range_id: UUID,
@@ -458,7 +534,7 @@ async def validate_range_deployment(
     - Network configuration: Validates no duplicate IPs within networks
 
     Returns:
-        Validation result with errors and warnings
+        Validation result with errors, warnings and how long it took
     """
     from cyroid.services.deployment_validator import DeploymentValidator
 
@@ -478,33 +554,7 @@ async def validate_range_deployment(
     validator = DeploymentValidator(db, docker)
     result = await validator.validate_range(range_id)
 
-    return {
-        "valid": result.valid,
-        "errors": [
-            {
-                "message": r.message,
-                "vm_id": r.vm_id,
-                "details": r.details
-            }
-            for r in result.errors
-        ],
-        "warnings": [
-            {
-                "message": r.message,
-                "vm_id": r.vm_id,
-                "details": r.details
-            }
-            for r in result.warnings
-        ],
-        "info": [
-            {
-                "message": r.message,
-                "vm_id": r.vm_id,
-                "details": r.details
-            }
-            for r in result.info
-        ],
-    }
+    return _validation_response(result)
 
 
 @router.post("/{range_id}/deploy", response_model=RangeResponse)
@@ -516,6 +566,7 @@ def deploy_range(range_id: UUID, db: DBSession, current_user: CurrentUser):
     for real-time progress updates.
     """
     from cyroid.services.deployment_validator import DeploymentValidator
+    from cyroid.services.resource_ledger import InsufficientResourcesError, ResourceLedger, host_capacity
     from cyroid.tasks.deployment import deploy_range_task
     import asyncio
 
@@ -549,7 +600,22 @@ def deploy_range(range_id: UUID, db: DBSession, current_user: CurrentUser):
             }
         )
 
+    # Reserve disk, RAM, vCPUs and a DinD against other in-flight deployments;
+    # the worker releases the reservation when the deployment ends
+    try:
+        ResourceLedger(db).claim(range_id, host_capacity(docker))
+    except InsufficientResourcesError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": str(e),
+                "shortfalls": e.shortfalls,
+                "hint": "Wait for running deployments to finish or stop other ranges."
+            }
+        )
+
     # Set status to DEPLOYING immediately
+    previous_status, previous_error = range_obj.status, range_obj.error_message
     range_obj.status = RangeStatus.DEPLOYING
     range_obj.error_message = None  # Clear any previous error
     db.commit()
@@ -557,7 +623,18 @@ def deploy_range(range_id: UUID, db: DBSession, current_user: CurrentUser):
     # Dispatch deployment to background worker
     # The worker will log DEPLOYMENT_STARTED and handle all progress events
     logger.info(f"Dispatching deployment for range {range_id} to background worker")
-    deploy_range_task.send(str(range_id))
+    try:
+        deploy_range_task.send(str(range_id))
+    except Exception as e:
+        # No worker will run, so nothing else would release the reservation
+        logger.error(f"Failed to queue deployment for range {range_id}: {e}")
+        range_obj.status = previous_status
+        range_obj.error_message = previous_error
+        ResourceLedger(db).release(range_id)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to queue deployment: {e}",
+        )
 
     return range_obj
 
@@ -772,7 +849,6 @@ def get_vnc_status(range_id: UUID, db: DBSession, current_user: CurrentUser):
     Use this endpoint to diagnose VNC connectivity issues.
     """
     import asyncio
-    from pathlib import Path
 
     range_obj = db.query(Range).options(
         joinedload(Range.vms)
@@ -787,15 +863,11 @@ def get_vnc_status(range_id: UUID, db: DBSession, current_user: CurrentUser):
     # Get VNC mappings from database
     vnc_mappings = range_obj.vnc_proxy_mappings or {}
 
-    # Check Traefik route file
-    traefik_route_file = Path(f"/app/traefik/dynamic/range-{str(range_id)[:8]}.yml")
-    traefik_routes_exist = traefik_route_file.exists()
-    traefik_routes_content = None
-    if traefik_routes_exist:
-        try:
-            traefik_routes_content = traefik_route_file.read_text()
-        except:
-            traefik_routes_content = "Error reading file"
+    # Check the range's Traefik routes
+    traefik_service = get_traefik_route_service()
+    range_routes = traefik_service.routes_for_range(str(range_id))
+    traefik_routes_exist = range_routes is not None
+    traefik_route_rules = [r.get("rule", "") for r in (range_routes or {}).get("routers", {}).values()]
 
     # Build per-VM VNC status
     vm_vnc_status = []
@@ -823,8 +895,8 @@ def get_vnc_status(range_id: UUID, db: DBSession, current_user: CurrentUser):
             status_info["original_port"] = mapping.get("original_port")
             status_info["vnc_url"] = f"/vnc/{vm_id_str}"
 
-            # Check if route exists in Traefik file
-            if traefik_routes_content and vm_id_str[:12] not in traefik_routes_content:
+            # Check if route exists in Traefik config
+            if traefik_routes_exist and not any(vm_id_str in rule for rule in traefik_route_rules):
                 status_info["issues"].append("VNC route not found in Traefik config")
         else:
             status_info["issues"].append("No VNC mapping in database")
@@ -918,7 +990,7 @@ def get_vnc_status(range_id: UUID, db: DBSession, current_user: CurrentUser):
         "dind_mgmt_ip": range_obj.dind_mgmt_ip,
         "vnc_mappings_count": len(vnc_mappings),
         "traefik_routes_exist": traefik_routes_exist,
-        "traefik_route_file": str(traefik_route_file),
+        "traefik_route_file": str(traefik_service.route_file),
         "socat_processes": socat_processes,
         "socat_proxies": socat_proxies,
         "network_interfaces": network_interfaces,
@@ -2162,6 +2234,7 @@ def add_range_tag(range_id: UUID, tag_data: ResourceTagCreate, db: DBSession, cu
         tag=tag_data.tag
     )
     db.add(tag)
+    VisibilityService(db).refresh_resource('range', range_id)
     db.commit()
 
     return {"message": f"Tag '{tag_data.tag}' added to range"}
@@ -2190,6 +2263,7 @@ def remove_range_tag(range_id: UUID, tag: str, db: DBSession, current_user: Curr
         raise HTTPException(status_code=404, detail="Tag not found on this range")
 
     db.delete(tag_obj)
+    VisibilityService(db).refresh_resource('range', range_id)
     db.commit()
 
     return {"message": f"Tag '{tag}' removed from range"}
@@ -2342,15 +2416,61 @@ def get_range_stats(range_id: UUID, db: DBSession, current_user: CurrentUser):
         range_client = dind_service.get_range_client(str(range_id), range_obj.dind_docker_url)
         containers = range_client.containers.list(all=True)
         networks = range_client.networks.list()
+        collector, vms = _range_stats_collector(range_obj, db)
+        totals = collector.aggregate([vm.container_id for vm in vms])
 
         return RangeConsoleStats(
             container_count=len(containers),
             network_count=len(networks),
+            cpu_percent=totals["cpu_percent"] if totals["containers_reporting"] else None,
+            memory_mb=totals["memory_mb"] if totals["containers_reporting"] else None,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {e}")
 
 
+def _range_stats_collector(range_obj: Range, db: Session):
+    """The range's stats collector, streaming every running VM container; also returns those VMs."""
+    from cyroid.services.container_stats_collector import get_stats_collector
+
+    vms = db.query(VM).filter(
+        VM.range_id == range_obj.id,
+        VM.status == VMStatus.RUNNING,
+        VM.container_id.isnot(None),
+    ).all()
+    collector = get_stats_collector().for_range(
+        str(range_obj.id), range_obj.dind_docker_url, [vm.container_id for vm in vms]
+    )
+    return collector, vms
+
+
+@router.get("/{range_id}/stats")
+def get_range_resource_stats(range_id: UUID, db: DBSession, current_user: CurrentUser):
+    """
+    Get aggregate resource statistics for a range's running VMs.
+
+    Read from the background stats collector without calling Docker: totals
+    of each VM's latest sample, a 5-second-resolution history of those
+    totals, and each VM's latest sample.
+    """
+    range_obj = db.query(Range).filter(Range.id == range_id).first()
+    if not range_obj:
+        raise HTTPException(status_code=404, detail="Range not found")
+
+    check_resource_access('range', range_id, current_user, db, range_obj.created_by)
+
+    collector, vms = _range_stats_collector(range_obj, db)
+    return {
+        "range_id": str(range_id),
+        "vms_running": len(vms),
+        **collector.aggregate([vm.container_id for vm in vms]),
+        "vms": [
+            {"vm_id": str(vm.id), "hostname": vm.hostname, "stats": collector.latest(vm.container_id)}
+            for vm in vms
+        ],
+    }
+
+
 @router.get("/{range_id}/console/iptables")
 def get_range_iptables(range_id: UUID, db: DBSession, current_user: CurrentUser):
     """
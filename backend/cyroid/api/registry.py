@@ -23,6 +23,7 @@ class RegistryImage(BaseModel):
     """Registry image info."""
     name: str
     tags: List[str]
+    size_bytes: Optional[int] = None  # Unique blob bytes across the repository's tags
 
 
 class RegistryStats(BaseModel):
@@ -30,6 +31,10 @@ class RegistryStats(BaseModel):
     image_count: int
     tag_count: int
     healthy: bool
+    size_bytes: Optional[int] = None  # Unique blob bytes referenced by tagged images
+    refreshed_at: Optional[str] = None  # When the cached catalog was crawled
+    crawl_seconds: Optional[float] = None
+    crawl_errors: int = 0
 
 
 class PushRequest(BaseModel):
@@ -75,11 +80,30 @@ class DeleteResponse(BaseModel):
     message: str
 
 
+class RegistryGCReport(BaseModel):
+    """Result of a registry retention and garbage collection pass."""
+    started_at: str
+    duration_seconds: float
+    in_window: bool
+    dry_run: bool
+    tags_scanned: int
+    referenced: int
+    pending: int  # Unreferenced, still inside the retention period
+    deleted: List[str]
+    kept_shared: List[str]  # Expired, but the manifest is shared with a kept tag
+    gc_ran: bool
+    gc_skipped_reason: Optional[str] = None
+    bytes_before: Optional[int] = None
+    bytes_after: Optional[int] = None
+    bytes_reclaimed: int
+    error: Optional[str] = None
+
+
 @router.get("/images", response_model=List[RegistryImage])
 async def list_registry_images(
     current_user: CurrentUser
 ):
-    """List all images in the local registry."""
+    """List all images in the local registry (served from the cached catalog crawl)."""
     registry = get_registry_service()
     images = await registry.list_images()
     return [RegistryImage(**img) for img in images]
@@ -128,44 +152,45 @@ def _run_registry_push(operation_id: str, image_tag: str):
             "progress_percent": 10,
         })
 
-        # Push to registry with progress tracking
-        push_output = docker_client.images.push(
-            push_tag,
-            stream=True,
-            decode=True
-        )
+        # Push to registry with progress tracking; garbage collection waits for the push
+        with registry.push_lease():
+            push_output = docker_client.images.push(
+                push_tag,
+                stream=True,
+                decode=True
+            )
 
-        # Track layer progress
-        layers = {}
-        for line in push_output:
-            if "error" in line:
-                _active_registry_pushes[operation_id].update({
-                    "status": "failed",
-                    "error_message": line.get("error", "Push error"),
-                })
-                return
+            # Track layer progress
+            layers = {}
+            for line in push_output:
+                if "error" in line:
+                    _active_registry_pushes[operation_id].update({
+                        "status": "failed",
+                        "error_message": line.get("error", "Push error"),
+                    })
+                    return
 
-            if "id" in line and "status" in line:
-                layer_id = line["id"]
-                layer_status = line.get("status", "")
+                if "id" in line and "status" in line:
+                    layer_id = line["id"]
+                    layer_status = line.get("status", "")
 
-                if layer_status in ("Pushing", "Pushed", "Layer already exists"):
-                    layers[layer_id] = layer_status
+                    if layer_status in ("Pushing", "Pushed", "Layer already exists"):
+                        layers[layer_id] = layer_status
 
-                    completed = sum(1 for s in layers.values() if s in ("Pushed", "Layer already exists"))
-                    total = len(layers)
+                        completed = sum(1 for s in layers.values() if s in ("Pushed", "Layer already exists"))
+                        total = len(layers)
 
-                    # Progress: 10-70% for pushing layers
-                    if total > 0:
-                        layer_progress = int(10 + (completed / total) * 60)
-                    else:
-                        layer_progress = 10
+                        # Progress: 10-70% for pushing layers
+                        if total > 0:
+                            layer_progress = int(10 + (completed / total) * 60)
+                        else:
+                            layer_progress = 10
 
-                    _active_registry_pushes[operation_id].update({
-                        "progress_percent": min(layer_progress, 70),
-                        "current_layer": completed,
-                        "total_layers": total,
-                    })
+                        _active_registry_pushes[operation_id].update({
+                            "progress_percent": min(layer_progress, 70),
+                            "current_layer": completed,
+                            "total_layers": total,
+                        })
 
         _active_registry_pushes[operation_id].update({
             "status": "verifying",
@@ -185,6 +210,7 @@ def _run_registry_push(operation_id: str, image_tag: str):
                 "error_message": f"Image {image_tag} not found in registry after push",
             })
             return
+        registry.catalog.invalidate()
 
         _active_registry_pushes[operation_id].update({
             "status": "cleaning",
@@ -393,3 +419,37 @@ async def delete_registry_image(
             status_code=500,
             detail=f"Failed to delete {image_tag} from registry"
         )
+
+
+@router.post("/gc", response_model=RegistryGCReport)
+async def run_registry_gc(
+    current_user: AdminUser,
+    dry_run: bool = False,
+    force: bool = False,
+):
+    """Run a registry retention pass now (admin only).
+
+    Args:
+        dry_run: Report what would be deleted without deleting anything
+        force: Delete expired tags and garbage-collect even outside the maintenance window
+
+    Returns:
+        RegistryGCReport with deleted tags, bytes reclaimed and run time
+    """
+    from cyroid.services.registry_retention_service import get_registry_retention_service
+
+    registry = get_registry_service()
+    if not await registry.is_healthy():
+        raise HTTPException(status_code=503, detail="Registry is not healthy")
+
+    report = await get_registry_retention_service().run(force_window=force, dry_run=dry_run)
+    return RegistryGCReport(**report)
+
+
+@router.get("/gc", response_model=Optional[RegistryGCReport])
+async def get_registry_gc_report(current_user: AdminUser):
+    """Get the most recent registry retention report (admin only)."""
+    from cyroid.services.registry_retention_service import get_registry_retention_service
+
+    report = get_registry_retention_service().last_report()
+    return RegistryGCReport(**report) if report else None
@@ -12,6 +12,8 @@ from cyroid.schemas.user import (
     UserResponse, UserUpdate, UserDetailResponse,
     UserAttributeCreate, UserAttributeResponse, AdminCreateUser
 )
+from cyroid.services.principal_cache import get_principal_cache
+from cyroid.services.visibility_service import VisibilityService
 from cyroid.utils.security import get_password_hash
 
 router = APIRouter(prefix="/users", tags=["User Management"])
@@ -96,6 +98,9 @@ def create_user(user_data: AdminCreateUser, db: DBSession, current_user: AdminUs
         )
         db.add(tag_attr)
 
+    if user_data.tags:
+        VisibilityService(db).refresh_user(user.id)
+
     db.commit()
     db.refresh(user)
     return user
@@ -159,6 +164,7 @@ def update_user(user_id: UUID, user_update: UserUpdate, db: DBSession, current_u
         user.is_approved = user_update.is_approved
 
     db.commit()
+    get_principal_cache().invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -175,6 +181,7 @@ def approve_user(user_id: UUID, db: DBSession, current_user: AdminUser):
 
     user.is_approved = True
     db.commit()
+    get_principal_cache().invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -191,6 +198,7 @@ def deny_user(user_id: UUID, db: DBSession, current_user: AdminUser):
 
     db.delete(user)
     db.commit()
+    get_principal_cache().invalidate(user_id)
     return None
 
 
@@ -207,6 +215,7 @@ def admin_reset_password(user_id: UUID, db: DBSession, current_user: AdminUser):
 
     user.password_reset_required = True
     db.commit()
+    get_principal_cache().invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -229,6 +238,7 @@ def delete_user(user_id: UUID, db: DBSession, current_user: AdminUser):
 
     db.delete(user)
     db.commit()
+    get_principal_cache().invalidate(user_id)
     return None
 
 
@@ -296,7 +306,11 @@ def add_user_attribute(user_id: UUID, attr_data: UserAttributeCreate, db: DBSess
     if attr_data.attribute_type == 'role' and attr_data.attribute_value == 'admin':
         user.role = UserRole.ADMIN
 
+    if attr_data.attribute_type == 'tag':
+        VisibilityService(db).refresh_user(user_id)
+
     db.commit()
+    get_principal_cache().invalidate(user_id)
     db.refresh(attr)
     return attr
 
@@ -325,7 +339,10 @@ def remove_user_attribute(user_id: UUID, attribute_id: UUID, db: DBSession, curr
         )
 
     db.delete(attr)
+    if attr.attribute_type == 'tag':
+        VisibilityService(db).refresh_user(user_id)
     db.commit()
+    get_principal_cache().invalidate(user_id)
     return None
 
 
@@ -1885,8 +1885,18 @@ def stop_vm(vm_id: UUID, db: DBSession, current_user: CurrentUser):
 
 
 @router.get("/{vm_id}/stats")
-def get_vm_stats(vm_id: UUID, db: DBSession, current_user: CurrentUser):
-    """Get real-time resource statistics for a VM"""
+def get_vm_stats(
+    vm_id: UUID,
+    db: DBSession,
+    current_user: CurrentUser,
+    history: bool = Query(False, description="Include the buffered samples (about one a second)"),
+):
+    """Get real-time resource statistics for a VM.
+
+    Served from the background stats collector, which keeps a streaming
+    subscription per running container of the range; the first read of a
+    range starts its streams, so stats may be null for a second or two.
+    """
     vm = db.query(VM).filter(VM.id == vm_id).first()
     if not vm:
         raise HTTPException(
@@ -1901,14 +1911,20 @@ def get_vm_stats(vm_id: UUID, db: DBSession, current_user: CurrentUser):
         return {"vm_id": str(vm.id), "status": vm.status.value, "stats": None}
 
     try:
-        docker = get_docker_service()
-        stats = docker.get_container_stats(vm.container_id)
-        return {
+        from cyroid.services.container_stats_collector import get_stats_collector
+        range_obj = db.query(Range).filter(Range.id == vm.range_id).first()
+        collector = get_stats_collector().for_range(
+            str(vm.range_id), range_obj.dind_docker_url if range_obj else None, [vm.container_id]
+        )
+        response = {
             "vm_id": str(vm.id),
             "hostname": vm.hostname,
             "status": vm.status.value,
-            "stats": stats
+            "stats": collector.latest(vm.container_id)
         }
+        if history:
+            response["history"] = collector.history(vm.container_id)
+        return response
     except Exception as e:
         logger.warning(f"Failed to get stats for VM {vm_id}: {e}")
         return {"vm_id": str(vm.id), "status": vm.status.value, "stats": None}
@@ -1,7 +1,7 @@
 # backend/cyroid/api/walkthrough.py
 from uuid import UUID
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
@@ -10,6 +10,13 @@ from cyroid.models.user import User
 from cyroid.models.range import Range
 from cyroid.models.content import Content
 from cyroid.models.walkthrough_progress import WalkthroughProgress
+from cyroid.services.content_render_cache import (
+    RENDER_WALKTHROUGH,
+    content_etag,
+    content_revision,
+    etag_matches,
+    get_content_render_cache,
+)
 from cyroid.services.walkthrough_parser import parse_markdown_to_walkthrough
 
 
@@ -41,10 +48,16 @@ class WalkthroughProgressUpdate(BaseModel):
 @router.get("/{range_id}/walkthrough", response_model=WalkthroughResponse)
 def get_walkthrough(
     range_id: UUID,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Get the walkthrough content for a range from Content Library."""
+    """Get the walkthrough content for a range from Content Library.
+
+    Parsed walkthroughs are cached per content revision and served with an
+    ETag; a matching If-None-Match gets a 304 without loading the content body.
+    """
     range_obj = db.query(Range).filter(Range.id == range_id).first()
     if not range_obj:
         raise HTTPException(status_code=404, detail="Range not found")
@@ -52,15 +65,36 @@ def get_walkthrough(
     # Fetch walkthrough from Content Library via student_guide relationship
     walkthrough = None
     if range_obj.student_guide_id:
-        content = db.query(Content).filter(Content.id == range_obj.student_guide_id).first()
-        if content:
-            if content.walkthrough_data:
-                walkthrough = content.walkthrough_data
-            elif content.body_markdown:
-                # Auto-parse markdown into structured walkthrough format
-                walkthrough = parse_markdown_to_walkthrough(
-                    content.title or "Walkthrough", content.body_markdown
-                )
+        # Look up the revision only; the body is loaded on a cache miss
+        meta = (
+            db.query(Content.id, Content.updated_at, Content.version)
+            .filter(Content.id == range_obj.student_guide_id)
+            .first()
+        )
+        if meta:
+            revision = content_revision(meta.updated_at, meta.version)
+            etag = content_etag(RENDER_WALKTHROUGH, meta.id, revision)
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+
+            def render() -> Optional[dict]:
+                content = db.query(Content).filter(Content.id == meta.id).first()
+                if not content:
+                    return None
+                if content.walkthrough_data:
+                    return content.walkthrough_data
+                if content.body_markdown:
+                    # Auto-parse markdown into structured walkthrough format
+                    return parse_markdown_to_walkthrough(
+                        content.title or "Walkthrough", content.body_markdown
+                    )
+                return None
+
+            walkthrough = get_content_render_cache().get_or_render(
+                RENDER_WALKTHROUGH, meta.id, revision, render
+            )
 
     return WalkthroughResponse(walkthrough=walkthrough)
 
@@ -7,10 +7,12 @@ from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPException, status
 from starlette.websockets import WebSocketState
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import websockets
 
-from cyroid.database import get_db
+from cyroid.database import get_async_session_local, get_db
 from cyroid.models.vm import VM
 from cyroid.models.range import Range
 from cyroid.utils.security import decode_access_token
@@ -38,14 +40,31 @@ def get_dind_docker_client(range_obj: Range):
 
 async def get_current_user_ws(websocket: WebSocket, token: str, db: Session):
     """Authenticate WebSocket connection using JWT token."""
-    from cyroid.models.user import User
+    from cyroid.services.principal_cache import get_principal_cache
 
     user_id = decode_access_token(token)
     if not user_id:
         await websocket.close(code=4001, reason="Invalid token")
         return None
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_principal_cache().load_user(db, user_id)
+    if not user:
+        await websocket.close(code=4001, reason="User not found")
+        return None
+
+    return user
+
+
+async def get_current_user_ws_async(websocket: WebSocket, token: str, db: AsyncSession):
+    """get_current_user_ws() using an async session."""
+    from cyroid.services.principal_cache import get_principal_cache
+
+    user_id = decode_access_token(token)
+    if not user_id:
+        await websocket.close(code=4001, reason="Invalid token")
+        return None
+
+    user = await get_principal_cache().load_user_async(db, user_id)
     if not user:
         await websocket.close(code=4001, reason="User not found")
         return None
@@ -576,22 +595,31 @@ async def range_status(
     """
     WebSocket endpoint for range status updates.
     Combines periodic polling with real-time event notifications.
+
+    Polls use short-lived async sessions, so an open status socket neither
+    blocks the event loop nor holds a database connection between polls.
     """
     await websocket.accept()
 
-    db = next(get_db())
+    session_factory = get_async_session_local()
     connection_id = f"status_{range_id}_{id(websocket)}"
 
+    async def read_status():
+        async with session_factory() as db:
+            range_status_value = await db.scalar(select(Range.status).where(Range.id == range_id))
+            rows = await db.execute(select(VM.id, VM.status).where(VM.range_id == range_id))
+            return range_status_value, {str(vm_id): vm_status.value for vm_id, vm_status in rows}
+
     try:
-        user = await get_current_user_ws(websocket, token, db)
+        async with session_factory() as db:
+            user = await get_current_user_ws_async(websocket, token, db)
         if not user:
             return
 
-        from cyroid.models.range import Range
         from cyroid.services.event_broadcaster import get_connection_manager
 
-        range_obj = db.query(Range).filter(Range.id == range_id).first()
-        if not range_obj:
+        range_status_value, current_status = await read_status()
+        if range_status_value is None:
             await websocket.close(code=4004, reason="Range not found")
             return
 
@@ -601,36 +629,32 @@ async def range_status(
         await connection_manager.subscribe_to_range(connection_id, str(range_id))
 
         # Send initial status immediately
-        vms = db.query(VM).filter(VM.range_id == range_id).all()
-        current_status = {str(vm.id): vm.status.value for vm in vms}
         await websocket.send_json({
             "type": "status_update",
             "range_id": str(range_id),
-            "range_status": range_obj.status.value,
+            "range_status": range_status_value.value,
             "vms": current_status,
         })
 
         # Poll for status updates (as backup to real-time events)
         last_status = current_status.copy()
         while True:
-            # Refresh data
-            db.expire_all()
-            vms = db.query(VM).filter(VM.range_id == range_id).all()
-            current_status = {str(vm.id): vm.status.value for vm in vms}
-            db.refresh(range_obj)
+            await asyncio.sleep(3)  # Poll every 3 seconds as backup
+
+            range_status_value, current_status = await read_status()
+            if range_status_value is None:
+                break
 
             # Check for changes
             if current_status != last_status:
                 await websocket.send_json({
                     "type": "status_update",
                     "range_id": str(range_id),
-                    "range_status": range_obj.status.value,
+                    "range_status": range_status_value.value,
                     "vms": current_status,
                 })
                 last_status = current_status.copy()
 
-            await asyncio.sleep(3)  # Poll every 3 seconds as backup
-
     except WebSocketDisconnect:
         logger.info(f"Status WebSocket disconnected for range {range_id}")
     except Exception as e:
@@ -646,7 +670,6 @@ async def range_status(
             await connection_manager.disconnect(connection_id)
         except Exception:
             pass
-        db.close()
 
 
 @router.websocket("/ws/events")
@@ -663,6 +686,7 @@ async def system_events(
 
     Message types received:
     - Event broadcasts (event_type, message, range_id, vm_id, data, timestamp)
+    - Notifications for this user (type: "notification", id, title, message, severity, ...)
     - Ping messages (type: "ping") for keepalive
 
     Client can send:
@@ -692,6 +716,8 @@ async def system_events(
 
         connection_manager = get_connection_manager()
         await connection_manager.connect(connection_id, websocket)
+        # Notifications are pushed to every events socket of their recipients
+        connection_manager.register_user(connection_id, str(user.id))
 
         # If range_id specified, subscribe to that range
         if range_id:
@@ -785,3 +811,103 @@ async def system_events(
             pass
         if db is not None:
             db.close()
+
+
+@router.websocket("/ws/infrastructure/logs/{service}")
+async def infrastructure_log_tail(
+    websocket: WebSocket,
+    service: str,
+    token: str = Query(...),
+    level: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    backlog: int = Query(100, ge=0, le=1000),
+):
+    """
+    Live tail of a CYROID infrastructure service's logs (admin only).
+
+    Sends the newest `backlog` matching lines, then new lines as the log
+    store ingests them, filtered by `level` and `search` like
+    GET /admin/infrastructure/logs.
+
+    Message types sent:
+    - {"type": "logs", "service", "entries": [{seq, cursor, timestamp, level, message, raw}], "dropped"}
+    - Ping messages (type: "ping") for keepalive
+    """
+    await websocket.accept()
+
+    from cyroid.api.admin import INFRASTRUCTURE_SERVICES, _service_log_buffer
+    from cyroid.services.infrastructure_log_store import level_rank
+
+    buffer = None
+    queue = None
+    try:
+        async with get_async_session_local()() as db:
+            user = await get_current_user_ws_async(websocket, token, db)
+        if not user:
+            return
+        if not user.is_admin:
+            await websocket.close(code=4003, reason="Administrator access required")
+            return
+        if service not in INFRASTRUCTURE_SERVICES:
+            await websocket.close(code=4004, reason="Unknown service")
+            return
+
+        loop = asyncio.get_running_loop()
+        buffer = await loop.run_in_executor(None, _service_log_buffer, service)
+        # Subscribe before reading the backlog so no line falls in between
+        queue = buffer.subscribe(loop)
+        page = buffer.query(level=level, search=search, limit=backlog) if backlog else None
+        last_seq = page.records[-1].seq if page and page.records else -1
+
+        rank = level_rank(level)
+        needle = search.lower() if search else None
+
+        def serialize(records):
+            return [
+                {**record.to_dict(), "timestamp": record.timestamp.isoformat() if record.timestamp else None}
+                for record in records
+            ]
+
+        await websocket.send_json({
+            "type": "logs",
+            "service": service,
+            "entries": serialize(page.records if page else []),
+            "dropped": 0,
+        })
+
+        dropped = 0
+        while True:
+            try:
+                records = await asyncio.wait_for(queue.get(), timeout=30.0)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "ping"})
+                continue
+
+            matching = [
+                record for record in records
+                if record.seq > last_seq
+                and (not rank or (record.level and level_rank(record.level) >= rank))
+                and (needle is None or needle in record.lowered)
+            ]
+            now_dropped = buffer.dropped(queue)
+            if matching or now_dropped != dropped:
+                await websocket.send_json({
+                    "type": "logs",
+                    "service": service,
+                    "entries": serialize(matching),
+                    "dropped": now_dropped - dropped,
+                })
+                dropped = now_dropped
+
+    except WebSocketDisconnect:
+        logger.debug(f"Log tail WebSocket disconnected for {service}")
+    except Exception as e:
+        logger.warning(f"Log tail WebSocket error for {service}: {e}")
+        try:
+            if websocket.client_state == WebSocketState.CONNECTED:
+                await websocket.close(code=4000, reason=str(e)[:120])
+        except Exception:
+            pass
+    finally:
+        if buffer is not None and queue is not None:
+            buffer.unsubscribe(queue)
@@ -90,6 +90,9 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "change-me-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60
+    # Authenticated-user cache shared by API workers through Redis (0 = off)
+    principal_cache_ttl: int = 30
+    principal_cache_max_entries: int = 10000
 
     # App
     app_name: str = "CYROID"
@@ -101,6 +104,10 @@ class Settings(BaseSettings):
     # Image/ISO Cache (platform-aware defaults)
     iso_cache_dir: str = os.path.join(_get_default_data_dir(), "iso-cache")
     template_storage_dir: str = os.path.join(_get_default_data_dir(), "template-storage")
+    ingest_workers: int = 2  # Threads for spooling uploads and extracting archives
+    # qemu-img conversions: concurrent slots = disk budget / per-conversion bandwidth
+    conversion_disk_bandwidth_mbps: int = 400
+    conversion_job_bandwidth_mbps: int = 200
 
     # VM Storage (platform-aware defaults)
     vm_storage_dir: str = os.path.join(_get_default_data_dir(), "vm-storage")
@@ -108,6 +115,48 @@ class Settings(BaseSettings):
 
     # Catalog
     catalog_storage_dir: str = os.path.join(_get_default_data_dir(), "catalogs")
+    catalog_sync_timeout: int = 120  # Seconds allowed per source during a sync
+    catalog_sync_workers: int = 4  # Sources synced concurrently
+    catalog_sync_interval: int = 0  # Seconds between background syncs of all sources (0 = off)
+
+    # Event log retention (raw rows older than this are rolled up into daily counts, then deleted)
+    event_retention_days: int = 90  # 0 = keep forever
+    event_retention_overrides: str = ""  # Per type, e.g. "deployment_step=7,vm_error=365" (0 = keep forever)
+    event_prune_interval: int = 300  # Seconds between background pruning passes (0 = off)
+    event_prune_batch_size: int = 5000  # Rows deleted per transaction
+
+    # Local registry retention (unreferenced tags are deleted, then blobs garbage-collected)
+    registry_gc_interval: int = 3600  # Seconds between background retention passes (0 = off)
+    registry_gc_window: str = "02:00-05:00"  # UTC maintenance window for deletes and GC ("" = any time)
+    registry_gc_timeout: int = 1800  # Seconds allowed for one garbage-collect run
+    registry_retention_days: float = 7  # Days a tag stays unreferenced before it is deleted
+    registry_retention_keep: str = ""  # Comma-separated repo:tag globs never deleted, e.g. "cyroid/*,mirror/*:stable"
+    registry_compose_service: str = "registry"  # Compose service name of the registry container
+
+    # Local registry catalog (listings are served from a cached crawl)
+    registry_catalog_refresh_interval: int = 60  # Seconds between background crawls per API worker (0 = off)
+    registry_catalog_max_age: int = 300  # Seconds a crawl is served before a request triggers a new one
+    registry_catalog_concurrency: int = 16  # Registry requests in flight during a crawl
+    registry_catalog_page_size: int = 1000  # Repositories / tags requested per page
+
+    # Pre-deployment validation: seconds host facts (local images, disk usage) are reused across validations
+    validation_cache_ttl: int = 30
+    # Deployment admission: reserved resources must fit what the host has left
+    reservation_cpu_overcommit: float = 4.0  # vCPUs admitted per host core
+    reservation_ram_overcommit: float = 1.0  # VM RAM admitted per byte of host RAM
+    reservation_max_dind: int = 0  # Ranges (DinD containers) running or deploying at once (0 = no limit)
+    reservation_ttl: int = 7200  # Seconds before a reservation left by a crashed worker stops counting
+
+    # Container stats: streamed per running container while someone is looking
+    stats_history_samples: int = 300  # Samples kept per container (Docker streams about one a second)
+    stats_idle_timeout: int = 120  # Seconds without a read before a range's streams are closed
+
+    # Infrastructure logs: each service's container log is followed into an indexed buffer
+    infra_log_buffer_lines: int = 20000  # Lines kept per service
+    infra_log_idle_seconds: int = 900  # Seconds without a query or tail before a worker stops following a service
+
+    # Traefik VNC routes: changes are coalesced and written to one route file
+    traefik_route_flush_delay: float = 0.5  # Seconds a change waits for others before the file is written
 
     # VyOS Router Configuration
     vyos_image: str = "2stacks/vyos:1.2.0-rc11"
@@ -120,6 +169,19 @@ class Settings(BaseSettings):
     dind_image: str = "ghcr.io/jongodb/cyroid-dind:latest"
     dind_startup_timeout: int = 60  # Seconds to wait for inner Docker daemon
     dind_docker_port: int = 2375  # Docker daemon port inside DinD
+    dind_client_timeout: int = 60  # Seconds per Docker API call against a range's daemon
+    dind_transfer_timeout: int = 600  # Seconds per call for image transfers, snapshots, copies and execs in DinD
+    dind_client_pool_size: int = 10  # HTTP connections kept per range client
+    dind_client_idle_timeout: int = 600  # Close a range's clients after this many idle seconds
+    dind_probe_interval: int = 30  # Re-ping a range's daemon when its last good probe is older
+    dind_probe_timeout: int = 3  # Seconds a liveness probe may take
+
+    # === Docker SDK Executor ===
+    # Blocking docker-py calls made from async service methods run on this pool
+    docker_executor_workers: int = 16
+    docker_call_timeout: int = 120  # Default seconds per off-loop Docker operation
+    docker_long_call_timeout: int = 3600  # Seconds for pulls, pushes, image transfers and commits
+    loop_lag_interval: float = 0.5  # Seconds between event-loop lag samples
 
     # === Network Configuration ===
     # Management network for CYROID infrastructure services
@@ -1,12 +1,22 @@
 # backend/cyroid/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 
 from cyroid.config import get_settings
 
 _engine = None
 _SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
+
+# Async drivers for the sync database URLs used in settings
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
 
 def get_engine():
@@ -37,3 +47,47 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver.
+
+    Raises:
+        ValueError: If there is no async driver for the database
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Async engine for read paths that run on the event loop.
+
+    Pooled connections are awaited instead of held by a threadpool worker,
+    so concurrent requests scale with the pool rather than the threadpool.
+    """
+    global _async_engine
+    if _async_engine is None:
+        settings = get_settings()
+        url = async_database_url(settings.database_url)
+        options = {"pool_pre_ping": True}
+        if not url.startswith("sqlite"):
+            options.update(pool_size=20, max_overflow=40, pool_recycle=3600)
+        _async_engine = create_async_engine(url, **options)
+    return _async_engine
+
+
+def get_async_session_local():
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        # Objects stay readable after commit; async sessions cannot lazy-load them
+        _AsyncSessionLocal = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    AsyncSessionLocal = get_async_session_local()
+    async with AsyncSessionLocal() as db:
+        yield db
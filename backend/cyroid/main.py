@@ -1,4 +1,5 @@
 # backend/cyroid/main.py
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -56,9 +57,61 @@ async def lifespan(app: FastAPI):
 
     logger.info("Real-time event services started")
 
+    catalog_sync_task = None
+    if settings.catalog_sync_interval > 0:
+        from cyroid.services.catalog_sync_scheduler import get_catalog_sync_scheduler
+        catalog_sync_task = asyncio.create_task(
+            get_catalog_sync_scheduler().run_forever(settings.catalog_sync_interval)
+        )
+        logger.info(f"Background catalog sync every {settings.catalog_sync_interval}s")
+
+    event_prune_task = None
+    if settings.event_prune_interval > 0:
+        from cyroid.services.event_retention_service import get_event_retention_service
+        event_prune_task = asyncio.create_task(
+            get_event_retention_service().run_forever(settings.event_prune_interval)
+        )
+        logger.info(f"Background event log pruning every {settings.event_prune_interval}s")
+
+    registry_gc_task = None
+    if settings.registry_gc_interval > 0:
+        from cyroid.services.registry_retention_service import get_registry_retention_service
+        registry_gc_task = asyncio.create_task(
+            get_registry_retention_service().run_forever(settings.registry_gc_interval)
+        )
+        logger.info(
+            f"Background registry retention every {settings.registry_gc_interval}s "
+            f"(window {settings.registry_gc_window or 'any time'} UTC)"
+        )
+
+    registry_catalog_task = None
+    if settings.registry_catalog_refresh_interval > 0:
+        from cyroid.services.registry_service import get_registry_service
+        registry_catalog_task = asyncio.create_task(
+            get_registry_service().catalog.run_forever(settings.registry_catalog_refresh_interval)
+        )
+
+    from cyroid.services.docker_executor import get_docker_executor, get_loop_lag_monitor
+    loop_lag_monitor = get_loop_lag_monitor()
+    loop_lag_monitor.start()
+
     yield
 
     # Shutdown
+    if catalog_sync_task:
+        catalog_sync_task.cancel()
+    if event_prune_task:
+        event_prune_task.cancel()
+    if registry_gc_task:
+        registry_gc_task.cancel()
+    if registry_catalog_task:
+        registry_catalog_task.cancel()
+    from cyroid.services.container_stats_collector import get_stats_collector
+    get_stats_collector().stop_all()
+    from cyroid.services.infrastructure_log_store import get_infrastructure_log_store
+    get_infrastructure_log_store().stop_all()
+    await loop_lag_monitor.stop()
+    get_docker_executor().shutdown()
     logger.info("Stopping real-time event services...")
     await connection_manager.stop()
     await broadcaster.disconnect()
@@ -1,7 +1,7 @@
 # backend/cyroid/models/__init__.py
 from cyroid.models.base import Base
 from cyroid.models.user import User, UserRole, UserAttribute, AVAILABLE_ROLES
-from cyroid.models.resource_tag import ResourceTag
+from cyroid.models.resource_tag import ResourceTag, ResourceVisibility
 from cyroid.models.vm_enums import OSType, VMType, LinuxDistro
 from cyroid.models.range import Range, RangeStatus
 from cyroid.models.network import Network
@@ -9,7 +9,7 @@ from cyroid.models.vm import VM, VMStatus, BootSource
 from cyroid.models.vm_network import VMNetwork
 from cyroid.models.artifact import Artifact, ArtifactPlacement, ArtifactType, MaliciousIndicator, PlacementStatus
 from cyroid.models.snapshot import Snapshot
-from cyroid.models.event_log import EventLog, EventType
+from cyroid.models.event_log import EventLog, EventLogRollup, EventType
 from cyroid.models.connection import Connection, ConnectionProtocol, ConnectionState
 from cyroid.models.msel import MSEL
 from cyroid.models.inject import Inject, InjectStatus
@@ -18,7 +18,10 @@ from cyroid.models.walkthrough_progress import WalkthroughProgress
 from cyroid.models.blueprint import RangeBlueprint, RangeInstance
 from cyroid.models.content import Content, ContentAsset, ContentType
 from cyroid.models.event import TrainingEvent, EventParticipant, EventStatus
-from cyroid.models.notification import Notification, NotificationType, NotificationSeverity
+from cyroid.models.notification import (
+    Notification, NotificationCounter, NotificationInboxEntry, NotificationType, NotificationSeverity,
+)
+from cyroid.models.resource_reservation import ResourceReservation
 # Image Library models
 from cyroid.models.base_image import BaseImage, ImageType
 from cyroid.models.golden_image import GoldenImage, GoldenImageSource
@@ -28,14 +31,14 @@ from cyroid.models.catalog import CatalogSource, CatalogInstalledItem, CatalogSo
 __all__ = [
     "Base",
     "User", "UserRole", "UserAttribute", "AVAILABLE_ROLES",
-    "ResourceTag",
+    "ResourceTag", "ResourceVisibility",
     "OSType", "VMType", "LinuxDistro",
     "Range", "RangeStatus",
     "Network",
     "VM", "VMStatus", "BootSource", "VMNetwork",
     "Artifact", "ArtifactPlacement", "ArtifactType", "MaliciousIndicator", "PlacementStatus",
     "Snapshot",
-    "EventLog", "EventType",
+    "EventLog", "EventLogRollup", "EventType",
     "Connection", "ConnectionProtocol", "ConnectionState",
     "MSEL",
     "Inject", "InjectStatus",
@@ -44,7 +47,8 @@ __all__ = [
     "RangeBlueprint", "RangeInstance",
     "Content", "ContentAsset", "ContentType",
     "TrainingEvent", "EventParticipant", "EventStatus",
-    "Notification", "NotificationType", "NotificationSeverity",
+    "Notification", "NotificationInboxEntry", "NotificationCounter", "NotificationType", "NotificationSeverity",
+    "ResourceReservation",
     # Image Library
     "BaseImage", "ImageType",
     "GoldenImage", "GoldenImageSource",
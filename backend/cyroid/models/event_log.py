@@ -1,8 +1,9 @@
 # backend/cyroid/models/event_log.py
+from datetime import date
 from enum import Enum
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import String, Text, ForeignKey
+from sqlalchemy import Date, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cyroid.models.base import Base, TimestampMixin, UUIDMixin
@@ -43,8 +44,9 @@ class EventType(str, Enum):
 class EventLog(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "event_logs"
 
-    range_id: Mapped[UUID] = mapped_column(ForeignKey("ranges.id", ondelete="CASCADE"), index=True)
-    vm_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("vms.id", ondelete="SET NULL"), nullable=True, index=True)
+    # range_id and vm_id are indexed by the composite indexes below
+    range_id: Mapped[UUID] = mapped_column(ForeignKey("ranges.id", ondelete="CASCADE"))
+    vm_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("vms.id", ondelete="SET NULL"), nullable=True)
     network_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("networks.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -59,3 +61,26 @@ class EventLog(Base, UUIDMixin, TimestampMixin):
     vm = relationship("VM", back_populates="event_logs")
     network = relationship("Network", back_populates="event_logs")
     user = relationship("User")
+
+    __table_args__ = (
+        # Newest-first keyset paging: WHERE range_id = ? AND (created_at, id) < (?, ?)
+        Index('ix_event_logs_range_created', 'range_id', 'created_at', 'id'),
+        Index('ix_event_logs_vm_created', 'vm_id', 'created_at', 'id'),
+        # Retention pruning walks the oldest rows first
+        Index('ix_event_logs_created_at', 'created_at'),
+    )
+
+
+class EventLogRollup(Base):
+    """
+    Per-range daily event counts.
+
+    Written by EventRetentionService as raw event_logs rows are pruned, so a
+    range's activity history survives after its individual events expire.
+    """
+    __tablename__ = "event_log_rollups"
+
+    range_id: Mapped[UUID] = mapped_column(ForeignKey("ranges.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(50), primary_key=True)  # EventType value
+    count: Mapped[int] = mapped_column(Integer, default=0)
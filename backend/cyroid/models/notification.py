@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Text, Boolean, ForeignKey, Index
+from sqlalchemy import DateTime, Integer, String, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cyroid.models.base import Base, TimestampMixin, UUIDMixin
@@ -95,8 +95,7 @@ class Notification(Base, UUIDMixin, TimestampMixin):
         nullable=True
     )
 
-    # Read status per user - stored as JSON {user_id: read_at}
-    # For single-user notifications, we just use read_at
+    # Legacy shared read flag; per-user read state lives in notification_inbox
     read_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     # Relationships
@@ -108,3 +107,38 @@ class Notification(Base, UUIDMixin, TimestampMixin):
         Index('ix_notifications_resource', 'resource_type', 'resource_id'),
         Index('ix_notifications_created_at', 'created_at'),
     )
+
+
+class NotificationInboxEntry(Base):
+    """A notification delivered to one user, with that user's read state.
+
+    Recipients are resolved from the notification's scoping (user, role,
+    range or event) once, when it is created, so listing a user's inbox is
+    an indexed scan of their own rows.
+    """
+    __tablename__ = "notification_inbox"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    notification_id: Mapped[UUID] = mapped_column(
+        ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))  # Copied from the notification
+    read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    notification = relationship("Notification", lazy="joined")
+
+    __table_args__ = (
+        # Newest-first inbox listing per user
+        Index('ix_notification_inbox_user_created', 'user_id', 'created_at'),
+        # Recipients of one notification (fan-out counters, pushes, cascades)
+        Index('ix_notification_inbox_notification', 'notification_id'),
+    )
+
+
+class NotificationCounter(Base):
+    """Per-user inbox totals, maintained as entries are delivered and read."""
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,28 @@
+# backend/cyroid/models/resource_reservation.py
+"""Host resources reserved by range deployments that are still in progress."""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cyroid.models.base import Base
+
+
+class ResourceReservation(Base):
+    """Disk, RAM, vCPU and DinD claimed by one deploying range.
+
+    Held from admission until the deployment completes or fails, so
+    concurrent deployments are admitted against what is still free once
+    every other in-flight deployment has been accounted for.
+    """
+    __tablename__ = "resource_reservations"
+
+    range_id: Mapped[UUID] = mapped_column(ForeignKey("ranges.id", ondelete="CASCADE"), primary_key=True)
+    disk_gb: Mapped[float] = mapped_column(Float, default=0)
+    ram_mb: Mapped[int] = mapped_column(Integer, default=0)
+    vcpus: Mapped[int] = mapped_column(Integer, default=0)
+    dind: Mapped[int] = mapped_column(Integer, default=1)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Reservations of crashed workers stop counting after this
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -2,7 +2,7 @@
 """Resource tags for ABAC visibility control."""
 from uuid import UUID
 
-from sqlalchemy import String, UniqueConstraint, Index
+from sqlalchemy import ForeignKey, String, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from cyroid.models.base import Base, TimestampMixin, UUIDMixin
@@ -28,3 +28,23 @@ class ResourceTag(Base, UUIDMixin, TimestampMixin):
         Index('ix_resource_tags_lookup', 'resource_type', 'resource_id'),
         Index('ix_resource_tags_by_tag', 'resource_type', 'tag'),
     )
+
+
+class ResourceVisibility(Base):
+    """
+    Materialized tag grants: one row per user and tagged resource that the
+    user can see through a matching tag.
+
+    Maintained by VisibilityService whenever resource tags or user tag
+    attributes change, so visibility checks are indexed lookups instead of
+    tag subqueries. Untagged (public) resources have no rows.
+    """
+    __tablename__ = "resource_visibility"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    resource_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    resource_id: Mapped[UUID] = mapped_column(primary_key=True)
+
+    __table_args__ = (
+        Index('ix_resource_visibility_resource', 'resource_type', 'resource_id'),
+    )
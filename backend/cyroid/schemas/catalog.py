@@ -26,6 +26,16 @@ class CatalogSourceUpdate(BaseModel):
     enabled: Optional[bool] = None
 
 
+class CatalogSyncStats(BaseModel):
+    """Outcome of a catalog source's most recent sync."""
+    changed: bool
+    bytes_transferred: int = 0
+    duration_seconds: float = 0.0
+    item_count: int = 0
+    synced_at: datetime
+    error: Optional[str] = None
+
+
 class CatalogSourceResponse(BaseModel):
     id: UUID
     name: str
@@ -37,6 +47,7 @@ class CatalogSourceResponse(BaseModel):
     error_message: Optional[str] = None
     item_count: int = 0
     last_synced: Optional[datetime] = None
+    last_sync: Optional[CatalogSyncStats] = None
     created_by: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
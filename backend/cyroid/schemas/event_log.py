@@ -1,5 +1,5 @@
 # backend/cyroid/schemas/event_log.py
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 from typing import Optional, List
 from pydantic import BaseModel
@@ -44,4 +44,12 @@ class EventLogResponse(EventLogBase):
 
 class EventLogList(BaseModel):
     events: List[EventLogResponse]
-    total: int
+    total: Optional[int] = None  # Omitted when paging with a cursor or include_total=false
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next (older) page
+
+
+class EventDailyCount(BaseModel):
+    """Events of one type on one day (UTC), including pruned events."""
+    day: date
+    event_type: str
+    count: int
@@ -35,6 +35,8 @@ class InfrastructureServicesResponse(BaseModel):
 # Log Models
 class LogEntry(BaseModel):
     """A single log entry."""
+    seq: Optional[int] = None  # Position in this worker's log buffer (used by the live tail)
+    cursor: Optional[str] = None  # Worker-independent line position; page back with ?before=<oldest cursor>
     timestamp: Optional[datetime] = None
     level: Optional[str] = None
     message: str
@@ -168,12 +170,127 @@ class StorageMetrics(BaseModel):
     vm_storage_dirs: int = 0
 
 
+class PrincipalCacheMetrics(BaseModel):
+    """Authenticated-user cache metrics, summed across API workers."""
+    enabled: bool = False
+    ttl_seconds: int = 0
+    max_entries: int = 0
+    entries: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+
+
+class ResourceAmountsMetrics(BaseModel):
+    """An amount of each reservable resource (None = unknown or unlimited)."""
+    disk_gb: Optional[float] = None
+    ram_mb: Optional[int] = None
+    vcpus: Optional[int] = None
+    dind: Optional[int] = None
+
+
+class ResourceReservationEntry(BaseModel):
+    """Resources held by one in-flight deployment."""
+    range_id: str
+    range_name: str
+    disk_gb: float
+    ram_mb: int
+    vcpus: int
+    dind: int
+    created_at: datetime
+    expires_at: datetime
+
+
+class ResourceReservationMetrics(BaseModel):
+    """Deployment admission ledger: capacity, running ranges' usage and in-flight reservations."""
+    capacity: ResourceAmountsMetrics = Field(default_factory=ResourceAmountsMetrics)
+    committed: ResourceAmountsMetrics = Field(default_factory=ResourceAmountsMetrics)
+    reserved: ResourceAmountsMetrics = Field(default_factory=ResourceAmountsMetrics)
+    reservations: List[ResourceReservationEntry] = []
+
+
+class TraefikRouteMetrics(BaseModel):
+    """VNC route writer: route set size and Traefik reloads triggered (reloads_total spans all processes)."""
+    route_file: Optional[str] = None
+    ranges: int = 0
+    routers: int = 0
+    reloads_total: int = 0
+    last_reload_at: Optional[float] = None
+    changes: int = 0
+    pending: int = 0
+    flushes: int = 0
+    reloads: int = 0
+    last_flush_ms: float = 0.0
+
+
+class DinDClientMetrics(BaseModel):
+    """Pooled Docker clients of one range and its daemon's request latency."""
+    range_id: str
+    docker_url: str
+    clients: int = 0
+    idle_seconds: float = 0.0
+    probe_ms: float = 0.0
+    probe_failures: int = 0
+    reresolved: int = 0
+    requests: int = 0
+    errors: int = 0
+    avg_ms: float = 0.0
+    p95_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class DinDClientPoolMetrics(BaseModel):
+    """DinD client pool of the API process: size, churn and per-range latency."""
+    ranges: int = 0
+    clients: int = 0
+    created: int = 0
+    evicted: int = 0
+    timeout: int = 0
+    pool_size: int = 0
+    per_range: List[DinDClientMetrics] = []
+
+
+class DockerOperationMetrics(BaseModel):
+    """Calls of one Docker operation run off the event loop."""
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    avg_ms: float = 0.0
+    max_ms: float = 0.0
+    avg_wait_ms: float = 0.0
+
+
+class EventLoopLagMetrics(BaseModel):
+    """How late the API worker's event loop wakes from a sleep."""
+    interval_ms: float = 0.0
+    samples: int = 0
+    avg_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class DockerExecutorMetrics(BaseModel):
+    """Docker SDK executor of the API process and its event-loop lag."""
+    workers: int = 0
+    queued: int = 0
+    running: int = 0
+    abandoned: int = 0
+    operations: Dict[str, DockerOperationMetrics] = {}
+    loop_lag: EventLoopLagMetrics = Field(default_factory=EventLoopLagMetrics)
+
+
 class InfrastructureMetricsResponse(BaseModel):
     """Response for metrics endpoint."""
     host: HostMetrics
     database: DatabaseMetrics
     task_queue: TaskQueueMetrics
     storage: StorageMetrics
+    principal_cache: PrincipalCacheMetrics = Field(default_factory=PrincipalCacheMetrics)
+    reservations: ResourceReservationMetrics = Field(default_factory=ResourceReservationMetrics)
+    traefik_routes: TraefikRouteMetrics = Field(default_factory=TraefikRouteMetrics)
+    dind_clients: DinDClientPoolMetrics = Field(default_factory=DinDClientPoolMetrics)
+    docker_executor: DockerExecutorMetrics = Field(default_factory=DockerExecutorMetrics)
     collected_at: datetime
 
 
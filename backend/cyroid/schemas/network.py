@@ -1,7 +1,7 @@
 # backend/cyroid/schemas/network.py
 import ipaddress
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, model_validator
 
@@ -42,6 +42,23 @@ class NetworkUpdate(BaseModel):
     dhcp_enabled: Optional[bool] = None
 
 
+class NetworkPolicyUpdate(BaseModel):
+    """Policy flags to change in one call; omitted flags are left as they are."""
+    is_isolated: Optional[bool] = None
+    internet_enabled: Optional[bool] = None
+    dhcp_enabled: Optional[bool] = None
+
+
+class NetworkPolicyChange(BaseModel):
+    """iptables rules changed inside the range's DinD container."""
+    network: str
+    applied: bool
+    added: List[str] = []
+    removed: List[str] = []
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+
 class NetworkResponse(NetworkBase):
     id: UUID
     range_id: UUID
@@ -49,6 +66,8 @@ class NetworkResponse(NetworkBase):
     vyos_interface: Optional[str] = None  # eth1, eth2, etc.
     created_at: datetime
     updated_at: datetime
+    # Set by policy endpoints when rules were applied to a deployed range
+    policy_change: Optional[NetworkPolicyChange] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,197 @@
+# backend/cyroid/services/catalog_index.py
+"""
+In-memory search index over a catalog source's index.json.
+
+Parsing index.json and scanning every item's name and description on each
+browse request gets slow with several large catalog sources. Instead each
+source's index is parsed once into a CatalogIndex holding inverted indexes
+for name/description tokens, tags and item types, and cached per process.
+
+A cached index is reused until the source's index.json changes on disk
+(i.e. the source was synced, possibly by another API worker) or it is
+explicitly invalidated by a sync or delete.
+"""
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class CatalogIndex:
+    """Parsed catalog items plus inverted token, tag and type indexes.
+
+    Item positions follow index.json order, so every query returns matches
+    in a stable order suitable for offset pagination.
+    """
+
+    def __init__(self, index_data: dict):
+        self.catalog: dict = index_data.get("catalog", {})
+        self.items: List[dict] = index_data.get("items", [])
+        self.by_id: Dict[str, int] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._tags: Dict[str, Set[int]] = {}
+        self._types: Dict[str, Set[int]] = {}
+        self._text: List[str] = []
+
+        for pos, item in enumerate(self.items):
+            self.by_id.setdefault(item.get("id", ""), pos)
+            text = f"{item.get('name', '')}\n{item.get('description', '')}".lower()
+            self._text.append(text)
+            for token in set(tokenize(text)):
+                self._tokens.setdefault(token, set()).add(pos)
+            for tag in item.get("tags", []):
+                if tag:
+                    self._tags.setdefault(tag, set()).add(pos)
+            self._types.setdefault(item.get("type", "blueprint"), set()).add(pos)
+
+        # Sorted vocabulary for prefix lookups
+        self._vocabulary: List[str] = sorted(self._tokens)
+        # Memoized token -> positions for query fragments (vocabulary is immutable)
+        self._fragment_cache: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, item_id: str) -> Optional[dict]:
+        pos = self.by_id.get(item_id)
+        return self.items[pos] if pos is not None else None
+
+    def _positions_for_fragment(self, fragment: str) -> Set[int]:
+        """Positions of items with a token containing ``fragment``."""
+        cached = self._fragment_cache.get(fragment)
+        if cached is not None:
+            return cached
+
+        positions: Set[int] = set()
+        # Fast path: tokens starting with the fragment are contiguous in the sorted vocabulary
+        start = bisect.bisect_left(self._vocabulary, fragment)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(fragment):
+                break
+            positions |= self._tokens[token]
+        # Substring matches inside longer tokens (e.g. "sql" in "mysql")
+        for token in self._vocabulary:
+            if fragment in token and not token.startswith(fragment):
+                positions |= self._tokens[token]
+
+        if len(self._fragment_cache) < 4096:
+            self._fragment_cache[fragment] = positions
+        return positions
+
+    def search(
+        self,
+        item_type: Optional[str] = None,
+        search: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> List[dict]:
+        """Return items matching all given filters, in index order.
+
+        Args:
+            item_type: Only items of this type.
+            search: Case-insensitive substring of the name or description.
+            tags: Items must have at least one of these tags.
+        """
+        candidates: Optional[Set[int]] = None
+
+        def narrow(positions: Set[int]) -> None:
+            nonlocal candidates
+            candidates = set(positions) if candidates is None else candidates & positions
+
+        if item_type:
+            narrow(self._types.get(item_type, set()))
+
+        if tags:
+            tagged: Set[int] = set()
+            for tag in tags:
+                tagged |= self._tags.get(tag, set())
+            narrow(tagged)
+
+        search_lower = search.lower() if search else None
+        if search_lower:
+            fragments = tokenize(search_lower)
+            for fragment in fragments:
+                narrow(self._positions_for_fragment(fragment))
+                if not candidates:
+                    return []
+            if candidates is None:
+                # Query has no alphanumeric characters; fall back to a scan
+                candidates = set(range(len(self.items)))
+            # Confirm the exact substring (the token index is a superset filter)
+            candidates = {pos for pos in candidates if search_lower in self._text[pos]}
+
+        if candidates is None:
+            return list(self.items)
+        return [self.items[pos] for pos in sorted(candidates)]
+
+
+class CatalogIndexCache:
+    """Per-process cache of CatalogIndex objects keyed by source ID.
+
+    Entries are validated against the index.json file's mtime and size, so a
+    sync performed by another worker is picked up without re-parsing on every
+    request.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], CatalogIndex]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, source_id: str, index_path: Path) -> CatalogIndex:
+        """Get the index for a source, parsing index.json only if it changed.
+
+        Raises:
+            FileNotFoundError: If index.json does not exist.
+            json.JSONDecodeError: If index.json is malformed.
+        """
+        try:
+            st = os.stat(index_path)
+        except FileNotFoundError:
+            self.invalidate(source_id)
+            raise FileNotFoundError(f"index.json not found at {index_path}")
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(source_id)
+        if entry and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(source_id)
+            if entry and entry[0] == stamp:
+                return entry[1]
+
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = CatalogIndex(json.load(f))
+            self._entries[source_id] = (stamp, index)
+            self.builds += 1
+            logger.debug(f"Built catalog index for source {source_id}: {len(index)} items")
+            return index
+
+    def invalidate(self, source_id: str) -> None:
+        with self._lock:
+            self._entries.pop(source_id, None)
+
+
+# Singleton instance
+_catalog_index_cache: Optional[CatalogIndexCache] = None
+
+
+def get_catalog_index_cache() -> CatalogIndexCache:
+    """Get the singleton CatalogIndexCache instance."""
+    global _catalog_index_cache
+    if _catalog_index_cache is None:
+        _catalog_index_cache = CatalogIndexCache()
+    return _catalog_index_cache
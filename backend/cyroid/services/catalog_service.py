@@ -14,9 +14,11 @@ import logging
 import os
 import shutil
 import subprocess
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 import yaml
@@ -36,6 +38,7 @@ from cyroid.models.catalog import (
 )
 from cyroid.models.content import Content, ContentType
 from cyroid.schemas.catalog import CatalogItemDetail, CatalogItemSummary
+from cyroid.services.catalog_index import CatalogIndex, get_catalog_index_cache
 from cyroid.services.walkthrough_parser import parse_markdown_to_walkthrough
 
 logger = logging.getLogger(__name__)
@@ -125,6 +128,30 @@ def build_config_from_yaml(blueprint_data: dict) -> dict:
     return config
 
 
+@dataclass
+class CatalogSyncResult:
+    """Outcome of syncing one catalog source."""
+    source_id: str
+    changed: bool
+    bytes_transferred: int
+    duration_seconds: float
+    item_count: int
+    synced_at: str
+    error: Optional[str] = None
+
+
+def _dir_size(path: Path) -> int:
+    """Total size in bytes of the files under ``path``."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
 class CatalogService:
     """Service for catalog source management, index browsing, and content installation."""
 
@@ -149,13 +176,14 @@ class CatalogService:
         storage_root.mkdir(parents=True, exist_ok=True)
         return storage_root / str(source.id)
 
-    def sync_source(self, source: CatalogSource) -> int:
-        """Sync a catalog source by cloning/pulling git, fetching HTTP, or verifying local.
+    def sync_source(self, source: CatalogSource, timeout: Optional[float] = None) -> int:
+        """Sync a catalog source by fetching git, fetching HTTP, or verifying local.
 
         Updates the source's sync_status and item_count in the database.
 
         Args:
             source: The catalog source to sync.
+            timeout: Per-source network timeout in seconds (defaults to settings).
 
         Returns:
             Number of items found in the index.
@@ -163,64 +191,162 @@ class CatalogService:
         Raises:
             Exception: If sync fails (also sets source status to ERROR).
         """
+        return self.sync_source_with_stats(source, timeout).item_count
+
+    def sync_source_with_stats(
+        self, source: CatalogSource, timeout: Optional[float] = None
+    ) -> CatalogSyncResult:
+        """Sync a catalog source and record duration and bytes transferred.
+
+        Unchanged sources (HTTP 304, or a git fetch that doesn't move the
+        branch) are not rewritten, so their cached index stays valid.
+
+        Args:
+            source: The catalog source to sync.
+            timeout: Per-source network timeout in seconds (defaults to settings).
+
+        Returns:
+            CatalogSyncResult for this sync, also persisted for get_sync_stats.
+
+        Raises:
+            Exception: If sync fails (also sets source status to ERROR).
+        """
+        timeout = timeout or self.settings.catalog_sync_timeout
         source.sync_status = CatalogSyncStatus.SYNCING
         source.error_message = None
         self.db.commit()
 
+        started = time.monotonic()
         try:
             if source.source_type == CatalogSourceType.GIT:
-                self._sync_git(source)
+                changed, bytes_transferred = self._sync_git(source, timeout)
             elif source.source_type == CatalogSourceType.HTTP:
-                self._sync_http(source)
+                changed, bytes_transferred = self._sync_http(source, timeout)
             elif source.source_type == CatalogSourceType.LOCAL:
                 self._sync_local(source)
+                changed, bytes_transferred = True, 0
             else:
                 raise ValueError(f"Unknown source type: {source.source_type}")
 
-            # Count items from the index
-            index = self._load_index(source)
-            item_count = len(index.get("items", []))
+            if changed:
+                # Rebuild the search index from the freshly synced index.json
+                get_catalog_index_cache().invalidate(str(source.id))
+            item_count = len(self._get_index(source))
 
             source.sync_status = CatalogSyncStatus.IDLE
             source.item_count = item_count
             source.error_message = None
             self.db.commit()
 
-            logger.info(f"Synced catalog source '{source.name}': {item_count} items")
-            return item_count
+            result = CatalogSyncResult(
+                source_id=str(source.id),
+                changed=changed,
+                bytes_transferred=bytes_transferred,
+                duration_seconds=round(time.monotonic() - started, 3),
+                item_count=item_count,
+                synced_at=datetime.now(timezone.utc).isoformat(),
+            )
+            self._save_sync_state(source, result=asdict(result))
+
+            logger.info(
+                f"Synced catalog source '{source.name}': {item_count} items "
+                f"({'changed' if changed else 'unchanged'}, {bytes_transferred} bytes, "
+                f"{result.duration_seconds:.2f}s)"
+            )
+            return result
 
         except Exception as e:
             source.sync_status = CatalogSyncStatus.ERROR
             source.error_message = str(e)[:500]
             self.db.commit()
+            self._save_sync_state(source, result=asdict(CatalogSyncResult(
+                source_id=str(source.id),
+                changed=False,
+                bytes_transferred=0,
+                duration_seconds=round(time.monotonic() - started, 3),
+                item_count=source.item_count or 0,
+                synced_at=datetime.now(timezone.utc).isoformat(),
+                error=str(e)[:500],
+            )))
             logger.error(f"Failed to sync catalog source '{source.name}': {e}")
             raise
 
-    def _sync_git(self, source: CatalogSource) -> None:
-        """Clone or pull a git catalog source.
+    def _sync_state_path(self, source: CatalogSource) -> Path:
+        """Path of the sidecar file holding a source's sync metadata.
+
+        Kept next to (not inside) the source directory so it never ends up
+        in a git checkout.
+        """
+        return Path(self.settings.catalog_storage_dir) / f"{source.id}.sync.json"
+
+    def _load_sync_state(self, source: CatalogSource) -> Dict[str, Any]:
+        try:
+            with open(self._sync_state_path(source), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_sync_state(self, source: CatalogSource, **fields: Any) -> None:
+        state = self._load_sync_state(source)
+        state.update(fields)
+        path = self._sync_state_path(source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def get_sync_stats(self, source: CatalogSource) -> Optional[Dict[str, Any]]:
+        """Get the recorded outcome of a source's last sync, if any."""
+        return self._load_sync_state(source).get("result")
+
+    def _git(self, source_dir: Path, *args: str, timeout: float) -> str:
+        """Run a git command in ``source_dir`` and return its stdout."""
+        result = subprocess.run(
+            ["git", "-C", str(source_dir), *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git {args[0]} failed: {result.stderr.strip() or result.stdout.strip()}"
+            )
+        return result.stdout.strip()
 
-        If the local directory already exists with a .git folder, does a pull.
-        Otherwise, clones the repository fresh.
+    def _sync_git(self, source: CatalogSource, timeout: float = 120) -> Tuple[bool, int]:
+        """Shallow-clone or shallow-fetch a git catalog source.
+
+        If the local directory already exists with a .git folder, fetches only
+        the tip of the branch and resets to it when it moved. Otherwise, clones
+        the repository fresh with depth 1.
 
         Args:
             source: The git catalog source.
+            timeout: Timeout in seconds for each git operation.
+
+        Returns:
+            Tuple of (changed, bytes transferred into the object store).
         """
         source_dir = self.get_source_dir(source)
         git_dir = source_dir / ".git"
 
         if git_dir.exists():
-            # Pull existing repo
-            logger.info(f"Pulling catalog source '{source.name}' from {source.url}")
-            result = subprocess.run(
-                ["git", "-C", str(source_dir), "pull", "--ff-only"],
-                capture_output=True,
-                text=True,
-                timeout=120,
+            # Fetch only the branch tip into the existing shallow clone
+            logger.info(f"Fetching catalog source '{source.name}' from {source.url}")
+            size_before = _dir_size(git_dir)
+            self._git(
+                source_dir, "fetch", "--depth", "1", "origin", source.branch or "HEAD",
+                timeout=timeout,
             )
-            if result.returncode != 0:
-                raise RuntimeError(
-                    f"git pull failed: {result.stderr.strip() or result.stdout.strip()}"
-                )
+            bytes_transferred = max(0, _dir_size(git_dir) - size_before)
+
+            head = self._git(source_dir, "rev-parse", "HEAD", timeout=timeout)
+            fetched = self._git(source_dir, "rev-parse", "FETCH_HEAD", timeout=timeout)
+            if head == fetched:
+                return False, bytes_transferred
+
+            self._git(source_dir, "reset", "--hard", "FETCH_HEAD", timeout=timeout)
+            return True, bytes_transferred
         else:
             # Clone fresh
             logger.info(f"Cloning catalog source '{source.name}' from {source.url}")
@@ -231,12 +357,16 @@ class CatalogService:
                 cmd.extend(["--branch", source.branch])
             cmd.extend([source.url, str(source_dir)])
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired:
+                shutil.rmtree(source_dir, ignore_errors=True)
+                raise
             if result.returncode != 0:
                 # Clean up partial clone
                 if source_dir.exists():
@@ -244,34 +374,60 @@ class CatalogService:
                 raise RuntimeError(
                     f"git clone failed: {result.stderr.strip() or result.stdout.strip()}"
                 )
+            return True, _dir_size(git_dir)
 
-    def _sync_http(self, source: CatalogSource) -> None:
+    def _sync_http(self, source: CatalogSource, timeout: float = 30.0) -> Tuple[bool, int]:
         """Fetch index.json from an HTTP catalog source.
 
-        Downloads the index.json from the source URL and stores it locally.
+        Sends the ETag/Last-Modified validators from the previous fetch so an
+        unchanged index is answered with 304 and not downloaded again.
 
         Args:
             source: The HTTP catalog source.
+            timeout: Request timeout in seconds.
+
+        Returns:
+            Tuple of (changed, bytes downloaded).
         """
         import httpx
 
         source_dir = self.get_source_dir(source)
         source_dir.mkdir(parents=True, exist_ok=True)
+        index_path = source_dir / "index.json"
 
         # Ensure URL points to index.json
         url = source.url.rstrip("/")
         if not url.endswith("index.json"):
             url = f"{url}/index.json"
 
+        headers = {}
+        validators = self._load_sync_state(source).get("http", {})
+        if index_path.exists() and validators.get("url") == url:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
         logger.info(f"Fetching catalog index from {url}")
-        response = httpx.get(url, timeout=30.0, follow_redirects=True)
+        response = httpx.get(url, headers=headers, timeout=timeout, follow_redirects=True)
+        if response.status_code == 304:
+            logger.info(f"Catalog index at {url} not modified")
+            return False, 0
         response.raise_for_status()
 
-        # Write index.json locally
-        index_path = source_dir / "index.json"
-        index_path.write_text(response.text, encoding="utf-8")
+        # Write index.json locally (atomically, so readers never see a partial file)
+        tmp_path = source_dir / "index.json.tmp"
+        tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, index_path)
+
+        self._save_sync_state(source, http={
+            "url": url,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        })
 
         logger.info(f"Fetched catalog index from {url}")
+        return True, len(response.content)
 
     def _sync_local(self, source: CatalogSource) -> None:
         """Verify that a local catalog source path exists and has an index.json.
@@ -297,6 +453,8 @@ class CatalogService:
         Args:
             source: The catalog source whose local data should be removed.
         """
+        get_catalog_index_cache().invalidate(str(source.id))
+        self._sync_state_path(source).unlink(missing_ok=True)
         source_dir = self.get_source_dir(source)
         if source_dir.exists():
             shutil.rmtree(source_dir, ignore_errors=True)
@@ -322,27 +480,48 @@ class CatalogService:
             return Path(source.url)
         return self.get_source_dir(source)
 
-    def _load_index(self, source: CatalogSource) -> dict:
-        """Load and parse the index.json for a catalog source.
+    def _get_index(self, source: CatalogSource) -> CatalogIndex:
+        """Get the cached search index for a catalog source.
+
+        index.json is only re-parsed when it changed since the last load,
+        i.e. after the source was synced.
 
         Args:
             source: The catalog source.
 
         Returns:
-            Parsed index dictionary with 'catalog' and 'items' keys.
+            CatalogIndex over the source's items.
 
         Raises:
             FileNotFoundError: If index.json does not exist.
             json.JSONDecodeError: If index.json is malformed.
         """
-        catalog_root = self._get_catalog_root(source)
-        index_path = catalog_root / "index.json"
+        index_path = self._get_catalog_root(source) / "index.json"
+        return get_catalog_index_cache().get(str(source.id), index_path)
+
+    def search_items(
+        self,
+        source: CatalogSource,
+        item_type: Optional[CatalogItemType] = None,
+        search: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """Find raw index entries matching the filters, in stable index order.
 
-        if not index_path.exists():
-            raise FileNotFoundError(f"index.json not found at {index_path}")
+        Args:
+            source: The catalog source to search.
+            item_type: Optional filter by item type.
+            search: Optional text search against name and description.
+            tags: Optional tag filter (items must have at least one matching tag).
 
-        with open(index_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        Returns:
+            List of item dictionaries from index.json.
+        """
+        return self._get_index(source).search(
+            item_type=item_type.value if item_type else None,
+            search=search,
+            tags=tags,
+        )
 
     def list_items(
         self,
@@ -362,8 +541,20 @@ class CatalogService:
         Returns:
             List of CatalogItemSummary objects with install status populated.
         """
-        index = self._load_index(source)
-        items = index.get("items", [])
+        return self.summarize_items(source, self.search_items(source, item_type, search, tags))
+
+    def summarize_items(self, source: CatalogSource, items: List[dict]) -> List[CatalogItemSummary]:
+        """Build CatalogItemSummary objects with install status for index entries.
+
+        Args:
+            source: The catalog source the items belong to.
+            items: Item dictionaries as returned by search_items.
+
+        Returns:
+            List of CatalogItemSummary objects, in the same order.
+        """
+        if not items:
+            return []
 
         # Build a lookup of installed items for this source
         installed_lookup: Dict[str, CatalogInstalledItem] = {}
@@ -376,26 +567,8 @@ class CatalogService:
             installed_lookup[inst.catalog_item_id] = inst
 
         results: List[CatalogItemSummary] = []
-        search_lower = search.lower() if search else None
 
         for item_data in items:
-            # Filter by type
-            if item_type and item_data.get("type") != item_type.value:
-                continue
-
-            # Filter by search text
-            if search_lower:
-                name_match = search_lower in item_data.get("name", "").lower()
-                desc_match = search_lower in item_data.get("description", "").lower()
-                if not name_match and not desc_match:
-                    continue
-
-            # Filter by tags
-            if tags:
-                item_tags = item_data.get("tags", [])
-                if not any(t in item_tags for t in tags):
-                    continue
-
             # Build summary with install status
             item_id = item_data.get("id", "")
             installed = installed_lookup.get(item_id)
@@ -450,15 +623,7 @@ class CatalogService:
         Returns:
             CatalogItemDetail with readme content and install status, or None if not found.
         """
-        index = self._load_index(source)
-        items = index.get("items", [])
-
-        item_data = None
-        for item in items:
-            if item.get("id") == item_id:
-                item_data = item
-                break
-
+        item_data = self._get_index(source).get(item_id)
         if not item_data:
             return None
 
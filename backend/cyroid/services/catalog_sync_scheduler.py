@@ -0,0 +1,149 @@
+# backend/cyroid/services/catalog_sync_scheduler.py
+"""
+Concurrent sync of all enabled catalog sources.
+
+Syncing is dominated by network round-trips (git fetches, HTTP requests), so
+sources are refreshed in parallel on a small thread pool, each with its own
+database session and a per-source timeout. One slow or failing source does
+not hold up or fail the others.
+
+When ``catalog_sync_interval`` is set, the API runs the scheduler in the
+background; a Redis lock ensures only one API worker syncs per interval.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from cyroid.config import get_settings
+from cyroid.models.catalog import CatalogSource
+from cyroid.services.catalog_service import CatalogService, CatalogSyncResult
+
+logger = logging.getLogger(__name__)
+
+SYNC_LOCK_KEY = "catalog_sync:lock"
+
+
+class CatalogSyncScheduler:
+    """Syncs catalog sources concurrently and reports per-source results."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        settings = get_settings()
+        if session_factory is None:
+            from cyroid.database import get_session_local
+            session_factory = get_session_local()
+        self.session_factory = session_factory
+        self.max_workers = max_workers or settings.catalog_sync_workers
+        self.timeout = timeout or settings.catalog_sync_timeout
+        self.last_run: Optional[dict] = None
+
+    def sync_all(self, source_ids: Optional[List[UUID]] = None) -> List[CatalogSyncResult]:
+        """Sync sources concurrently.
+
+        Args:
+            source_ids: Sources to sync; defaults to all enabled sources.
+
+        Returns:
+            One CatalogSyncResult per source, in the order the sources were listed.
+        """
+        if source_ids is None:
+            db = self.session_factory()
+            try:
+                source_ids = [
+                    source.id for source in
+                    db.query(CatalogSource)
+                    .filter(CatalogSource.enabled == True)
+                    .order_by(CatalogSource.name)
+                    .all()
+                ]
+            finally:
+                db.close()
+
+        if not source_ids:
+            return []
+
+        started = datetime.now(timezone.utc)
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(source_ids)),
+            thread_name_prefix="catalog-sync",
+        ) as pool:
+            results = list(pool.map(self._sync_one, source_ids))
+
+        self.last_run = {
+            "started_at": started.isoformat(),
+            "duration_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 3),
+            "sources": len(results),
+            "changed": sum(1 for r in results if r.changed),
+            "failed": sum(1 for r in results if r.error),
+            "bytes_transferred": sum(r.bytes_transferred for r in results),
+        }
+        logger.info(f"Catalog sync finished: {self.last_run}")
+        return results
+
+    def _sync_one(self, source_id: UUID) -> CatalogSyncResult:
+        """Sync a single source in its own session; failures become results."""
+        db = self.session_factory()
+        try:
+            source = db.query(CatalogSource).filter(CatalogSource.id == source_id).first()
+            if not source:
+                return self._failed(source_id, "Catalog source not found")
+
+            service = CatalogService(db)
+            try:
+                return service.sync_source_with_stats(source, timeout=self.timeout)
+            except Exception as e:
+                # sync_source_with_stats records the failure with its duration
+                stats = service.get_sync_stats(source)
+                return CatalogSyncResult(**stats) if stats else self._failed(source_id, str(e))
+        finally:
+            db.close()
+
+    @staticmethod
+    def _failed(source_id: UUID, error: str) -> CatalogSyncResult:
+        return CatalogSyncResult(
+            source_id=str(source_id),
+            changed=False,
+            bytes_transferred=0,
+            duration_seconds=0.0,
+            item_count=0,
+            synced_at=datetime.now(timezone.utc).isoformat(),
+            error=error,
+        )
+
+    async def run_forever(self, interval: float, redis_client: Optional[Redis] = None) -> None:
+        """Sync all sources every ``interval`` seconds until cancelled.
+
+        Each API worker runs this loop, but only the one that takes the
+        Redis lock for the current interval performs the sync.
+        """
+        redis_client = redis_client or Redis.from_url(get_settings().redis_url)
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if redis_client.set(SYNC_LOCK_KEY, "1", nx=True, ex=max(1, int(interval))):
+                    await loop.run_in_executor(None, self.sync_all)
+            except Exception as e:
+                logger.error(f"Background catalog sync failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+_catalog_sync_scheduler: Optional[CatalogSyncScheduler] = None
+
+
+def get_catalog_sync_scheduler() -> CatalogSyncScheduler:
+    """Get the singleton CatalogSyncScheduler instance."""
+    global _catalog_sync_scheduler
+    if _catalog_sync_scheduler is None:
+        _catalog_sync_scheduler = CatalogSyncScheduler()
+    return _catalog_sync_scheduler
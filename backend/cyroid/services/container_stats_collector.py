@@ -0,0 +1,347 @@
+# backend/cyroid/services/container_stats_collector.py
+"""
+Background collection of VM container resource stats.
+
+A one-shot ``container.stats(stream=False)`` blocks for about a second while
+Docker takes two CPU samples, so a dashboard polling 20 VMs used to hold 20
+threadpool slots per refresh. Instead, each running container of a range
+gets one streaming stats subscription - against the range's DinD daemon -
+whose samples go into a fixed-size ring buffer, and stats endpoints read the
+buffer without touching Docker.
+
+The buffers live in Redis (``stats:{range_id}:samples:{container_id}``), so
+every API worker serves the same samples. Which worker streams a container
+is decided by an owner lease (``stats:{range_id}:owner:{container_id}``,
+SET NX): the owner renews it while streaming, and if its worker dies the
+lease lapses and the next read on any worker takes the stream over.
+
+Streams start when a range's stats are first read and stop once no worker
+has read them for ``stats_idle_timeout`` seconds, when the container stops,
+or on shutdown. Stream reads time out after ``STREAM_READ_TIMEOUT`` seconds,
+so these checks run even while a container sends no samples. If the daemon
+cannot be reached, the stream waits ``STREAM_READ_TIMEOUT`` before it
+reconnects.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import docker
+import requests
+import urllib3
+from redis import Redis
+
+from cyroid.config import get_settings
+from cyroid.services.docker_service import summarize_container_stats
+
+logger = logging.getLogger(__name__)
+
+# Seconds per point in a range's aggregate history
+AGGREGATE_BUCKET_SECONDS = 5
+# Seconds a stream read may block before the stop and ownership checks run anyway
+STREAM_READ_TIMEOUT = 5
+# Seconds a stream owner's lease outlives its last renewal
+OWNER_TTL = 15
+
+
+
+def _is_read_timeout(error: Exception) -> bool:
+    """True for a stream read that waited STREAM_READ_TIMEOUT without a sample.
+
+    requests wraps urllib3's ReadTimeoutError in a ConnectionError, which it
+    also raises when the daemon cannot be reached at all.
+    """
+    if isinstance(error, (urllib3.exceptions.ReadTimeoutError, requests.exceptions.ReadTimeout)):
+        return True
+    return any(isinstance(arg, urllib3.exceptions.ReadTimeoutError) for arg in error.args)
+
+
+class RangeStatsCollector:
+    """Streams stats for the containers of one range into Redis ring buffers."""
+
+    def __init__(
+        self,
+        range_id: str,
+        client_factory: Callable[[], docker.DockerClient],
+        history: int,
+        idle_timeout: float,
+        redis_client: Redis,
+        owner_token: str,
+    ):
+        self.range_id = range_id
+        self._client_factory = client_factory
+        self._history = history
+        self._idle_timeout = idle_timeout
+        self._redis = redis_client
+        self._token = owner_token
+        self._lock = threading.Lock()
+        self._streams: Dict[str, threading.Thread] = {}
+        self._last_read = time.monotonic()
+        self._stop = threading.Event()
+
+    def _key(self, kind: str, container_id: Optional[str] = None) -> str:
+        key = f"stats:{self.range_id}:{kind}"
+        return f"{key}:{container_id}" if container_id else key
+
+    def _touch(self) -> None:
+        """Record a read, here and for the workers that own the streams."""
+        with self._lock:
+            self._last_read = time.monotonic()
+        self._redis.set(self._key("read"), time.time(), ex=int(self._idle_timeout) + OWNER_TTL)
+
+    def watch(self, container_ids: Iterable[str]) -> None:
+        """Make sure each container is streamed, by this worker or another."""
+        self._touch()
+        with self._lock:
+            self._stop.clear()
+            candidates = [cid for cid in dict.fromkeys(container_ids) if cid not in self._streams]
+        if not candidates:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for container_id in candidates:
+            pipe.set(self._key("owner", container_id), self._token, nx=True, ex=OWNER_TTL)
+        claimed = pipe.execute()
+
+        with self._lock:
+            for container_id, owned in zip(candidates, claimed):
+                if not owned or container_id in self._streams:
+                    continue
+                thread = threading.Thread(
+                    target=self._stream,
+                    args=(container_id,),
+                    name=f"stats-{self.range_id[:8]}-{container_id[:12]}",
+                    daemon=True,
+                )
+                self._streams[container_id] = thread
+                thread.start()
+
+    def _samples(self, container_ids: List[str], last_only: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        self._touch()
+        start = -1 if last_only else 0
+        pipe = self._redis.pipeline(transaction=False)
+        for container_id in container_ids:
+            pipe.lrange(self._key("samples", container_id), start, -1)
+        return {
+            container_id: [json.loads(sample) for sample in samples]
+            for container_id, samples in zip(container_ids, pipe.execute())
+        }
+
+    def latest(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent sample for a container, if any."""
+        samples = self._samples([container_id], last_only=True)[container_id]
+        return samples[-1] if samples else None
+
+    def history(self, container_id: str) -> List[Dict[str, Any]]:
+        """Buffered samples for a container, oldest first."""
+        return self._samples([container_id])[container_id]
+
+    def aggregate(self, container_ids: Iterable[str]) -> Dict[str, Any]:
+        """Range-wide totals of the containers' latest samples, with history.
+
+        History points cover AGGREGATE_BUCKET_SECONDS each and sum the last
+        sample of every container in that bucket.
+        """
+        buffers = self._samples(list(container_ids))
+
+        latest = [samples[-1] for samples in buffers.values() if samples]
+        buckets: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for container_id, samples in buffers.items():
+            for sample in samples:
+                bucket = int(sample["timestamp"]) // AGGREGATE_BUCKET_SECONDS * AGGREGATE_BUCKET_SECONDS
+                buckets.setdefault(bucket, {})[container_id] = sample
+
+        return {
+            "containers_reporting": len(latest),
+            **_sum_samples(latest),
+            "history": [
+                {"timestamp": bucket, "containers": len(samples), **_sum_samples(samples.values())}
+                for bucket, samples in sorted(buckets.items())
+            ],
+        }
+
+    def stop(self) -> None:
+        """Ask this worker's streams to close; each ends within STREAM_READ_TIMEOUT."""
+        self._stop.set()
+
+    @property
+    def streaming(self) -> int:
+        with self._lock:
+            return len(self._streams)
+
+    @property
+    def idle(self) -> bool:
+        """No open streams and no reads on this worker within the idle timeout."""
+        with self._lock:
+            return not self._streams and time.monotonic() - self._last_read > self._idle_timeout
+
+    def _should_stop(self, container_id: str) -> bool:
+        """Stopped, unread by every worker, or the lease was lost. Renews the lease otherwise."""
+        if self._stop.is_set():
+            return True
+        last_read = self._redis.get(self._key("read"))
+        if last_read is None or time.time() - float(last_read) > self._idle_timeout:
+            return True
+        owner_key = self._key("owner", container_id)
+        if self._redis.get(owner_key) != self._token:
+            return True
+        self._redis.expire(owner_key, OWNER_TTL)
+        return False
+
+    def _record(self, container_id: str, sample: Dict[str, Any]) -> None:
+        key = self._key("samples", container_id)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.rpush(key, json.dumps(sample))
+        pipe.ltrim(key, -self._history, -1)
+        pipe.expire(key, int(self._idle_timeout) + OWNER_TTL)
+        pipe.execute()
+
+    def _stream(self, container_id: str) -> None:
+        try:
+            while not self._should_stop(container_id):
+                try:
+                    container = self._client_factory().containers.get(container_id)
+                    for raw in container.stats(stream=True, decode=True):
+                        try:
+                            sample = summarize_container_stats(raw)
+                        except (KeyError, ZeroDivisionError) as e:
+                            logger.debug(f"Skipping stats sample for {container_id[:12]}: {e}")
+                            continue
+                        sample["timestamp"] = time.time()
+                        self._record(container_id, sample)
+                        if self._should_stop(container_id):
+                            return
+                    return  # Docker ends the stream when the container stops
+                except (urllib3.exceptions.HTTPError, requests.exceptions.RequestException) as e:
+                    if _is_read_timeout(e):
+                        # No sample within STREAM_READ_TIMEOUT: check whether to go on, then reconnect
+                        logger.debug(f"Stats stream for {container_id[:12]} idle, reconnecting: {e}")
+                        continue
+                    # Daemon unreachable: back off instead of reconnecting in a tight loop
+                    logger.debug(f"Stats stream for {container_id[:12]} lost its connection, retrying: {e}")
+                    self._stop.wait(STREAM_READ_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Stats stream for container {container_id[:12]} in range {self.range_id} ended: {e}")
+        finally:
+            # Release the lease before forgetting the stream, so a read that
+            # finds no stream here can claim it again straight away
+            try:
+                owner_key = self._key("owner", container_id)
+                if self._redis.get(owner_key) == self._token:
+                    self._redis.delete(owner_key)
+            except Exception as e:
+                logger.debug(f"Failed to release stats stream lease for {container_id[:12]}: {e}")
+            with self._lock:
+                self._streams.pop(container_id, None)
+
+
+def _sum_samples(samples: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    samples = list(samples)
+    return {
+        "cpu_percent": round(sum(s["cpu_percent"] for s in samples), 2),
+        "memory_mb": round(sum(s["memory_mb"] for s in samples), 2),
+        "memory_limit_mb": round(sum(s["memory_limit_mb"] for s in samples), 2),
+        "network_rx_bytes": sum(s["network_rx_bytes"] for s in samples),
+        "network_tx_bytes": sum(s["network_tx_bytes"] for s in samples),
+    }
+
+
+class ContainerStatsCollector:
+    """Per-range stats collectors for this API process."""
+
+    def __init__(
+        self,
+        history: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        redis_client: Optional[Redis] = None,
+    ):
+        settings = get_settings()
+        self._history = history or settings.stats_history_samples
+        self._idle_timeout = idle_timeout or settings.stats_idle_timeout
+        self._redis = redis_client
+        # Identifies this worker's stream leases
+        self._token = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._ranges: Dict[str, RangeStatsCollector] = {}
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    def for_range(
+        self,
+        range_id: str,
+        docker_url: Optional[str],
+        container_ids: Iterable[str],
+        client_factory: Optional[Callable[[], docker.DockerClient]] = None,
+    ) -> RangeStatsCollector:
+        """Get a range's collector, streaming stats for the given running containers.
+
+        Args:
+            range_id: Range the containers belong to
+            docker_url: The range's DinD daemon URL (None for host containers)
+            container_ids: Running VM containers to stream
+            client_factory: Docker client to stream from (defaults to the range's)
+
+        Returns:
+            The range's RangeStatsCollector
+        """
+        range_id = str(range_id)
+        with self._lock:
+            # Drop buffers of ranges nobody has looked at since their streams ended
+            for idle_id in [rid for rid, c in self._ranges.items() if rid != range_id and c.idle]:
+                del self._ranges[idle_id]
+            collector = self._ranges.get(range_id)
+            if collector is None:
+                collector = RangeStatsCollector(
+                    range_id,
+                    client_factory or _range_client_factory(range_id, docker_url),
+                    self._history,
+                    self._idle_timeout,
+                    self.redis,
+                    self._token,
+                )
+                self._ranges[range_id] = collector
+        collector.watch(container_ids)
+        return collector
+
+    def stop_all(self) -> None:
+        with self._lock:
+            collectors = list(self._ranges.values())
+            self._ranges.clear()
+        for collector in collectors:
+            collector.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            collectors = list(self._ranges.values())
+        return {"ranges": len(collectors), "streams": sum(c.streaming for c in collectors)}
+
+
+def _range_client_factory(range_id: str, docker_url: Optional[str]) -> Callable[[], docker.DockerClient]:
+    """Clients whose reads time out after STREAM_READ_TIMEOUT, so streams never block for long."""
+    host_client: List[docker.DockerClient] = []
+
+    def factory() -> docker.DockerClient:
+        if docker_url:
+            from cyroid.services.dind_service import get_dind_service
+            return get_dind_service().get_range_client(range_id, docker_url, timeout=STREAM_READ_TIMEOUT)
+        if not host_client:
+            host_client.append(docker.from_env(timeout=STREAM_READ_TIMEOUT))
+        return host_client[0]
+    return factory
+
+
+_collector: Optional[ContainerStatsCollector] = None
+
+
+def get_stats_collector() -> ContainerStatsCollector:
+    """Get the stats collector singleton."""
+    global _collector
+    if _collector is None:
+        _collector = ContainerStatsCollector()
+    return _collector
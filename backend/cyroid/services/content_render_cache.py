@@ -0,0 +1,128 @@
+# backend/cyroid/services/content_render_cache.py
+"""
+Cache of rendered Content (structured walkthroughs and HTML exports).
+
+Parsing a student guide's markdown into a walkthrough, or rendering it to
+HTML, is deterministic for a given content revision. Every student in a
+class opening the walkthrough panel would otherwise parse the same document
+again, so renders are cached per process, keyed by content id, render kind
+and revision (``updated_at`` plus ``version``).
+
+The same revision stamp yields an ETag, so clients that already hold the
+current render get a 304 after a lookup of the content's id and timestamps
+only, without loading its body.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+RENDER_WALKTHROUGH = "walkthrough"
+RENDER_HTML = "html"
+
+
+def content_revision(updated_at: Optional[datetime], version: Optional[str]) -> str:
+    """Revision stamp for a content row; changes whenever the row is edited."""
+    stamp = updated_at.isoformat() if updated_at else ""
+    return f"{stamp}|{version or ''}"
+
+
+def content_etag(kind: str, content_id: UUID, revision: str) -> str:
+    """Weak ETag for a render of a given content revision."""
+    digest = hashlib.sha256(f"{kind}|{content_id}|{revision}".encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class ContentRenderCache:
+    """Thread-safe LRU cache of rendered content, keyed by revision."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, UUID], Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(
+        self,
+        kind: str,
+        content_id: UUID,
+        revision: str,
+        render: Callable[[], Any],
+    ) -> Any:
+        """Return the cached render for this revision, rendering it on a miss.
+
+        Only the latest revision of each content item is kept; an older entry
+        is replaced as soon as a newer revision is rendered.
+
+        Args:
+            kind: Render kind (RENDER_WALKTHROUGH or RENDER_HTML)
+            content_id: Content ID
+            revision: Stamp from content_revision()
+            render: Produces the render; only called on a miss
+
+        Returns:
+            The rendered value. Callers must treat it as read-only.
+        """
+        key = (kind, content_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == revision:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Render outside the lock; concurrent misses may render twice, harmlessly
+        value = render()
+
+        with self._lock:
+            self._entries[key] = (revision, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, content_id: UUID) -> None:
+        """Drop all renders of a content item (e.g. when it is deleted)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == content_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Singleton instance
+_content_render_cache: Optional[ContentRenderCache] = None
+
+
+def get_content_render_cache() -> ContentRenderCache:
+    """Get the singleton ContentRenderCache instance."""
+    global _content_render_cache
+    if _content_render_cache is None:
+        _content_render_cache = ContentRenderCache()
+    return _content_render_cache
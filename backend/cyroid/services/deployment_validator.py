@@ -6,13 +6,20 @@ potential issues early:
 - Architecture compatibility (ARM64 host running x86 VMs with emulation warning)
 - Disk space requirements
 - Network configuration (duplicate IPs within same network)
+
+Many ranges can be validated at once (e.g. before a training event): their
+VMs, networks and image records are loaded with one query per table, and host
+facts - the local image list and Docker disk usage - come from a short-lived
+cache shared by all validations instead of one Docker API call per image.
 """
 
 import logging
 import os
-import platform
 import shutil
-from typing import List, Optional
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, field
 from uuid import UUID
 
@@ -20,7 +27,6 @@ from sqlalchemy.orm import Session
 
 from cyroid.models import Range
 from cyroid.models.vm import VM
-from cyroid.models.vm_enums import VMType
 from cyroid.models.network import Network
 from cyroid.models.snapshot import Snapshot
 from cyroid.models.base_image import BaseImage
@@ -47,6 +53,7 @@ class DeploymentValidation:
     """Complete deployment validation result."""
     valid: bool
     results: List[ValidationResult]
+    duration_ms: float = 0.0
 
     @property
     def errors(self) -> List[ValidationResult]:
@@ -64,6 +71,103 @@ class DeploymentValidation:
         return [r for r in self.results if r.severity == "info"]
 
 
+@dataclass
+class BatchValidation:
+    """Validation of several ranges that will be deployed together."""
+    ranges: Dict[UUID, DeploymentValidation]
+    results: List[ValidationResult]  # Checks across the whole batch (combined disk space)
+    duration_ms: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return all(v.valid for v in self.ranges.values()) and all(
+            r.valid for r in self.results if r.severity == "error"
+        )
+
+
+class HostFacts:
+    """Host facts that change slowly, cached for a few seconds across validations.
+
+    Holds the set of references (tags, full and short IDs) of locally present
+    Docker images, ``docker info``, and the Docker data directory with its
+    disk usage. Only presence is cached: a reference missing from the
+    snapshot is always looked up live, so an image pulled a moment ago is
+    never reported missing.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._images: Optional[Tuple[float, Set[str]]] = None
+        self._disk: Optional[Tuple[float, str, tuple]] = None
+        self._info: Optional[Tuple[float, dict]] = None
+
+    def local_images(self, docker: DockerService) -> Set[str]:
+        """References of all locally present images (one Docker API call per TTL)."""
+        with self._lock:
+            if self._images and time.monotonic() - self._images[0] < self.ttl:
+                return self._images[1]
+            refs = set()
+            for image in docker.client.images.list():
+                refs.update(image.tags)
+                refs.add(image.id)
+                refs.add(image.id.split(":", 1)[-1][:12])
+            self._images = (time.monotonic(), refs)
+            return refs
+
+    def info(self, docker: DockerService) -> dict:
+        """Docker daemon info (``docker info``), one call per TTL."""
+        with self._lock:
+            if self._info and time.monotonic() - self._info[0] < self.ttl:
+                return self._info[1]
+        info = docker.client.info()
+        with self._lock:
+            self._info = (time.monotonic(), info)
+        return info
+
+    def disk_usage(self, docker: DockerService, default_path: str) -> Tuple[str, tuple]:
+        """(Docker data directory, shutil.disk_usage of it)."""
+        with self._lock:
+            if self._disk and time.monotonic() - self._disk[0] < self.ttl:
+                return self._disk[1], self._disk[2]
+        path = default_path
+        # Check if custom Docker root is configured
+        try:
+            path = self.info(docker).get("DockerRootDir") or default_path
+        except Exception:
+            pass
+        usage = shutil.disk_usage(path)
+        with self._lock:
+            self._disk = (time.monotonic(), path, usage)
+        return path, usage
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images = None
+            self._disk = None
+            self._info = None
+
+
+@dataclass
+class _ImageSources:
+    """Image records referenced by the VMs being validated, by ID."""
+    base_images: Dict[UUID, BaseImage]
+    golden_images: Dict[UUID, GoldenImage]
+    snapshots: Dict[UUID, Snapshot]
+
+    @classmethod
+    def load(cls, db: Session, vms: List[VM]) -> "_ImageSources":
+        def by_id(model, ids):
+            ids = {i for i in ids if i}
+            return {row.id: row for row in db.query(model).filter(model.id.in_(ids))} if ids else {}
+
+        return cls(
+            base_images=by_id(BaseImage, (vm.base_image_id for vm in vms)),
+            golden_images=by_id(GoldenImage, (vm.golden_image_id for vm in vms)),
+            snapshots=by_id(Snapshot, (vm.snapshot_id for vm in vms)),
+        )
+
+
 class DeploymentValidator:
     """Validates range configuration before deployment.
 
@@ -83,15 +187,22 @@ class DeploymentValidator:
     # Docker data directory (default, can be overridden)
     DOCKER_DATA_DIR = "/var/lib/docker"
 
-    def __init__(self, db: Session, docker_service: DockerService):
+    def __init__(self, db: Session, docker_service: DockerService, host_facts: Optional[HostFacts] = None):
         """Initialize the deployment validator.
 
         Args:
             db: SQLAlchemy database session
             docker_service: Docker service instance for image checks
+            host_facts: Host fact cache (defaults to the shared one)
         """
         self.db = db
         self.docker = docker_service
+        self.facts = host_facts or get_host_facts()
+        # Image lookups done during the current validation, so each reference
+        # is resolved at most once however many VMs use it
+        self._image_checks: Dict[str, bool] = {}
+        # Disk held by other deployments' reservations during the current validation
+        self._reserved_disk_gb = 0.0
 
     async def validate_range(self, range_id: UUID) -> DeploymentValidation:
         """Run all validation checks for a range.
@@ -102,32 +213,81 @@ class DeploymentValidator:
         Returns:
             DeploymentValidation with all results
         """
-        results = []
+        batch = await self.validate_ranges([range_id])
+        validation = batch.ranges[range_id]
+        validation.duration_ms = batch.duration_ms
+        return validation
 
-        # Fetch the range with eager loading of relationships
-        db_range = self.db.query(Range).filter(Range.id == range_id).first()
-        if not db_range:
-            return DeploymentValidation(
-                valid=False,
-                results=[ValidationResult(False, "Range not found", "error")]
-            )
+    async def validate_ranges(self, range_ids: Sequence[UUID]) -> BatchValidation:
+        """Run all validation checks for several ranges at once.
 
-        # Get VMs and networks for this range
-        vms = self.db.query(VM).filter(VM.range_id == range_id).all()
-        networks = self.db.query(Network).filter(Network.range_id == range_id).all()
+        VMs, networks and image records for every range are loaded with one
+        query per table, and each image reference is resolved once. Besides
+        each range's own disk check, the combined requirement of all ranges is
+        checked against the free space, since they will share the host.
+        Disk reserved by other in-flight deployments does not count as free.
 
-        # Run all validators
-        results.extend(await self._validate_images_exist(vms))
-        results.extend(self._validate_architecture(vms))
-        results.extend(self._validate_disk_space(vms))
-        results.extend(self._validate_network_config(vms, networks))
+        Args:
+            range_ids: UUIDs of the ranges to validate
 
-        # Determine overall validity - only errors make it invalid
-        valid = all(r.valid for r in results if r.severity == "error")
+        Returns:
+            BatchValidation with a DeploymentValidation per range; each one's
+            duration_ms covers its own checks, the batch's the whole run
+        """
+        from cyroid.services.resource_ledger import ResourceLedger
+
+        started = time.perf_counter()
+        self._image_checks = {}
+        range_ids = list(dict.fromkeys(range_ids))
+
+        found = {r.id for r in self.db.query(Range.id).filter(Range.id.in_(range_ids))}
+        self._reserved_disk_gb = ResourceLedger(self.db).reserved(exclude=list(found)).disk_gb
+        vms_by_range: Dict[UUID, List[VM]] = defaultdict(list)
+        networks_by_range: Dict[UUID, List[Network]] = defaultdict(list)
+        if found:
+            for vm in self.db.query(VM).filter(VM.range_id.in_(found)):
+                vms_by_range[vm.range_id].append(vm)
+            for network in self.db.query(Network).filter(Network.range_id.in_(found)):
+                networks_by_range[network.range_id].append(network)
+        all_vms = [vm for vms in vms_by_range.values() for vm in vms]
+        sources = _ImageSources.load(self.db, all_vms)
+
+        validations = {}
+        for range_id in range_ids:
+            range_started = time.perf_counter()
+            if range_id not in found:
+                validations[range_id] = DeploymentValidation(
+                    valid=False,
+                    results=[ValidationResult(False, "Range not found", "error")]
+                )
+                continue
+
+            vms, networks = vms_by_range[range_id], networks_by_range[range_id]
+            results = []
+            results.extend(await self._validate_images_exist(vms, sources))
+            results.extend(self._validate_architecture(vms, sources))
+            results.extend(self._validate_disk_space(vms))
+            results.extend(self._validate_network_config(vms, networks))
+
+            # Determine overall validity - only errors make it invalid
+            valid = all(r.valid for r in results if r.severity == "error")
+            validations[range_id] = DeploymentValidation(
+                valid=valid,
+                results=results,
+                duration_ms=round((time.perf_counter() - range_started) * 1000, 2),
+            )
 
-        return DeploymentValidation(valid=valid, results=results)
+        batch_results = []
+        if len(found) > 1:
+            batch_results = self._validate_disk_space(all_vms, scope=f"{len(found)} ranges combined")
 
-    async def _validate_images_exist(self, vms: List[VM]) -> List[ValidationResult]:
+        return BatchValidation(
+            ranges=validations,
+            results=batch_results,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    async def _validate_images_exist(self, vms: List[VM], sources: _ImageSources) -> List[ValidationResult]:
         """Strictly validate that all required images/ISOs exist before deployment.
 
         For container VMs: Docker image must be in local cache
@@ -136,12 +296,12 @@ class DeploymentValidator:
 
         Args:
             vms: List of VMs to validate
+            sources: Image records referenced by the VMs
 
         Returns:
             List of validation results
         """
         results = []
-        settings = get_settings()
 
         if not vms:
             results.append(ValidationResult(
@@ -154,19 +314,19 @@ class DeploymentValidator:
         for vm in vms:
             # Base Image (Image Library - container or ISO)
             if vm.base_image_id:
-                result = self._validate_base_image_vm(vm)
+                result = self._validate_base_image_vm(vm, sources.base_images.get(vm.base_image_id))
                 results.append(result)
                 continue
 
             # Golden Image (Image Library - snapshot or import)
             if vm.golden_image_id:
-                result = self._validate_golden_image_vm(vm)
+                result = self._validate_golden_image_vm(vm, sources.golden_images.get(vm.golden_image_id))
                 results.append(result)
                 continue
 
             # Snapshot-based VM
             if vm.snapshot_id:
-                result = self._validate_snapshot_vm(vm)
+                result = self._validate_snapshot_vm(vm, sources.snapshots.get(vm.snapshot_id))
                 results.append(result)
                 continue
 
@@ -183,23 +343,35 @@ class DeploymentValidator:
     def _check_image_exists(self, image: str) -> bool:
         """Check if a Docker image exists locally.
 
+        Looks the reference up in the cached local image list first, and only
+        asks Docker when it is not there (e.g. a name without a tag).
+
         Args:
             image: Docker image name/tag/id
 
         Returns:
             True if image exists, False otherwise
         """
+        if image in self._image_checks:
+            return self._image_checks[image]
+
         try:
-            self.docker.client.images.get(image)
-            return True
-        except Exception:
-            return False
+            exists = image in self.facts.local_images(self.docker)
+        except Exception as e:
+            logger.warning(f"Could not list local images: {e}")
+            exists = False
+        if not exists:
+            try:
+                self.docker.client.images.get(image)
+                exists = True
+            except Exception:
+                exists = False
+
+        self._image_checks[image] = exists
+        return exists
 
-    def _validate_base_image_vm(self, vm: VM) -> ValidationResult:
+    def _validate_base_image_vm(self, vm: VM, base_image: Optional[BaseImage]) -> ValidationResult:
         """Validate a base image VM (Image Library - container or ISO)."""
-        base_image = self.db.query(BaseImage).filter(
-            BaseImage.id == vm.base_image_id
-        ).first()
         if not base_image:
             return ValidationResult(
                 valid=False,
@@ -243,11 +415,8 @@ class DeploymentValidator:
                     vm_id=str(vm.id)
                 )
 
-    def _validate_golden_image_vm(self, vm: VM) -> ValidationResult:
+    def _validate_golden_image_vm(self, vm: VM, golden_image: Optional[GoldenImage]) -> ValidationResult:
         """Validate a golden image VM (Image Library - snapshot or import)."""
-        golden_image = self.db.query(GoldenImage).filter(
-            GoldenImage.id == vm.golden_image_id
-        ).first()
         if not golden_image:
             return ValidationResult(
                 valid=False,
@@ -296,11 +465,8 @@ class DeploymentValidator:
                 vm_id=str(vm.id)
             )
 
-    def _validate_snapshot_vm(self, vm: VM) -> ValidationResult:
+    def _validate_snapshot_vm(self, vm: VM, snapshot: Optional[Snapshot]) -> ValidationResult:
         """Validate a snapshot-based VM."""
-        snapshot = self.db.query(Snapshot).filter(
-            Snapshot.id == vm.snapshot_id
-        ).first()
         if not snapshot:
             return ValidationResult(
                 valid=False,
@@ -326,7 +492,7 @@ class DeploymentValidator:
             )
 
 
-    def _validate_architecture(self, vms: List[VM]) -> List[ValidationResult]:
+    def _validate_architecture(self, vms: List[VM], sources: _ImageSources) -> List[ValidationResult]:
         """Check architecture compatibility for VMs.
 
         ARM64 hosts can run x86_64 VMs through QEMU emulation, but with
@@ -334,6 +500,7 @@ class DeploymentValidator:
 
         Args:
             vms: List of VMs to validate
+            sources: Image records referenced by the VMs
 
         Returns:
             List of validation results
@@ -350,15 +517,11 @@ class DeploymentValidator:
             target_arch = "x86_64"  # Default
 
             if vm.base_image_id:
-                base_image = self.db.query(BaseImage).filter(
-                    BaseImage.id == vm.base_image_id
-                ).first()
+                base_image = sources.base_images.get(vm.base_image_id)
                 if base_image:
                     target_arch = base_image.native_arch or "x86_64"
             elif vm.golden_image_id:
-                golden_image = self.db.query(GoldenImage).filter(
-                    GoldenImage.id == vm.golden_image_id
-                ).first()
+                golden_image = sources.golden_images.get(vm.golden_image_id)
                 if golden_image:
                     target_arch = golden_image.native_arch or "x86_64"
 
@@ -386,19 +549,22 @@ class DeploymentValidator:
 
         return results
 
-    def _validate_disk_space(self, vms: List[VM]) -> List[ValidationResult]:
+    def _validate_disk_space(self, vms: List[VM], scope: Optional[str] = None) -> List[ValidationResult]:
         """Check available disk space for deployment.
 
         Calculates estimated disk requirements based on VM disk sizes
-        and checks against available space in Docker data directory.
+        and checks against available space in Docker data directory, less
+        what other in-flight deployments have reserved.
 
         Args:
             vms: List of VMs to validate
+            scope: What the VMs belong to when not a single range, for the message
 
         Returns:
             List of validation results
         """
         results = []
+        prefix = f"{scope}: " if scope else ""
 
         # Calculate estimated disk requirements
         total_disk_gb = sum(vm.disk_gb for vm in vms)
@@ -411,53 +577,39 @@ class DeploymentValidator:
 
         # Get available disk space
         try:
-            # Try Docker data directory first
-            docker_data_path = self.DOCKER_DATA_DIR
-
-            # Check if custom Docker root is configured
-            try:
-                info = self.docker.client.info()
-                docker_root = info.get("DockerRootDir")
-                if docker_root:
-                    docker_data_path = docker_root
-            except Exception:
-                pass
-
-            # Get disk usage
-            disk_usage = shutil.disk_usage(docker_data_path)
-            available_gb = disk_usage.free / (1024 ** 3)
+            docker_data_path, disk_usage = self.facts.disk_usage(self.docker, self.DOCKER_DATA_DIR)
+            reserved_gb = self._reserved_disk_gb
+            available_gb = max(disk_usage.free / (1024 ** 3) - reserved_gb, 0)
             total_gb = disk_usage.total / (1024 ** 3)
+            details = {
+                "available_gb": round(available_gb, 1),
+                "required_gb": round(required_gb, 1),
+                "reserved_gb": round(reserved_gb, 1),
+                "total_gb": round(total_gb, 1),
+                "docker_path": docker_data_path
+            }
+            reserved = f" after {reserved_gb:.1f} GB reserved by other deployments" if reserved_gb else ""
 
             if available_gb >= required_gb:
                 results.append(ValidationResult(
                     valid=True,
-                    message=f"Sufficient disk space: {available_gb:.1f} GB available, {required_gb:.1f} GB required (including 20% buffer)",
+                    message=f"{prefix}Sufficient disk space: {available_gb:.1f} GB available{reserved}, {required_gb:.1f} GB required (including 20% buffer)",
                     severity="info",
-                    details={
-                        "available_gb": round(available_gb, 1),
-                        "required_gb": round(required_gb, 1),
-                        "total_gb": round(total_gb, 1),
-                        "docker_path": docker_data_path
-                    }
+                    details=details
                 ))
             else:
                 results.append(ValidationResult(
                     valid=False,
-                    message=f"Insufficient disk space: {available_gb:.1f} GB available, but {required_gb:.1f} GB required (including 20% buffer)",
+                    message=f"{prefix}Insufficient disk space: {available_gb:.1f} GB available{reserved}, but {required_gb:.1f} GB required (including 20% buffer)",
                     severity="error",
-                    details={
-                        "available_gb": round(available_gb, 1),
-                        "required_gb": round(required_gb, 1),
-                        "total_gb": round(total_gb, 1),
-                        "docker_path": docker_data_path
-                    }
+                    details=details
                 ))
 
         except Exception as e:
             logger.warning(f"Could not check disk space: {e}")
             results.append(ValidationResult(
                 valid=True,  # Don't fail on inability to check
-                message=f"Could not verify disk space (estimated {required_gb:.1f} GB required): {str(e)}",
+                message=f"{prefix}Could not verify disk space (estimated {required_gb:.1f} GB required): {str(e)}",
                 severity="warning"
             ))
 
@@ -575,3 +727,14 @@ class DeploymentValidator:
             ))
 
         return results
+
+
+_host_facts: Optional[HostFacts] = None
+
+
+def get_host_facts() -> HostFacts:
+    """Get the host fact cache shared by all validators."""
+    global _host_facts
+    if _host_facts is None:
+        _host_facts = HostFacts(ttl=get_settings().validation_cache_ttl)
+    return _host_facts
@@ -0,0 +1,274 @@
+# backend/cyroid/services/dind_client_pool.py
+"""
+Managed pool of Docker clients for range DinD daemons.
+
+Each range gets one ``DockerClient`` per timeout class: the default
+``dind_client_timeout`` for ordinary API calls and ``dind_transfer_timeout``
+for image transfers, snapshots and execs. That way a dead daemon costs an
+ordinary call seconds, not the ten minutes an image transfer may need.
+Before a client is handed out, its daemon is pinged again if the last successful probe is more
+than ``dind_probe_interval`` seconds old. If the probe fails, the range's
+endpoint is resolved again from its DinD container, because a restarted
+container can come back on a new IP. Clients nobody has used for
+``dind_client_idle_timeout`` seconds are closed.
+
+Every response from a range's daemon is timed with a requests hook, so
+per-range latency is available without wrapping the SDK.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+import docker
+from docker.errors import DockerException
+
+from cyroid.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per range for percentiles
+LATENCY_SAMPLES = 256
+
+
+class RangeLatency:
+    """Request latency of one range's Docker daemon."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, elapsed_ms: float, error: bool = False) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            "p95_ms": round(p95, 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class RangeClients:
+    """The pooled clients of one range and the liveness of its daemon."""
+
+    def __init__(self, range_id: str, docker_url: str):
+        self.range_id = range_id
+        self.docker_url = docker_url
+        # Endpoints this range moved away from; callers holding a stale URL keep the new one
+        self.replaced_urls: Set[str] = set()
+        self.clients: Dict[int, docker.DockerClient] = {}
+        self.lock = threading.Lock()
+        self.latency = RangeLatency()
+        self.last_used = time.monotonic()
+        self.last_probe_ok = 0.0
+        self.probe_ms = 0.0
+        self.probe_failures = 0
+        self.reresolved = 0
+
+    def close(self) -> None:
+        for client in self.clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        self.clients.clear()
+        self.last_probe_ok = 0.0
+
+
+class DinDClientPool:
+    """Hands out probed, pooled Docker clients for range DinD daemons."""
+
+    def __init__(
+        self,
+        resolver: Optional[Callable[[str], Optional[str]]] = None,
+        client_factory: Callable[..., docker.DockerClient] = docker.DockerClient,
+        timeout: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        probe_interval: Optional[float] = None,
+        probe_timeout: Optional[float] = None,
+    ):
+        settings = get_settings()
+        self._resolver = resolver
+        self._client_factory = client_factory
+        self.timeout = timeout or settings.dind_client_timeout
+        self.pool_size = pool_size or settings.dind_client_pool_size
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.dind_client_idle_timeout
+        self.probe_interval = probe_interval if probe_interval is not None else settings.dind_probe_interval
+        self.probe_timeout = probe_timeout or settings.dind_probe_timeout
+        self._lock = threading.Lock()
+        self._ranges: Dict[str, RangeClients] = {}
+        self._last_sweep = time.monotonic()
+        self._created = 0
+        self._evicted = 0
+
+    def get(self, range_id: str, docker_url: str, timeout: Optional[int] = None) -> docker.DockerClient:
+        """
+        Get a live client for a range's Docker daemon.
+
+        Args:
+            range_id: Range identifier
+            docker_url: Docker daemon URL (tcp://ip:port) as last recorded for the range
+            timeout: Seconds each API call may take (defaults to dind_client_timeout)
+
+        Returns:
+            DockerClient connected to the range's Docker daemon
+
+        Raises:
+            DockerException: If the daemon is unreachable, even at a re-resolved endpoint
+        """
+        range_id = str(range_id)
+        timeout = timeout or self.timeout
+        self._evict_idle()
+
+        with self._lock:
+            entry = self._ranges.get(range_id)
+            if entry is not None and docker_url != entry.docker_url and docker_url not in entry.replaced_urls:
+                # The range was redeployed on a new endpoint
+                self._ranges.pop(range_id)
+                entry.close()
+                entry = None
+            if entry is None:
+                entry = self._ranges[range_id] = RangeClients(range_id, docker_url)
+            entry.last_used = time.monotonic()
+
+        with entry.lock:
+            if time.monotonic() - entry.last_probe_ok > self.probe_interval and not self._probe(entry):
+                self._reresolve(entry)
+            client = entry.clients.get(timeout)
+            if client is None:
+                client = entry.clients[timeout] = self._connect(entry, timeout)
+            return client
+
+    def close(self, range_id: str) -> bool:
+        """Close a range's clients. Returns True if it had any."""
+        with self._lock:
+            entry = self._ranges.pop(str(range_id), None)
+        if entry is None:
+            return False
+        with entry.lock:
+            entry.close()
+        logger.debug(f"Closed Docker clients for range {range_id}")
+        return True
+
+    def close_all(self) -> None:
+        """Close every pooled client."""
+        for range_id in list(self._ranges):
+            self.close(range_id)
+
+    def _connect(self, entry: RangeClients, timeout: int) -> docker.DockerClient:
+        """Create a client; connecting negotiates the API version, which doubles as a probe."""
+        started = time.perf_counter()
+        try:
+            client = self._client_factory(
+                base_url=entry.docker_url,
+                timeout=self.probe_timeout,
+                max_pool_size=self.pool_size,
+            )
+        except DockerException:
+            entry.probe_failures += 1
+            entry.last_probe_ok = 0.0
+            raise
+        client.api.timeout = timeout
+        client.api.hooks["response"].append(self._latency_hook(entry.latency))
+        entry.probe_ms = (time.perf_counter() - started) * 1000
+        entry.last_probe_ok = time.monotonic()
+        self._created += 1
+        logger.debug(f"Created Docker client for range {entry.range_id} at {entry.docker_url} (timeout {timeout}s)")
+        return client
+
+    def _probe(self, entry: RangeClients) -> bool:
+        """Ping the daemon with a short timeout. A range without clients is probed by connecting."""
+        client = next(iter(entry.clients.values()), None)
+        if client is None:
+            return True
+        started = time.perf_counter()
+        try:
+            response = client.api.get(f"{client.api.base_url}/_ping", timeout=self.probe_timeout)
+            response.raise_for_status()
+        except Exception as e:
+            entry.probe_failures += 1
+            logger.warning(f"Docker daemon for range {entry.range_id} failed its probe at {entry.docker_url}: {e}")
+            return False
+        entry.probe_ms = (time.perf_counter() - started) * 1000
+        entry.last_probe_ok = time.monotonic()
+        return True
+
+    def _reresolve(self, entry: RangeClients) -> None:
+        """Drop a range's dead clients and look its endpoint up again."""
+        entry.close()
+        if self._resolver is None:
+            return
+        try:
+            docker_url = self._resolver(entry.range_id)
+        except Exception as e:
+            logger.warning(f"Could not re-resolve DinD endpoint for range {entry.range_id}: {e}")
+            return
+        if docker_url and docker_url != entry.docker_url:
+            logger.info(f"DinD endpoint for range {entry.range_id} moved from {entry.docker_url} to {docker_url}")
+            entry.replaced_urls.add(entry.docker_url)
+            entry.replaced_urls.discard(docker_url)
+            entry.docker_url = docker_url
+            entry.reresolved += 1
+
+    @staticmethod
+    def _latency_hook(latency: RangeLatency) -> Callable:
+        def hook(response, *args, **kwargs):
+            # elapsed runs until the headers arrive, so streamed bodies are not counted
+            latency.record(response.elapsed.total_seconds() * 1000, response.status_code >= 500)
+            return response
+        return hook
+
+    def _evict_idle(self) -> None:
+        """Close ranges nobody has used for idle_timeout seconds (checked at most every quarter of it)."""
+        now = time.monotonic()
+        if now - self._last_sweep < self.idle_timeout / 4:
+            return
+        self._last_sweep = now
+        with self._lock:
+            idle = [r for r, e in self._ranges.items() if now - e.last_used > self.idle_timeout]
+        for range_id in idle:
+            if self.close(range_id):
+                self._evicted += 1
+                logger.debug(f"Evicted idle Docker clients for range {range_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, churn and per-range daemon latency (for this process)."""
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._ranges.values())
+        ranges: List[Dict[str, Any]] = [
+            {
+                "range_id": entry.range_id,
+                "docker_url": entry.docker_url,
+                "clients": len(entry.clients),
+                "idle_seconds": round(now - entry.last_used, 1),
+                "probe_ms": round(entry.probe_ms, 2),
+                "probe_failures": entry.probe_failures,
+                "reresolved": entry.reresolved,
+                **entry.latency.snapshot(),
+            }
+            for entry in entries
+        ]
+        return {
+            "ranges": len(ranges),
+            "clients": sum(r["clients"] for r in ranges),
+            "created": self._created,
+            "evicted": self._evicted,
+            "timeout": self.timeout,
+            "pool_size": self.pool_size,
+            "per_range": ranges,
+        }
@@ -10,12 +10,15 @@ import asyncio
 import logging
 import os
 import re
+from functools import partial
 from typing import List, Optional, Callable
 
 import docker
 from docker.errors import APIError, NotFound
 
 from cyroid.config import get_settings
+from cyroid.services.dind_client_pool import DinDClientPool
+from cyroid.services.docker_executor import run_docker
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -31,7 +34,9 @@ class DinDService:
 
     def __init__(self):
         self.host_client = docker.from_env()
-        self._range_clients: dict[str, docker.DockerClient] = {}
+        self.client_pool = DinDClientPool(resolver=self._resolve_docker_url)
+        # range_id -> DinD container ID, so lookups skip the label query
+        self._container_ids: dict[str, str] = {}
 
     def _sanitize_name(self, name: str) -> str:
         """
@@ -68,14 +73,27 @@ class DinDService:
         """
         Find a DinD container by its range_id label.
 
+        The container ID is remembered, so later lookups are a single
+        inspect; the label query only runs again if that container is gone.
+
         Returns the container object or None if not found.
         """
+        range_id = str(range_id)
         try:
+            container_id = self._container_ids.get(range_id)
+            if container_id:
+                try:
+                    return self.host_client.containers.get(container_id)
+                except NotFound:
+                    self._container_ids.pop(range_id, None)
             containers = self.host_client.containers.list(
                 all=True,
                 filters={"label": f"cyroid.range_id={range_id}"}
             )
-            return containers[0] if containers else None
+            if not containers:
+                return None
+            self._container_ids[range_id] = containers[0].id
+            return containers[0]
         except Exception as e:
             logger.error(f"Error finding container for range {range_id}: {e}")
             return None
@@ -349,6 +367,7 @@ class DinDService:
                 logger.info(f"Deleted DinD container: {container_name}")
             except Exception as e:
                 logger.error(f"Error deleting container {container_name}: {e}")
+            self._container_ids.pop(str(range_id), None)
         else:
             logger.warning(f"No DinD container found for range {range_id}")
 
@@ -390,43 +409,44 @@ class DinDService:
             logger.error(f"Error getting container info for {range_id}: {e}")
             return None
 
-    def get_range_client(self, range_id: str, docker_url: str) -> docker.DockerClient:
+    def _resolve_docker_url(self, range_id: str) -> Optional[str]:
+        """Look up a range's Docker daemon URL from its DinD container's network."""
+        container = self._find_container_by_range_id(range_id)
+        if not container or container.status != "running":
+            return None
+        networks = container.attrs["NetworkSettings"]["Networks"]
+        mgmt_ip = networks.get(self.ranges_network, {}).get("IPAddress")
+        return f"tcp://{mgmt_ip}:{self.dind_docker_port}" if mgmt_ip else None
+
+    def get_range_client(
+        self, range_id: str, docker_url: str, timeout: Optional[int] = None
+    ) -> docker.DockerClient:
         """
-        Get or create a Docker client for a range's DinD container.
+        Get a pooled Docker client for a range's DinD container.
 
         Args:
             range_id: Range identifier
             docker_url: Docker daemon URL (tcp://ip:port)
+            timeout: Seconds each API call may take; pass dind_transfer_timeout
+                     for image transfers and other long calls (defaults to
+                     dind_client_timeout)
 
         Returns:
             DockerClient connected to the range's Docker daemon
         """
-        range_id_str = str(range_id)
-        if range_id_str not in self._range_clients:
-            logger.debug(f"Creating Docker client for range {range_id} at {docker_url}")
-            # Set a longer timeout (10 min) for large image transfers
-            self._range_clients[range_id_str] = docker.DockerClient(
-                base_url=docker_url,
-                timeout=600  # 10 minute timeout for large image operations
-            )
-
-        return self._range_clients[range_id_str]
+        return self.client_pool.get(str(range_id), docker_url, timeout=timeout)
 
     def close_range_client(self, range_id: str) -> None:
-        """Close and remove cached Docker client for a range."""
+        """Close and remove pooled Docker clients for a range."""
         range_id_str = str(range_id)
-        if range_id_str in self._range_clients:
-            try:
-                self._range_clients[range_id_str].close()
-            except Exception:
-                pass
-            del self._range_clients[range_id_str]
-            logger.debug(f"Closed Docker client for range {range_id}")
+        # The range's resolved network topology goes with its client
+        from cyroid.services.network_policy_service import get_network_policy_service
+        get_network_policy_service().invalidate(range_id_str)
+        self.client_pool.close(range_id_str)
 
     def close_all_range_clients(self) -> None:
-        """Close all cached range Docker clients."""
-        for range_id in list(self._range_clients.keys()):
-            self.close_range_client(range_id)
+        """Close all pooled range Docker clients."""
+        self.client_pool.close_all()
 
     async def _wait_for_docker_ready(
         self, docker_url: str, timeout: Optional[int] = None,
@@ -632,6 +652,7 @@ class DinDService:
         docker_url: str,
         networks: List[str],
         allow_internet: Optional[List[str]] = None,
+        isolated: Optional[List[str]] = None,
     ) -> None:
         """
         Apply iptables rules inside DinD container for network isolation.
@@ -640,14 +661,20 @@ class DinDService:
         - Block forwarding between different networks by default
         - Allow traffic within the same network
         - Optionally allow internet access for specified networks via NAT
+        - Drop all routed traffic into and out of isolated networks, with the
+          same rules the network policy agent applies at runtime
 
         Args:
             range_id: Range identifier
             docker_url: Docker daemon URL inside DinD (tcp://ip:port)
             networks: List of network names in this range
             allow_internet: Networks that should have internet access (via DinD NAT)
+            isolated: Networks that must not exchange routed traffic with any other network
         """
+        from cyroid.services.network_policy_service import isolation_rules
+
         allow_internet = allow_internet or []
+        isolated = isolated or []
 
         # Find the DinD container by range_id label (name may include range name)
         dind_container = self._find_container_by_range_id(range_id)
@@ -756,6 +783,15 @@ class DinDService:
                 f"iptables -t nat -A POSTROUTING -o {outbound_iface} -j MASQUERADE"
             )
 
+        # Isolated networks: drop routed traffic at the head of FORWARD so it
+        # overrides the ACCEPT rules above
+        for network in isolated:
+            bridge_id = network_bridge_ids.get(network)
+            if not bridge_id:
+                continue
+            for rule in isolation_rules(f"br-{bridge_id}"):
+                rules.append(f"iptables -I {rule}")
+
         # Execute rules inside the DinD container
         for rule in rules:
             try:
@@ -770,7 +806,8 @@ class DinDService:
 
         logger.info(
             f"Applied network isolation rules for range {range_id} "
-            f"({len(validated_networks)} networks, {len(validated_allow_internet)} with internet)"
+            f"({len(validated_networks)} networks, {len(validated_allow_internet)} with internet, "
+            f"{len(isolated)} isolated)"
         )
 
     async def teardown_network_isolation_in_dind(
@@ -826,6 +863,21 @@ class DinDService:
                 - proxy_host: DinD management IP
                 - original_port: Original VNC port in VM container
         """
+        # One exec per proxy start and check, so the whole setup runs off the
+        # event loop; with many VMs it can outlast the default call timeout
+        return await run_docker(
+            partial(self._setup_vnc_port_forwarding, range_id, vm_ports, existing_mappings),
+            op="dind_vnc_forwarding",
+            timeout=get_settings().docker_long_call_timeout,
+        )
+
+    def _setup_vnc_port_forwarding(
+        self,
+        range_id: str,
+        vm_ports: List[dict],
+        existing_mappings: Optional[dict],
+    ) -> dict[str, dict]:
+        """Blocking body of setup_vnc_port_forwarding."""
         # Port range for VNC proxy allocation (1000 ports per range)
         VNC_PROXY_PORT_MIN = 15900
         VNC_PROXY_PORT_MAX = 16899
@@ -971,9 +1023,9 @@ class DinDService:
         try:
             # Kill socat process listening on this port
             kill_cmd = f"pkill -f 'socat.*:{proxy_port}' 2>/dev/null"
-            exit_code, _ = dind_container.exec_run(
-                ["sh", "-c", kill_cmd],
-                privileged=True
+            await run_docker(
+                partial(dind_container.exec_run, ["sh", "-c", kill_cmd], privileged=True),
+                op="dind_exec",
             )
 
             # pkill returns 1 if no processes matched, which is fine
@@ -1006,7 +1058,10 @@ class DinDService:
         try:
             # Kill all socat processes for VNC proxy ports
             kill_cmd = "pkill -f 'socat.*TCP-LISTEN:15' 2>/dev/null || true"
-            dind_container.exec_run(["sh", "-c", kill_cmd], privileged=True)
+            await run_docker(
+                partial(dind_container.exec_run, ["sh", "-c", kill_cmd], privileged=True),
+                op="dind_exec",
+            )
             logger.debug(f"Teardown VNC port forwarding for range {range_id}")
         except Exception as e:
             logger.warning(f"Error during VNC teardown for range {range_id}: {e}")
@@ -0,0 +1,257 @@
+# backend/cyroid/services/docker_executor.py
+"""
+Off-loop execution of blocking Docker SDK calls.
+
+docker-py is synchronous, so an image pull or a commit made directly from an
+``async def`` holds the event loop for the whole call. Service coroutines
+hand such calls to :func:`run_docker` instead. It runs them on a dedicated,
+sized thread pool, kept apart from the default executor so Docker work cannot
+starve other ``run_in_executor`` users. Each call gets a timeout and can be
+cancelled: a call still queued never starts, and a call already running gets
+its ``on_cancel`` hook (e.g. closing the client whose socket it is blocked on).
+
+:class:`LoopLagMonitor` measures how late the event loop wakes from a sleep.
+If blocking work creeps back onto the loop, it shows in the admin metrics
+and can be asserted in tests.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from cyroid.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Lag samples kept for percentiles
+LAG_SAMPLES = 600
+
+
+class DockerOperationTimeout(TimeoutError):
+    """A Docker operation did not finish within its timeout."""
+
+
+class DockerExecutor:
+    """Sized thread pool for blocking Docker SDK calls, with per-operation stats."""
+
+    def __init__(self, workers: Optional[int] = None, default_timeout: Optional[float] = None):
+        settings = get_settings()
+        self.workers = workers or settings.docker_executor_workers
+        self.default_timeout = default_timeout or settings.docker_call_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cyroid-docker")
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, float]] = {}
+        self._queued = 0
+        self._running = 0
+        # Timed-out or cancelled calls still holding a worker
+        self._abandoned = 0
+
+    async def run(
+        self,
+        func: Callable,
+        *args,
+        op: str,
+        timeout: Optional[float] = None,
+        on_cancel: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Run a blocking Docker call on the pool.
+
+        Bind keyword arguments with a lambda or functools.partial.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            op: Operation name for stats and errors
+            timeout: Seconds the call may take, queueing included (defaults to docker_call_timeout)
+            on_cancel: Called if the call times out or is cancelled while running
+
+        Returns:
+            What func returns
+
+        Raises:
+            DockerOperationTimeout: If the call did not finish in time
+        """
+        timeout = timeout or self.default_timeout
+        submitted = time.monotonic()
+        # Guarded by self._lock: whether func has returned, and whether we gave up on it
+        state = {"finished": False, "abandoned": False}
+
+        def call():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            started = time.monotonic()
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    state["finished"] = True
+                    if state["abandoned"]:
+                        self._abandoned -= 1
+                    self._record(op, "started", 1)
+                    self._record(op, "wait_ms", (started - submitted) * 1000)
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(call)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(op, future, state, on_cancel, "timeouts")
+            raise DockerOperationTimeout(f"Docker operation '{op}' timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            self._abandon(op, future, state, on_cancel, "cancelled")
+            raise
+        except Exception:
+            self._finish(op, submitted, error=True)
+            raise
+        self._finish(op, submitted)
+        return result
+
+    def _abandon(self, op: str, future, state: Dict[str, bool], on_cancel, outcome: str) -> None:
+        """Give up on a call: a queued one never starts, a running one gets its cancel hook."""
+        with self._lock:
+            if future.cancel():
+                self._queued -= 1
+                running = False
+            else:
+                running = not state["finished"]
+                state["abandoned"] = running
+                self._abandoned += int(running)
+            self._record(op, outcome, 1)
+        if running and on_cancel is not None:
+            try:
+                on_cancel()
+            except Exception as e:
+                logger.warning(f"Cancel hook for Docker operation '{op}' failed: {e}")
+        logger.warning(f"Docker operation '{op}' {'timed out' if outcome == 'timeouts' else 'was cancelled'}")
+
+    def _finish(self, op: str, submitted: float, error: bool = False) -> None:
+        with self._lock:
+            self._record(op, "calls", 1)
+            self._record(op, "errors", int(error))
+            elapsed_ms = (time.monotonic() - submitted) * 1000
+            self._record(op, "total_ms", elapsed_ms)
+            stats = self._ops[op]
+            stats["max_ms"] = max(stats.get("max_ms", 0.0), elapsed_ms)
+
+    def _record(self, op: str, key: str, value: float) -> None:
+        stats = self._ops.setdefault(op, {})
+        stats[key] = stats.get(key, 0) + value
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and per-operation call counts and latency."""
+        with self._lock:
+            operations = {}
+            for op, stats in self._ops.items():
+                calls = stats.get("calls", 0)
+                started = stats.get("started", 0)
+                operations[op] = {
+                    "calls": int(calls),
+                    "errors": int(stats.get("errors", 0)),
+                    "timeouts": int(stats.get("timeouts", 0)),
+                    "cancelled": int(stats.get("cancelled", 0)),
+                    "avg_ms": round(stats.get("total_ms", 0) / calls, 2) if calls else 0.0,
+                    "max_ms": round(stats.get("max_ms", 0.0), 2),
+                    "avg_wait_ms": round(stats.get("wait_ms", 0) / started, 2) if started else 0.0,
+                }
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "abandoned": self._abandoned,
+                "operations": operations,
+            }
+
+    def shutdown(self) -> None:
+        """Stop taking calls; queued calls are dropped, running ones finish on their own."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LoopLagMonitor:
+    """Samples how late the running event loop wakes from a short sleep."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or get_settings().loop_lag_interval
+        self._samples: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, loop.time() - expected) * 1000
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag over the recent samples; max_ms covers the monitor's lifetime."""
+        ordered = sorted(self._samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+        return {
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "p99_ms": round(p99, 2),
+            "max_ms": round(self._max_ms, 2),
+        }
+
+
+# Singleton instances for dependency injection
+_docker_executor: Optional[DockerExecutor] = None
+_loop_lag_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_docker_executor() -> DockerExecutor:
+    """Get or create the Docker executor singleton."""
+    global _docker_executor
+    if _docker_executor is None:
+        _docker_executor = DockerExecutor()
+    return _docker_executor
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    """Get or create the event-loop lag monitor singleton."""
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = LoopLagMonitor()
+    return _loop_lag_monitor
+
+
+async def run_docker(
+    func: Callable,
+    *args,
+    op: str,
+    timeout: Optional[float] = None,
+    on_cancel: Optional[Callable[[], None]] = None,
+) -> Any:
+    """Run a blocking Docker call on the shared Docker executor (see DockerExecutor.run)."""
+    return await get_docker_executor().run(func, *args, op=op, timeout=timeout, on_cancel=on_cancel)
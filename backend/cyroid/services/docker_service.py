@@ -18,15 +18,19 @@ When DIND_ISOLATION_ENABLED=true, each range deploys inside its own DinD
 container, providing complete network namespace isolation. This eliminates
 IP conflicts between concurrent range instances using identical blueprint IPs.
 """
+import asyncio
 import docker
 from docker.errors import APIError, NotFound, ImageNotFound
+from functools import partial
 from typing import Optional, Dict, List, Any, Callable, TYPE_CHECKING
 import logging
+import threading
 import time
 import ipaddress
 
 from cyroid.utils.arch import IS_ARM, HOST_ARCH, requires_emulation
 from cyroid.config import get_settings
+from cyroid.services.docker_executor import run_docker
 
 if TYPE_CHECKING:
     from cyroid.services.dind_service import DinDService
@@ -34,6 +38,48 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def summarize_container_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a raw Docker stats document to the figures shown in the UI.
+
+    Works for both one-shot and streamed stats; a stream's first document has
+    no previous CPU sample, which is reported as 0% CPU.
+
+    Returns:
+        Dict with cpu_percent, memory_mb, memory_limit_mb, memory_percent,
+        network_rx_bytes, network_tx_bytes
+    """
+    # CPU calculation
+    precpu = stats.get("precpu_stats", {})
+    cpu_percent = 0.0
+    if "system_cpu_usage" in precpu:
+        cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
+                    precpu["cpu_usage"]["total_usage"]
+        system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
+                       precpu["system_cpu_usage"]
+        # Normalize to 0-100% (average across all cores) instead of 0-N*100%
+        cpu_percent = (cpu_delta / system_delta) * 100.0 if system_delta > 0 else 0.0
+
+    # Memory
+    memory_usage = stats["memory_stats"].get("usage", 0)
+    memory_limit = stats["memory_stats"].get("limit", 0)
+    memory_mb = memory_usage / (1024 * 1024)
+    memory_limit_mb = memory_limit / (1024 * 1024)
+
+    # Network
+    network_stats = stats.get("networks", {})
+    rx_bytes = sum(n.get("rx_bytes", 0) for n in network_stats.values())
+    tx_bytes = sum(n.get("tx_bytes", 0) for n in network_stats.values())
+
+    return {
+        "cpu_percent": round(cpu_percent, 2),
+        "memory_mb": round(memory_mb, 2),
+        "memory_limit_mb": round(memory_limit_mb, 2),
+        "memory_percent": round((memory_usage / memory_limit) * 100, 2) if memory_limit > 0 else 0,
+        "network_rx_bytes": rx_bytes,
+        "network_tx_bytes": tx_bytes
+    }
+
+
 class DockerService:
     """
     Service for managing Docker containers and networks.
@@ -67,7 +113,9 @@ class DockerService:
 
         return self._dind_service
 
-    async def get_range_client(self, range_id: str, docker_url: Optional[str] = None) -> docker.DockerClient:
+    async def get_range_client(
+        self, range_id: str, docker_url: Optional[str] = None, timeout: Optional[int] = None
+    ) -> docker.DockerClient:
         """
         Get Docker client for a range's DinD container.
 
@@ -77,32 +125,36 @@ class DockerService:
             range_id: Range identifier
             docker_url: Optional Docker URL (if known). If not provided,
                        will query DinD service for the URL.
+            timeout: Seconds each API call may take (defaults to dind_client_timeout)
 
         Returns:
             DockerClient for operating on the range
         """
         if docker_url:
-            return self.dind_service.get_range_client(str(range_id), docker_url)
+            return self.dind_service.get_range_client(str(range_id), docker_url, timeout=timeout)
 
         # Get container info to find Docker URL
         container_info = await self.dind_service.get_container_info(str(range_id))
         if not container_info or not container_info.get("docker_url"):
             raise ValueError(f"Range {range_id} has no active DinD container")
 
-        return self.dind_service.get_range_client(str(range_id), container_info["docker_url"])
+        return self.dind_service.get_range_client(str(range_id), container_info["docker_url"], timeout=timeout)
 
-    def get_range_client_sync(self, range_id: str, docker_url: str) -> docker.DockerClient:
+    def get_range_client_sync(
+        self, range_id: str, docker_url: str, timeout: Optional[int] = None
+    ) -> docker.DockerClient:
         """
         Synchronous version of get_range_client (for use when URL is known).
 
         Args:
             range_id: Range identifier
             docker_url: Docker URL (tcp://ip:port)
+            timeout: Seconds each API call may take (defaults to dind_client_timeout)
 
         Returns:
             DockerClient for operating on the range
         """
-        return self.dind_service.get_range_client(str(range_id), docker_url)
+        return self.dind_service.get_range_client(str(range_id), docker_url, timeout=timeout)
 
     def _merge_container_config(
         self,
@@ -1691,35 +1743,7 @@ local-hostname: {name}
             if container.status != "running":
                 return None
 
-            stats = container.stats(stream=False)
-
-            # CPU calculation
-            cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                        stats["precpu_stats"]["cpu_usage"]["total_usage"]
-            system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                           stats["precpu_stats"]["system_cpu_usage"]
-            # Normalize to 0-100% (average across all cores) instead of 0-N*100%
-            cpu_percent = (cpu_delta / system_delta) * 100.0 if system_delta > 0 else 0.0
-
-            # Memory
-            memory_usage = stats["memory_stats"].get("usage", 0)
-            memory_limit = stats["memory_stats"].get("limit", 0)
-            memory_mb = memory_usage / (1024 * 1024)
-            memory_limit_mb = memory_limit / (1024 * 1024)
-
-            # Network
-            network_stats = stats.get("networks", {})
-            rx_bytes = sum(n.get("rx_bytes", 0) for n in network_stats.values())
-            tx_bytes = sum(n.get("tx_bytes", 0) for n in network_stats.values())
-
-            return {
-                "cpu_percent": round(cpu_percent, 2),
-                "memory_mb": round(memory_mb, 2),
-                "memory_limit_mb": round(memory_limit_mb, 2),
-                "memory_percent": round((memory_usage / memory_limit) * 100, 2) if memory_limit > 0 else 0,
-                "network_rx_bytes": rx_bytes,
-                "network_tx_bytes": tx_bytes
-            }
+            return summarize_container_stats(container.stats(stream=False))
         except NotFound:
             return None
         except (KeyError, ZeroDivisionError) as e:
@@ -2829,7 +2853,9 @@ local-hostname: {name}
         Returns:
             Container ID
         """
-        range_client = self.get_range_client_sync(range_id, docker_url)
+        range_client = self.get_range_client_sync(
+            range_id, docker_url, timeout=get_settings().dind_transfer_timeout
+        )
 
         # Map arch to Docker platform string
         platform = None
@@ -2843,7 +2869,8 @@ local-hostname: {name}
             range_client.images.get(image)
         except ImageNotFound:
             logger.info(f"Image {image} not in DinD, pulling (fallback)")
-            range_client.images.pull(image)
+            await run_docker(range_client.images.pull, image, op="dind_image_pull",
+                             timeout=get_settings().docker_long_call_timeout)
 
         # Get network
         try:
@@ -2920,7 +2947,7 @@ local-hostname: {name}
         """Start a container inside a range's DinD."""
         range_client = self.get_range_client_sync(range_id, docker_url)
         try:
-            range_client.api.start(container_id)
+            await run_docker(range_client.api.start, container_id, op="dind_container_start")
             logger.info(f"Started container {container_id[:12]} in range {range_id} DinD")
             return True
         except NotFound:
@@ -2939,7 +2966,11 @@ local-hostname: {name}
         """Stop a container inside a range's DinD."""
         range_client = self.get_range_client_sync(range_id, docker_url)
         try:
-            range_client.api.stop(container_id, timeout=timeout)
+            # The stop grace period comes on top of the call timeout
+            await run_docker(
+                partial(range_client.api.stop, container_id, timeout=timeout),
+                op="dind_container_stop", timeout=get_settings().docker_call_timeout + timeout,
+            )
             logger.info(f"Stopped container {container_id[:12]} in range {range_id} DinD")
             return True
         except NotFound:
@@ -2958,7 +2989,10 @@ local-hostname: {name}
         """Remove a container inside a range's DinD."""
         range_client = self.get_range_client_sync(range_id, docker_url)
         try:
-            range_client.api.remove_container(container_id, force=force, v=True)
+            await run_docker(
+                partial(range_client.api.remove_container, container_id, force=force, v=True),
+                op="dind_container_remove",
+            )
             logger.info(f"Removed container {container_id[:12]} from range {range_id} DinD")
             return True
         except NotFound:
@@ -3007,6 +3041,27 @@ local-hostname: {name}
 
         return result
 
+    def _pull_and_retag(self, range_client: docker.DockerClient, registry_tag: str, repo: str, tag: str) -> None:
+        """Pull an image from the local registry into DinD and tag it with its original name.
+
+        Args:
+            range_client: Docker client of the range's DinD daemon
+            registry_tag: Registry-qualified tag to pull
+            repo: Original repository name
+            tag: Original tag
+        """
+        range_client.images.pull(registry_tag)
+
+        # Retag to original name — use api.tag for reliability
+        # (images.get can fail for multi-platform manifests)
+        try:
+            pulled_image = range_client.images.get(registry_tag)
+            pulled_image.tag(repo, tag)
+        except docker.errors.ImageNotFound:
+            # Pull succeeded but get-by-tag fails (multi-platform manifest)
+            # Try tagging via API directly
+            range_client.api.tag(registry_tag, repo, tag)
+
     def _pull_platform_image(self, image: str, platform: str):
         """Pull a specific platform variant of a multi-platform image by resolving its digest.
 
@@ -3129,10 +3184,16 @@ local-hostname: {name}
         report_progress(0, 0, 'starting')
 
         image_size = 0
+        # Docker calls run off the event loop; pulls and loads get the long timeout
+        long_timeout = get_settings().docker_long_call_timeout
 
         # Get DinD client first - we'll need it for all paths
         try:
-            range_client = self.get_range_client_sync(range_id, docker_url)
+            range_client = await run_docker(
+                partial(self.get_range_client_sync, range_id, docker_url,
+                        timeout=get_settings().dind_transfer_timeout),
+                op="dind_connect",
+            )
         except Exception as e:
             logger.error(f"Failed to connect to DinD at {docker_url}: {e}")
             report_progress(0, 0, 'error')
@@ -3141,7 +3202,7 @@ local-hostname: {name}
         # Check if image already exists in DinD (early return)
         # If a specific platform is requested, verify the cached image matches
         try:
-            existing = range_client.images.get(image)
+            existing = await run_docker(range_client.images.get, image, op="dind_image_get")
             if platform:
                 img_arch = existing.attrs.get("Architecture", "")
                 expected_arch = "amd64" if platform == "linux/amd64" else "arm64"
@@ -3165,22 +3226,14 @@ local-hostname: {name}
             registry = get_registry_service()
 
             if await registry.is_healthy():
-                # Check if image is already in registry
-                registry_images = await registry.list_images()
                 # Parse image name (e.g., "cyroid/samba-dc:latest" -> repo="cyroid/samba-dc", tag="latest")
                 if ':' in image:
                     img_repo, img_tag = image.rsplit(':', 1)
                 else:
                     img_repo, img_tag = image, 'latest'
 
-                # Check if this image+tag is in registry
-                image_in_registry = False
-                for reg_img in registry_images:
-                    if reg_img.get('name') == img_repo and img_tag in reg_img.get('tags', []):
-                        image_in_registry = True
-                        break
-
-                if image_in_registry:
+                # Check this one image+tag directly rather than listing the whole registry
+                if await registry.image_exists(image):
                     logger.info(f"Image '{image}' found in registry, pulling directly into DinD")
                     report_progress(0, 0, 'pulling_from_registry')
 
@@ -3188,17 +3241,10 @@ local-hostname: {name}
                     try:
                         # Don't pass platform for local registry pulls — the registry
                         # stores single-platform images, not multi-arch manifests.
-                        range_client.images.pull(registry_tag)
-
-                        # Retag to original name — use api.tag for reliability
-                        # (images.get can fail for multi-platform manifests)
-                        try:
-                            pulled_image = range_client.images.get(registry_tag)
-                            pulled_image.tag(img_repo, img_tag)
-                        except docker.errors.ImageNotFound:
-                            # Pull succeeded but get-by-tag fails (multi-platform manifest)
-                            # Try tagging via API directly
-                            range_client.api.tag(registry_tag, img_repo, img_tag)
+                        await run_docker(
+                            self._pull_and_retag, range_client, registry_tag, img_repo, img_tag,
+                            op="dind_registry_pull", timeout=long_timeout,
+                        )
 
                         logger.info(f"Successfully pulled '{image}' from registry into DinD")
                         report_progress(0, 0, 'complete')
@@ -3218,7 +3264,7 @@ local-hostname: {name}
 
         for img_name in image_variants:
             try:
-                host_image = self.client.images.get(img_name)
+                host_image = await run_docker(self.client.images.get, img_name, op="host_image_get")
                 image_size = host_image.attrs.get('Size', 0)
                 logger.info(f"Image '{img_name}' found on host (size: {image_size / 1024 / 1024:.1f} MB, tags: {host_image.tags})")
 
@@ -3233,7 +3279,10 @@ local-hostname: {name}
                             f"Image '{img_name}' on host is {img_arch}, need {expected_arch} — "
                             f"re-pulling with platform digest"
                         )
-                        host_image = self._pull_platform_image(image, platform)
+                        host_image = await run_docker(
+                            self._pull_platform_image, image, platform,
+                            op="host_image_pull", timeout=long_timeout,
+                        )
                         if host_image:
                             image_size = host_image.attrs.get('Size', 0)
                             logger.info(f"Re-pulled '{image}' as {expected_arch} ({image_size / 1024 / 1024:.1f} MB)")
@@ -3255,11 +3304,19 @@ local-hostname: {name}
                 try:
                     if platform:
                         # Use digest-based pull for cross-platform to avoid ARM cache issues
-                        host_image = self._pull_platform_image(image, platform)
+                        host_image = await run_docker(
+                            self._pull_platform_image, image, platform,
+                            op="host_image_pull", timeout=long_timeout,
+                        )
                         if not host_image:
-                            host_image = self.client.images.pull(image, platform=platform)
+                            host_image = await run_docker(
+                                partial(self.client.images.pull, image, platform=platform),
+                                op="host_image_pull", timeout=long_timeout,
+                            )
                     else:
-                        host_image = self.client.images.pull(image)
+                        host_image = await run_docker(
+                            self.client.images.pull, image, op="host_image_pull", timeout=long_timeout
+                        )
                     image_size = host_image.attrs.get('Size', 0)
                     logger.info(f"Pulled '{image}' to host (size: {image_size / 1024 / 1024:.1f} MB)")
                     report_progress(image_size, image_size, 'pulled_to_host')
@@ -3288,18 +3345,14 @@ local-hostname: {name}
 
                         # Pull from registry into DinD (no platform — local registry is single-arch)
                         try:
-                            range_client.images.pull(registry_tag)
-
-                            # Retag to original name
                             if ':' in image:
                                 repo, tag = image.rsplit(':', 1)
                             else:
                                 repo, tag = image, 'latest'
-                            try:
-                                pulled_image = range_client.images.get(registry_tag)
-                                pulled_image.tag(repo, tag)
-                            except docker.errors.ImageNotFound:
-                                range_client.api.tag(registry_tag, repo, tag)
+                            await run_docker(
+                                self._pull_and_retag, range_client, registry_tag, repo, tag,
+                                op="dind_registry_pull", timeout=long_timeout,
+                            )
 
                             logger.info(f"Successfully transferred '{image}' via registry")
                             report_progress(image_size, image_size, 'complete')
@@ -3323,7 +3376,7 @@ local-hostname: {name}
             # named=True preserves the image tags
             try:
                 logger.info(f"Starting image export (tags: {host_image.tags})...")
-                image_data = host_image.save(named=True)
+                image_data = await run_docker(partial(host_image.save, named=True), op="host_image_save")
                 logger.info(f"Image export stream created, loading into DinD at {docker_url}...")
             except Exception as save_err:
                 logger.error(f"Failed to export image '{image}' from host: {type(save_err).__name__}: {save_err}")
@@ -3333,14 +3386,19 @@ local-hostname: {name}
                 return False
 
             # Wrap the generator to track progress
-            import time
             transferred_bytes = [0]
             last_progress_report = [time.time()]
             start_time = time.time()
+            # The load runs on the Docker executor: progress is reported back on
+            # the event loop, and a cancelled transfer stops at the next chunk
+            loop = asyncio.get_running_loop()
+            cancelled = threading.Event()
 
             def progress_wrapper(data_generator):
                 """Wrap generator to track bytes transferred and report progress."""
                 for chunk in data_generator:
+                    if cancelled.is_set():
+                        raise RuntimeError("Image transfer cancelled")
                     transferred_bytes[0] += len(chunk)
                     # Report progress every 2 seconds to avoid spamming
                     now = time.time()
@@ -3351,14 +3409,19 @@ local-hostname: {name}
                             elapsed = int(now - start_time)
                             transferred_mb = transferred_bytes[0] / 1024 / 1024
                             total_mb = image_size / 1024 / 1024
-                            report_progress(transferred_bytes[0], image_size, f'transferring:{pct}')
+                            loop.call_soon_threadsafe(
+                                report_progress, transferred_bytes[0], image_size, f'transferring:{pct}'
+                            )
                             logger.info(f"Transfer progress: {transferred_mb:.1f}/{total_mb:.1f} MB ({pct}%) - {elapsed}s elapsed")
                     yield chunk
 
             # Load into DinD - images.load accepts an iterator of bytes
             try:
                 logger.info(f"Loading image into DinD (this may take a while for large images)...")
-                result = range_client.images.load(progress_wrapper(image_data))
+                result = await run_docker(
+                    range_client.images.load, progress_wrapper(image_data),
+                    op="dind_image_load", timeout=long_timeout, on_cancel=cancelled.set,
+                )
                 elapsed = int(time.time() - start_time)
                 logger.info(f"Image load completed in {elapsed}s")
             except Exception as load_err:
@@ -3386,7 +3449,7 @@ local-hostname: {name}
                 for loaded_img in result:
                     if loaded_img.tags:
                         try:
-                            loaded_img.tag(bare_repo, bare_tag)
+                            await run_docker(loaded_img.tag, bare_repo, bare_tag, op="dind_image_tag")
                             logger.info(f"Retagged to '{bare_repo}:{bare_tag}' inside DinD")
                             break
                         except Exception as tag_err:
@@ -3480,9 +3543,8 @@ local-hostname: {name}
                     )
                     if progress_callback:
                         progress_callback(0, 0, "building_from_dockerfile")
-                    try:
-                        host_client = docker.from_env()
-                        _img, build_logs = host_client.images.build(
+                    def build_image():
+                        _img, build_logs = self.client.images.build(
                             path=f"/data/images/{project_name}",
                             tag=image,
                             rm=True,
@@ -3491,6 +3553,10 @@ local-hostname: {name}
                         for log_line in build_logs:
                             if "stream" in log_line:
                                 logger.debug(log_line["stream"].strip())
+
+                    try:
+                        await run_docker(build_image, op="host_image_build",
+                                         timeout=get_settings().docker_long_call_timeout)
                         logger.info(f"Auto-built image '{image}' from Dockerfile")
                         built = True
                     except Exception as build_err:
@@ -3517,8 +3583,15 @@ local-hostname: {name}
         # Fallback: try direct pull into DinD (requires internet in DinD)
         logger.info(f"Falling back to direct pull of '{image}' into DinD (platform={platform})")
         try:
-            range_client = self.get_range_client_sync(range_id, docker_url)
-            range_client.images.pull(image, platform=platform)
+            range_client = await run_docker(
+                partial(self.get_range_client_sync, range_id, docker_url,
+                        timeout=get_settings().dind_transfer_timeout),
+                op="dind_connect",
+            )
+            await run_docker(
+                partial(range_client.images.pull, image, platform=platform),
+                op="dind_image_pull", timeout=get_settings().docker_long_call_timeout,
+            )
             logger.info(f"Successfully pulled '{image}' into DinD from internet")
             result["success"] = True
             result["source"] = "internet"
@@ -3576,22 +3649,27 @@ local-hostname: {name}
                 return True
 
             # Get the range client for DinD
-            range_client = self.get_range_client_sync(range_id, docker_url)
+            range_client = await run_docker(
+                partial(self.get_range_client_sync, range_id, docker_url,
+                        timeout=get_settings().dind_transfer_timeout),
+                op="dind_connect",
+            )
 
             # Get the image from DinD
             try:
-                dind_image = range_client.images.get(image)
+                dind_image = await run_docker(range_client.images.get, image, op="dind_image_get")
             except docker.errors.ImageNotFound:
                 logger.warning(f"Image '{image}' not found in DinD, cannot cache")
                 return False
 
-            # Export the image from DinD (as tar stream)
+            # Export the image from DinD (as tar stream) and load it to the
+            # host Docker daemon temporarily
             logger.info(f"Exporting image '{image}' from DinD for registry caching")
-            image_data = dind_image.save(named=True)
-
-            # Load to host Docker daemon temporarily
             logger.info(f"Loading image '{image}' to host for registry push")
-            loaded_images = self.client.images.load(image_data)
+            loaded_images = await run_docker(
+                lambda: self.client.images.load(dind_image.save(named=True)),
+                op="host_image_load", timeout=get_settings().docker_long_call_timeout,
+            )
             if not loaded_images:
                 logger.warning(f"Failed to load image '{image}' to host")
                 return False
@@ -3606,7 +3684,8 @@ local-hostname: {name}
                 logger.warning(f"Failed to push '{image}' to registry: {push_err}")
                 # Clean up the loaded image from host
                 try:
-                    self.client.images.remove(image, force=False)
+                    await run_docker(partial(self.client.images.remove, image, force=False),
+                                     op="host_image_remove")
                 except Exception:
                     pass  # Ignore cleanup errors
                 return False
@@ -3632,15 +3711,20 @@ local-hostname: {name}
         Returns:
             Image ID
         """
-        range_client = self.get_range_client_sync(range_id, docker_url)
-        try:
+        def commit():
+            range_client = self.get_range_client_sync(
+                range_id, docker_url, timeout=get_settings().dind_transfer_timeout
+            )
             container = range_client.containers.get(container_id)
-            image = container.commit(
+            return container.commit(
                 repository=snapshot_name,
                 tag="latest",
                 message=f"Snapshot of {container.name}",
                 conf={"Labels": labels or {}}
             )
+
+        try:
+            image = await run_docker(commit, op="dind_commit", timeout=get_settings().docker_long_call_timeout)
             logger.info(f"Created DinD snapshot: {snapshot_name} ({image.id[:12]})")
             return image.id
         except NotFound:
@@ -3674,9 +3758,10 @@ local-hostname: {name}
         import tarfile
         import io
 
-        range_client = self.get_range_client_sync(range_id, docker_url)
-
-        try:
+        def copy():
+            range_client = self.get_range_client_sync(
+                range_id, docker_url, timeout=get_settings().dind_transfer_timeout
+            )
             container = range_client.containers.get(container_id)
 
             # Create tar archive with the file
@@ -3687,6 +3772,9 @@ local-hostname: {name}
 
             # Copy to container
             container.put_archive(dst_path, data)
+
+        try:
+            await run_docker(copy, op="dind_put_archive", timeout=get_settings().docker_long_call_timeout)
             logger.info(f"Copied {src_path} to {container_id}:{dst_path} in DinD")
             return True
 
@@ -3717,7 +3805,9 @@ local-hostname: {name}
         Returns:
             Tuple of (exit_code, output)
         """
-        range_client = self.get_range_client_sync(range_id, docker_url)
+        range_client = self.get_range_client_sync(
+            range_id, docker_url, timeout=get_settings().dind_transfer_timeout
+        )
 
         try:
             container = range_client.containers.get(container_id)
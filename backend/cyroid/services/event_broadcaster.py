@@ -4,11 +4,16 @@ Real-time event broadcasting via Redis pub/sub.
 
 This service enables real-time UI updates by broadcasting events
 to connected WebSocket clients through Redis pub/sub.
+
+Notifications are pushed on their own channel: each message carries the
+recipient user IDs once, and every API worker forwards it only to its own
+WebSocket connections belonging to those users.
 """
 import asyncio
 import json
 import logging
-from typing import Optional, Dict, Set, Callable, Any
+import time
+from typing import Optional, Dict, List, Set, Any
 from uuid import UUID
 from datetime import datetime
 
@@ -24,6 +29,7 @@ settings = get_settings()
 EVENTS_CHANNEL = "cyroid:events"
 RANGE_CHANNEL_PREFIX = "cyroid:range:"
 VM_CHANNEL_PREFIX = "cyroid:vm:"
+NOTIFICATIONS_CHANNEL = "cyroid:notifications"
 
 
 class RealtimeEvent(BaseModel):
@@ -153,6 +159,11 @@ class ConnectionManager:
         self._pubsub: Optional[redis.client.PubSub] = None
         self._listener_task: Optional[asyncio.Task] = None
         self._redis: Optional[redis.Redis] = None
+        # Map of user_id -> connection_ids, for notification pushes
+        self._user_connections: Dict[str, Set[str]] = {}
+        self._connection_users: Dict[str, str] = {}
+        # Notification push counters, reported by push_stats()
+        self._push_stats = {"messages": 0, "deliveries": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
 
     async def start(self) -> None:
         """Start the connection manager and Redis listener."""
@@ -161,8 +172,8 @@ class ConnectionManager:
             decode_responses=True
         )
         self._pubsub = self._redis.pubsub()
-        # Subscribe to global events channel
-        await self._pubsub.subscribe(EVENTS_CHANNEL)
+        # Subscribe to global events and notification channels
+        await self._pubsub.subscribe(EVENTS_CHANNEL, NOTIFICATIONS_CHANNEL)
         # Start listener task
         self._listener_task = asyncio.create_task(self._listen())
         logger.info("ConnectionManager started")
@@ -205,8 +216,22 @@ class ConnectionManager:
                         await self._pubsub.unsubscribe(channel)
             del self._subscriptions[connection_id]
 
+        user_id = self._connection_users.pop(connection_id, None)
+        if user_id is not None:
+            connections = self._user_connections.get(user_id, set())
+            connections.discard(connection_id)
+            if not connections:
+                self._user_connections.pop(user_id, None)
+
         logger.info(f"WebSocket disconnected: {connection_id}")
 
+    def register_user(self, connection_id: str, user_id: str) -> None:
+        """Deliver the user's notifications to this connection."""
+        if connection_id not in self._connections:
+            return
+        self._connection_users[connection_id] = str(user_id)
+        self._user_connections.setdefault(str(user_id), set()).add(connection_id)
+
     async def subscribe(self, connection_id: str, channel: str) -> None:
         """Subscribe a connection to a channel."""
         if connection_id not in self._subscriptions:
@@ -258,6 +283,10 @@ class ConnectionManager:
 
     async def _route_message(self, channel: str, data: str) -> None:
         """Route a message to all subscribed connections."""
+        if channel == NOTIFICATIONS_CHANNEL:
+            await self.route_notification(data)
+            return
+
         # Get subscribers for this channel
         subscribers = set()
 
@@ -276,6 +305,63 @@ class ConnectionManager:
                 except Exception as e:
                     logger.warning(f"Failed to send to {connection_id}: {e}")
 
+    async def route_notification(self, data: str) -> int:
+        """Send a pushed notification to the local connections of its recipients.
+
+        Args:
+            data: JSON with ``recipients`` (user IDs) and ``notification``
+
+        Returns:
+            Number of connections the notification was sent to
+        """
+        started = time.perf_counter()
+        try:
+            push = json.loads(data)
+            recipients: List[str] = push["recipients"]
+            text = json.dumps({"type": "notification", **push["notification"]})
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding malformed notification push: {e}")
+            return 0
+
+        # Walk whichever side is smaller: the recipients or the connected users
+        if len(recipients) <= len(self._user_connections):
+            targets = [c for user_id in recipients for c in self._user_connections.get(user_id, ())]
+        else:
+            wanted = set(recipients)
+            targets = [c for user_id, conns in self._user_connections.items() if user_id in wanted for c in conns]
+
+        # Send concurrently so one slow client does not hold up the rest
+        results = await asyncio.gather(*(self._send(c, text) for c in targets))
+        delivered = sum(results)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self._push_stats
+        stats["messages"] += 1
+        stats["deliveries"] += delivered
+        stats["failures"] += len(targets) - delivered
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        return delivered
+
+    async def _send(self, connection_id: str, text: str) -> bool:
+        websocket = self._connections.get(connection_id)
+        if websocket is None:
+            return False
+        try:
+            await websocket.send_text(text)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to send to {connection_id}: {e}")
+            return False
+
+    def push_stats(self) -> dict:
+        """Notification push counters for this worker since start."""
+        stats = dict(self._push_stats)
+        stats["avg_ms"] = round(stats.pop("total_ms") / stats["messages"], 3) if stats["messages"] else 0.0
+        stats["max_ms"] = round(stats["max_ms"], 3)
+        stats["connected_users"] = len(self._user_connections)
+        return stats
+
 
 # Singleton instances
 _broadcaster: Optional[EventBroadcaster] = None
@@ -0,0 +1,183 @@
+# backend/cyroid/services/event_retention_service.py
+"""
+Event log retention.
+
+Every deployment step, VM state change and inject writes an ``event_logs``
+row, so without pruning the table and its indexes grow without bound.
+
+Rows older than their event type's retention period are folded into
+per-range daily counts (``event_log_rollups``) and then deleted. Pruning
+works in small batches, oldest rows first, each in its own short
+transaction, so it can run continuously next to live inserts without
+holding long locks. On PostgreSQL, batches skip rows locked by another
+pruner.
+
+When ``event_prune_interval`` is set, the API runs the pruner in the
+background; a Redis lock ensures only one API worker prunes per interval.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from redis import Redis
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from cyroid.config import get_settings
+from cyroid.models.event_log import EventLog, EventLogRollup, EventType
+
+logger = logging.getLogger(__name__)
+
+PRUNE_LOCK_KEY = "event_retention:lock"
+
+
+def parse_retention_overrides(value: str) -> Dict[EventType, int]:
+    """Parse "deployment_step=7,vm_error=365" into {EventType: days}.
+
+    Raises:
+        ValueError: On an unknown event type or a non-integer day count
+    """
+    overrides = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, days = item.partition("=")
+        overrides[EventType(name.strip().lower())] = int(days)
+    return overrides
+
+
+def _utc_day(created_at: datetime) -> date:
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+class EventRetentionService:
+    """Rolls up and deletes expired event logs in batches."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        retention_days: Optional[int] = None,
+        overrides: Optional[Dict[EventType, int]] = None,
+        batch_size: Optional[int] = None,
+    ):
+        settings = get_settings()
+        if session_factory is None:
+            from cyroid.database import get_session_local
+            session_factory = get_session_local()
+        self.session_factory = session_factory
+        self.retention_days = settings.event_retention_days if retention_days is None else retention_days
+        self.overrides = (
+            parse_retention_overrides(settings.event_retention_overrides) if overrides is None else overrides
+        )
+        self.batch_size = batch_size or settings.event_prune_batch_size
+        self.last_run: Optional[dict] = None
+
+    def retention_policy(self) -> Dict[int, List[EventType]]:
+        """Group event types by retention days, leaving out those kept forever."""
+        policy: Dict[int, List[EventType]] = {}
+        for event_type in EventType:
+            days = self.overrides.get(event_type, self.retention_days)
+            if days > 0:
+                policy.setdefault(days, []).append(event_type)
+        return policy
+
+    def prune(self, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> dict:
+        """Roll up and delete all expired events.
+
+        Args:
+            now: Reference time for the cutoffs (defaults to the current time)
+            max_batches: Stop after this many batches (None = until caught up)
+
+        Returns:
+            Run summary with the number of rows pruned and batches used
+        """
+        now = now or datetime.now(timezone.utc)
+        started = time.monotonic()
+        pruned = batches = 0
+
+        db = self.session_factory()
+        try:
+            for days, event_types in sorted(self.retention_policy().items()):
+                cutoff = now - timedelta(days=days)
+                while max_batches is None or batches < max_batches:
+                    deleted = self._prune_batch(db, event_types, cutoff)
+                    if not deleted:
+                        break
+                    pruned += deleted
+                    batches += 1
+        finally:
+            db.close()
+
+        self.last_run = {
+            "started_at": now.isoformat(),
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "pruned": pruned,
+            "batches": batches,
+        }
+        if pruned:
+            logger.info(f"Event retention pruned {pruned} events in {batches} batches")
+        return self.last_run
+
+    def _prune_batch(self, db: Session, event_types: List[EventType], cutoff: datetime) -> int:
+        """Roll up and delete the oldest expired rows in one short transaction."""
+        rows = db.execute(
+            select(EventLog.id, EventLog.range_id, EventLog.event_type, EventLog.created_at)
+            .where(EventLog.created_at < cutoff, EventLog.event_type.in_(event_types))
+            .order_by(EventLog.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            db.rollback()
+            return 0
+
+        counts = Counter((row.range_id, _utc_day(row.created_at), row.event_type.value) for row in rows)
+        self._add_rollups(db, counts)
+        db.execute(delete(EventLog).where(EventLog.id.in_([row.id for row in rows])))
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def _add_rollups(db: Session, counts: Counter) -> None:
+        insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+        stmt = insert(EventLogRollup).values([
+            {"range_id": range_id, "day": day, "event_type": event_type, "count": count}
+            for (range_id, day, event_type), count in counts.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["range_id", "day", "event_type"],
+            set_={"count": EventLogRollup.count + stmt.excluded.count},
+        ))
+
+    async def run_forever(self, interval: float, redis_client: Optional[Redis] = None) -> None:
+        """Prune every ``interval`` seconds until cancelled.
+
+        Each API worker runs this loop, but only the one that takes the
+        Redis lock for the current interval prunes.
+        """
+        redis_client = redis_client or Redis.from_url(get_settings().redis_url)
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if redis_client.set(PRUNE_LOCK_KEY, "1", nx=True, ex=max(1, int(interval))):
+                    await loop.run_in_executor(None, self.prune)
+            except Exception as e:
+                logger.error(f"Background event pruning failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+_event_retention_service: Optional[EventRetentionService] = None
+
+
+def get_event_retention_service() -> EventRetentionService:
+    """Get the singleton EventRetentionService instance."""
+    global _event_retention_service
+    if _event_retention_service is None:
+        _event_retention_service = EventRetentionService()
+    return _event_retention_service
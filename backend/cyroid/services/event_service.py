@@ -1,15 +1,71 @@
 # backend/cyroid/services/event_service.py
 import asyncio
+import base64
 import json
 import logging
+from datetime import date, datetime
 from uuid import UUID
-from typing import Optional, List
+from typing import Dict, Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
-from cyroid.models.event_log import EventLog, EventType
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from cyroid.models.event_log import EventLog, EventLogRollup, EventType
 
 logger = logging.getLogger(__name__)
 
+# Matches the (range_id, created_at, id) and (vm_id, created_at, id) indexes
+NEWEST_FIRST = (desc(EventLog.created_at), desc(EventLog.id))
+
+
+def encode_event_cursor(event: EventLog) -> str:
+    """Opaque cursor pointing just past an event in newest-first order."""
+    raw = f"{event.created_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_event_cursor(); raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, event_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(event_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _range_events_select(range_id: UUID, event_types: Optional[List[EventType]]):
+    stmt = select(EventLog).options(joinedload(EventLog.user)).where(EventLog.range_id == range_id)
+    if event_types:
+        stmt = stmt.where(EventLog.event_type.in_(event_types))
+    return stmt.order_by(*NEWEST_FIRST)
+
+
+def _page_select(range_id: UUID, limit: int, cursor: Optional[str], event_types: Optional[List[EventType]]):
+    # One extra row tells whether there is a next page
+    stmt = _range_events_select(range_id, event_types).limit(limit + 1)
+    if cursor:
+        created_at, event_id = decode_event_cursor(cursor)
+        stmt = stmt.where(tuple_(EventLog.created_at, EventLog.id) < (created_at, event_id))
+    return stmt
+
+
+def _split_page(events: List[EventLog], limit: int) -> tuple[List[EventLog], Optional[str]]:
+    next_cursor = encode_event_cursor(events[limit - 1]) if len(events) > limit else None
+    return events[:limit], next_cursor
+
+
+def _count_select(range_id: UUID, event_types: Optional[List[EventType]]):
+    stmt = select(func.count(EventLog.id)).where(EventLog.range_id == range_id)
+    if event_types:
+        stmt = stmt.where(EventLog.event_type.in_(event_types))
+    return stmt
+
+
+def _vm_events_select(vm_id: UUID, limit: int):
+    return select(EventLog).options(joinedload(EventLog.user)).where(
+        EventLog.vm_id == vm_id
+    ).order_by(*NEWEST_FIRST).limit(limit)
+
 
 class EventService:
     def __init__(self, db: Session):
@@ -141,23 +197,120 @@ class EventService:
         range_id: UUID,
         limit: int = 100,
         offset: int = 0,
-        event_types: Optional[List[EventType]] = None
-    ) -> tuple[List[EventLog], int]:
-        query = self.db.query(EventLog).options(
-            joinedload(EventLog.user)
-        ).filter(EventLog.range_id == range_id)
+        event_types: Optional[List[EventType]] = None,
+        include_total: bool = True,
+    ) -> tuple[List[EventLog], Optional[int]]:
+        """Newest-first page of a range's events using OFFSET.
+
+        Prefer get_events_page() for paging; OFFSET scans every skipped row.
+        """
+        total = self.count_events(range_id, event_types) if include_total else None
+        stmt = _range_events_select(range_id, event_types).offset(offset).limit(limit)
+        return list(self.db.scalars(stmt)), total
 
-        if event_types:
-            query = query.filter(EventLog.event_type.in_(event_types))
+    def get_events_page(
+        self,
+        range_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        event_types: Optional[List[EventType]] = None,
+    ) -> tuple[List[EventLog], Optional[str]]:
+        """Newest-first page of a range's events using a keyset cursor.
 
-        total = query.count()
-        events = query.order_by(desc(EventLog.created_at)).offset(offset).limit(limit).all()
+        Pages seek on the (range_id, created_at, id) index, so a deep page
+        costs the same as the first one.
+
+        Args:
+            range_id: Range to list events for
+            limit: Page size
+            cursor: next_cursor from the previous page, or None for the first page
+            event_types: Optional event type filter
+
+        Returns:
+            (events, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        stmt = _page_select(range_id, limit, cursor, event_types)
+        return _split_page(list(self.db.scalars(stmt)), limit)
 
-        return events, total
+    def count_events(self, range_id: UUID, event_types: Optional[List[EventType]] = None) -> int:
+        return self.db.scalar(_count_select(range_id, event_types))
 
     def get_vm_events(self, vm_id: UUID, limit: int = 50) -> List[EventLog]:
-        return self.db.query(EventLog).options(
-            joinedload(EventLog.user)
-        ).filter(
-            EventLog.vm_id == vm_id
-        ).order_by(desc(EventLog.created_at)).limit(limit).all()
+        return list(self.db.scalars(_vm_events_select(vm_id, limit)))
+
+    def get_daily_counts(self, range_id: UUID, since: Optional[date] = None) -> List[dict]:
+        """Per-day event counts for a range, including events already pruned.
+
+        Combines the rollups written by retention pruning with counts of the
+        raw events that are still stored.
+
+        Args:
+            range_id: Range to summarize
+            since: Optional first day to include
+
+        Returns:
+            Dicts with day, event_type and count, ordered by day then type
+        """
+        counts: Dict[tuple, int] = {}
+
+        rollups = self.db.query(EventLogRollup).filter(EventLogRollup.range_id == range_id)
+        if since:
+            rollups = rollups.filter(EventLogRollup.day >= since)
+        for rollup in rollups:
+            counts[(rollup.day, rollup.event_type)] = rollup.count
+
+        day = func.date(EventLog.created_at)
+        live = self.db.query(day, EventLog.event_type, func.count(EventLog.id)).filter(
+            EventLog.range_id == range_id
+        )
+        if since:
+            live = live.filter(EventLog.created_at >= datetime.combine(since, datetime.min.time()))
+        for event_day, event_type, count in live.group_by(day, EventLog.event_type):
+            # SQLite returns the day as a string
+            key = (date.fromisoformat(str(event_day)), event_type.value)
+            counts[key] = counts.get(key, 0) + count
+
+        return [
+            {"day": d, "event_type": t, "count": c}
+            for (d, t), c in sorted(counts.items())
+        ]
+
+
+class AsyncEventService:
+    """Read-only event queries for async handlers, awaited on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_events(
+        self,
+        range_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        event_types: Optional[List[EventType]] = None,
+        include_total: bool = True,
+    ) -> tuple[List[EventLog], Optional[int]]:
+        """See EventService.get_events()."""
+        total = await self.count_events(range_id, event_types) if include_total else None
+        stmt = _range_events_select(range_id, event_types).offset(offset).limit(limit)
+        return list(await self.db.scalars(stmt)), total
+
+    async def get_events_page(
+        self,
+        range_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        event_types: Optional[List[EventType]] = None,
+    ) -> tuple[List[EventLog], Optional[str]]:
+        """See EventService.get_events_page()."""
+        stmt = _page_select(range_id, limit, cursor, event_types)
+        return _split_page(list(await self.db.scalars(stmt)), limit)
+
+    async def count_events(self, range_id: UUID, event_types: Optional[List[EventType]] = None) -> int:
+        return await self.db.scalar(_count_select(range_id, event_types))
+
+    async def get_vm_events(self, vm_id: UUID, limit: int = 50) -> List[EventLog]:
+        return list(await self.db.scalars(_vm_events_select(vm_id, limit)))
@@ -0,0 +1,235 @@
+# backend/cyroid/services/image_conversion_service.py
+"""
+qemu-img conversion runner with progress, cancellation and admission control.
+
+Conversions are disk-bound, so concurrency is limited by a disk bandwidth
+budget rather than by CPU: the number of conversion slots is the configured
+disk write budget divided by the bandwidth one conversion is expected to use.
+Extra conversions wait for a slot instead of thrashing the disk together.
+
+Slots are Redis keys (``conversion:slot:{n}``) taken with SET NX, so the
+budget holds across every API worker on the host. A running conversion
+renews its slot; a slot whose holder died expires after ``SLOT_TTL``.
+
+Output is written next to its final destination as ``<dest>.partial`` and
+renamed into place on success, so a converted image is never copied a
+second time and a half-written image is never visible under its final name.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+from redis import Redis
+
+from cyroid.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# qemu-img -p prints "    (12.34/100%)\r" as it goes
+_PROGRESS_PATTERN = re.compile(rb"\((\d+(?:\.\d+)?)/100%\)")
+CANCEL_CHECK_INTERVAL = 0.5  # Seconds between cancellation checks
+SLOT_KEY_PREFIX = "conversion:slot"
+SLOT_TTL = 60  # Seconds a slot outlives a holder that stopped renewing it
+SLOT_POLL_INTERVAL = 1.0  # Seconds between attempts to take a slot while queued
+HEARTBEAT_INTERVAL = 30.0  # Seconds between heartbeat callbacks (queued or running)
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ConversionCancelled(Exception):
+    """Raised when a conversion is cancelled before completion."""
+    pass
+
+
+class ImageConversionRunner:
+    """Runs qemu-img conversions within a disk bandwidth budget."""
+
+    def __init__(self, max_concurrent: Optional[int] = None, redis_client: Optional[Redis] = None):
+        if max_concurrent is None:
+            settings = get_settings()
+            max_concurrent = max(
+                1,
+                settings.conversion_disk_bandwidth_mbps // max(1, settings.conversion_job_bandwidth_mbps),
+            )
+        self.max_concurrent = max_concurrent
+        self._redis = redis_client
+        # This process only; the slot keys are the host-wide view
+        self.running = 0
+        self.waiting = 0
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    def _slot_keys(self):
+        return [f"{SLOT_KEY_PREFIX}:{n}" for n in range(self.max_concurrent)]
+
+    def _try_acquire(self, token: str) -> Optional[str]:
+        for key in self._slot_keys():
+            if self.redis.set(key, token, nx=True, ex=SLOT_TTL):
+                return key
+        return None
+
+    def _release(self, key: str, token: str) -> None:
+        if self.redis.get(key) == token:
+            self.redis.delete(key)
+
+    async def _acquire(
+        self,
+        token: str,
+        is_cancelled: Optional[Callable[[], bool]],
+        heartbeat: Optional[Callable[[], None]],
+    ) -> str:
+        """Wait for a free slot, checking for cancellation and heartbeating while queued."""
+        last_beat = time.monotonic()
+        while True:
+            if is_cancelled and is_cancelled():
+                raise ConversionCancelled("Conversion cancelled while queued")
+            key = self._try_acquire(token)
+            if key is not None:
+                return key
+            if heartbeat and time.monotonic() - last_beat >= HEARTBEAT_INTERVAL:
+                last_beat = time.monotonic()
+                heartbeat()
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    async def _renew(self, key: str, token: str, heartbeat: Optional[Callable[[], None]]) -> None:
+        """Keep the slot (and the caller's job) alive while a conversion runs."""
+        interval = min(SLOT_TTL / 3, HEARTBEAT_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.redis.get(key) == token:
+                    self.redis.expire(key, SLOT_TTL)
+                if heartbeat:
+                    heartbeat()
+            except Exception as e:
+                logger.warning(f"Failed to renew conversion slot {key}: {e}")
+
+    def stats(self) -> dict:
+        """Current admission state, for status reporting."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "waiting": self.waiting,
+            "host_running": self.redis.exists(*self._slot_keys()),
+        }
+
+    async def convert(
+        self,
+        source: Path,
+        dest: Path,
+        source_format: str,
+        output_format: str = "qcow2",
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_start: Optional[Callable[[], None]] = None,
+        heartbeat: Optional[Callable[[], None]] = None,
+    ) -> Path:
+        """Convert ``source`` into ``dest``, waiting for a free slot first.
+
+        Args:
+            source: Source disk image
+            dest: Final path of the converted image
+            source_format: qemu-img format of the source (vmdk, vdi, ...)
+            output_format: qemu-img output format
+            progress: Called with (percent, 100) as qemu-img reports progress
+            is_cancelled: Polled while queued and during the conversion; returning True aborts it
+            on_start: Called once a slot has been acquired
+            heartbeat: Called periodically while queued and running, e.g. to renew a job lease
+
+        Returns:
+            ``dest``
+
+        Raises:
+            ConversionCancelled: If ``is_cancelled`` returned True
+            RuntimeError: If qemu-img fails
+        """
+        token = uuid.uuid4().hex
+        self.waiting += 1
+        try:
+            slot = await self._acquire(token, is_cancelled, heartbeat)
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        renew = asyncio.get_running_loop().create_task(self._renew(slot, token, heartbeat))
+        try:
+            if on_start:
+                on_start()
+            return await self._run(source, dest, source_format, output_format, progress, is_cancelled)
+        finally:
+            self.running -= 1
+            renew.cancel()
+            self._release(slot, token)
+
+    async def _run(self, source, dest, source_format, output_format, progress, is_cancelled) -> Path:
+        partial = dest.with_name(dest.name + ".partial")
+        logger.info(f"Converting {source_format.upper()} to {output_format.upper()}: {source} -> {dest}")
+        started = time.monotonic()
+
+        # Using create_subprocess_exec is safe - no shell interpolation
+        proc = await asyncio.create_subprocess_exec(
+            'qemu-img', 'convert',
+            '-f', source_format,
+            '-O', output_format,
+            '-p',  # Progress
+            str(source),
+            str(partial),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            buffer = b""
+            last_check = 0.0
+            while chunk := await proc.stdout.read(256):
+                buffer = (buffer + chunk)[-256:]
+                if progress and (matches := _PROGRESS_PATTERN.findall(buffer)):
+                    progress(int(float(matches[-1])), 100)
+
+                now = time.monotonic()
+                if is_cancelled and now - last_check >= CANCEL_CHECK_INTERVAL:
+                    last_check = now
+                    if is_cancelled():
+                        proc.terminate()
+                        await proc.wait()
+                        raise ConversionCancelled(f"Conversion of {source.name} cancelled")
+
+            stderr = await proc.stderr.read()
+            await proc.wait()
+        except BaseException:
+            # Cancellation, client disconnect or failure: don't leave qemu-img running
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            partial.unlink(missing_ok=True)
+            raise
+
+        if proc.returncode != 0:
+            partial.unlink(missing_ok=True)
+            error = stderr.decode() if stderr else 'Unknown error'
+            raise RuntimeError(f"qemu-img convert failed: {error}")
+
+        os.replace(partial, dest)
+        logger.info(f"Converted to {output_format.upper()}: {dest} in {time.monotonic() - started:.1f}s")
+        return dest
+
+
+# Singleton instance
+_conversion_runner: Optional[ImageConversionRunner] = None
+
+
+def get_conversion_runner() -> ImageConversionRunner:
+    """Get the singleton ImageConversionRunner instance."""
+    global _conversion_runner
+    if _conversion_runner is None:
+        _conversion_runner = ImageConversionRunner()
+    return _conversion_runner
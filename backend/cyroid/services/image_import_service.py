@@ -1,10 +1,8 @@
 # backend/cyroid/services/image_import_service.py
 """Service for importing VM images (OVA, QCOW2, VMDK, VDI) as GoldenImages."""
-import asyncio
 import logging
 import os
 import shutil
-import tarfile
 import tempfile
 from pathlib import Path
 from typing import Optional
@@ -15,6 +13,12 @@ from sqlalchemy.orm import Session
 
 from cyroid.config import get_settings
 from cyroid.models.golden_image import GoldenImage
+from cyroid.services.image_conversion_service import get_conversion_runner
+from cyroid.services.upload_ingest_service import (
+    IngestJob,
+    get_upload_ingest_service,
+    run_in_ingest_pool,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -75,35 +79,66 @@ class ImageImportService:
         if not ext:
             raise ValueError(f"Unsupported format. Supported: {', '.join(self.SUPPORTED_FORMATS)}")
 
+        # Generate safe filename
+        safe_name = name.lower().replace(' ', '-').replace('_', '-')
+        safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
+        final_filename = f"{safe_name}.qcow2"
+
+        ingest = IngestJob(final_filename, filename=final_filename, source=file.filename)
+        if not ingest.owned:
+            raise ValueError(f"Image '{final_filename}' is already being imported")
+
+        try:
+            golden = await self._import(
+                file, ext, final_filename, ingest,
+                name=name,
+                description=description,
+                os_type=os_type,
+                vm_type=vm_type,
+                native_arch=native_arch,
+                default_cpu=default_cpu,
+                default_ram_mb=default_ram_mb,
+                default_disk_gb=default_disk_gb,
+                created_by=user_id,
+                db=db,
+            )
+        except Exception as e:
+            ingest.finish("failed", error=str(e))
+            raise
+        ingest.finish("completed", progress_percent=100, size_bytes=golden.size_bytes)
+        return golden
+
+    async def _import(
+        self,
+        file: UploadFile,
+        ext: str,
+        final_filename: str,
+        ingest: IngestJob,
+        db: Session,
+        **golden_fields,
+    ) -> GoldenImage:
+        """Spool, convert and register an upload. See import_vm_image."""
         # Create temp directory for processing
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(prefix=".import-", dir=self.GOLDEN_IMAGES_DIR) as temp_dir:
             temp_path = Path(temp_dir)
 
-            # Save uploaded file
+            # Spool uploaded file to disk in chunks
             upload_path = temp_path / f"upload{ext}"
-            with open(upload_path, 'wb') as f:
-                content = await file.read()
-                f.write(content)
-
-            logger.info(f"Uploaded {file.filename} ({len(content)} bytes) to {upload_path}")
-
-            # Convert to qcow2 if needed
-            if ext == '.ova':
-                qcow2_path = await self._convert_ova(upload_path, temp_path)
-            elif ext == '.vmdk':
-                qcow2_path = await self._convert_vmdk(upload_path, temp_path)
-            elif ext == '.vdi':
-                qcow2_path = await self._convert_vdi(upload_path, temp_path)
-            else:  # Already qcow2
-                qcow2_path = upload_path
-
-            # Generate safe filename
-            safe_name = name.lower().replace(' ', '-').replace('_', '-')
-            safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
-            final_filename = f"{safe_name}.qcow2"
-
-            # Move to golden images storage
-            storage_path = self._move_to_storage(qcow2_path, final_filename)
+            await get_upload_ingest_service().spool(file, str(upload_path), ingest.stage("uploading"))
+
+            # Reserve the final storage path so conversions write straight into it
+            storage_path = self._reserve_storage_path(final_filename)
+            try:
+                if ext == '.ova':
+                    vmdk_path = await self._extract_ova_disk(upload_path, temp_path, ingest)
+                    await self._convert(vmdk_path, 'vmdk', storage_path, ingest)
+                elif ext in ('.vmdk', '.vdi'):
+                    await self._convert(upload_path, ext[1:], storage_path, ingest)
+                else:  # Already qcow2
+                    await self._move_to_storage(upload_path, storage_path)
+            except BaseException:
+                storage_path.unlink(missing_ok=True)
+                raise
 
             # Get file size
             size_bytes = storage_path.stat().st_size
@@ -112,19 +147,11 @@ class ImageImportService:
 
             # Create GoldenImage record
             golden = GoldenImage(
-                name=name,
-                description=description,
                 source="import",
                 disk_image_path=str(storage_path),
                 import_format=ext[1:],  # Remove leading dot
-                os_type=os_type,
-                vm_type=vm_type,
-                native_arch=native_arch,
-                default_cpu=default_cpu,
-                default_ram_mb=default_ram_mb,
-                default_disk_gb=default_disk_gb,
                 size_bytes=size_bytes,
-                created_by=user_id,
+                **golden_fields,
             )
             db.add(golden)
             db.commit()
@@ -132,132 +159,103 @@ class ImageImportService:
 
             return golden
 
-    async def _convert_ova(self, ova_path: Path, temp_dir: Path) -> Path:
-        """Convert OVA to QCOW2.
+    async def _extract_ova_disk(self, ova_path: Path, temp_dir: Path, ingest: Optional[IngestJob] = None) -> Path:
+        """Extract the main disk from an OVA.
 
         OVA is a tar archive containing OVF descriptor and VMDK disk(s).
+        Only the largest VMDK (the main disk) is extracted.
 
         Args:
             ova_path: Path to OVA file
             temp_dir: Temporary directory for extraction
+            ingest: Optional ingest job to report extraction progress to
 
         Returns:
-            Path to converted QCOW2 file
+            Path to the extracted VMDK file
         """
         logger.info(f"Extracting OVA: {ova_path}")
 
-        # Extract OVA (it's a tar file)
-        extract_dir = temp_dir / "ova_contents"
-        extract_dir.mkdir()
-
-        with tarfile.open(ova_path, 'r') as tar:
-            tar.extractall(extract_dir)
-
-        # Find VMDK file(s)
-        vmdk_files = list(extract_dir.glob('*.vmdk'))
-        if not vmdk_files:
-            raise ValueError("No VMDK disk found in OVA archive")
-
-        # Use the largest VMDK (main disk)
-        vmdk_path = max(vmdk_files, key=lambda p: p.stat().st_size)
+        vmdk_path = Path(await get_upload_ingest_service().extract_member(
+            str(ova_path), ('.vmdk',), str(temp_dir),
+            ingest.stage("extracting") if ingest else None,
+        ))
         logger.info(f"Found VMDK: {vmdk_path}")
+        return vmdk_path
 
-        # Convert VMDK to QCOW2
-        return await self._convert_vmdk(vmdk_path, temp_dir)
-
-    async def _convert_vmdk(self, vmdk_path: Path, temp_dir: Path) -> Path:
-        """Convert VMDK to QCOW2 using qemu-img.
+    async def _convert(
+        self,
+        source_path: Path,
+        source_format: str,
+        dest_path: Path,
+        ingest: Optional[IngestJob] = None,
+    ) -> Path:
+        """Convert a disk image to QCOW2 at ``dest_path`` using the shared runner.
 
-        Uses asyncio.create_subprocess_exec for safe command execution
-        (no shell interpolation).
+        The conversion waits for a free slot in the disk bandwidth budget,
+        reports percent-complete and can be cancelled through the ingest job.
 
         Args:
-            vmdk_path: Path to VMDK file
-            temp_dir: Temporary directory for output
+            source_path: Path to the source disk image
+            source_format: qemu-img format of the source (vmdk, vdi)
+            dest_path: Final storage path for the QCOW2 image
+            ingest: Optional ingest job for progress and cancellation
 
         Returns:
             Path to converted QCOW2 file
         """
-        logger.info(f"Converting VMDK to QCOW2: {vmdk_path}")
-
-        qcow2_path = temp_dir / "converted.qcow2"
-
-        # Using create_subprocess_exec is safe - no shell interpolation
-        proc = await asyncio.create_subprocess_exec(
-            'qemu-img', 'convert',
-            '-f', 'vmdk',
-            '-O', 'qcow2',
-            '-p',  # Progress
-            str(vmdk_path),
-            str(qcow2_path),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        runner = get_conversion_runner()
+        if ingest is None:
+            return await runner.convert(source_path, dest_path, source_format)
+
+        report = ingest.stage("queued")
+        return await runner.convert(
+            source_path, dest_path, source_format,
+            progress=report,
+            is_cancelled=ingest.is_cancelled,
+            on_start=lambda: ingest.stage("converting"),
+            heartbeat=ingest.touch,
         )
-        stdout, stderr = await proc.communicate()
 
-        if proc.returncode != 0:
-            error = stderr.decode() if stderr else 'Unknown error'
-            raise RuntimeError(f"qemu-img convert failed: {error}")
+    def _reserve_storage_path(self, filename: str) -> Path:
+        """Reserve a unique path in the golden images storage directory.
 
-        logger.info(f"Converted to QCOW2: {qcow2_path}")
-        return qcow2_path
-
-    async def _convert_vdi(self, vdi_path: Path, temp_dir: Path) -> Path:
-        """Convert VDI to QCOW2 using qemu-img.
-
-        Uses asyncio.create_subprocess_exec for safe command execution
-        (no shell interpolation).
+        An empty placeholder is created atomically so concurrent imports of
+        the same name get distinct paths.
 
         Args:
-            vdi_path: Path to VDI file
-            temp_dir: Temporary directory for output
+            filename: Desired filename in storage
 
         Returns:
-            Path to converted QCOW2 file
+            Path reserved for the stored file
         """
-        logger.info(f"Converting VDI to QCOW2: {vdi_path}")
-
-        qcow2_path = temp_dir / "converted.qcow2"
-
-        # Using create_subprocess_exec is safe - no shell interpolation
-        proc = await asyncio.create_subprocess_exec(
-            'qemu-img', 'convert',
-            '-f', 'vdi',
-            '-O', 'qcow2',
-            '-p',
-            str(vdi_path),
-            str(qcow2_path),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
+        stem, _, ext = filename.rpartition('.')
+        dest_path = self.GOLDEN_IMAGES_DIR / filename
 
-        if proc.returncode != 0:
-            error = stderr.decode() if stderr else 'Unknown error'
-            raise RuntimeError(f"qemu-img convert failed: {error}")
+        # Handle filename collision by adding suffix
+        counter = 1
+        while True:
+            try:
+                with open(dest_path, 'x'):
+                    return dest_path
+            except FileExistsError:
+                dest_path = self.GOLDEN_IMAGES_DIR / f"{stem}-{counter}.{ext}"
+                counter += 1
 
-        logger.info(f"Converted to QCOW2: {qcow2_path}")
-        return qcow2_path
+    async def _move_to_storage(self, source_path: Path, dest_path: Path) -> Path:
+        """Move a file into golden images storage.
 
-    def _move_to_storage(self, source_path: Path, filename: str) -> Path:
-        """Move a file to the golden images storage directory.
+        A rename when source and destination share a filesystem; otherwise
+        the copy runs on the ingest pool.
 
         Args:
             source_path: Current path of the file
-            filename: Desired filename in storage
+            dest_path: Reserved path in storage
 
         Returns:
             Path to the stored file
         """
-        dest_path = self.GOLDEN_IMAGES_DIR / filename
-
-        # Handle filename collision by adding suffix
-        counter = 1
-        while dest_path.exists():
-            stem = filename.rsplit('.', 1)[0]
-            ext = filename.rsplit('.', 1)[1] if '.' in filename else ''
-            dest_path = self.GOLDEN_IMAGES_DIR / f"{stem}-{counter}.{ext}"
-            counter += 1
-
-        shutil.move(str(source_path), str(dest_path))
+        if source_path.stat().st_dev == dest_path.parent.stat().st_dev:
+            os.replace(source_path, dest_path)
+        else:
+            await run_in_ingest_pool(shutil.move, str(source_path), str(dest_path))
         return dest_path
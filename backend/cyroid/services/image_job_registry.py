@@ -0,0 +1,246 @@
+# backend/cyroid/services/image_job_registry.py
+"""
+Shared registry for Docker image pull, build and upload ingest jobs.
+
+Job state lives in Redis so every API worker sees the same view of a pull or
+build, regardless of which process accepted the request or which Dramatiq
+worker is running it. A short-lived lease key deduplicates concurrent
+requests for the same image: only the caller that acquires the lease starts
+a job, everyone else attaches to the existing one.
+
+Redis layout (``{kind}`` is ``pull``, ``build`` or ``ingest``):
+
+    image_job:{kind}:{key}          JSON job document
+    image_job:{kind}:{key}:layers   hash of layer id -> JSON layer progress
+    image_job:{kind}:{key}:lease    owner token, expires unless refreshed
+    image_job:{kind}:{key}:cancel   set when cancellation is requested
+    image_jobs:{kind}               set of known job keys (listing index)
+"""
+import json
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from redis import Redis
+
+from cyroid.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND_PULL = "pull"
+JOB_KIND_BUILD = "build"
+JOB_KIND_INGEST = "ingest"
+
+# Statuses for which a job is considered to still be running
+ACTIVE_STATUSES = (
+    "queued", "pulling", "building", "pushing_to_registry",
+    "uploading", "extracting", "converting",
+)
+
+JOB_TTL = 3600  # Keep finished job documents for an hour, like export jobs
+QUEUED_LEASE_TTL = 600  # Time a queued job may wait for a worker to pick it up
+LEASE_TTL = 120  # Heartbeat window for a running job
+
+
+def image_job_key(image: str) -> str:
+    """Normalize an image reference into the key used by the pull endpoints."""
+    return image.replace("/", "_").replace(":", "_")
+
+
+class ImageJobRegistry:
+    """Redis-backed registry of image pull, build and ingest jobs."""
+
+    def __init__(self, redis_client: Optional[Redis] = None):
+        self._redis = redis_client
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    # ---- key helpers ----
+
+    @staticmethod
+    def _doc_key(kind: str, key: str) -> str:
+        return f"image_job:{kind}:{key}"
+
+    @classmethod
+    def _layers_key(cls, kind: str, key: str) -> str:
+        return f"{cls._doc_key(kind, key)}:layers"
+
+    @classmethod
+    def _lease_key(cls, kind: str, key: str) -> str:
+        return f"{cls._doc_key(kind, key)}:lease"
+
+    @classmethod
+    def _cancel_key(cls, kind: str, key: str) -> str:
+        return f"{cls._doc_key(kind, key)}:cancel"
+
+    @staticmethod
+    def _index_key(kind: str) -> str:
+        return f"image_jobs:{kind}"
+
+    # ---- lifecycle ----
+
+    def claim(self, kind: str, key: str, fields: Dict[str, Any]) -> bool:
+        """Atomically claim a job slot for ``key``.
+
+        Returns False when another request already owns an active job for the
+        same image, in which case the caller should report that job instead
+        of starting a new one.
+        """
+        token = uuid.uuid4().hex
+        if not self.redis.set(self._lease_key(kind, key), token, nx=True, ex=QUEUED_LEASE_TTL):
+            return False
+
+        now = datetime.utcnow().isoformat()
+        doc = {
+            "job_id": token,
+            "status": "queued",
+            "progress_percent": 0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            **fields,
+        }
+        pipe = self.redis.pipeline()
+        pipe.delete(self._layers_key(kind, key), self._cancel_key(kind, key))
+        pipe.setex(self._doc_key(kind, key), JOB_TTL, json.dumps(doc))
+        pipe.sadd(self._index_key(kind), key)
+        pipe.execute()
+        return True
+
+    def update(self, kind: str, key: str, **fields: Any) -> None:
+        """Merge ``fields`` into the job document and refresh the lease."""
+        doc = self._read_doc(kind, key) or {}
+        doc.update(fields)
+        doc["updated_at"] = datetime.utcnow().isoformat()
+
+        pipe = self.redis.pipeline()
+        pipe.setex(self._doc_key(kind, key), JOB_TTL, json.dumps(doc))
+        if doc.get("status") in ACTIVE_STATUSES:
+            pipe.expire(self._lease_key(kind, key), LEASE_TTL)
+        pipe.execute()
+
+    @contextmanager
+    def heartbeat(self, kind: str, key: str, interval: Optional[float] = None) -> Iterator[None]:
+        """Keep the job's lease alive for the duration of the block.
+
+        Progress updates refresh the lease too, but a registry push or a long
+        build step can run for minutes without one. Only the lease this job
+        holds is renewed, so a later job for the same key is never extended.
+
+        Args:
+            kind: Job kind
+            key: Job key
+            interval: Seconds between renewals (defaults to a third of LEASE_TTL)
+        """
+        lease_key = self._lease_key(kind, key)
+        token = self.redis.get(lease_key)
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(interval or LEASE_TTL / 3):
+                try:
+                    if self.redis.get(lease_key) != token:
+                        return
+                    self.redis.expire(lease_key, LEASE_TTL)
+                except Exception as e:
+                    logger.warning(f"Failed to renew lease for {kind} job {key}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"image-job-heartbeat-{key}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def update_layers(self, kind: str, key: str, layers: Dict[str, Dict[str, Any]]) -> None:
+        """Store per-layer progress for a pull."""
+        if not layers:
+            return
+        pipe = self.redis.pipeline()
+        pipe.hset(
+            self._layers_key(kind, key),
+            mapping={layer_id: json.dumps(info) for layer_id, info in layers.items()},
+        )
+        pipe.expire(self._layers_key(kind, key), JOB_TTL)
+        pipe.execute()
+
+    def finish(self, kind: str, key: str, status: str, **fields: Any) -> None:
+        """Record a terminal status and release the lease so the image can be re-requested."""
+        self.update(kind, key, status=status, **fields)
+        self.redis.delete(self._lease_key(kind, key), self._cancel_key(kind, key))
+
+    def request_cancel(self, kind: str, key: str) -> None:
+        """Flag a job for cancellation; the running worker checks this flag.
+
+        The flag lives as long as the job document, so a job queued for a
+        while still sees it; finish() and claim() clear it.
+        """
+        self.redis.setex(self._cancel_key(kind, key), JOB_TTL, "1")
+
+    def is_cancelled(self, kind: str, key: str) -> bool:
+        return bool(self.redis.exists(self._cancel_key(kind, key)))
+
+    # ---- queries ----
+
+    def _read_doc(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        data = self.redis.get(self._doc_key(kind, key))
+        return json.loads(data) if data else None
+
+    def get(self, kind: str, key: str, include_layers: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a job document, or None if no job is known for ``key``.
+
+        A job that claims to be active but whose lease has expired belonged
+        to a worker that died mid-job; it is reported as failed so callers
+        can retry instead of polling forever.
+        """
+        doc = self._read_doc(kind, key)
+        if doc is None:
+            return None
+
+        if doc.get("status") in ACTIVE_STATUSES and not self.redis.exists(self._lease_key(kind, key)):
+            doc.update({
+                "status": "failed",
+                "error": "Job was interrupted before completion",
+            })
+            self.redis.setex(self._doc_key(kind, key), JOB_TTL, json.dumps(doc))
+
+        if include_layers:
+            raw = self.redis.hgetall(self._layers_key(kind, key))
+            doc["layers"] = [
+                {"id": layer_id, **json.loads(info)}
+                for layer_id, info in sorted(raw.items())
+            ]
+        return doc
+
+    def list(self, kind: str, active_only: bool = True) -> List[Dict[str, Any]]:
+        """List jobs of ``kind``, pruning index entries whose document expired."""
+        jobs = []
+        for key in sorted(self.redis.smembers(self._index_key(kind))):
+            doc = self.get(kind, key)
+            if doc is None:
+                self.redis.srem(self._index_key(kind), key)
+                continue
+            if active_only and doc.get("status") not in ACTIVE_STATUSES:
+                continue
+            jobs.append({"key": key, **doc})
+        return jobs
+
+
+# Singleton instance
+_image_job_registry: Optional[ImageJobRegistry] = None
+
+
+def get_image_job_registry() -> ImageJobRegistry:
+    """Get the singleton ImageJobRegistry instance."""
+    global _image_job_registry
+    if _image_job_registry is None:
+        _image_job_registry = ImageJobRegistry()
+    return _image_job_registry
@@ -0,0 +1,510 @@
+# backend/cyroid/services/infrastructure_log_store.py
+"""
+Indexed in-memory store of CYROID infrastructure service logs.
+
+The admin logs endpoint used to fetch up to 5000 tail lines from a service
+container on every request and filter them in Python, so anything older
+than that window could not be found. Instead, one follower thread per
+service backfills the buffer once and then follows the container's log
+stream, appending parsed lines to a bounded buffer with:
+
+- a timestamp index (integer microseconds), so time ranges are two bisections
+- per-level sequence indexes, so level filters skip non-matching lines
+- a lowercased copy of every message for text search
+
+Reads never touch Docker, and live subscribers (the log tail WebSocket)
+get new lines as they are ingested. Followers survive container restarts
+by re-locating the container and resuming from the last ingested line.
+
+Every API worker keeps its own buffers, so paging cursors are derived from
+the log lines themselves rather than from buffer positions: a cursor is the
+line's timestamp in microseconds plus its ordinal among lines with the same
+timestamp, and means the same line on every worker. A worker's followers
+stop, and their buffers are dropped, once nobody has queried or tailed them
+for ``infra_log_idle_seconds``, so only workers that recently served log
+requests keep following containers.
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cyroid.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Severity ranks; a level filter matches lines at or above its rank
+LEVEL_RANKS = {"DEBUG": 0, "INFO": 1, "WARN": 2, "WARNING": 2, "ERROR": 3}
+_INDEXED_RANKS = (1, 2, 3)
+_LEVEL_PATTERN = re.compile(r"\b(ERROR|WARN(?:ING)?|INFO|DEBUG)\b", re.IGNORECASE)
+
+# Seconds between attempts to find a missing or restarted container
+FOLLOW_RETRY_SECONDS = 5
+# Live lines buffered per tail subscriber before new ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    """Exact epoch microseconds of a datetime (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int]:
+    """Split a ``<micros>-<ordinal>`` paging cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    micros, _, ordinal = cursor.rpartition("-")
+    return int(micros), int(ordinal)
+
+
+class LogRecord:
+    """One parsed log line."""
+
+    __slots__ = ("seq", "micros", "ordinal", "timestamp", "level", "message", "raw", "lowered")
+
+    def __init__(
+        self,
+        seq: int,
+        micros: int,
+        ordinal: int,
+        timestamp: Optional[datetime],
+        level: Optional[str],
+        message: str,
+        raw: str,
+    ):
+        self.seq = seq
+        self.micros = micros
+        self.ordinal = ordinal
+        self.timestamp = timestamp
+        self.level = level
+        self.message = message
+        self.raw = raw
+        self.lowered = message.lower()
+
+    @property
+    def cursor(self) -> str:
+        """Paging cursor naming this line on every worker."""
+        return f"{self.micros}-{self.ordinal}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "cursor": self.cursor,
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "message": self.message,
+            "raw": self.raw,
+        }
+
+
+@dataclass
+class LogPage:
+    """A page of query results, oldest first."""
+    records: List[LogRecord] = field(default_factory=list)
+    total: int = 0
+    has_more: bool = False
+
+
+def parse_log_line(line: str) -> Tuple[Optional[datetime], Optional[str], str]:
+    """Split a ``docker logs --timestamps`` line into timestamp, level and message."""
+    timestamp = None
+    message = line
+    try:
+        # Docker format: 2024-01-18T14:32:01.123456789Z message
+        if len(line) > 30 and line[4] == "-" and line[10] == "T":
+            ts_str = line[:30].split()[0]
+            timestamp = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+            message = line[31:].strip() if len(line) > 31 else line
+    except ValueError:
+        pass
+
+    level = None
+    level_match = _LEVEL_PATTERN.search(message[:100])
+    if level_match:
+        level = level_match.group(1).upper()
+        if level == "WARNING":
+            level = "WARN"
+    return timestamp, level, message
+
+
+def level_rank(level: Optional[str]) -> int:
+    """Minimum rank a level filter selects (0 selects everything)."""
+    return LEVEL_RANKS.get((level or "").upper(), 0)
+
+
+class ServiceLogBuffer:
+    """Bounded, indexed log buffer for one infrastructure service.
+
+    Records get increasing sequence numbers, local to this buffer, which
+    the live tail uses to skip lines it already sent. Paging across requests
+    uses the worker-independent ``cursor`` of each record instead.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        capacity: int,
+        locator: Optional[Callable[[], Any]] = None,
+        idle_seconds: Optional[float] = None,
+    ):
+        self.service = service
+        self.capacity = capacity
+        self.idle_seconds = idle_seconds
+        self._locator = locator
+        self._lock = threading.Lock()
+        self._records: List[LogRecord] = []
+        self._times: List[int] = []  # Non-decreasing epoch microseconds, parallel to _records
+        self._by_rank: Dict[int, List[int]] = {rank: [] for rank in _INDEXED_RANKS}
+        self._next_seq = 0
+        self._last_time = 0  # 0 until a line with a timestamp is seen
+        self._ordinal = 0
+        self.last_used = time.monotonic()
+        self._subscribers: Dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._dropped: Dict[asyncio.Queue, int] = {}
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self.attached = False
+
+    # Ingestion
+
+    def ingest(self, lines: Iterable[str]) -> List[LogRecord]:
+        """Parse and append log lines, evicting the oldest beyond capacity.
+
+        Args:
+            lines: Raw ``docker logs --timestamps`` lines, oldest first
+
+        Returns:
+            The appended records
+        """
+        added = []
+        with self._lock:
+            for line in lines:
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                timestamp, level, message = parse_log_line(line)
+                # stdout and stderr can interleave slightly out of order; keep the index sorted
+                line_time = self._last_time
+                if timestamp is not None:
+                    line_time = max(line_time, to_micros(timestamp))
+                self._ordinal = self._ordinal + 1 if self._records and line_time == self._last_time else 0
+                self._last_time = line_time
+                record = LogRecord(self._next_seq, line_time, self._ordinal, timestamp, level, message, line)
+                self._next_seq += 1
+                self._records.append(record)
+                self._times.append(self._last_time)
+                rank = LEVEL_RANKS.get(level, 0)
+                for indexed in _INDEXED_RANKS:
+                    if rank >= indexed:
+                        self._by_rank[indexed].append(record.seq)
+                added.append(record)
+            # Evict in batches so appends stay amortized O(1)
+            excess = len(self._records) - self.capacity
+            if excess > max(self.capacity // 4, 0):
+                self._records = self._records[excess:]
+                self._times = self._times[excess:]
+                first_seq = self._records[0].seq if self._records else self._next_seq
+                for rank, seqs in self._by_rank.items():
+                    self._by_rank[rank] = seqs[bisect_left(seqs, first_seq):]
+            subscribers = list(self._subscribers.items())
+
+        if added:
+            for queue, loop in subscribers:
+                try:
+                    loop.call_soon_threadsafe(self._offer, queue, added)
+                except RuntimeError:
+                    # Subscriber's event loop is closed
+                    self.unsubscribe(queue)
+        return added
+
+    def _offer(self, queue: asyncio.Queue, records: List[LogRecord]) -> None:
+        try:
+            queue.put_nowait(records)
+        except asyncio.QueueFull:
+            self._dropped[queue] = self._dropped.get(queue, 0) + len(records)
+
+    # Queries
+
+    def query(
+        self,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        before: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> LogPage:
+        """Find buffered lines, newest matches first, returned oldest first.
+
+        Args:
+            level: Minimum level (error, warning, info; debug or None for all)
+            search: Case-insensitive text the message must contain
+            since: Earliest timestamp
+            until: Latest timestamp
+            before: Only lines older than the line with this cursor
+            limit: Page size
+            offset: Matches to skip, counting back from the newest
+
+        Returns:
+            LogPage with the page and the total number of matches
+
+        Raises:
+            ValueError: If ``before`` is not a valid cursor
+        """
+        rank = level_rank(level)
+        needle = search.lower() if search else None
+        before_key = parse_cursor(before) if before is not None else None
+        self.last_used = time.monotonic()
+        with self._lock:
+            if not self._records:
+                return LogPage()
+            first_seq = self._records[0].seq
+            lo = bisect_left(self._times, to_micros(since)) if since else 0
+            hi = bisect_right(self._times, to_micros(until)) if until else len(self._records)
+            if before_key is not None:
+                hi = min(hi, self._position(*before_key))
+            if lo >= hi:
+                return LogPage()
+
+            if rank:
+                seqs = self._by_rank[rank]
+                start = bisect_left(seqs, first_seq + lo)
+                end = bisect_left(seqs, first_seq + hi)
+                candidates = (self._records[seq - first_seq] for seq in reversed(seqs[start:end]))
+                count = end - start
+            else:
+                candidates = (self._records[i] for i in range(hi - 1, lo - 1, -1))
+                count = hi - lo
+
+            if needle is None:
+                page = []
+                for record in candidates:
+                    if len(page) >= offset + limit:
+                        break
+                    page.append(record)
+                page = page[offset:]
+                total = count
+            else:
+                page = []
+                total = 0
+                for record in candidates:
+                    if needle in record.lowered:
+                        if offset <= total < offset + limit:
+                            page.append(record)
+                        total += 1
+
+        page.reverse()
+        return LogPage(records=page, total=total, has_more=offset + limit < total)
+
+    def _position(self, line_time: int, ordinal: int) -> int:
+        """Index of the line a cursor names (or where it would be). Caller holds the lock."""
+        start = bisect_left(self._times, line_time)
+        end = bisect_right(self._times, line_time, lo=start)
+        if start == end:
+            return start
+        # Ordinals are counted from the first line with this timestamp, which may have been evicted
+        return min(start + max(ordinal - self._records[start].ordinal, 0), end)
+
+    # Live tail
+
+    def subscribe(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.Queue:
+        """Queue receiving lists of newly ingested records on the caller's event loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.last_used = time.monotonic()
+        with self._lock:
+            self._subscribers[queue] = loop or asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.last_used = time.monotonic()
+        with self._lock:
+            self._subscribers.pop(queue, None)
+            self._dropped.pop(queue, None)
+
+    def idle(self) -> bool:
+        """True if nobody is tailing the buffer and it has not been queried recently."""
+        if self.idle_seconds is None:
+            return False
+        with self._lock:
+            if self._subscribers:
+                return False
+        return time.monotonic() - self.last_used > self.idle_seconds
+
+    def dropped(self, queue: asyncio.Queue) -> int:
+        """Live records a slow subscriber has missed because its queue was full."""
+        return self._dropped.get(queue, 0)
+
+    # Following
+
+    def start(self) -> None:
+        """Start following the service container, if not already."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._follow, name=f"logs-{self.service}", daemon=True)
+            self._thread.start()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait until the initial backfill has been attempted."""
+        return self._ready.wait(timeout)
+
+    def stop(self) -> None:
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _follow(self) -> None:
+        while not self._stop.is_set():
+            if self.idle():
+                # Resumed by start() on the next query
+                logger.debug(f"Stopped following idle {self.service} logs")
+                break
+            try:
+                container = self._locator() if self._locator else None
+            except Exception as e:
+                logger.warning(f"Could not locate {self.service} container: {e}")
+                container = None
+            self.attached = container is not None
+            if container is None:
+                self._ready.set()
+                self._stop.wait(FOLLOW_RETRY_SECONDS)
+                continue
+
+            try:
+                with self._lock:
+                    resume_after = self._last_time if self._records else None
+                if not resume_after:
+                    # Backfill with one read so the first query has history to search
+                    raw = container.logs(tail=self.capacity, timestamps=True)
+                    self.ingest(raw.decode("utf-8", errors="replace").split("\n"))
+                    with self._lock:
+                        resume_after = self._last_time if self._records else None
+                self._ready.set()
+                self._follow_stream(container, resume_after)
+            except Exception as e:
+                logger.warning(f"Log stream for {self.service} ended: {e}")
+            self.attached = False
+            self._ready.set()
+            self._stop.wait(FOLLOW_RETRY_SECONDS)
+
+    def _follow_stream(self, container, resume_after: Optional[int]) -> None:
+        kwargs: Dict[str, Any] = {"stream": True, "follow": True, "timestamps": True}
+        if resume_after:
+            kwargs["since"] = resume_after // 1_000_000
+        else:
+            resume_after = None
+            kwargs["tail"] = 0
+        self._stream = container.logs(**kwargs)
+        pending = b""
+        try:
+            for chunk in self._stream:
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                decoded = [line.decode("utf-8", errors="replace") for line in lines]
+                if resume_after is not None:
+                    # `since` has one-second resolution; skip lines already ingested
+                    decoded = [line for line in decoded if _after(line, resume_after)]
+                    if decoded:
+                        resume_after = None
+                self.ingest(decoded)
+                if self._stop.is_set() or self.idle():
+                    break
+        finally:
+            self._stream = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lines": len(self._records),
+                "oldest": self._records[0].timestamp if self._records else None,
+                "subscribers": len(self._subscribers),
+                "dropped": sum(self._dropped.values()),
+                "following": self.attached,
+            }
+
+
+def _after(line: str, resume_after: int) -> bool:
+    timestamp, _, _ = parse_log_line(line)
+    return timestamp is None or to_micros(timestamp) > resume_after
+
+
+class InfrastructureLogStore:
+    """Log buffers of the infrastructure services, followed on first use.
+
+    Followers of idle buffers stop on their own; the buffers themselves are
+    dropped the next time the store is used.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, idle_seconds: Optional[float] = None):
+        settings = get_settings()
+        self._capacity = capacity or settings.infra_log_buffer_lines
+        self._idle_seconds = idle_seconds if idle_seconds is not None else settings.infra_log_idle_seconds
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, ServiceLogBuffer] = {}
+
+    def service(self, service: str, locator: Callable[[], Any], wait: float = 10.0) -> ServiceLogBuffer:
+        """Get a service's buffer, starting to follow its container if needed.
+
+        Args:
+            service: Infrastructure service name
+            locator: Returns the service's container (or None if not found)
+            wait: Seconds to wait for the initial backfill of a new buffer
+
+        Returns:
+            The service's ServiceLogBuffer
+        """
+        with self._lock:
+            buffer = self._buffers.get(service)
+            if buffer is None:
+                buffer = ServiceLogBuffer(service, self._capacity, locator, self._idle_seconds)
+                self._buffers[service] = buffer
+            buffer.last_used = time.monotonic()
+            idle = [name for name, other in self._buffers.items() if other.idle()]
+            dropped = [self._buffers.pop(name) for name in idle]
+        for other in dropped:
+            other.stop()
+        buffer.start()
+        buffer.wait_ready(wait)
+        return buffer
+
+    def stop_all(self) -> None:
+        with self._lock:
+            buffers = list(self._buffers.values())
+        for buffer in buffers:
+            buffer.stop()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buffers = dict(self._buffers)
+        return {name: buffer.stats() for name, buffer in buffers.items()}
+
+
+_store: Optional[InfrastructureLogStore] = None
+
+
+def get_infrastructure_log_store() -> InfrastructureLogStore:
+    """Get the infrastructure log store singleton."""
+    global _store
+    if _store is None:
+        _store = InfrastructureLogStore()
+    return _store
@@ -0,0 +1,305 @@
+# backend/cyroid/services/network_policy_service.py
+"""
+Live per-network policy updates for deployed ranges.
+
+Toggling internet access or isolation on a running range used to resolve the
+DinD container by label, detect its outbound interface with an exec, then run
+one exec per iptables command, all inside the HTTP request.
+
+A NetworkPolicyAgent is kept per range. It holds the resolved topology (the
+DinD container and its outbound interface) and converges a network's policy with a single exec of a small shell script. The
+script checks each rule before adding or removing it and prints what it
+changed, so the reported diff reflects the rules actually applied, even if
+they were changed by a redeploy since the agent last ran.
+
+Policy inside DinD, per network bridge:
+- internet: ``FORWARD -i br-X -o <out> -j ACCEPT``. The shared return-traffic
+  and MASQUERADE rules are added when needed but never removed, since other
+  networks in the range may depend on them.
+- isolation: the FORWARD rules from isolation_rules() drop new connections
+  routed into or out of br-X, so the network cannot reach other networks or
+  be reached from them. Deploy-time setup (setup_network_isolation_in_dind)
+  uses the same rules. They are inserted at the head of FORWARD so that they
+  take precedence over ACCEPT rules added for routing or internet access.
+- DHCP is served by the range's VyOS router, not by iptables; DHCP changes are
+  recorded but produce no rule changes.
+"""
+import logging
+import shlex
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADD_MARK = "+"
+REMOVE_MARK = "-"
+
+
+@dataclass
+class NetworkPolicy:
+    """Desired policy for one network."""
+    internet_enabled: bool
+    is_isolated: bool
+    dhcp_enabled: bool
+
+
+@dataclass
+class PolicyChange:
+    """Result of applying a network policy."""
+    network: str
+    applied: bool
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "network": self.network,
+            "applied": self.applied,
+            "added": self.added,
+            "removed": self.removed,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+def bridge_for(docker_network_id: str) -> str:
+    """Bridge interface name Docker uses for a network ID."""
+    return f"br-{docker_network_id[:12]}"
+
+
+def isolation_rules(bridge: str) -> List[str]:
+    """FORWARD rules that cut a network's bridge off from routed traffic.
+
+    Traffic within the bridge and replies to established connections are not
+    matched.
+
+    Args:
+        bridge: Bridge interface of the network (br-<id>)
+
+    Returns:
+        iptables arguments without the -I/-D verb
+    """
+    return [
+        f"FORWARD -i {bridge} ! -o {bridge} -m state --state NEW,INVALID -j DROP",
+        f"FORWARD ! -i {bridge} -o {bridge} -m state --state NEW,INVALID -j DROP",
+    ]
+
+
+def policy_rules(bridge: str, out_iface: str, policy: NetworkPolicy) -> Tuple[List[str], List[str], List[str]]:
+    """Compute the rules to converge a network to a policy.
+
+    Args:
+        bridge: Bridge interface of the network (br-<id>)
+        out_iface: DinD interface carrying the default route
+        policy: Desired policy
+
+    Returns:
+        (ensure, shared, absent): per-network rules that must exist, shared
+        rules that must exist, and per-network rules that must not exist.
+        Rules are iptables arguments without the -A/-D verb.
+    """
+    internet = f"FORWARD -i {bridge} -o {out_iface} -j ACCEPT"
+    isolation = isolation_rules(bridge)
+
+    ensure, shared, absent = [], [], []
+    if policy.internet_enabled:
+        ensure.append(internet)
+        shared.append(f"FORWARD -i {out_iface} -m state --state ESTABLISHED,RELATED -j ACCEPT")
+        shared.append(f"-t nat POSTROUTING -o {out_iface} -j MASQUERADE")
+    else:
+        absent.append(internet)
+
+    if policy.is_isolated:
+        ensure.extend(isolation)
+    else:
+        absent.extend(isolation)
+
+    return ensure, shared, absent
+
+
+def _split_table(rule: str) -> Tuple[str, str]:
+    """Split a leading ``-t <table>`` off a rule."""
+    if rule.startswith("-t "):
+        _, table, rest = rule.split(" ", 2)
+        return f"-t {table} ", rest
+    return "", rule
+
+
+def build_script(ensure: List[str], absent: List[str]) -> str:
+    """Build one idempotent shell script that converges the given rules.
+
+    Each rule is checked with ``iptables -C`` first; the script prints
+    ``+ <rule>`` or ``- <rule>`` for every rule it actually changed and exits
+    non-zero if any change failed. DROP rules are inserted at the head of
+    their chain, other rules are appended.
+    """
+    lines = ["rc=0"]
+    for rule in ensure:
+        table, spec = _split_table(rule)
+        quoted = shlex.quote(rule)
+        verb = "-I" if spec.endswith("-j DROP") else "-A"
+        lines.append(
+            f"iptables {table}-C {spec} 2>/dev/null || "
+            f"{{ iptables {table}{verb} {spec} && echo {ADD_MARK} {quoted} || rc=1; }}"
+        )
+    for rule in absent:
+        table, spec = _split_table(rule)
+        quoted = shlex.quote(rule)
+        lines.append(
+            f"while iptables {table}-C {spec} 2>/dev/null; do "
+            f"iptables {table}-D {spec} && echo {REMOVE_MARK} {quoted} || {{ rc=1; break; }}; done"
+        )
+    lines.append("exit $rc")
+    return "\n".join(lines)
+
+
+def parse_changes(output: str) -> Tuple[List[str], List[str]]:
+    """Parse the added/removed rules printed by build_script()."""
+    added, removed = [], []
+    for line in output.splitlines():
+        if line.startswith(f"{ADD_MARK} "):
+            added.append(line[2:])
+        elif line.startswith(f"{REMOVE_MARK} "):
+            removed.append(line[2:])
+    return added, removed
+
+
+class NetworkPolicyAgent:
+    """Holds a deployed range's network topology and applies policy deltas."""
+
+    def __init__(self, range_id: str, container, out_iface: str):
+        self.range_id = range_id
+        self.container = container
+        self.out_iface = out_iface
+        self.policies: Dict[str, NetworkPolicy] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def container_id(self) -> str:
+        return self.container.id
+
+    def apply(self, network_name: str, docker_network_id: str, policy: NetworkPolicy) -> PolicyChange:
+        """Converge one network to a policy with a single exec.
+
+        Args:
+            network_name: Network name (for reporting)
+            docker_network_id: Network ID inside DinD
+            policy: Desired policy
+
+        Returns:
+            PolicyChange listing the rules added and removed
+        """
+        started = time.monotonic()
+        # Not cached: a recreated network keeps its name but gets a new bridge
+        bridge = bridge_for(docker_network_id)
+        ensure, shared, absent = policy_rules(bridge, self.out_iface, policy)
+        change = PolicyChange(network=network_name, applied=True)
+
+        with self._lock:
+            exit_code, output = self.container.exec_run(
+                ["sh", "-c", build_script(shared + ensure, absent)], privileged=True
+            )
+            output_str = output.decode() if isinstance(output, bytes) else str(output or "")
+            change.added, change.removed = parse_changes(output_str)
+            if exit_code != 0:
+                change.applied = False
+                change.error = output_str.strip() or f"exit code {exit_code}"
+                logger.warning(f"Network policy for {network_name} partially applied: {change.error}")
+            else:
+                self.policies[network_name] = policy
+
+        change.duration_ms = round((time.monotonic() - started) * 1000, 2)
+        logger.info(
+            f"Applied policy to {network_name} in range {self.range_id} "
+            f"({len(change.added)} added, {len(change.removed)} removed, {change.duration_ms}ms)"
+        )
+        return change
+
+
+class NetworkPolicyService:
+    """Keeps one NetworkPolicyAgent per deployed range."""
+
+    def __init__(self):
+        self._agents: Dict[str, NetworkPolicyAgent] = {}
+        self._lock = threading.Lock()
+
+    def get_agent(self, range_id: str, dind_container_id: str) -> Optional[NetworkPolicyAgent]:
+        """Get the agent for a range, resolving its topology on first use.
+
+        The cached agent is reused as long as the range still points at the
+        same DinD container; a redeployed range gets a fresh agent.
+
+        Args:
+            range_id: Range ID
+            dind_container_id: The range's current DinD container ID
+
+        Returns:
+            The agent, or None if the DinD container cannot be found
+        """
+        range_id = str(range_id)
+        with self._lock:
+            agent = self._agents.get(range_id)
+            if agent and agent.container_id == dind_container_id:
+                return agent
+
+        from cyroid.services.dind_service import get_dind_service
+        dind_service = get_dind_service()
+
+        container = None
+        try:
+            container = dind_service.host_client.containers.get(dind_container_id)
+        except Exception:
+            container = dind_service._find_container_by_range_id(range_id)
+        if not container:
+            self.invalidate(range_id)
+            return None
+
+        agent = NetworkPolicyAgent(range_id, container, dind_service._get_outbound_interface(container))
+        with self._lock:
+            self._agents[range_id] = agent
+        logger.debug(f"Resolved network topology for range {range_id} (outbound {agent.out_iface})")
+        return agent
+
+    def apply_policy(
+        self,
+        range_id: str,
+        dind_container_id: str,
+        network_name: str,
+        docker_network_id: str,
+        policy: NetworkPolicy,
+    ) -> Optional[PolicyChange]:
+        """Apply a network's policy on its deployed range.
+
+        Returns:
+            PolicyChange, or None if the range has no reachable DinD container
+        """
+        agent = self.get_agent(range_id, dind_container_id)
+        if not agent:
+            return None
+        try:
+            return agent.apply(network_name, docker_network_id, policy)
+        except Exception:
+            # The container went away or was replaced; re-resolve next time
+            self.invalidate(range_id)
+            raise
+
+    def invalidate(self, range_id: str) -> None:
+        """Forget a range's topology (e.g. when its DinD container stops)."""
+        with self._lock:
+            self._agents.pop(str(range_id), None)
+
+
+# Singleton instance
+_network_policy_service: Optional[NetworkPolicyService] = None
+
+
+def get_network_policy_service() -> NetworkPolicyService:
+    """Get the singleton NetworkPolicyService instance."""
+    global _network_policy_service
+    if _network_policy_service is None:
+        _network_policy_service = NetworkPolicyService()
+    return _network_policy_service
@@ -1,26 +1,175 @@
 # backend/cyroid/services/notification_service.py
-"""Service for creating and querying user-scoped notifications."""
+"""Service for creating and querying user-scoped notifications.
+
+Each notification is delivered into the inbox (``notification_inbox``) of
+every user its scoping resolves to, when it is created: the targeted user,
+users holding the target role, the owner and assignee of a range, or the
+participants of an event. Fan-out is a single INSERT ... SELECT, however
+many users a role has.
+
+Because recipients are resolved on write, a user who later gains a role, a
+range assignment or an event participation would miss what was sent to that
+scope before. When such a grant is flushed, the granting transaction
+delivers the notifications of the last ``BACKFILL_DAYS`` scoped to that
+user into their inbox before it commits. Older notifications are not
+backfilled, and losing a role or assignment does not remove entries
+already delivered.
+
+Read state is kept per inbox entry, and ``notification_counters`` holds each
+user's unread and total counts, updated as entries are delivered and read,
+so the unread badge is a primary-key lookup.
+
+New notifications are pushed to their recipients' open WebSockets: one
+message per notification is published on the notifications channel once the
+creating transaction commits (never for a rollback), and each API worker's
+``ConnectionManager`` forwards it to its own connections of those users.
+"""
+import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple
 from uuid import UUID
 
+from redis import Redis
+from sqlalchemy import delete, event, func, insert, inspect, literal, or_, select, union, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from cyroid.models.notification import Notification, NotificationType, NotificationSeverity
-from cyroid.models.user import User
+from cyroid.config import get_settings
+from cyroid.models.notification import (
+    Notification,
+    NotificationCounter,
+    NotificationInboxEntry,
+    NotificationSeverity,
+    NotificationType,
+)
+from cyroid.models.user import User, UserAttribute
 from cyroid.models.range import Range
-from cyroid.models.event import TrainingEvent, EventParticipant
-from cyroid.services.event_broadcaster import get_broadcaster
+from cyroid.models.event import EventParticipant
+from cyroid.services.event_broadcaster import NOTIFICATIONS_CHANNEL
 
 logger = logging.getLogger(__name__)
 
+# Session.info keys for pushes waiting on the transaction to commit
+PENDING_PUSHES_KEY = "notification_pushes"
+PUSH_REDIS_KEY = "notification_push_redis"
+# Session.info key for role, assignment and participation grants awaiting backfill
+PENDING_GRANTS_KEY = "notification_grants"
+
+# Notifications younger than this are delivered to users who gain access later
+BACKFILL_DAYS = 30
+
+_push_redis: Optional[Redis] = None
+
+
+def _get_push_redis() -> Redis:
+    global _push_redis
+    if _push_redis is None:
+        _push_redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+    return _push_redis
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_pushes(session: Session) -> None:
+    """Publish notifications created in the committed transaction."""
+    pushes = session.info.pop(PENDING_PUSHES_KEY, None)
+    client = session.info.pop(PUSH_REDIS_KEY, None)
+    if not pushes:
+        return
+    try:
+        client = client or _get_push_redis()
+        pipe = client.pipeline(transaction=False)
+        for payload in pushes:
+            pipe.publish(NOTIFICATIONS_CHANNEL, payload)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to push {len(pushes)} notification(s): {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_pushes(session: Session) -> None:
+    session.info.pop(PENDING_PUSHES_KEY, None)
+    session.info.pop(PUSH_REDIS_KEY, None)
+    session.info.pop(PENDING_GRANTS_KEY, None)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_access_grants(session: Session, flush_context, instances) -> None:
+    """Remember new roles, range assignments and event participations.
+
+    Role attributes and participants are kept as objects because their
+    user_id may only be set by the flush (e.g. ``user.attributes.append``).
+    """
+    grants = []
+    for obj in session.new:
+        if isinstance(obj, EventParticipant) or (isinstance(obj, UserAttribute) and obj.attribute_type == "role"):
+            grants.append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Range):
+            grants.extend(user_id for user_id in inspect(obj).attrs.assigned_to_user_id.history.added if user_id)
+    if grants:
+        session.info.setdefault(PENDING_GRANTS_KEY, []).extend(grants)
+
+
+@event.listens_for(Session, "before_commit")
+def _deliver_to_new_grantees(session: Session) -> None:
+    """Backfill the inboxes of users granted access in this transaction."""
+    # Flush now (commit would next) so grants still pending are collected
+    session.flush()
+    grants = session.info.pop(PENDING_GRANTS_KEY, None)
+    if not grants:
+        return
+    user_ids = {grant if isinstance(grant, UUID) else grant.user_id for grant in grants}
+    user_ids.discard(None)
+    if user_ids:
+        NotificationService(session).deliver_existing(user_ids)
+
+
+def _recipients(notification: Notification):
+    """SELECT user_id of every user a notification is scoped to, or None if unscoped."""
+    selects = []
+    if notification.user_id:
+        selects.append(select(User.id.label("user_id")).where(User.id == notification.user_id))
+    if notification.target_role:
+        selects.append(select(UserAttribute.user_id.label("user_id")).where(
+            UserAttribute.attribute_type == "role",
+            UserAttribute.attribute_value == notification.target_role,
+        ))
+    if notification.resource_type == "range" and notification.resource_id:
+        # Range owner or assignee
+        selects.append(select(Range.created_by.label("user_id")).where(Range.id == notification.resource_id))
+        selects.append(select(Range.assigned_to_user_id.label("user_id")).where(
+            Range.id == notification.resource_id, Range.assigned_to_user_id.isnot(None)
+        ))
+    if notification.resource_type == "event" and notification.resource_id:
+        selects.append(select(EventParticipant.user_id.label("user_id")).where(EventParticipant.event_id == notification.resource_id))
+
+    if not selects:
+        return None
+    return union(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+
+
+def _inbox_page(user_id: UUID, limit: int, offset: int, unread_only: bool):
+    stmt = select(NotificationInboxEntry).where(NotificationInboxEntry.user_id == user_id)
+    if unread_only:
+        stmt = stmt.where(NotificationInboxEntry.read_at.is_(None))
+    return stmt.order_by(NotificationInboxEntry.created_at.desc()).offset(offset).limit(limit)
+
+
+def _counts(counter: Optional[NotificationCounter], unread_only: bool) -> Tuple[int, int]:
+    """(total, unread_count) as returned by get_user_notifications()."""
+    unread = counter.unread if counter else 0
+    total = counter.total if counter else 0
+    return (unread if unread_only else total), unread
+
 
 class NotificationService:
     """Service for managing user-scoped notifications."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, redis_client: Optional[Redis] = None):
         self.db = db
+        self._redis = redis_client
 
     def create_notification(
         self,
@@ -47,7 +196,7 @@ class NotificationService:
             resource_type: Resource type for access-based scoping (optional)
             resource_id: Resource ID for access-based scoping (optional)
             source_event_id: Link to source EventLog entry (optional)
-            broadcast: Whether to broadcast via WebSocket
+            broadcast: Whether to push to recipients' WebSockets on commit
 
         Returns:
             Created Notification instance
@@ -65,32 +214,123 @@ class NotificationService:
         )
         self.db.add(notification)
         self.db.flush()
+        self._deliver(notification)
 
         if broadcast:
             self._broadcast_notification(notification)
 
         return notification
 
-    def _broadcast_notification(self, notification: Notification):
-        """Broadcast notification to relevant WebSocket clients."""
-        try:
-            broadcaster = get_broadcaster()
-            event_data = {
-                "event_type": "notification",
-                "notification_id": str(notification.id),
+    def _broadcast_notification(self, notification: Notification) -> None:
+        """Queue a WebSocket push of the notification to its recipients.
+
+        The push is published when the session commits, so clients are never
+        told about a notification that is not yet in their inbox.
+        """
+        recipients = self.db.scalars(
+            select(NotificationInboxEntry.user_id).where(NotificationInboxEntry.notification_id == notification.id)
+        ).all()
+        if not recipients:
+            return
+        payload = json.dumps({
+            "recipients": [str(user_id) for user_id in recipients],
+            "notification": {
+                "id": str(notification.id),
                 "notification_type": notification.notification_type.value,
                 "title": notification.title,
                 "message": notification.message,
                 "severity": notification.severity.value,
-                "user_id": str(notification.user_id) if notification.user_id else None,
-                "target_role": notification.target_role,
                 "resource_type": notification.resource_type,
                 "resource_id": str(notification.resource_id) if notification.resource_id else None,
-                "timestamp": notification.created_at.isoformat(),
-            }
-            broadcaster.broadcast(event_data)
-        except Exception as e:
-            logger.warning(f"Failed to broadcast notification: {e}")
+                "created_at": notification.created_at.isoformat(),
+            },
+        })
+        self.db.info.setdefault(PENDING_PUSHES_KEY, []).append(payload)
+        if self._redis is not None:
+            self.db.info[PUSH_REDIS_KEY] = self._redis
+
+    def _deliver(self, notification: Notification) -> int:
+        """Fan a new notification out to its recipients' inboxes and counters.
+
+        Returns:
+            Number of recipients
+        """
+        recipients = _recipients(notification)
+        if recipients is None:
+            return 0
+
+        notification_id = literal(notification.id, Notification.id.type)
+        created_at = select(Notification.created_at).where(Notification.id == notification.id).scalar_subquery()
+        delivered = self.db.execute(
+            insert(NotificationInboxEntry).from_select(
+                ["user_id", "notification_id", "created_at"],
+                select(recipients.c.user_id, notification_id, created_at).distinct(),
+            )
+        ).rowcount
+
+        inbox_users = select(NotificationInboxEntry.user_id).where(
+            NotificationInboxEntry.notification_id == notification.id
+        )
+        self._ensure_counters(inbox_users)
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id.in_(inbox_users))
+            .values(unread=NotificationCounter.unread + 1, total=NotificationCounter.total + 1)
+        )
+        return delivered
+
+    def deliver_existing(self, user_ids, days: int = BACKFILL_DAYS) -> int:
+        """Deliver recent notifications a user is now scoped to but never received.
+
+        Args:
+            user_ids: Users whose roles, range assignments or event participations changed
+            days: How far back to look
+
+        Returns:
+            Number of inbox entries added
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        delivered = 0
+        for user_id in user_ids:
+            user = literal(user_id, User.id.type)
+            roles = select(UserAttribute.attribute_value).where(
+                UserAttribute.user_id == user_id, UserAttribute.attribute_type == "role"
+            )
+            ranges = select(Range.id).where(or_(Range.created_by == user_id, Range.assigned_to_user_id == user_id))
+            events = select(EventParticipant.event_id).where(EventParticipant.user_id == user_id)
+            missing = select(user, Notification.id, Notification.created_at).where(
+                Notification.created_at >= cutoff,
+                or_(
+                    Notification.target_role.in_(roles),
+                    (Notification.resource_type == "range") & Notification.resource_id.in_(ranges),
+                    (Notification.resource_type == "event") & Notification.resource_id.in_(events),
+                ),
+                ~select(NotificationInboxEntry.notification_id).where(
+                    NotificationInboxEntry.user_id == user_id,
+                    NotificationInboxEntry.notification_id == Notification.id,
+                ).exists(),
+            )
+            added = self.db.execute(
+                insert(NotificationInboxEntry).from_select(["user_id", "notification_id", "created_at"], missing)
+            ).rowcount
+            if added:
+                self.recount([user_id])
+                delivered += added
+        return delivered
+
+    def _ensure_counters(self, user_ids) -> None:
+        """Create zeroed counters for the given users that have none yet."""
+        users = user_ids.subquery()
+        missing = select(users.c.user_id, literal(0), literal(0)).where(
+            ~select(NotificationCounter.user_id).where(NotificationCounter.user_id == users.c.user_id).exists()
+        )
+        columns = ["user_id", "unread", "total"]
+        if self.db.get_bind().dialect.name == "postgresql":
+            # A concurrent delivery may create the same counter
+            stmt = pg_insert(NotificationCounter).from_select(columns, missing).on_conflict_do_nothing()
+        else:
+            stmt = insert(NotificationCounter).from_select(columns, missing)
+        self.db.execute(stmt)
 
     def get_user_notifications(
         self,
@@ -98,8 +338,8 @@ class NotificationService:
         limit: int = 50,
         offset: int = 0,
         unread_only: bool = False,
-    ) -> Tuple[List[Notification], int, int]:
-        """Get notifications visible to a specific user.
+    ) -> Tuple[List[NotificationInboxEntry], int, int]:
+        """Get a page of a user's inbox, newest first.
 
         Args:
             user: The user to get notifications for
@@ -108,71 +348,16 @@ class NotificationService:
             unread_only: Only return unread notifications
 
         Returns:
-            Tuple of (notifications, total_count, unread_count)
+            Tuple of (inbox entries, total_count, unread_count); each entry
+            carries its notification and the user's read_at
         """
-        # Build query for notifications this user can see
-        query = self._build_user_query(user)
-
-        if unread_only:
-            query = query.filter(Notification.read_at.is_(None))
-
-        # Get total and unread counts
-        total = query.count()
-        unread_query = self._build_user_query(user).filter(Notification.read_at.is_(None))
-        unread_count = unread_query.count()
+        entries = list(self.db.scalars(_inbox_page(user.id, limit, offset, unread_only)).unique())
+        total, unread_count = _counts(self.db.get(NotificationCounter, user.id), unread_only)
+        return entries, total, unread_count
 
-        # Get paginated results
-        notifications = query.order_by(
-            Notification.created_at.desc()
-        ).offset(offset).limit(limit).all()
-
-        return notifications, total, unread_count
-
-    def _build_user_query(self, user: User):
-        """Build query for notifications visible to a user."""
-        from sqlalchemy import or_
-
-        # Start with base query
-        query = self.db.query(Notification)
-
-        # Build OR conditions for visibility
-        conditions = []
-
-        # 1. Direct user targeting
-        conditions.append(Notification.user_id == user.id)
-
-        # 2. Role-based targeting
-        if user.roles:
-            for role in user.roles:
-                conditions.append(Notification.target_role == role)
-
-        # 3. Resource-based targeting (check user access)
-        # For ranges - user owns or is assigned
-        range_subquery = self.db.query(Range.id).filter(
-            or_(
-                Range.created_by == user.id,
-                Range.assigned_to_user_id == user.id,
-            )
-        ).subquery()
-        conditions.append(
-            (Notification.resource_type == "range") &
-            (Notification.resource_id.in_(range_subquery))
-        )
-
-        # For events - user is participant
-        event_subquery = self.db.query(EventParticipant.event_id).filter(
-            EventParticipant.user_id == user.id
-        ).subquery()
-        conditions.append(
-            (Notification.resource_type == "event") &
-            (Notification.resource_id.in_(event_subquery))
-        )
-
-        # Admin sees all admin-only notifications
-        if "admin" in (user.roles or []):
-            conditions.append(Notification.target_role == "admin")
-
-        return query.filter(or_(*conditions))
+    def get_unread_count(self, user: User) -> int:
+        counter = self.db.get(NotificationCounter, user.id)
+        return counter.unread if counter else 0
 
     def mark_as_read(self, notification_ids: List[UUID], user: User) -> int:
         """Mark notifications as read for a user.
@@ -184,16 +369,22 @@ class NotificationService:
         Returns:
             Number of notifications updated
         """
-        # Only update notifications the user can see
-        query = self._build_user_query(user).filter(
-            Notification.id.in_(notification_ids),
-            Notification.read_at.is_(None),
-        )
-
-        count = query.update(
-            {"read_at": datetime.utcnow()},
-            synchronize_session=False
-        )
+        # Only entries in the user's own inbox
+        count = self.db.execute(
+            update(NotificationInboxEntry)
+            .where(
+                NotificationInboxEntry.user_id == user.id,
+                NotificationInboxEntry.notification_id.in_(notification_ids),
+                NotificationInboxEntry.read_at.is_(None),
+            )
+            .values(read_at=datetime.now(timezone.utc))
+        ).rowcount
+        if count:
+            self.db.execute(
+                update(NotificationCounter)
+                .where(NotificationCounter.user_id == user.id)
+                .values(unread=NotificationCounter.unread - count)
+            )
         self.db.flush()
         return count
 
@@ -203,17 +394,40 @@ class NotificationService:
         Returns:
             Number of notifications updated
         """
-        query = self._build_user_query(user).filter(
-            Notification.read_at.is_(None)
-        )
-
-        count = query.update(
-            {"read_at": datetime.utcnow()},
-            synchronize_session=False
+        count = self.db.execute(
+            update(NotificationInboxEntry)
+            .where(NotificationInboxEntry.user_id == user.id, NotificationInboxEntry.read_at.is_(None))
+            .values(read_at=datetime.now(timezone.utc))
+        ).rowcount
+        self.db.execute(
+            update(NotificationCounter).where(NotificationCounter.user_id == user.id).values(unread=0)
         )
         self.db.flush()
         return count
 
+    def recount(self, user_ids=None) -> None:
+        """Recompute counters from the inbox.
+
+        Args:
+            user_ids: Users (a list or a SELECT of user IDs) to recount; all users if None
+        """
+        counted = select(
+            NotificationInboxEntry.user_id,
+            func.count().filter(NotificationInboxEntry.read_at.is_(None)),
+            func.count(),
+        ).group_by(NotificationInboxEntry.user_id)
+        stale = delete(NotificationCounter)
+        if user_ids is not None:
+            counted = counted.where(NotificationInboxEntry.user_id.in_(user_ids))
+            stale = stale.where(NotificationCounter.user_id.in_(user_ids))
+        rows = self.db.execute(counted).all()
+        self.db.execute(stale)
+        if rows:
+            self.db.execute(insert(NotificationCounter), [
+                {"user_id": user_id, "unread": unread, "total": total} for user_id, unread, total in rows
+            ])
+        self.db.flush()
+
     def delete_old_notifications(self, days: int = 30) -> int:
         """Delete notifications older than specified days.
 
@@ -223,12 +437,22 @@ class NotificationService:
         Returns:
             Number of notifications deleted
         """
-        from datetime import timedelta
         cutoff = datetime.utcnow() - timedelta(days=days)
 
+        expired = select(Notification.id).where(Notification.created_at < cutoff)
+        affected_users = list(self.db.scalars(
+            select(NotificationInboxEntry.user_id)
+            .where(NotificationInboxEntry.notification_id.in_(expired))
+            .distinct()
+        ))
+
+        # Inbox entries are removed explicitly; SQLite does not enforce the cascade by default
+        self.db.execute(delete(NotificationInboxEntry).where(NotificationInboxEntry.notification_id.in_(expired)))
         count = self.db.query(Notification).filter(
             Notification.created_at < cutoff
         ).delete(synchronize_session=False)
+        if affected_users:
+            self.recount(affected_users)
         self.db.flush()
 
         if count > 0:
@@ -237,6 +461,33 @@ class NotificationService:
         return count
 
 
+class AsyncNotificationService:
+    """Read-only notification queries for async handlers, awaited on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_notifications(
+        self,
+        user: User,
+        limit: int = 50,
+        offset: int = 0,
+        unread_only: bool = False,
+    ) -> Tuple[List[NotificationInboxEntry], int, int]:
+        """See NotificationService.get_user_notifications()."""
+        entries = (await self.db.scalars(_inbox_page(user.id, limit, offset, unread_only))).unique()
+        total, unread_count = _counts(await self.db.get(NotificationCounter, user.id), unread_only)
+        return list(entries), total, unread_count
+
+    async def get_unread_count(self, user: User) -> int:
+        counter = await self.db.get(NotificationCounter, user.id)
+        return counter.unread if counter else 0
+
+    async def get_user_notification(self, user: User, notification_id: UUID) -> Optional[NotificationInboxEntry]:
+        """A notification in the user's inbox, or None if it was not delivered to them."""
+        return await self.db.get(NotificationInboxEntry, (user.id, notification_id))
+
+
 # Convenience functions for creating common notifications
 def notify_user(
     db: Session,
@@ -0,0 +1,316 @@
+# backend/cyroid/services/principal_cache.py
+"""
+Shared cache of authenticated users (principals).
+
+Every API call and WebSocket handshake resolves the JWT subject to a User
+with its ABAC attributes. With frontends polling several endpoints per second
+per user, that lookup was the most frequent query on the database.
+
+Users are cached in Redis, so every API worker shares the same entries:
+- each entry holds the user's columns (except the password hash) and
+  attributes, and expires after ``principal_cache_ttl`` seconds;
+- the number of entries is capped at ``principal_cache_max_entries``; the
+  oldest entries are evicted first;
+- writers that change a user's role, approval, activation, attributes or
+  password call ``invalidate()`` after committing.
+
+A hit is rebuilt into a User and merged into the request's session without
+loading it, so handlers can use and modify it as before. Columns left out of
+the cache (the password hash) load on first access. ``load_user_async()`` does
+the same for async sessions, without blocking the event loop.
+
+Hit and miss counts are summed across workers and reported in the admin
+infrastructure metrics. If Redis is unavailable, users are loaded from the
+database as before.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from cyroid.config import get_settings
+from cyroid.models.user import User, UserAttribute
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "principal"
+INDEX_KEY = f"{KEY_PREFIX}:index"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+# Columns never written to the cache
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+# Local hit/miss counts are pushed to Redis in batches
+STATS_FLUSH_EVERY = 100
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    return value
+
+
+def _snapshot(obj, exclude=frozenset()) -> dict:
+    return {
+        column.key: _encode(getattr(obj, column.key))
+        for column in obj.__table__.columns
+        if column.key not in exclude
+    }
+
+
+def _restore(model, data: dict):
+    """Build a detached instance from a snapshot, as if loaded from the database."""
+    columns = {column.key: column for column in model.__table__.columns}
+    obj = model(**{key: _decode(columns[key], value) for key, value in data.items() if key in columns})
+    make_transient_to_detached(obj)
+    return obj
+
+
+class PrincipalCache:
+    """Redis-backed TTL cache of users and their attributes."""
+
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self._redis = redis_client
+        self._async_redis: Optional[AsyncRedis] = None
+        self.ttl = settings.principal_cache_ttl if ttl is None else ttl
+        self.max_entries = settings.principal_cache_max_entries if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    @property
+    def async_redis(self) -> AsyncRedis:
+        if self._async_redis is None:
+            self._async_redis = AsyncRedis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._async_redis
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f"{KEY_PREFIX}:{user_id}"
+
+    def load_user(self, db: Session, user_id: UUID) -> Optional[User]:
+        """Load a user with attributes, from the cache when possible.
+
+        Args:
+            db: Request database session; a cached user is merged into it
+            user_id: User ID from the access token
+
+        Returns:
+            The User attached to ``db``, or None if it does not exist
+        """
+        if not self.enabled:
+            return self._query(db, user_id)
+
+        cached = None
+        try:
+            cached = self.redis.get(self._key(user_id))
+        except Exception as e:
+            logger.debug(f"Principal cache unavailable: {e}")
+
+        if cached:
+            try:
+                user = db.merge(self._from_json(cached), load=False)
+                self._count("hits")
+                return user
+            except Exception as e:
+                logger.warning(f"Discarding unreadable principal cache entry for {user_id}: {e}")
+                self.invalidate(user_id)
+
+        self._count("misses")
+        user = self._query(db, user_id)
+        if user is not None:
+            self.set(user)
+        return user
+
+    @staticmethod
+    def _query(db: Session, user_id: UUID) -> Optional[User]:
+        return db.query(User).options(joinedload(User.attributes)).filter(User.id == user_id).first()
+
+    async def load_user_async(self, db: AsyncSession, user_id: UUID) -> Optional[User]:
+        """Async variant of load_user() for handlers using an AsyncSession.
+
+        Args:
+            db: Request async database session; a cached user is merged into it
+            user_id: User ID from the access token
+
+        Returns:
+            The User attached to ``db``, or None if it does not exist
+        """
+        cached = None
+        if self.enabled:
+            try:
+                cached = await self.async_redis.get(self._key(user_id))
+            except Exception as e:
+                logger.debug(f"Principal cache unavailable: {e}")
+
+        if cached:
+            try:
+                user = await db.merge(self._from_json(cached), load=False)
+                self._count("hits")
+                return user
+            except Exception as e:
+                logger.warning(f"Discarding unreadable principal cache entry for {user_id}: {e}")
+                await self.async_redis.delete(self._key(user_id))
+
+        result = await db.execute(
+            select(User).options(selectinload(User.attributes)).where(User.id == user_id)
+        )
+        user = result.scalars().first()
+        if self.enabled:
+            self._count("misses")
+            if user is not None:
+                await self._store_async(user)
+        return user
+
+    @staticmethod
+    def _to_json(user: User) -> str:
+        data = _snapshot(user, EXCLUDED_COLUMNS)
+        data["attributes"] = [_snapshot(attr) for attr in user.attributes]
+        return json.dumps(data)
+
+    def set(self, user: User) -> None:
+        """Cache a user loaded from the database, evicting the oldest entries over the cap."""
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(self._key(user.id), self.ttl, self._to_json(user))
+            pipe.zadd(INDEX_KEY, {str(user.id): now})
+            pipe.zremrangebyscore(INDEX_KEY, "-inf", now - self.ttl)
+            pipe.zcard(INDEX_KEY)
+            size = pipe.execute()[-1]
+            if size > self.max_entries:
+                evicted = [member for member, _ in self.redis.zpopmin(INDEX_KEY, size - self.max_entries)]
+                if evicted:
+                    self.redis.delete(*(self._key(user_id) for user_id in evicted))
+        except Exception as e:
+            logger.debug(f"Could not cache principal {user.id}: {e}")
+
+    async def _store_async(self, user: User) -> None:
+        """set() through the async Redis client."""
+        now = time.time()
+        try:
+            pipe = self.async_redis.pipeline()
+            pipe.setex(self._key(user.id), self.ttl, self._to_json(user))
+            pipe.zadd(INDEX_KEY, {str(user.id): now})
+            pipe.zremrangebyscore(INDEX_KEY, "-inf", now - self.ttl)
+            pipe.zcard(INDEX_KEY)
+            size = (await pipe.execute())[-1]
+            if size > self.max_entries:
+                evicted = [member for member, _ in await self.async_redis.zpopmin(INDEX_KEY, size - self.max_entries)]
+                if evicted:
+                    await self.async_redis.delete(*(self._key(user_id) for user_id in evicted))
+        except Exception as e:
+            logger.debug(f"Could not cache principal {user.id}: {e}")
+
+    @staticmethod
+    def _from_json(raw: str) -> User:
+        data = json.loads(raw)
+        attributes = [_restore(UserAttribute, attr) for attr in data.pop("attributes", [])]
+        user = _restore(User, data)
+        set_committed_value(user, "attributes", attributes)
+        return user
+
+    def invalidate(self, user_id) -> None:
+        """Drop a user's entry; call after committing a change to the user."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self._key(user_id))
+            pipe.zrem(INDEX_KEY, str(user_id))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not invalidate cached principal {user_id}: {e}")
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._pending[outcome] += 1
+            if sum(self._pending.values()) < STATS_FLUSH_EVERY:
+                return
+        self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {"hits": 0, "misses": 0}
+        try:
+            pipe = self.redis.pipeline()
+            for outcome, count in pending.items():
+                if count:
+                    pipe.hincrby(STATS_KEY, outcome, count)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"Could not record principal cache stats: {e}")
+
+    def stats(self) -> dict:
+        """Hit/miss counts across all workers, and the current number of entries."""
+        self._flush_stats()
+        try:
+            counts = self.redis.hgetall(STATS_KEY)
+            entries = self.redis.zcard(INDEX_KEY)
+        except Exception as e:
+            logger.debug(f"Could not read principal cache stats: {e}")
+            counts, entries = {}, 0
+        hits = int(counts.get("hits", 0))
+        misses = int(counts.get("misses", 0))
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+
+
+# Singleton instance
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the singleton PrincipalCache instance."""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
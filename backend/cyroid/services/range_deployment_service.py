@@ -8,7 +8,9 @@ own DinD container, allowing multiple ranges to use identical IP spaces
 without conflicts.
 """
 
+import json
 import logging
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from uuid import UUID
@@ -239,12 +241,14 @@ class RangeDeploymentService:
         allow_internet = [
             network.name for network in networks if network.internet_enabled
         ]
+        isolated = [network.name for network in networks if network.is_isolated]
 
         await self.dind_service.setup_network_isolation_in_dind(
             range_id=range_id,
             docker_url=docker_url,
             networks=network_names,
             allow_internet=allow_internet,
+            isolated=isolated,
         )
 
         # 3. Pull required images into DinD
@@ -432,226 +436,8 @@ class RangeDeploymentService:
                     vm_id=vm.id,
                 )
 
-                # Determine container image from Image Library or legacy template/snapshot
-                container_image = None
-                if vm.base_image_id and vm.base_image:
-                    # New Image Library: Base Image
-                    if vm.base_image.image_type == "container":
-                        container_image = vm.base_image.docker_image_tag or vm.base_image.docker_image_id
-                        logger.info(f"VM {vm.hostname}: base_image_tag={container_image}, vm.arch={vm.arch}")
-                        # Override dockurr/windows image based on vm.arch
-                        # dockurr/windows (x86_64) and dockurr/windows-arm (arm64) are separate images
-                        if container_image and ("dockurr/windows" in container_image.lower() or "dockur/windows" in container_image.lower()):
-                            if vm.arch == "x86_64":
-                                container_image = "dockurr/windows:latest"
-                                logger.info(f"VM {vm.hostname}: arch override -> {container_image}")
-                            elif vm.arch == "arm64":
-                                container_image = "dockurr/windows-arm:latest"
-                                logger.info(f"VM {vm.hostname}: arch override -> {container_image}")
-                            elif not vm.arch:
-                                logger.warning(f"VM {vm.hostname}: dockurr/windows image detected but vm.arch is None — using base_image tag as-is: {container_image}")
-                    else:
-                        # ISO-based VMs: derive the QEMU/dockurr container image from vm_type
-                        target_arch = vm.arch or vm.base_image.native_arch
-                        if vm.base_image.vm_type == VMType.WINDOWS_VM:
-                            container_image = "dockurr/windows-arm:latest" if target_arch == "arm64" else "dockurr/windows:latest"
-                        elif vm.base_image.vm_type == VMType.LINUX_VM:
-                            container_image = "qemux/qemu:latest"
-                        elif vm.base_image.vm_type == VMType.MACOS_VM:
-                            container_image = "dockurr/macos:latest"
-                        else:
-                            container_image = "qemux/qemu:latest"
-                        logger.info(f"VM {vm.hostname}: ISO base image resolved to {container_image}")
-                elif vm.golden_image_id and vm.golden_image:
-                    # New Image Library: Golden Image
-                    container_image = vm.golden_image.docker_image_tag or vm.golden_image.docker_image_id
-                elif vm.snapshot_id and vm.snapshot:
-                    # Snapshot
-                    container_image = vm.snapshot.docker_image_tag or vm.snapshot.docker_image_id
-
-                if not container_image:
-                    error_msg = f"VM {vm.hostname} has no container image configured"
-                    logger.warning(error_msg)
-                    vm.status = VMStatus.ERROR
-                    vm.error_message = error_msg
-                    event_service.log_event(
-                        range_id=range_uuid,
-                        event_type=EventType.VM_ERROR,
-                        message=error_msg,
-                        vm_id=vm.id,
-                    )
-                    failed_vms.append(vm.hostname)
-                    continue
-
-                # Get all network interfaces for this VM (multi-NIC support)
-                interfaces = db.query(VMNetwork).filter(VMNetwork.vm_id == vm.id).order_by(
-                    VMNetwork.is_primary.desc()  # Primary first
-                ).all()
-
-                if interfaces:
-                    # New multi-NIC path: use VMNetwork records
-                    primary_iface = interfaces[0]
-                    primary_network = db.query(Network).filter(Network.id == primary_iface.network_id).first()
-                    primary_ip = primary_iface.ip_address
-                    secondary_interfaces = interfaces[1:]
-                else:
-                    # Legacy fallback: use vm.network_id directly for backwards compatibility
-                    primary_network = db.query(Network).filter(Network.id == vm.network_id).first()
-                    primary_ip = vm.ip_address
-                    secondary_interfaces = []
-
-                if not primary_network:
-                    error_msg = f"VM {vm.hostname} has no network assigned"
-                    logger.warning(error_msg)
-                    vm.status = VMStatus.ERROR
-                    vm.error_message = error_msg
-                    event_service.log_event(
-                        range_id=range_uuid,
-                        event_type=EventType.VM_ERROR,
-                        message=error_msg,
-                        vm_id=vm.id,
-                    )
+                if not await self._create_vm_container(db, range_obj, vm, docker_url, event_service):
                     failed_vms.append(vm.hostname)
-                    continue
-
-                labels = {
-                    "cyroid.range_id": range_id,
-                    "cyroid.vm_id": str(vm.id),
-                }
-
-                # Set up environment variables: blueprint env vars first, then image-type overrides
-                environment = dict(vm.environment) if vm.environment else {}
-                privileged = False
-                cap_add = None
-                sysctls = None
-                devices = None
-
-                # Apply container_config from BaseImage (VM Library settings)
-                # This allows users to set privileged, cap_add, sysctls, devices per-image
-                if vm.base_image and vm.base_image.container_config:
-                    config = vm.base_image.container_config
-                    if config.get("privileged"):
-                        privileged = True
-                        logger.info(f"VM {vm.hostname}: privileged=True from base_image.container_config")
-                    if config.get("cap_add"):
-                        cap_add = config["cap_add"]
-                        logger.info(f"VM {vm.hostname}: cap_add={cap_add} from base_image.container_config")
-                    if config.get("sysctls"):
-                        sysctls = config["sysctls"]
-                        logger.info(f"VM {vm.hostname}: sysctls={sysctls} from base_image.container_config")
-                    if config.get("devices"):
-                        devices = config["devices"]
-                        logger.info(f"VM {vm.hostname}: devices={devices} from base_image.container_config")
-
-                # macOS VM (dockur/macos or dockurr/macos) - requires VERSION env and privileged mode for KVM
-                if "dockur/macos" in container_image.lower() or "dockurr/macos" in container_image.lower():
-                    # Map version number to dockur version name
-                    macos_version_map = {
-                        "15": "sequoia",
-                        "14": "sonoma",
-                        "13": "ventura",
-                        "12": "monterey",
-                        "11": "big-sur",
-                    }
-                    version_name = macos_version_map.get(vm.macos_version, "sonoma")  # Default to Sonoma
-                    environment["VERSION"] = version_name
-                    privileged = True  # Required for KVM access
-                    labels["cyroid.vm_type"] = "macos"
-
-                # Windows VM (dockur/windows or dockurr/windows) - set VERSION if specified
-                elif "dockur/windows" in container_image.lower() or "dockurr/windows" in container_image.lower():
-                    if vm.windows_version:
-                        environment["VERSION"] = vm.windows_version
-                    environment["KVM"] = "N"
-                    privileged = True  # Required for KVM access
-                    labels["cyroid.vm_type"] = "windows"
-
-                # Linux VM (qemux/qemu) - uses VERSION for distro
-                elif "qemux/qemu" in container_image.lower():
-                    privileged = True  # Required for KVM access
-                    labels["cyroid.vm_type"] = "linux"
-
-                event_service.log_event(
-                    range_id=range_uuid,
-                    event_type=EventType.DEPLOYMENT_STEP,
-                    message=f"Creating container for '{vm.hostname}' using image {container_image}...",
-                    vm_id=vm.id,
-                )
-
-                container_id = await self.docker_service.create_range_container_dind(
-                    range_id=range_id,
-                    docker_url=docker_url,
-                    name=vm.hostname,
-                    image=container_image,
-                    network_name=primary_network.name,
-                    ip_address=primary_ip,
-                    cpu_limit=vm.cpu or 2,
-                    memory_limit_mb=vm.ram_mb or 2048,
-                    hostname=vm.hostname,
-                    labels=labels,
-                    dns_servers=primary_network.dns_servers,
-                    dns_search=primary_network.dns_search,
-                    environment=environment if environment else None,
-                    privileged=privileged,
-                    cap_add=cap_add,
-                    sysctls=sysctls,
-                    devices=devices,
-                    arch=vm.arch,
-                )
-
-                vm.container_id = container_id
-
-                # Attach secondary networks before starting (multi-NIC support)
-                if secondary_interfaces:
-                    event_service.log_event(
-                        range_id=range_uuid,
-                        event_type=EventType.DEPLOYMENT_STEP,
-                        message=f"Attaching {len(secondary_interfaces)} additional network(s) to '{vm.hostname}'...",
-                        vm_id=vm.id,
-                    )
-                    for iface in secondary_interfaces:
-                        sec_network = db.query(Network).filter(Network.id == iface.network_id).first()
-                        if sec_network:
-                            self.docker_service.connect_container_to_network_dind(
-                                range_id=range_id,
-                                docker_url=docker_url,
-                                container_id=container_id,
-                                network_name=sec_network.name,
-                                ip_address=iface.ip_address,
-                            )
-                            logger.info(f"Attached secondary NIC to {vm.hostname}: {sec_network.name} ({iface.ip_address})")
-
-                event_service.log_event(
-                    range_id=range_uuid,
-                    event_type=EventType.DEPLOYMENT_STEP,
-                    message=f"Container created for '{vm.hostname}', starting...",
-                    vm_id=vm.id,
-                )
-
-                # Start the container
-                await self.docker_service.start_range_container_dind(
-                    range_id=range_id,
-                    docker_url=docker_url,
-                    container_id=container_id,
-                )
-
-                # Mark VM as running after successful start (Issue #75)
-                vm.status = VMStatus.RUNNING
-
-                # Build network info for the event message
-                network_info = f"{primary_network.name} ({primary_ip})"
-                if secondary_interfaces:
-                    for iface in secondary_interfaces:
-                        sec_network = db.query(Network).filter(Network.id == iface.network_id).first()
-                        if sec_network:
-                            network_info += f", {sec_network.name} ({iface.ip_address})"
-
-                event_service.log_event(
-                    range_id=range_uuid,
-                    event_type=EventType.VM_STARTED,
-                    message=f"VM '{vm.hostname}' running on {network_info}",
-                    vm_id=vm.id,
-                )
 
             except Exception as e:
                 # Log VM-specific error and continue with other VMs
@@ -805,6 +591,349 @@ class RangeDeploymentService:
             "vnc_proxy_ports": len(vm_ports),
         }
 
+    async def _create_vm_container(
+        self,
+        db: Session,
+        range_obj: Range,
+        vm: VM,
+        docker_url: str,
+        event_service: EventService,
+    ) -> bool:
+        """Create and start one VM container inside the range's DinD.
+
+        Sets vm.container_id and vm.status. Configuration problems (no image,
+        no network) are recorded on the VM and reported by returning False;
+        Docker errors are raised to the caller.
+
+        Returns:
+            True if the container was created and started
+        """
+        range_id = str(range_obj.id)
+        range_uuid = range_obj.id
+
+        # Determine container image from Image Library or legacy template/snapshot
+        container_image = None
+        if vm.base_image_id and vm.base_image:
+            # New Image Library: Base Image
+            if vm.base_image.image_type == "container":
+                container_image = vm.base_image.docker_image_tag or vm.base_image.docker_image_id
+                logger.info(f"VM {vm.hostname}: base_image_tag={container_image}, vm.arch={vm.arch}")
+                # Override dockurr/windows image based on vm.arch
+                # dockurr/windows (x86_64) and dockurr/windows-arm (arm64) are separate images
+                if container_image and ("dockurr/windows" in container_image.lower() or "dockur/windows" in container_image.lower()):
+                    if vm.arch == "x86_64":
+                        container_image = "dockurr/windows:latest"
+                        logger.info(f"VM {vm.hostname}: arch override -> {container_image}")
+                    elif vm.arch == "arm64":
+                        container_image = "dockurr/windows-arm:latest"
+                        logger.info(f"VM {vm.hostname}: arch override -> {container_image}")
+                    elif not vm.arch:
+                        logger.warning(f"VM {vm.hostname}: dockurr/windows image detected but vm.arch is None — using base_image tag as-is: {container_image}")
+            else:
+                # ISO-based VMs: derive the QEMU/dockurr container image from vm_type
+                target_arch = vm.arch or vm.base_image.native_arch
+                if vm.base_image.vm_type == VMType.WINDOWS_VM:
+                    container_image = "dockurr/windows-arm:latest" if target_arch == "arm64" else "dockurr/windows:latest"
+                elif vm.base_image.vm_type == VMType.LINUX_VM:
+                    container_image = "qemux/qemu:latest"
+                elif vm.base_image.vm_type == VMType.MACOS_VM:
+                    container_image = "dockurr/macos:latest"
+                else:
+                    container_image = "qemux/qemu:latest"
+                logger.info(f"VM {vm.hostname}: ISO base image resolved to {container_image}")
+        elif vm.golden_image_id and vm.golden_image:
+            # New Image Library: Golden Image
+            container_image = vm.golden_image.docker_image_tag or vm.golden_image.docker_image_id
+        elif vm.snapshot_id and vm.snapshot:
+            # Snapshot
+            container_image = vm.snapshot.docker_image_tag or vm.snapshot.docker_image_id
+
+        if not container_image:
+            error_msg = f"VM {vm.hostname} has no container image configured"
+            logger.warning(error_msg)
+            vm.status = VMStatus.ERROR
+            vm.error_message = error_msg
+            event_service.log_event(
+                range_id=range_uuid,
+                event_type=EventType.VM_ERROR,
+                message=error_msg,
+                vm_id=vm.id,
+            )
+            return False
+
+        # Get all network interfaces for this VM (multi-NIC support)
+        interfaces = db.query(VMNetwork).filter(VMNetwork.vm_id == vm.id).order_by(
+            VMNetwork.is_primary.desc()  # Primary first
+        ).all()
+
+        if interfaces:
+            # New multi-NIC path: use VMNetwork records
+            primary_iface = interfaces[0]
+            primary_network = db.query(Network).filter(Network.id == primary_iface.network_id).first()
+            primary_ip = primary_iface.ip_address
+            secondary_interfaces = interfaces[1:]
+        else:
+            # Legacy fallback: use vm.network_id directly for backwards compatibility
+            primary_network = db.query(Network).filter(Network.id == vm.network_id).first()
+            primary_ip = vm.ip_address
+            secondary_interfaces = []
+
+        if not primary_network:
+            error_msg = f"VM {vm.hostname} has no network assigned"
+            logger.warning(error_msg)
+            vm.status = VMStatus.ERROR
+            vm.error_message = error_msg
+            event_service.log_event(
+                range_id=range_uuid,
+                event_type=EventType.VM_ERROR,
+                message=error_msg,
+                vm_id=vm.id,
+            )
+            return False
+
+        labels = {
+            "cyroid.range_id": range_id,
+            "cyroid.vm_id": str(vm.id),
+        }
+
+        # Set up environment variables: blueprint env vars first, then image-type overrides
+        environment = dict(vm.environment) if vm.environment else {}
+        privileged = False
+        cap_add = None
+        sysctls = None
+        devices = None
+
+        # Apply container_config from BaseImage (VM Library settings)
+        # This allows users to set privileged, cap_add, sysctls, devices per-image
+        if vm.base_image and vm.base_image.container_config:
+            config = vm.base_image.container_config
+            if config.get("privileged"):
+                privileged = True
+                logger.info(f"VM {vm.hostname}: privileged=True from base_image.container_config")
+            if config.get("cap_add"):
+                cap_add = config["cap_add"]
+                logger.info(f"VM {vm.hostname}: cap_add={cap_add} from base_image.container_config")
+            if config.get("sysctls"):
+                sysctls = config["sysctls"]
+                logger.info(f"VM {vm.hostname}: sysctls={sysctls} from base_image.container_config")
+            if config.get("devices"):
+                devices = config["devices"]
+                logger.info(f"VM {vm.hostname}: devices={devices} from base_image.container_config")
+
+        # macOS VM (dockur/macos or dockurr/macos) - requires VERSION env and privileged mode for KVM
+        if "dockur/macos" in container_image.lower() or "dockurr/macos" in container_image.lower():
+            # Map version number to dockur version name
+            macos_version_map = {
+                "15": "sequoia",
+                "14": "sonoma",
+                "13": "ventura",
+                "12": "monterey",
+                "11": "big-sur",
+            }
+            version_name = macos_version_map.get(vm.macos_version, "sonoma")  # Default to Sonoma
+            environment["VERSION"] = version_name
+            privileged = True  # Required for KVM access
+            labels["cyroid.vm_type"] = "macos"
+
+        # Windows VM (dockur/windows or dockurr/windows) - set VERSION if specified
+        elif "dockur/windows" in container_image.lower() or "dockurr/windows" in container_image.lower():
+            if vm.windows_version:
+                environment["VERSION"] = vm.windows_version
+            environment["KVM"] = "N"
+            privileged = True  # Required for KVM access
+            labels["cyroid.vm_type"] = "windows"
+
+        # Linux VM (qemux/qemu) - uses VERSION for distro
+        elif "qemux/qemu" in container_image.lower():
+            privileged = True  # Required for KVM access
+            labels["cyroid.vm_type"] = "linux"
+
+        event_service.log_event(
+            range_id=range_uuid,
+            event_type=EventType.DEPLOYMENT_STEP,
+            message=f"Creating container for '{vm.hostname}' using image {container_image}...",
+            vm_id=vm.id,
+        )
+
+        container_id = await self.docker_service.create_range_container_dind(
+            range_id=range_id,
+            docker_url=docker_url,
+            name=vm.hostname,
+            image=container_image,
+            network_name=primary_network.name,
+            ip_address=primary_ip,
+            cpu_limit=vm.cpu or 2,
+            memory_limit_mb=vm.ram_mb or 2048,
+            hostname=vm.hostname,
+            labels=labels,
+            dns_servers=primary_network.dns_servers,
+            dns_search=primary_network.dns_search,
+            environment=environment if environment else None,
+            privileged=privileged,
+            cap_add=cap_add,
+            sysctls=sysctls,
+            devices=devices,
+            arch=vm.arch,
+        )
+
+        vm.container_id = container_id
+
+        # Attach secondary networks before starting (multi-NIC support)
+        if secondary_interfaces:
+            event_service.log_event(
+                range_id=range_uuid,
+                event_type=EventType.DEPLOYMENT_STEP,
+                message=f"Attaching {len(secondary_interfaces)} additional network(s) to '{vm.hostname}'...",
+                vm_id=vm.id,
+            )
+            for iface in secondary_interfaces:
+                sec_network = db.query(Network).filter(Network.id == iface.network_id).first()
+                if sec_network:
+                    self.docker_service.connect_container_to_network_dind(
+                        range_id=range_id,
+                        docker_url=docker_url,
+                        container_id=container_id,
+                        network_name=sec_network.name,
+                        ip_address=iface.ip_address,
+                    )
+                    logger.info(f"Attached secondary NIC to {vm.hostname}: {sec_network.name} ({iface.ip_address})")
+
+        event_service.log_event(
+            range_id=range_uuid,
+            event_type=EventType.DEPLOYMENT_STEP,
+            message=f"Container created for '{vm.hostname}', starting...",
+            vm_id=vm.id,
+        )
+
+        # Start the container
+        await self.docker_service.start_range_container_dind(
+            range_id=range_id,
+            docker_url=docker_url,
+            container_id=container_id,
+        )
+
+        # Mark VM as running after successful start (Issue #75)
+        vm.status = VMStatus.RUNNING
+
+        # Build network info for the event message
+        network_info = f"{primary_network.name} ({primary_ip})"
+        if secondary_interfaces:
+            for iface in secondary_interfaces:
+                sec_network = db.query(Network).filter(Network.id == iface.network_id).first()
+                if sec_network:
+                    network_info += f", {sec_network.name} ({iface.ip_address})"
+
+        event_service.log_event(
+            range_id=range_uuid,
+            event_type=EventType.VM_STARTED,
+            message=f"VM '{vm.hostname}' running on {network_info}",
+            vm_id=vm.id,
+        )
+
+        return True
+
+    async def reset_range(
+        self,
+        db: Session,
+        range_id: UUID,
+    ) -> Dict[str, Any]:
+        """
+        Reset a deployed range's VMs to their pristine images, in place.
+
+        Keeps the DinD container, its networks, image cache, inter-network
+        routing and VNC forwarding. Only the VM containers are removed (with
+        their anonymous volumes, i.e. all writable state) and recreated from
+        the same images. VM IPs don't change, so the existing VNC proxies
+        and Traefik routes remain valid.
+
+        Raises:
+            ValueError: If the range is not deployed or its DinD is not running
+        """
+        range_obj = db.query(Range).filter(Range.id == range_id).first()
+        if not range_obj:
+            raise ValueError(f"Range {range_id} not found")
+
+        if not range_obj.dind_container_id or not range_obj.dind_docker_url:
+            raise ValueError(f"Range {range_id} is not deployed (missing DinD container)")
+
+        range_id_str = str(range_id)
+        dind_info = await self.dind_service.get_container_info(range_id_str)
+        if not dind_info or dind_info["status"] != "running":
+            raise ValueError(f"DinD container for range {range_id_str} is not running")
+
+        docker_url = range_obj.dind_docker_url
+        started = time.monotonic()
+        event_service = EventService(db)
+
+        vms = db.query(VM).filter(VM.range_id == range_id).all()
+        range_obj.status = RangeStatus.DEPLOYING
+        db.commit()
+
+        event_service.log_event(
+            range_id=range_id,
+            event_type=EventType.DEPLOYMENT_STEP,
+            message=f"Resetting {len(vms)} VM(s) in place (keeping DinD, networks and images)...",
+        )
+
+        # 1. Remove VM containers and their writable volumes
+        for vm in vms:
+            if vm.container_id:
+                await self.docker_service.remove_range_container_dind(
+                    range_id=range_id_str,
+                    docker_url=docker_url,
+                    container_id=vm.container_id,
+                )
+                vm.container_id = None
+            vm.status = VMStatus.PENDING
+            vm.error_message = None
+        db.commit()
+
+        # 2. Recreate them from the images already cached in DinD
+        failed_vms = []
+        for vm in vms:
+            try:
+                if not await self._create_vm_container(db, range_obj, vm, docker_url, event_service):
+                    failed_vms.append(vm.hostname)
+            except Exception as e:
+                error_msg = f"Failed to recreate VM '{vm.hostname}': {str(e)[:200]}"
+                logger.error(error_msg)
+                vm.status = VMStatus.ERROR
+                vm.error_message = str(e)[:500]
+                event_service.log_event(
+                    range_id=range_id,
+                    event_type=EventType.VM_ERROR,
+                    message=error_msg,
+                    vm_id=vm.id,
+                )
+                failed_vms.append(vm.hostname)
+
+        range_obj.status = RangeStatus.RUNNING
+        range_obj.started_at = datetime.utcnow()
+        range_obj.error_message = None
+        db.commit()
+
+        duration = round(time.monotonic() - started, 2)
+        event_service.log_event(
+            range_id=range_id,
+            event_type=EventType.DEPLOYMENT_COMPLETED,
+            message=f"Range '{range_obj.name}' reset in {duration}s",
+            extra_data=json.dumps({
+                "reset": "in_place",
+                "vms_reset": len(vms) - len(failed_vms),
+                "failed_vms": failed_vms,
+                "duration_seconds": duration,
+            }),
+        )
+        logger.info(f"Reset range {range_id_str} in place in {duration}s ({len(failed_vms)} failed)")
+
+        return {
+            "range_id": range_id_str,
+            "status": "reset",
+            "vms_reset": len(vms) - len(failed_vms),
+            "failed_vms": failed_vms,
+            "duration_seconds": duration,
+        }
+
     async def destroy_range(
         self,
         db: Session,
@@ -926,11 +1055,13 @@ class RangeDeploymentService:
         if new_networks:
             network_names = [n.name for n in networks]
             allow_internet = [n.name for n in networks if n.internet_enabled]
+            isolated = [n.name for n in networks if n.is_isolated]
             await self.dind_service.setup_network_isolation_in_dind(
                 range_id=range_id_str,
                 docker_url=docker_url,
                 networks=network_names,
                 allow_internet=allow_internet,
+                isolated=isolated,
             )
 
         # 2. Pull images for new VMs
@@ -0,0 +1,291 @@
+# backend/cyroid/services/registry_catalog.py
+"""
+Cached, concurrent crawl of the local registry catalog.
+
+The registry API lists repositories in pages (``/v2/_catalog``, continued
+through ``Link: <...>; rel="next"`` headers) and tags per repository, so a
+sequential crawl of thousands of repositories takes thousands of
+round-trips. :class:`RegistryCatalog` follows the pagination and starts tag
+list and manifest requests as soon as each page arrives. A semaphore bounds
+how many requests are in flight at once. Manifests are addressed by digest
+and never change, so each one is fetched once and kept across crawls.
+
+Listings are served from the last crawl. A crawl runs when the snapshot is
+older than ``registry_catalog_max_age`` or was invalidated by a push or
+delete. Invalidation increments a generation counter in Redis
+(``registry_catalog:generation``), so a push on one API worker or Dramatiq
+worker invalidates the snapshots of all of them. Concurrent callers on one
+event loop share a single crawl. When ``registry_catalog_refresh_interval`` is set, each API worker
+refreshes its snapshot in the background, so requests never wait on a crawl.
+"""
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import httpx
+from redis import RedisError
+
+from cyroid.config import get_settings
+
+if TYPE_CHECKING:
+    from cyroid.services.registry_service import RegistryService
+
+logger = logging.getLogger(__name__)
+
+# Manifests kept by digest across crawls
+MANIFEST_CACHE_SIZE = 20000
+# Incremented on every invalidation, by any process
+GENERATION_KEY = "registry_catalog:generation"
+
+
+@dataclass
+class ManifestInfo:
+    """Blob sizes of one image manifest."""
+    layers: Dict[str, int]  # blob digest -> size, config blob included
+    size_bytes: Optional[int]  # None for manifest lists / OCI indexes
+
+
+@dataclass
+class CatalogSnapshot:
+    """One crawl of the registry."""
+    images: List[dict]  # [{'name', 'tags', 'size_bytes'}], sorted by name
+    tag_count: int
+    size_bytes: int  # Unique blob bytes referenced by tagged manifests
+    refreshed_at: float  # Epoch seconds
+    duration_seconds: float
+    generation: int
+    errors: int = 0
+    digests: Dict[str, str] = field(default_factory=dict)  # "repo:tag" -> manifest digest
+
+
+class RegistryCatalog:
+    """Paginated, concurrent registry crawl behind a snapshot cache."""
+
+    def __init__(
+        self,
+        registry: "RegistryService",
+        concurrency: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        settings = get_settings()
+        self.registry = registry
+        self.concurrency = concurrency or settings.registry_catalog_concurrency
+        self.page_size = page_size or settings.registry_catalog_page_size
+        self.max_age = settings.registry_catalog_max_age if max_age is None else max_age
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._manifests: Dict[str, ManifestInfo] = {}
+        # One in-flight crawl per event loop (API loop, Dramatiq worker loops)
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Mark every worker's snapshot out of date; their next reads crawl again."""
+        with self._lock:
+            self._generation += 1
+        try:
+            self.registry.redis.incr(GENERATION_KEY)
+        except RedisError as e:
+            logger.warning(f"Registry catalog invalidated in this process only: {e}")
+
+    def _current_generation(self) -> int:
+        """The shared generation, or this process's own if Redis is unreachable."""
+        try:
+            return int(self.registry.redis.get(GENERATION_KEY) or 0)
+        except RedisError as e:
+            logger.debug(f"Using local registry catalog generation: {e}")
+            return self._generation
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and time.time() - snapshot.refreshed_at < self.max_age
+            and snapshot.generation == self._current_generation()
+        )
+
+    async def get(self, refresh: bool = False) -> CatalogSnapshot:
+        """Return the cached snapshot, crawling first if it is stale or invalidated.
+
+        Args:
+            refresh: Crawl even if the snapshot is fresh
+
+        Raises:
+            httpx.RequestError: If a needed crawl could not read the catalog
+        """
+        snapshot = self._snapshot
+        if not refresh and self._is_fresh(snapshot):
+            return snapshot
+        return await self.refresh()
+
+    async def refresh(self) -> CatalogSnapshot:
+        """Crawl now, joining a crawl already running on this event loop."""
+        loop = asyncio.get_running_loop()
+        loop_id = id(loop)
+        task = self._inflight.get(loop_id)
+        if task is None or task.done():
+            task = loop.create_task(self._crawl())
+            self._inflight[loop_id] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(loop_id, None))
+        # Shield so one cancelled caller does not cancel the crawl others wait on
+        return await asyncio.shield(task)
+
+    async def _crawl(self) -> CatalogSnapshot:
+        generation = self._current_generation()
+        started = time.monotonic()
+        client = await self.registry._get_http_client()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        base_url = self.registry.REGISTRY_URL
+        errors = 0
+
+        async def fetch(method: str, url, **kwargs) -> httpx.Response:
+            async with semaphore:
+                return await client.request(method, url, **kwargs)
+
+        async def read_repository(repo: str) -> dict:
+            nonlocal errors
+            tags: List[str] = []
+            url = f"{base_url}/v2/{repo}/tags/list?n={self.page_size}"
+            try:
+                while url:
+                    response = await fetch("GET", url)
+                    if response.status_code != 200:
+                        if response.status_code != 404:
+                            errors += 1
+                        break
+                    tags.extend(response.json().get("tags") or [])
+                    url = self._next_url(response)
+            except (httpx.RequestError, ValueError) as e:
+                logger.warning(f"Failed to list tags for {repo}: {e}")
+                errors += 1
+            manifests = await asyncio.gather(*(read_manifest(repo, tag) for tag in tags))
+            return {"name": repo, "tags": tags, "manifests": dict(zip(tags, manifests))}
+
+        async def read_manifest(repo: str, tag: str) -> Optional[tuple]:
+            nonlocal errors
+            from cyroid.services.registry_service import MANIFEST_ACCEPT
+
+            try:
+                head = await fetch("HEAD", f"{base_url}/v2/{repo}/manifests/{tag}",
+                                   headers={"Accept": MANIFEST_ACCEPT})
+                digest = head.headers.get("Docker-Content-Digest") if head.status_code == 200 else None
+                if digest is None:
+                    return None
+                info = self._manifests.get(digest)
+                if info is None:
+                    response = await fetch("GET", f"{base_url}/v2/{repo}/manifests/{digest}",
+                                           headers={"Accept": MANIFEST_ACCEPT})
+                    if response.status_code != 200:
+                        errors += 1
+                        return digest, None
+                    info = self._remember(digest, response.json())
+                return digest, info
+            except (httpx.RequestError, ValueError) as e:
+                logger.warning(f"Failed to read manifest {repo}:{tag}: {e}")
+                errors += 1
+                return None
+
+        # Start each page's repositories while the next page is requested
+        pending: List[asyncio.Task] = []
+        url = f"{base_url}/v2/_catalog?n={self.page_size}"
+        try:
+            while url:
+                response = await fetch("GET", url)
+                if response.status_code != 200:
+                    raise httpx.RequestError(f"Catalog request failed: {response.status_code}")
+                for repo in response.json().get("repositories") or []:
+                    pending.append(asyncio.create_task(read_repository(repo)))
+                url = self._next_url(response)
+            repositories = await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        snapshot = self._build_snapshot(repositories, generation, started, errors)
+        with self._lock:
+            # A slower crawl that started earlier must not replace a newer snapshot
+            if self._snapshot is None or self._snapshot.generation <= generation:
+                self._snapshot = snapshot
+        logger.debug(
+            f"Registry catalog: {len(snapshot.images)} repositories, {snapshot.tag_count} tags "
+            f"in {snapshot.duration_seconds}s ({errors} errors)"
+        )
+        return snapshot
+
+    @staticmethod
+    def _next_url(response: httpx.Response) -> Optional[str]:
+        next_link = response.links.get("next", {}).get("url")
+        return str(response.url.join(next_link)) if next_link else None
+
+    def _remember(self, digest: str, manifest: dict) -> ManifestInfo:
+        if "manifests" in manifest:
+            # Manifest list / OCI index: the platform manifests carry the layers
+            info = ManifestInfo(layers={}, size_bytes=None)
+        else:
+            blobs = [manifest.get("config") or {}] + list(manifest.get("layers") or [])
+            layers = {blob["digest"]: int(blob.get("size", 0)) for blob in blobs if blob.get("digest")}
+            info = ManifestInfo(layers=layers, size_bytes=sum(layers.values()))
+        if len(self._manifests) >= MANIFEST_CACHE_SIZE:
+            self._manifests.clear()
+        self._manifests[digest] = info
+        return info
+
+    @staticmethod
+    def _build_snapshot(repositories: List[dict], generation: int, started: float, errors: int) -> CatalogSnapshot:
+        images = []
+        digests: Dict[str, str] = {}
+        blobs: Dict[str, int] = {}
+        for repo in sorted(repositories, key=lambda r: r["name"]):
+            repo_blobs: Dict[str, int] = {}
+            for tag, manifest in repo["manifests"].items():
+                if manifest is None:
+                    continue
+                digest, info = manifest
+                digests[f"{repo['name']}:{tag}"] = digest
+                if info is not None:
+                    repo_blobs.update(info.layers)
+            blobs.update(repo_blobs)
+            images.append({
+                "name": repo["name"],
+                "tags": repo["tags"],
+                "size_bytes": sum(repo_blobs.values()) if repo_blobs else None,
+            })
+        return CatalogSnapshot(
+            images=images,
+            tag_count=sum(len(image["tags"]) for image in images),
+            size_bytes=sum(blobs.values()),
+            refreshed_at=time.time(),
+            duration_seconds=round(time.monotonic() - started, 3),
+            generation=generation,
+            errors=errors,
+            digests=digests,
+        )
+
+    def stats(self) -> dict:
+        """Snapshot age and crawl cost, for the registry stats endpoint."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"refreshed_at": None, "crawl_seconds": None, "crawl_errors": 0}
+        return {
+            "refreshed_at": datetime.fromtimestamp(snapshot.refreshed_at, timezone.utc).isoformat(),
+            "crawl_seconds": snapshot.duration_seconds,
+            "crawl_errors": snapshot.errors,
+        }
+
+    async def run_forever(self, interval: float) -> None:
+        """Refresh the snapshot every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Background registry catalog refresh failed: {e}")
+            await asyncio.sleep(interval)
@@ -0,0 +1,474 @@
+# backend/cyroid/services/registry_retention_service.py
+"""
+Local registry retention and garbage collection.
+
+Images are pushed to the local registry by the Image Library, by snapshot
+and golden image creation, and by deployments that cache DinD pulls
+(``transfer_image_to_dind`` / ``_cache_dind_image_to_registry``). Deleting a
+manifest through the registry API only unlinks it; blob storage is
+reclaimed by the registry's own ``garbage-collect`` command.
+
+Each pass lists every tag in the registry and compares it with the tags the
+Image Library still references (base images, golden images, snapshots) plus
+the runtime images deployments always need. An unreferenced tag is first
+marked with the time it was seen unreferenced. If it stays unreferenced for
+``registry_retention_days`` and the pass runs inside the maintenance window,
+its manifest is deleted and blob GC runs in the registry container. The grace
+period covers images pushed before their Library row is written.
+
+GC must not run while a push is uploading blobs that no manifest references
+yet. Pushes hold a lease in Redis for their duration (:func:`registry_push_lease`).
+GC sets a running flag and then checks for leases, and a push takes its lease
+and then checks the flag, so the two never overlap. If the pass stops
+waiting for GC (timeout or cancellation), the ``garbage-collect`` exec keeps
+running in the registry container. The flag is then only cleared once
+``exec_inspect`` reports that exec finished.
+
+When ``registry_gc_interval`` is set, the API runs passes in the background;
+a Redis lock ensures only one API worker runs each pass.
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from redis import Redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cyroid.config import get_settings
+from cyroid.models.base_image import BaseImage
+from cyroid.models.golden_image import GoldenImage
+from cyroid.models.snapshot import Snapshot
+from cyroid.services.docker_executor import run_docker
+from cyroid.services.registry_service import RegistryService, get_registry_service
+
+logger = logging.getLogger(__name__)
+
+GC_LOCK_KEY = "registry_gc:lock"
+GC_RUNNING_KEY = "registry_gc:running"
+GC_DIRTY_KEY = "registry_gc:dirty"  # Manifests were deleted since the last blob GC
+PUSH_LEASES_KEY = "registry_gc:pushes"
+UNREFERENCED_KEY = "registry_gc:unreferenced"  # tag -> epoch first seen unreferenced
+REPORT_KEY = "registry_gc:last_report"
+
+REGISTRY_CONFIG = "/etc/docker/registry/config.yml"
+REGISTRY_ROOT = "/var/lib/registry"
+PUSH_WAIT_POLL = 2.0  # Seconds between checks while a push waits for GC to finish
+GC_EXEC_POLL = 10.0  # Seconds between checks on a GC exec the pass stopped waiting for
+
+# Images deployments pull at runtime without a Library row
+RUNTIME_IMAGES = (
+    "dockurr/windows:latest",
+    "dockurr/windows-arm:latest",
+    "dockurr/macos:latest",
+    "qemux/qemu:latest",
+)
+
+
+def normalize_tag(image_tag: str) -> str:
+    """Reduce an image reference to the ``repo:tag`` form the registry stores.
+
+    Strips a registry host prefix (``ghcr.io/``, ``localhost:5000/``) and
+    defaults the tag to ``latest``, as ``RegistryService.get_registry_tag`` does.
+    """
+    image = image_tag.partition("@")[0]
+    name, tag = image.rsplit(":", 1) if ":" in image.rsplit("/", 1)[-1] else (image, "latest")
+    parts = name.split("/")
+    if len(parts) > 1 and ("." in parts[0] or ":" in parts[0] or parts[0] == "localhost"):
+        name = "/".join(parts[1:])
+    return f"{name}:{tag}"
+
+
+def parse_window(value: str) -> Optional[Tuple[int, int]]:
+    """Parse "HH:MM-HH:MM" into (start, end) minutes past midnight UTC.
+
+    Returns:
+        None for an empty value (always in window)
+
+    Raises:
+        ValueError: On a malformed window
+    """
+    if not value.strip():
+        return None
+    start, _, end = value.partition("-")
+
+    def minutes(hhmm: str) -> int:
+        hours, _, mins = hhmm.strip().partition(":")
+        result = int(hours) * 60 + int(mins or 0)
+        if not 0 <= result <= 24 * 60:
+            raise ValueError(f"Invalid time in window: {hhmm!r}")
+        return result
+
+    return minutes(start), minutes(end)
+
+
+def in_window(window: Optional[Tuple[int, int]], now: datetime) -> bool:
+    """Whether ``now`` (UTC) falls inside the window; windows may wrap midnight."""
+    if window is None:
+        return True
+    start, end = window
+    current = now.hour * 60 + now.minute
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+@contextmanager
+def registry_push_lease(
+    redis_client: Redis,
+    ttl: float,
+    max_wait: Optional[float] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Iterator[None]:
+    """Hold a push lease so blob GC cannot start while this push uploads.
+
+    Waits while GC is running. Blocking: call from a worker thread.
+
+    Args:
+        redis_client: Redis client
+        ttl: Seconds the lease survives if the holder dies
+        max_wait: Seconds to wait for a running GC (defaults to registry_gc_timeout)
+        cancelled: Returns True to stop waiting
+
+    Raises:
+        TimeoutError: If GC is still running after max_wait
+    """
+    lease = uuid.uuid4().hex
+    deadline = time.monotonic() + (max_wait or get_settings().registry_gc_timeout)
+    while True:
+        redis_client.zadd(PUSH_LEASES_KEY, {lease: time.time() + ttl})
+        if not redis_client.exists(GC_RUNNING_KEY):
+            break
+        redis_client.zrem(PUSH_LEASES_KEY, lease)
+        if time.monotonic() >= deadline or (cancelled is not None and cancelled()):
+            raise TimeoutError("Registry garbage collection is still running")
+        time.sleep(PUSH_WAIT_POLL)
+    try:
+        yield
+    finally:
+        redis_client.zrem(PUSH_LEASES_KEY, lease)
+
+
+class RegistryRetentionService:
+    """Prunes unreferenced registry tags and reclaims blob storage."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        redis_client: Optional[Redis] = None,
+        registry: Optional[RegistryService] = None,
+        retention_days: Optional[float] = None,
+        window: Optional[str] = None,
+        keep: Optional[str] = None,
+    ):
+        settings = get_settings()
+        if session_factory is None:
+            from cyroid.database import get_session_local
+            session_factory = get_session_local()
+        self.session_factory = session_factory
+        self._redis = redis_client
+        self.registry = registry or get_registry_service()
+        self.retention_days = settings.registry_retention_days if retention_days is None else retention_days
+        self.window = parse_window(settings.registry_gc_window if window is None else window)
+        keep = settings.registry_retention_keep if keep is None else keep
+        self.keep_patterns = [pattern.strip() for pattern in keep.split(",") if pattern.strip()]
+        self.last_run: Optional[dict] = None
+        # Watches a GC exec that outlived its pass
+        self._gc_watch: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
+    def referenced_tags(self) -> Set[str]:
+        """Normalized tags still in use: Image Library rows and runtime images.
+
+        VMs in ranges reference images only through Library rows (base image,
+        golden image or snapshot), so the Library covers deployed ranges too.
+        """
+        settings = get_settings()
+        tags = {normalize_tag(tag) for tag in (*RUNTIME_IMAGES, settings.vyos_image, settings.dind_image)}
+        db = self.session_factory()
+        try:
+            for model in (BaseImage, GoldenImage, Snapshot):
+                for tag in db.execute(
+                    select(model.docker_image_tag).where(model.docker_image_tag.isnot(None))
+                ).scalars():
+                    if tag:
+                        tags.add(normalize_tag(tag))
+        finally:
+            db.close()
+        return tags
+
+    def _kept(self, tag: str) -> bool:
+        return any(fnmatch.fnmatchcase(tag, pattern) for pattern in self.keep_patterns)
+
+    async def run(self, force_window: bool = False, dry_run: bool = False, now: Optional[datetime] = None) -> dict:
+        """Run one retention pass.
+
+        Args:
+            force_window: Delete and collect even outside the maintenance window
+            dry_run: Only report what would be deleted; marks are still updated
+            now: Current time (UTC), for tests
+
+        Returns:
+            Report with tag counts, deleted tags, bytes reclaimed and run time
+        """
+        now = now or datetime.now(timezone.utc)
+        started = time.monotonic()
+        report = {
+            "started_at": now.isoformat(),
+            "duration_seconds": 0.0,
+            "in_window": force_window or in_window(self.window, now),
+            "dry_run": dry_run,
+            "tags_scanned": 0,
+            "referenced": 0,
+            "pending": 0,
+            "deleted": [],
+            "kept_shared": [],
+            "gc_ran": False,
+            "gc_skipped_reason": None,
+            "bytes_before": None,
+            "bytes_after": None,
+            "bytes_reclaimed": 0,
+            "error": None,
+        }
+        try:
+            loop = asyncio.get_running_loop()
+            referenced = await loop.run_in_executor(None, self.referenced_tags)
+            images = await self.registry.list_images(refresh=True)
+            registry_tags = {f"{image['name']}:{tag}" for image in images for tag in image.get("tags") or []}
+            report["tags_scanned"] = len(registry_tags)
+
+            expired = self._update_marks(registry_tags, referenced, now.timestamp(), report)
+            if report["in_window"] and expired:
+                await self._delete_expired(expired, registry_tags, referenced, dry_run, report)
+
+            if report["in_window"] and not dry_run:
+                if report["deleted"] or force_window or self.redis.exists(GC_DIRTY_KEY):
+                    await self._collect_garbage(report)
+                else:
+                    report["gc_skipped_reason"] = "nothing deleted"
+            else:
+                report["gc_skipped_reason"] = "dry run" if dry_run else "outside maintenance window"
+        except Exception as e:
+            logger.error(f"Registry retention pass failed: {e}")
+            report["error"] = str(e)
+
+        report["duration_seconds"] = round(time.monotonic() - started, 3)
+        self.last_run = report
+        try:
+            self.redis.set(REPORT_KEY, json.dumps(report))
+        except Exception as e:
+            logger.warning(f"Could not store registry GC report: {e}")
+        logger.info(
+            f"Registry retention: {len(report['deleted'])} tags deleted, "
+            f"{report['pending']} pending, {report['bytes_reclaimed']} bytes reclaimed "
+            f"in {report['duration_seconds']}s"
+        )
+        return report
+
+    def _update_marks(self, registry_tags: Set[str], referenced: Set[str], now: float, report: dict) -> List[str]:
+        """Mark newly unreferenced tags, unmark referenced or vanished ones.
+
+        Returns:
+            Tags unreferenced for at least the retention period
+        """
+        marks = self.redis.hgetall(UNREFERENCED_KEY)
+        cutoff = now - self.retention_days * 86400
+        expired = []
+        for tag in sorted(registry_tags):
+            if tag in referenced or self._kept(tag):
+                report["referenced"] += 1
+            elif tag not in marks:
+                self.redis.hset(UNREFERENCED_KEY, tag, now)
+                report["pending"] += 1
+            elif float(marks[tag]) <= cutoff:
+                expired.append(tag)
+            else:
+                report["pending"] += 1
+        stale = [tag for tag in marks if tag not in registry_tags or tag in referenced or self._kept(tag)]
+        if stale:
+            self.redis.hdel(UNREFERENCED_KEY, *stale)
+        return expired
+
+    async def _delete_expired(
+        self, expired: List[str], registry_tags: Set[str], referenced: Set[str], dry_run: bool, report: dict
+    ) -> None:
+        """Delete expired tags by digest, sparing digests a kept tag in the same repository shares."""
+        digests: Dict[str, Optional[str]] = {}
+
+        async def digest_of(tag: str) -> Optional[str]:
+            if tag not in digests:
+                digests[tag] = await self.registry.get_manifest_digest(tag)
+            return digests[tag]
+
+        expired_set = set(expired)
+        # Deleting a digest removes every tag in the repository that points at it
+        deleted_digests: Set[Tuple[str, str]] = set()
+        for tag in expired:
+            digest = await digest_of(tag)
+            if digest is None:
+                continue
+            repo = tag.rsplit(":", 1)[0]
+            if (repo, digest) in deleted_digests:
+                report["deleted"].append(tag)
+                self.redis.hdel(UNREFERENCED_KEY, tag)
+                continue
+            siblings = [
+                other for other in registry_tags
+                if other not in expired_set and other.rsplit(":", 1)[0] == repo
+            ]
+            if digest in [await digest_of(other) for other in siblings]:
+                report["kept_shared"].append(tag)
+                continue
+            if dry_run or await self.registry.delete_image(tag):
+                report["deleted"].append(tag)
+                if not dry_run:
+                    deleted_digests.add((repo, digest))
+                    self.redis.hdel(UNREFERENCED_KEY, tag)
+
+    async def _collect_garbage(self, report: dict) -> None:
+        """Run blob GC in the registry container, unless a push is uploading."""
+        settings = get_settings()
+        if not self.redis.set(GC_RUNNING_KEY, "1", nx=True, ex=settings.registry_gc_timeout):
+            report["gc_skipped_reason"] = "garbage collection still running"
+            return
+        exec_ids: List[str] = []
+        clear_flag = True
+        try:
+            self.redis.zremrangebyscore(PUSH_LEASES_KEY, "-inf", time.time())
+            if self.redis.zcard(PUSH_LEASES_KEY):
+                report["gc_skipped_reason"] = "push in progress"
+                return
+            try:
+                before, after = await run_docker(
+                    partial(self._garbage_collect, exec_ids.append),
+                    op="registry_gc", timeout=settings.registry_gc_timeout,
+                )
+            except BaseException:
+                # Stopped waiting, but the exec may still be deleting blobs
+                if exec_ids and await self._exec_running(exec_ids[0]):
+                    clear_flag = False
+                    self._gc_watch = asyncio.get_running_loop().create_task(self._clear_when_done(exec_ids[0]))
+                raise
+            report.update(
+                gc_ran=True,
+                bytes_before=before,
+                bytes_after=after,
+                bytes_reclaimed=max(0, before - after),
+            )
+            self.redis.delete(GC_DIRTY_KEY)
+        finally:
+            if clear_flag:
+                self.redis.delete(GC_RUNNING_KEY)
+
+    async def _exec_running(self, exec_id: str) -> bool:
+        """Whether a GC exec is still running; assumed running if Docker cannot say."""
+        api = self.registry._get_docker_client().api
+        try:
+            info = await run_docker(api.exec_inspect, exec_id, op="registry_gc_inspect")
+            return bool(info.get("Running"))
+        except Exception as e:
+            logger.warning(f"Could not inspect registry GC exec {exec_id[:12]}: {e}")
+            return True
+
+    async def _clear_when_done(self, exec_id: str) -> None:
+        """Keep the GC running flag until the exec exits, then clear it.
+
+        If this worker dies first, the flag still expires after registry_gc_timeout.
+        """
+        timeout = get_settings().registry_gc_timeout
+        logger.warning(f"Registry GC exec {exec_id[:12]} outlived its pass; holding pushes until it exits")
+        try:
+            while await self._exec_running(exec_id):
+                self.redis.expire(GC_RUNNING_KEY, timeout)
+                await asyncio.sleep(GC_EXEC_POLL)
+            self.redis.delete(GC_RUNNING_KEY)
+            logger.info(f"Registry GC exec {exec_id[:12]} finished")
+        except Exception as e:
+            logger.error(f"Lost track of registry GC exec {exec_id[:12]}: {e}")
+
+    def _garbage_collect(self, on_exec: Callable[[str], None]) -> Tuple[int, int]:
+        """Blocking: run ``registry garbage-collect`` and measure storage around it.
+
+        Args:
+            on_exec: Called with the exec id before the exec starts
+
+        Returns:
+            (bytes_before, bytes_after)
+        """
+        container = self._registry_container()
+        before = self._storage_bytes(container)
+        # A separate exec create/start, so the exec can be inspected if we stop waiting for it
+        api = self.registry._get_docker_client().api
+        exec_id = api.exec_create(
+            container.id, ["registry", "garbage-collect", "--delete-untagged", REGISTRY_CONFIG]
+        )["Id"]
+        on_exec(exec_id)
+        output = api.exec_start(exec_id)
+        exit_code = api.exec_inspect(exec_id).get("ExitCode")
+        if exit_code != 0:
+            raise RuntimeError(f"registry garbage-collect failed ({exit_code}): {output.decode(errors='replace')[-500:]}")
+        return before, self._storage_bytes(container)
+
+    def _registry_container(self):
+        service = get_settings().registry_compose_service
+        containers = self.registry._get_docker_client().containers.list(
+            filters={"label": f"com.docker.compose.service={service}"}
+        )
+        if not containers:
+            raise RuntimeError(f"Registry container for compose service '{service}' not found")
+        return containers[0]
+
+    @staticmethod
+    def _storage_bytes(container) -> int:
+        exit_code, output = container.exec_run(["du", "-sk", REGISTRY_ROOT])
+        if exit_code != 0:
+            raise RuntimeError(f"du failed ({exit_code}): {output.decode(errors='replace')}")
+        return int(output.split()[0]) * 1024
+
+    def last_report(self) -> Optional[dict]:
+        """The most recent report from any API worker."""
+        try:
+            stored = self.redis.get(REPORT_KEY)
+        except Exception as e:
+            logger.warning(f"Could not read registry GC report: {e}")
+            stored = None
+        return json.loads(stored) if stored else self.last_run
+
+    async def run_forever(self, interval: float, redis_client: Optional[Redis] = None) -> None:
+        """Run a retention pass every ``interval`` seconds until cancelled.
+
+        Each API worker runs this loop, but only the one that takes the
+        Redis lock for the current interval runs the pass.
+        """
+        redis_client = redis_client or self.redis
+        while True:
+            try:
+                if redis_client.set(GC_LOCK_KEY, "1", nx=True, ex=max(1, int(interval))):
+                    await self.run()
+            except Exception as e:
+                logger.error(f"Background registry retention failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+_registry_retention_service: Optional[RegistryRetentionService] = None
+
+
+def get_registry_retention_service() -> RegistryRetentionService:
+    """Get the singleton RegistryRetentionService instance."""
+    global _registry_retention_service
+    if _registry_retention_service is None:
+        _registry_retention_service = RegistryRetentionService()
+    return _registry_retention_service
@@ -2,13 +2,28 @@
 import asyncio
 import logging
 import threading
-from typing import Optional, List, Callable, Dict
+from contextlib import ExitStack, contextmanager
+from typing import Optional, List, Callable, Dict, Iterator
+from functools import partial
 import httpx
 import docker
 import docker.errors
+from redis import Redis, RedisError
+
+from cyroid.config import get_settings
+from cyroid.services.docker_executor import run_docker
+from cyroid.services.registry_catalog import RegistryCatalog
 
 logger = logging.getLogger(__name__)
 
+# Accept every manifest type we push, so HEAD returns the digest the tag actually points at
+MANIFEST_ACCEPT = ", ".join([
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+])
+
 
 class RegistryPushError(Exception):
     """Raised when pushing to registry fails."""
@@ -31,6 +46,9 @@ class RegistryService:
         self._http_clients: Dict[int, httpx.AsyncClient] = {}
         self._http_clients_lock = threading.Lock()
         self._docker_client: Optional[docker.DockerClient] = None
+        self._redis: Optional[Redis] = None
+        # Cached catalog crawl behind list_images / get_stats
+        self.catalog = RegistryCatalog(self)
 
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create async HTTP client for the current event loop.
@@ -66,6 +84,13 @@ class RegistryService:
             self._docker_client = docker.from_env()
         return self._docker_client
 
+    @property
+    def redis(self) -> Redis:
+        """Redis client coordinating pushes with garbage collection and sharing catalog invalidations."""
+        if self._redis is None:
+            self._redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+        return self._redis
+
     async def close(self):
         """Close HTTP client for the current event loop."""
         current_loop = asyncio.get_running_loop()
@@ -176,6 +201,72 @@ class RegistryService:
         Returns:
             True if push succeeded, False otherwise
         """
+        # The push runs on the Docker executor; progress is reported back on the event loop
+        loop = asyncio.get_running_loop()
+
+        def report(status: str, percent: int) -> None:
+            loop.call_soon_threadsafe(progress_callback, status, percent)
+
+        # A timed-out or cancelled push stops at the next progress line
+        cancelled = threading.Event()
+        try:
+            pushed = await run_docker(
+                partial(self._push_image, image_tag, report if progress_callback else None, cancelled),
+                op="registry_push", timeout=get_settings().docker_long_call_timeout,
+                on_cancel=cancelled.set,
+            )
+        except Exception as e:
+            logger.error(f"Failed to push {image_tag}: {e}")
+            return False
+        if pushed:
+            self.catalog.invalidate()
+        return pushed
+
+    @contextmanager
+    def push_lease(self, cancelled: Optional[Callable[[], bool]] = None) -> Iterator[None]:
+        """Keep blob garbage collection from running while a push uploads layers.
+
+        Every push to the registry must run inside this. If Redis is
+        unreachable the push goes ahead without a lease.
+
+        Args:
+            cancelled: Polled while waiting for a running garbage collection
+
+        Raises:
+            TimeoutError: If a running garbage collection did not finish in time
+        """
+        from cyroid.services.registry_retention_service import registry_push_lease
+
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(registry_push_lease(
+                    self.redis, ttl=get_settings().docker_long_call_timeout, cancelled=cancelled,
+                ))
+            except RedisError as e:
+                logger.warning(f"Pushing without a GC lease: {e}")
+            yield
+
+    def _push_image(
+        self,
+        image_tag: str,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> bool:
+        """Blocking body of push_image."""
+        try:
+            with self.push_lease(cancelled=cancelled.is_set if cancelled is not None else None):
+                return self._push_layers(image_tag, progress_callback, cancelled)
+        except TimeoutError as e:
+            logger.error(f"Cannot push {image_tag}: {e}")
+            return False
+
+    def _push_layers(
+        self,
+        image_tag: str,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> bool:
+        """Tag an image for the registry and push it."""
         try:
             docker_client = self._get_docker_client()
 
@@ -202,6 +293,9 @@ class RegistryService:
 
             # Process push output for progress
             for line in push_output:
+                if cancelled is not None and cancelled.is_set():
+                    logger.warning(f"Push of {image_tag} cancelled")
+                    return False
                 if 'error' in line:
                     logger.error(f"Push error: {line['error']}")
                     return False
@@ -295,28 +389,7 @@ class RegistryService:
 
         # Remove from host Docker - the registry tag we created
         try:
-            docker_client = self._get_docker_client()
-            push_tag = self.get_registry_tag(image_tag, for_host=True)
-
-            # Remove the registry-tagged version first (localhost:5000/...)
-            try:
-                docker_client.images.remove(push_tag, force=False)
-                logger.info(f"Removed registry tag {push_tag} from host")
-            except docker.errors.ImageNotFound:
-                logger.debug(f"Registry tag {push_tag} not found on host (already removed)")
-            except docker.errors.APIError as e:
-                logger.warning(f"Could not remove registry tag {push_tag}: {e}")
-
-            # Remove the original image tag
-            try:
-                docker_client.images.remove(image_tag, force=False)
-                logger.info(f"Removed original image {image_tag} from host")
-            except docker.errors.ImageNotFound:
-                logger.debug(f"Image {image_tag} not found on host (already removed)")
-            except docker.errors.APIError as e:
-                # Image might be in use or have other tags - log warning but don't fail
-                logger.warning(f"Could not remove image {image_tag} from host: {e}")
-
+            await run_docker(self._remove_host_tags, image_tag, op="host_image_remove")
         except Exception as e:
             # Cleanup failure is not critical - image is already in registry
             logger.warning(f"Host cleanup failed for {image_tag}, but image is in registry: {e}")
@@ -326,6 +399,30 @@ class RegistryService:
 
         return True
 
+    def _remove_host_tags(self, image_tag: str) -> None:
+        """Remove a pushed image and its registry tag from host Docker."""
+        docker_client = self._get_docker_client()
+        push_tag = self.get_registry_tag(image_tag, for_host=True)
+
+        # Remove the registry-tagged version first (localhost:5000/...)
+        try:
+            docker_client.images.remove(push_tag, force=False)
+            logger.info(f"Removed registry tag {push_tag} from host")
+        except docker.errors.ImageNotFound:
+            logger.debug(f"Registry tag {push_tag} not found on host (already removed)")
+        except docker.errors.APIError as e:
+            logger.warning(f"Could not remove registry tag {push_tag}: {e}")
+
+        # Remove the original image tag
+        try:
+            docker_client.images.remove(image_tag, force=False)
+            logger.info(f"Removed original image {image_tag} from host")
+        except docker.errors.ImageNotFound:
+            logger.debug(f"Image {image_tag} not found on host (already removed)")
+        except docker.errors.APIError as e:
+            # Image might be in use or have other tags - log warning but don't fail
+            logger.warning(f"Could not remove image {image_tag} from host: {e}")
+
     async def image_needs_push(self, image_tag: str) -> bool:
         """Check if image exists on host but not in registry.
 
@@ -351,72 +448,54 @@ class RegistryService:
             logger.warning(f"Error checking host for image {image_tag}: {e}")
             return False
 
-    async def list_images(self) -> List[dict]:
+    async def _catalog_snapshot(self, refresh: bool = False):
+        """Cached catalog crawl; the last good snapshot if the registry is unreachable."""
+        try:
+            return await self.catalog.get(refresh=refresh)
+        except httpx.RequestError as e:
+            logger.error(f"Failed to list registry images: {e}")
+            return self.catalog.snapshot
+
+    async def list_images(self, refresh: bool = False) -> List[dict]:
         """List all images in the registry.
 
-        Returns:
-            List of dicts with 'name' and 'tags' keys
-        """
-        try:
-            client = await self._get_http_client()
+        Served from the cached catalog crawl (see RegistryCatalog).
 
-            # Get catalog
-            response = await client.get(f"{self.REGISTRY_URL}/v2/_catalog")
-            if response.status_code != 200:
-                logger.warning(f"Failed to get catalog: {response.status_code}")
-                return []
-
-            repositories = response.json().get('repositories', [])
-
-            # Get tags for each repository
-            images = []
-            for repo in repositories:
-                tags_response = await client.get(f"{self.REGISTRY_URL}/v2/{repo}/tags/list")
-                if tags_response.status_code == 200:
-                    tags = tags_response.json().get('tags', [])
-                    images.append({
-                        'name': repo,
-                        'tags': tags or []
-                    })
-                else:
-                    images.append({
-                        'name': repo,
-                        'tags': []
-                    })
-
-            return images
+        Args:
+            refresh: Crawl the registry now instead of using a fresh cached listing
 
-        except httpx.RequestError as e:
-            logger.error(f"Failed to list registry images: {e}")
-            return []
+        Returns:
+            List of dicts with 'name', 'tags' and 'size_bytes' keys
+        """
+        snapshot = await self._catalog_snapshot(refresh)
+        return snapshot.images if snapshot else []
 
     async def get_stats(self) -> dict:
         """Get registry statistics.
 
         Returns:
-            Dict with image_count, tag_count, healthy status
+            Dict with image_count, tag_count, size_bytes, healthy status
+            and the age and cost of the cached crawl
         """
-        images = await self.list_images()
+        snapshot = await self._catalog_snapshot()
         healthy = await self.is_healthy()
 
-        tag_count = sum(len(img.get('tags', [])) for img in images)
-
         return {
-            'image_count': len(images),
-            'tag_count': tag_count,
+            'image_count': len(snapshot.images) if snapshot else 0,
+            'tag_count': snapshot.tag_count if snapshot else 0,
+            'size_bytes': snapshot.size_bytes if snapshot else None,
             'healthy': healthy,
+            **self.catalog.stats(),
         }
 
-    async def delete_image(self, image_tag: str) -> bool:
-        """Delete image from registry.
-
-        Note: Requires registry garbage collection to reclaim space.
+    async def get_manifest_digest(self, image_tag: str) -> Optional[str]:
+        """Get the manifest digest a tag points at.
 
         Args:
-            image_tag: Image tag like 'cyroid/kali:latest' or 'nginx:alpine'
+            image_tag: Image tag like 'cyroid/kali:latest'
 
         Returns:
-            True if deleted successfully, False otherwise
+            Digest like 'sha256:...', or None if the tag is missing or the lookup failed
         """
         name, tag = self._parse_image_tag(image_tag)
 
@@ -424,30 +503,61 @@ class RegistryService:
             client = await self._get_http_client()
 
             # Get manifest digest using HEAD request
-            headers = {
-                'Accept': 'application/vnd.docker.distribution.manifest.v2+json'
-            }
             head_response = await client.head(
                 f"{self.REGISTRY_URL}/v2/{name}/manifests/{tag}",
-                headers=headers
+                headers={'Accept': MANIFEST_ACCEPT}
             )
 
             if head_response.status_code == 404:
                 logger.warning(f"Image {image_tag} not found in registry")
-                return False
+                return None
 
             if head_response.status_code != 200:
                 logger.error(
                     f"Failed to get manifest for {image_tag}: {head_response.status_code}"
                 )
-                return False
+                return None
 
             # Get the digest from response header
             digest = head_response.headers.get('Docker-Content-Digest')
             if not digest:
                 logger.error(f"No Docker-Content-Digest header for {image_tag}")
+            return digest
+
+        except httpx.RequestError as e:
+            logger.error(f"Request error getting manifest for {image_tag}: {e}")
+            return None
+
+    def _mark_gc_needed(self) -> None:
+        """Flag that deleted manifests are waiting for blob garbage collection."""
+        from cyroid.services.registry_retention_service import GC_DIRTY_KEY
+
+        try:
+            self.redis.set(GC_DIRTY_KEY, "1")
+        except RedisError as e:
+            logger.warning(f"Could not flag registry for garbage collection: {e}")
+
+    async def delete_image(self, image_tag: str) -> bool:
+        """Delete image from registry.
+
+        Note: Blob space is reclaimed by the next garbage collection in the
+        maintenance window (see registry_retention_service).
+
+        Args:
+            image_tag: Image tag like 'cyroid/kali:latest' or 'nginx:alpine'
+
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        name, _tag = self._parse_image_tag(image_tag)
+
+        try:
+            digest = await self.get_manifest_digest(image_tag)
+            if not digest:
                 return False
 
+            client = await self._get_http_client()
+
             # Delete the manifest by digest
             delete_response = await client.delete(
                 f"{self.REGISTRY_URL}/v2/{name}/manifests/{digest}"
@@ -455,6 +565,8 @@ class RegistryService:
 
             if delete_response.status_code == 202:
                 logger.info(f"Successfully deleted {image_tag} from registry")
+                self.catalog.invalidate()
+                self._mark_gc_needed()
                 return True
             else:
                 logger.error(
@@ -0,0 +1,248 @@
+# backend/cyroid/services/resource_ledger.py
+"""Reservation ledger for host resources claimed by range deployments.
+
+A deployment claims the disk, RAM, vCPUs and DinD container its range needs
+before it starts, and releases the claim when it completes or fails. A claim
+is admitted only if it fits what the host has left after:
+
+- disk: every other in-flight reservation, since deployments that have been
+  admitted have not written their images and volumes yet
+- RAM and vCPU: the VMs of running ranges plus every in-flight reservation
+- DinD: running ranges plus in-flight reservations
+
+Claims from API and worker processes are serialized with a transaction-level
+advisory lock on PostgreSQL, so concurrent deployments cannot all pass the
+check against the same free space.
+"""
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from cyroid.config import get_settings
+from cyroid.models.range import Range, RangeStatus
+from cyroid.models.resource_reservation import ResourceReservation
+from cyroid.models.vm import VM
+from cyroid.services.deployment_validator import DeploymentValidator, get_host_facts
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key serializing claims ("CYRES")
+LEDGER_LOCK_ID = 0x4359524553
+
+
+@dataclass
+class ResourceAmounts:
+    """An amount of each reservable resource."""
+    disk_gb: float = 0.0
+    ram_mb: int = 0
+    vcpus: int = 0
+    dind: int = 0
+
+
+@dataclass
+class HostCapacity:
+    """What the host can admit; None means unknown or unlimited."""
+    disk_gb: Optional[float] = None  # Free space in the Docker data directory
+    ram_mb: Optional[int] = None
+    vcpus: Optional[int] = None
+    dind: Optional[int] = None
+
+
+class InsufficientResourcesError(Exception):
+    """A reservation does not fit the resources the host has left."""
+
+    def __init__(self, range_id: UUID, shortfalls: List[dict]):
+        self.range_id = range_id
+        self.shortfalls = shortfalls
+        super().__init__("Insufficient host resources: " + "; ".join(
+            f"{s['resource']} needs {s['requested']}, {s['available']} left" for s in shortfalls
+        ))
+
+
+def host_capacity(docker_service=None, host_facts=None) -> HostCapacity:
+    """Read the host's admission capacity from Docker (cached with the validator's host facts).
+
+    Args:
+        docker_service: Docker service (defaults to the shared one)
+        host_facts: Host fact cache (defaults to the shared one)
+
+    Returns:
+        HostCapacity; dimensions that cannot be read are left unknown
+    """
+    from cyroid.services.docker_service import get_docker_service
+
+    settings = get_settings()
+    docker = docker_service or get_docker_service()
+    facts = host_facts or get_host_facts()
+    capacity = HostCapacity(dind=settings.reservation_max_dind or None)
+
+    try:
+        info = facts.info(docker)
+        if info.get("MemTotal"):
+            capacity.ram_mb = int(info["MemTotal"] / (1024 * 1024) * settings.reservation_ram_overcommit)
+        if info.get("NCPU"):
+            capacity.vcpus = int(info["NCPU"] * settings.reservation_cpu_overcommit)
+    except Exception as e:
+        logger.warning(f"Could not read host memory and CPUs: {e}")
+    try:
+        _, usage = facts.disk_usage(docker, DeploymentValidator.DOCKER_DATA_DIR)
+        capacity.disk_gb = usage.free / (1024 ** 3)
+    except Exception as e:
+        logger.warning(f"Could not read host disk space: {e}")
+    return capacity
+
+
+class ResourceLedger:
+    """Claims and releases deployment resource reservations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def requirements(self, range_id: UUID) -> ResourceAmounts:
+        """Resources a range's deployment needs: its VMs' disk (plus buffer), RAM and vCPUs, and one DinD."""
+        disk_gb, ram_mb, vcpus = self.db.execute(
+            select(
+                func.coalesce(func.sum(VM.disk_gb), 0),
+                func.coalesce(func.sum(VM.ram_mb), 0),
+                func.coalesce(func.sum(VM.cpu), 0),
+            ).where(VM.range_id == range_id)
+        ).one()
+        return ResourceAmounts(
+            disk_gb=round(disk_gb * (1 + DeploymentValidator.DISK_BUFFER_PERCENT), 1),
+            ram_mb=int(ram_mb),
+            vcpus=int(vcpus),
+            dind=1,
+        )
+
+    def reserved(self, exclude: Optional[List[UUID]] = None) -> ResourceAmounts:
+        """Totals held by unexpired reservations, optionally excluding some ranges."""
+        stmt = select(
+            func.coalesce(func.sum(ResourceReservation.disk_gb), 0),
+            func.coalesce(func.sum(ResourceReservation.ram_mb), 0),
+            func.coalesce(func.sum(ResourceReservation.vcpus), 0),
+            func.coalesce(func.sum(ResourceReservation.dind), 0),
+        ).where(ResourceReservation.expires_at > datetime.now(timezone.utc))
+        if exclude:
+            stmt = stmt.where(ResourceReservation.range_id.notin_(exclude))
+        disk_gb, ram_mb, vcpus, dind = self.db.execute(stmt).one()
+        return ResourceAmounts(disk_gb=float(disk_gb), ram_mb=int(ram_mb), vcpus=int(vcpus), dind=int(dind))
+
+    def committed(self) -> ResourceAmounts:
+        """RAM, vCPUs and DinD containers of running ranges (their disk is already used)."""
+        ram_mb, vcpus = self.db.execute(
+            select(func.coalesce(func.sum(VM.ram_mb), 0), func.coalesce(func.sum(VM.cpu), 0))
+            .join(Range, Range.id == VM.range_id)
+            .where(Range.status == RangeStatus.RUNNING)
+        ).one()
+        dind = self.db.scalar(select(func.count()).select_from(Range).where(Range.status == RangeStatus.RUNNING))
+        return ResourceAmounts(ram_mb=int(ram_mb), vcpus=int(vcpus), dind=dind)
+
+    def claim(self, range_id: UUID, capacity: HostCapacity) -> ResourceReservation:
+        """Atomically reserve the resources a range's deployment needs.
+
+        Idempotent per range: a range that already holds a reservation keeps
+        it (with its lease renewed), so the API can claim at admission and
+        the deployment worker claim again when it starts. Commits the session.
+
+        Args:
+            range_id: Range being deployed
+            capacity: What the host can admit
+
+        Returns:
+            The range's reservation
+
+        Raises:
+            InsufficientResourcesError: If the request does not fit
+        """
+        self._lock()
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=get_settings().reservation_ttl)
+        self.db.execute(delete(ResourceReservation).where(ResourceReservation.expires_at <= now))
+
+        reservation = self.db.get(ResourceReservation, range_id)
+        if reservation is not None:
+            reservation.expires_at = expires_at
+            self.db.commit()
+            return reservation
+
+        request = self.requirements(range_id)
+        held = self.reserved()
+        committed = self.committed()
+        shortfalls = []
+        for resource, requested, available in (
+            ("disk_gb", request.disk_gb, _left(capacity.disk_gb, held.disk_gb)),
+            ("ram_mb", request.ram_mb, _left(capacity.ram_mb, committed.ram_mb + held.ram_mb)),
+            ("vcpus", request.vcpus, _left(capacity.vcpus, committed.vcpus + held.vcpus)),
+            ("dind", request.dind, _left(capacity.dind, committed.dind + held.dind)),
+        ):
+            if available is not None and requested > available:
+                shortfalls.append({"resource": resource, "requested": requested, "available": available})
+        if shortfalls:
+            self.db.rollback()
+            raise InsufficientResourcesError(range_id, shortfalls)
+
+        reservation = ResourceReservation(range_id=range_id, expires_at=expires_at, **asdict(request))
+        self.db.add(reservation)
+        self.db.commit()
+        logger.info(f"Reserved {asdict(request)} for range {range_id}")
+        return reservation
+
+    def release(self, range_id: UUID) -> bool:
+        """Release a range's reservation, if any. Commits the session.
+
+        Returns:
+            True if a reservation was released
+        """
+        released = self.db.execute(
+            delete(ResourceReservation).where(ResourceReservation.range_id == range_id)
+        ).rowcount
+        self.db.commit()
+        if released:
+            logger.info(f"Released resource reservation for range {range_id}")
+        return bool(released)
+
+    def snapshot(self, capacity: HostCapacity) -> dict:
+        """Capacity, usage and current reservations, for admin metrics."""
+        held = self.reserved()
+        committed = self.committed()
+        now = datetime.now(timezone.utc)
+        rows = self.db.execute(
+            select(ResourceReservation, Range.name)
+            .join(Range, Range.id == ResourceReservation.range_id)
+            .where(ResourceReservation.expires_at > now)
+            .order_by(ResourceReservation.created_at)
+        ).all()
+        return {
+            "capacity": asdict(capacity),
+            "committed": asdict(committed),
+            "reserved": asdict(held),
+            "reservations": [
+                {
+                    "range_id": str(reservation.range_id),
+                    "range_name": name,
+                    "disk_gb": reservation.disk_gb,
+                    "ram_mb": reservation.ram_mb,
+                    "vcpus": reservation.vcpus,
+                    "dind": reservation.dind,
+                    "created_at": reservation.created_at,
+                    "expires_at": reservation.expires_at,
+                }
+                for reservation, name in rows
+            ],
+        }
+
+    def _lock(self) -> None:
+        """Serialize claims until the transaction ends."""
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LEDGER_LOCK_ID})
+
+
+def _left(capacity: Optional[float], used: float) -> Optional[float]:
+    if capacity is None:
+        return None
+    return round(max(capacity - used, 0), 1)
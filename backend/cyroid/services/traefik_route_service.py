@@ -3,15 +3,34 @@
 Traefik Route Service
 
 Manages dynamic Traefik routes for VNC console access in DinD deployments.
-Generates YAML route files that Traefik watches via file provider.
+
+All ranges' routes are served from one file, ``vnc-routes.yml``, in the
+directory Traefik's file provider watches. Route changes are queued and
+coalesced for ``traefik_route_flush_delay`` seconds, so a burst of range
+deployments triggers one Traefik reload instead of one per range. The file
+is written to a temporary name and renamed into place, so Traefik never
+reads a partial file.
+
+The API and worker processes share the file: each flush takes a file lock,
+merges its queued changes into the route set kept in ``.vnc-routes.json``,
+and re-renders the route file only if its content changed. The strip-prefix
+and KasmVNC auth middlewares are shared by all routes to keep the rendered
+configuration compact.
 """
+import atexit
 import base64
+import fcntl
+import json
 import os
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 import yaml
 
+from cyroid.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 # KasmVNC auto-login credentials (hardcoded for seamless access)
@@ -19,22 +38,57 @@ KASM_USER = "kasm_user"
 KASM_PASSWORD = "vncpassword"
 KASM_AUTH_HEADER = f"Basic {base64.b64encode(f'{KASM_USER}:{KASM_PASSWORD}'.encode()).decode()}"
 
+ROUTE_FILE_NAME = "vnc-routes.yml"
+# Not .yml, so Traefik's file provider ignores them
+STATE_FILE_NAME = ".vnc-routes.json"
+LOCK_FILE_NAME = ".vnc-routes.lock"
+
+# Middlewares shared by every VNC route
+STRIP_PREFIX_MIDDLEWARE = "vnc-strip-prefix"
+KASM_AUTH_MIDDLEWARE = "vnc-auth-kasm"
+SHARED_MIDDLEWARES = {
+    STRIP_PREFIX_MIDDLEWARE: {"stripPrefixRegex": {"regex": ["^/vnc/[^/]+"]}},
+    KASM_AUTH_MIDDLEWARE: {"headers": {"customRequestHeaders": {"Authorization": KASM_AUTH_HEADER}}},
+}
+
+
+class _NoAliasDumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+    """Writes shared lists in full, so equal route sets always render identically."""
+
+    def ignore_aliases(self, data):
+        return True
+
+
+def _range_key(range_id: str) -> str:
+    # Same key the per-range route files used
+    return range_id[:8]
+
 
 class TraefikRouteService:
     """Manages dynamic Traefik routes for DinD VNC access."""
 
-    def __init__(self, routes_dir: Optional[str] = None):
+    def __init__(self, routes_dir: Optional[str] = None, flush_delay: Optional[float] = None):
         """
         Initialize the Traefik route service.
 
         Args:
             routes_dir: Directory where Traefik route files are written.
                        Defaults to /etc/traefik/vnc-routes or uses TRAEFIK_VNC_ROUTES_DIR env var.
+            flush_delay: Seconds to coalesce route changes (defaults to traefik_route_flush_delay)
         """
         self.routes_dir = Path(
             routes_dir or
             os.environ.get("TRAEFIK_VNC_ROUTES_DIR", "/etc/traefik/vnc-routes")
         )
+        self.route_file = self.routes_dir / ROUTE_FILE_NAME
+        self.flush_delay = get_settings().traefik_route_flush_delay if flush_delay is None else flush_delay
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}  # range key -> routes (None = remove)
+        self._timer: Optional[threading.Timer] = None
+        self._changes = 0
+        self._flushes = 0
+        self._reloads = 0
+        self._last_flush_ms = 0.0
 
     def _ensure_routes_dir(self) -> bool:
         """Ensure the routes directory exists. Returns True if successful."""
@@ -51,14 +105,17 @@ class TraefikRouteService:
         port_mappings: Dict[str, Dict[str, Any]],
     ) -> Optional[str]:
         """
-        Generate Traefik route file for VNC access to DinD VMs.
+        Set the VNC routes of a range's DinD VMs.
+
+        The change is written to the shared route file after the coalescing
+        window, together with any other changes queued meanwhile.
 
         Args:
             range_id: Range identifier
             port_mappings: Dict mapping vm_id to {proxy_host, proxy_port, original_port}
 
         Returns:
-            Path to the generated route file, or None if failed
+            Path to the route file serving the routes, or None if failed
         """
         if not self._ensure_routes_dir():
             logger.error("Cannot write VNC routes - directory not accessible")
@@ -112,28 +169,12 @@ class TraefikRouteService:
                     }
                 }
 
-            # Middleware to strip /vnc/{vm_id} prefix
-            middleware_name = f"vnc-strip-{vm_id_short}"
-            middlewares[middleware_name] = {
-                "stripPrefix": {
-                    "prefixes": [f"/vnc/{vm_id}"]
-                }
-            }
-
-            # Build middleware list for this route
-            route_middlewares = [middleware_name]
+            # Shared middleware strips the /vnc/{vm_id} prefix
+            route_middlewares = [STRIP_PREFIX_MIDDLEWARE]
 
-            # For KasmVNC (port 6901), add auth header middleware for auto-login
+            # For KasmVNC (port 6901), add the shared auth header middleware for auto-login
             if requires_ssl:
-                auth_middleware_name = f"vnc-auth-{vm_id_short}"
-                middlewares[auth_middleware_name] = {
-                    "headers": {
-                        "customRequestHeaders": {
-                            "Authorization": KASM_AUTH_HEADER
-                        }
-                    }
-                }
-                route_middlewares.append(auth_middleware_name)
+                route_middlewares.append(KASM_AUTH_MIDDLEWARE)
                 logger.debug(f"Added KasmVNC auto-auth middleware for VM {vm_id}")
 
             # For linuxserver/webtop containers, inject Basic auth header for auto-login
@@ -176,49 +217,179 @@ class TraefikRouteService:
             logger.debug(f"No valid VNC routes generated for range {range_id}")
             return None
 
-        # Build the config structure
-        config = {
-            "http": {
-                "routers": routers,
-                "services": services,
-                "middlewares": middlewares,
-            }
-        }
-
-        # Write to file
-        route_file = self.routes_dir / f"range-{range_id[:8]}.yml"
-        try:
-            with open(route_file, "w") as f:
-                yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
-
-            logger.info(f"Generated VNC routes for range {range_id}: {route_file}")
-            return str(route_file)
-
-        except Exception as e:
-            logger.error(f"Failed to write VNC routes for range {range_id}: {e}")
-            return None
+        self._queue(range_id, {"routers": routers, "services": services, "middlewares": middlewares})
+        logger.info(f"Queued VNC routes for range {range_id} ({len(services)} VMs)")
+        return str(self.route_file)
 
     def remove_vnc_routes(self, range_id: str) -> bool:
         """
-        Remove Traefik route file for a range.
+        Remove a range's VNC routes from the shared route file.
 
         Args:
             range_id: Range identifier
 
         Returns:
-            True if file was removed or didn't exist, False on error
+            True if the removal was queued, False on error
         """
-        route_file = self.routes_dir / f"range-{range_id[:8]}.yml"
-
         try:
-            if route_file.exists():
-                route_file.unlink()
-                logger.info(f"Removed VNC routes for range {range_id}: {route_file}")
+            self._queue(range_id, None)
+            logger.info(f"Queued removal of VNC routes for range {range_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to remove VNC routes for range {range_id}: {e}")
             return False
 
+    def routes_for_range(self, range_id: str) -> Optional[Dict[str, Any]]:
+        """Routes currently set for a range (including queued changes), or None."""
+        key = _range_key(range_id)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+        return self._read_state()["ranges"].get(key)
+
+    def _queue(self, range_id: str, routes: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._pending[_range_key(range_id)] = routes
+            self._changes += 1
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Flush after the coalescing window, unless a flush is already due."""
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        Write queued route changes now.
+
+        Merges them into the shared route set under a file lock and swaps in
+        a re-rendered route file if its content changed.
+
+        Returns:
+            True if the route file was rewritten (triggering a Traefik reload)
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return False
+
+        started = time.perf_counter()
+        try:
+            self.routes_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.routes_dir / LOCK_FILE_NAME, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                state = self._read_state()
+                legacy_files = list(self.routes_dir.glob("range-*.yml"))
+                for legacy_file in legacy_files:
+                    # Adopt routes written as one file per range
+                    state["ranges"].setdefault(legacy_file.stem[len("range-"):], _load_legacy_routes(legacy_file))
+
+                for key, routes in pending.items():
+                    if routes is None:
+                        state["ranges"].pop(key, None)
+                    else:
+                        state["ranges"][key] = routes
+                state["ranges"] = {key: routes for key, routes in state["ranges"].items() if routes}
+
+                content = yaml.dump(
+                    _render(state["ranges"]), Dumper=_NoAliasDumper, default_flow_style=False, allow_unicode=True
+                )
+                current = self.route_file.read_text() if self.route_file.exists() else None
+                reloaded = content != current
+                if reloaded:
+                    _atomic_write(self.route_file, content)
+                    state["reloads"] = state.get("reloads", 0) + 1
+                    state["last_reload_at"] = time.time()
+                _atomic_write(self.routes_dir / STATE_FILE_NAME, json.dumps(state))
+                for legacy_file in legacy_files:
+                    legacy_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to write VNC routes to {self.route_file}: {e}")
+            with self._lock:
+                # Retry the changes later, unless newer ones replaced them
+                for key, routes in pending.items():
+                    self._pending.setdefault(key, routes)
+            self._schedule()
+            return False
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        with self._lock:
+            self._flushes += 1
+            self._reloads += int(reloaded)
+            self._last_flush_ms = duration_ms
+        logger.info(
+            f"Wrote {len(pending)} VNC route change(s) to {self.route_file} in {duration_ms} ms"
+            if reloaded else f"VNC route changes for {len(pending)} range(s) left {self.route_file} unchanged"
+        )
+        return reloaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Route writer metrics; ranges, routers and total reloads cover all processes."""
+        state = self._read_state()
+        with self._lock:
+            return {
+                "route_file": str(self.route_file),
+                "ranges": len(state["ranges"]),
+                "routers": sum(len(routes.get("routers", {})) for routes in state["ranges"].values()),
+                "reloads_total": state.get("reloads", 0),
+                "last_reload_at": state.get("last_reload_at"),
+                "changes": self._changes,
+                "pending": len(self._pending),
+                "flushes": self._flushes,
+                "reloads": self._reloads,
+                "last_flush_ms": self._last_flush_ms,
+            }
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            state = json.loads((self.routes_dir / STATE_FILE_NAME).read_text())
+        except FileNotFoundError:
+            return {"ranges": {}}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable VNC route state: {e}")
+            return {"ranges": {}}
+        state.setdefault("ranges", {})
+        return state
+
+
+def _render(ranges: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Traefik dynamic configuration for every range's routes."""
+    routers: Dict[str, Any] = {}
+    services: Dict[str, Any] = {}
+    middlewares: Dict[str, Any] = {}
+    for routes in ranges.values():
+        routers.update(routes.get("routers", {}))
+        services.update(routes.get("services", {}))
+        middlewares.update(routes.get("middlewares", {}))
+    used = {name for router in routers.values() for name in router.get("middlewares", [])}
+    middlewares.update({name: config for name, config in SHARED_MIDDLEWARES.items() if name in used})
+    return {"http": {"routers": routers, "services": services, "middlewares": middlewares}}
+
+
+def _load_legacy_routes(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        http = (yaml.safe_load(path.read_text()) or {}).get("http", {})
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable route file {path}: {e}")
+        return None
+    return {key: http.get(key, {}) for key in ("routers", "services", "middlewares")}
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    """Write a file so readers see either the old or the new content."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 
 # Singleton instance
 _traefik_route_service: Optional[TraefikRouteService] = None
@@ -229,4 +400,6 @@ def get_traefik_route_service() -> TraefikRouteService:
     global _traefik_route_service
     if _traefik_route_service is None:
         _traefik_route_service = TraefikRouteService()
+        # Write changes still in the coalescing window when the process exits
+        atexit.register(_traefik_route_service.flush)
     return _traefik_route_service
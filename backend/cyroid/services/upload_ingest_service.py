@@ -0,0 +1,377 @@
+# backend/cyroid/services/upload_ingest_service.py
+"""
+Streaming ingest pipeline for uploaded ISOs, archives and VM images.
+
+Uploads are spooled to disk in fixed-size chunks and archives are unpacked
+member-by-member, extracting only the file that is actually needed (the ISO
+inside a zip, the main disk inside an OVA). All disk and decompression work
+runs on a dedicated thread pool so a multi-gigabyte upload never blocks the
+event loop of the API worker that received it, and memory use stays bounded
+by the chunk size.
+
+Progress is published through the shared ImageJobRegistry under the
+``ingest`` kind so any API worker can report it.
+"""
+import asyncio
+import bz2
+import gzip
+import logging
+import lzma
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, Callable, Optional
+
+from fastapi import UploadFile
+
+from cyroid.config import get_settings
+from cyroid.services.image_job_registry import JOB_KIND_INGEST, get_image_job_registry
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK_SIZE = 1024 * 1024  # 1MB
+PROGRESS_INTERVAL = 0.5  # Seconds between progress reports
+
+# Callback signature: (bytes_done, bytes_total). bytes_total may be 0 if unknown.
+ProgressCallback = Callable[[int, int], None]
+
+_SINGLE_FILE_OPENERS = {
+    '.gz': gzip.open,
+    '.gzip': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+    '.lzma': lzma.open,
+}
+_TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.ova')
+
+_ingest_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_ingest_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for spooling and extraction."""
+    global _ingest_executor
+    if _ingest_executor is None:
+        _ingest_executor = ThreadPoolExecutor(
+            max_workers=get_settings().ingest_workers,
+            thread_name_prefix="cyroid-ingest",
+        )
+    return _ingest_executor
+
+
+async def run_in_ingest_pool(func: Callable, *args, **kwargs):
+    """Run a blocking ingest function on the ingest thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ingest_executor(), partial(func, *args, **kwargs))
+
+
+def copy_stream(
+    src: BinaryIO,
+    dest: BinaryIO,
+    total: int = 0,
+    progress: Optional[ProgressCallback] = None,
+    done: int = 0,
+) -> int:
+    """Copy ``src`` to ``dest`` in chunks, reporting progress. Returns bytes copied."""
+    copied = 0
+    last_report = 0.0
+    while chunk := src.read(INGEST_CHUNK_SIZE):
+        dest.write(chunk)
+        copied += len(chunk)
+        if progress:
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                progress(done + copied, total)
+    if progress:
+        progress(done + copied, total)
+    return copied
+
+
+def _archive_kind(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith(_TAR_EXTENSIONS):
+        return 'tar'
+    if lower.endswith('.zip'):
+        return 'zip'
+    for ext in _SINGLE_FILE_OPENERS:
+        if lower.endswith(ext):
+            return 'single'
+    return '7z'
+
+
+def _safe_member_name(name: str) -> str:
+    """Reduce an archive member path to a bare file name (no traversal)."""
+    return os.path.basename(name.replace('\\', '/')) or 'member'
+
+
+def extract_largest_member(
+    archive_path: str,
+    suffixes: tuple,
+    dest_dir: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Extract only the largest archive member whose name ends with one of ``suffixes``.
+
+    Tar archives (including OVA and compressed tars) are read as a stream in a
+    single pass; zip archives are read via their central directory; single-file
+    compressed images are decompressed directly; anything else (7z, rar) is
+    listed with 7z and only the chosen member is extracted.
+
+    Args:
+        archive_path: Path to the archive file
+        suffixes: Lower-case file name suffixes to look for (e.g. ('.iso',))
+        dest_dir: Directory to create the extraction directory in
+
+    Returns:
+        Path to the extracted file, inside a new temporary directory under dest_dir
+
+    Raises:
+        ValueError: If no matching member is found
+        RuntimeError: If extraction fails
+    """
+    extract_dir = tempfile.mkdtemp(prefix="ingest_", dir=dest_dir)
+    total = os.path.getsize(archive_path)
+
+    try:
+        kind = _archive_kind(archive_path)
+        if kind == 'tar':
+            return _extract_from_tar(archive_path, suffixes, extract_dir, total, progress)
+        if kind == 'zip':
+            try:
+                return _extract_from_zip(archive_path, suffixes, extract_dir, progress)
+            except NotImplementedError as e:
+                # zipfile lacks Deflate64, which Windows tools use for large members; 7z has it
+                logger.info(f"zipfile cannot extract {archive_path} ({e}), falling back to 7z")
+                return _extract_with_7z(archive_path, suffixes, extract_dir, progress)
+        if kind == 'single':
+            return _extract_single_file(archive_path, extract_dir, total, progress)
+        return _extract_with_7z(archive_path, suffixes, extract_dir, progress)
+    except Exception:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        raise
+
+
+def _extract_from_tar(archive_path, suffixes, extract_dir, total, progress) -> str:
+    best_path = None
+    best_size = -1
+    with open(archive_path, 'rb') as raw, tarfile.open(fileobj=raw, mode='r|*') as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.lower().endswith(suffixes):
+                continue
+            if member.size <= best_size:
+                continue
+            out_path = os.path.join(extract_dir, _safe_member_name(member.name))
+            src = tar.extractfile(member)
+            with open(out_path, 'wb') as out:
+                # Progress is measured against the compressed archive position
+                copy_stream(src, out, total, progress and (lambda _d, t: progress(raw.tell(), t)))
+            if best_path and best_path != out_path:
+                os.remove(best_path)
+            best_path, best_size = out_path, member.size
+
+    if best_path is None:
+        raise ValueError(f"No {'/'.join(suffixes)} file found in archive")
+    return best_path
+
+
+def _extract_from_zip(archive_path, suffixes, extract_dir, progress) -> str:
+    with zipfile.ZipFile(archive_path) as zf:
+        candidates = [
+            info for info in zf.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(suffixes)
+        ]
+        if not candidates:
+            raise ValueError(f"No {'/'.join(suffixes)} file found in archive")
+        member = max(candidates, key=lambda info: info.file_size)
+        if len(candidates) > 1:
+            logger.warning(f"Multiple matching files found in archive, using largest: {member.filename}")
+
+        out_path = os.path.join(extract_dir, _safe_member_name(member.filename))
+        with zf.open(member) as src, open(out_path, 'wb') as out:
+            copy_stream(src, out, member.file_size, progress)
+    return out_path
+
+
+def _extract_single_file(archive_path, extract_dir, total, progress) -> str:
+    lower = archive_path.lower()
+    ext = next(e for e in _SINGLE_FILE_OPENERS if lower.endswith(e))
+    name = _safe_member_name(archive_path[:-len(ext)])
+    out_path = os.path.join(extract_dir, name)
+
+    with open(archive_path, 'rb') as raw, _SINGLE_FILE_OPENERS[ext](raw, 'rb') as src, \
+            open(out_path, 'wb') as out:
+        copy_stream(src, out, total, progress and (lambda _d, t: progress(raw.tell(), t)))
+    return out_path
+
+
+def _extract_with_7z(archive_path, suffixes, extract_dir, progress) -> str:
+    # List contents with technical info so only the needed member is extracted
+    listing = subprocess.run(
+        ['7z', 'l', '-slt', '-ba', archive_path],
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    if listing.returncode != 0:
+        raise RuntimeError(f"Failed to read archive: {listing.stderr}")
+
+    candidates = []
+    entry = {}
+    for line in listing.stdout.splitlines() + ['']:
+        if not line.strip():
+            if entry.get('Path', '').lower().endswith(suffixes) and entry.get('Folder') != '+':
+                candidates.append((int(entry.get('Size') or 0), entry['Path']))
+            entry = {}
+            continue
+        key, _, value = line.partition(' = ')
+        entry[key.strip()] = value.strip()
+
+    if not candidates:
+        raise ValueError(f"No {'/'.join(suffixes)} file found in archive")
+    size, member = max(candidates)
+
+    # -bsp1 streams percent-complete to stdout; -so is avoided so 7z handles its own I/O.
+    # stderr goes to a file: an unread pipe would block 7z once it fills.
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        proc = subprocess.Popen(
+            ['7z', 'e', '-y', '-bsp1', f'-o{extract_dir}', archive_path, member],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+        )
+        try:
+            buffer = ''
+            while chunk := proc.stdout.read(256):
+                buffer = (buffer + chunk)[-256:]
+                if progress and (match := re.findall(r'(\d+)%', buffer)):
+                    progress(int(match[-1]) * size // 100, size)
+            proc.wait(timeout=3600)  # 1 hour timeout for large archives
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise RuntimeError("Archive extraction timed out")
+
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"Failed to extract archive: {stderr.read()[-2000:]}")
+
+    out_path = os.path.join(extract_dir, _safe_member_name(member))
+    if not os.path.exists(out_path):
+        raise RuntimeError(f"7z did not produce {member}")
+    if progress:
+        progress(size, size)
+    return out_path
+
+
+def extract_iso_from_archive(
+    archive_path: str,
+    dest_dir: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Extract the ISO file from an archive, skipping every other member.
+
+    Args:
+        archive_path: Path to the archive file
+        dest_dir: Directory to extract to
+
+    Returns:
+        Path to the extracted ISO file (the largest one if there are several)
+
+    Raises:
+        ValueError: If no ISO found
+        RuntimeError: If extraction fails
+    """
+    # Single-file compression (.gz, .xz, ...) wraps the ISO itself, whatever its name
+    return extract_largest_member(archive_path, ('.iso',), dest_dir, progress)
+
+
+class IngestJob:
+    """Publishes progress for one ingest operation to the shared job registry."""
+
+    def __init__(self, key: str, **fields):
+        self.key = key
+        self._jobs = get_image_job_registry()
+        self.owned = self._jobs.claim(JOB_KIND_INGEST, key, fields)
+
+    def stage(self, status: str) -> ProgressCallback:
+        """Mark the job as entering ``status`` and return a progress callback for it."""
+        self._jobs.update(JOB_KIND_INGEST, self.key, status=status, progress_percent=0)
+
+        def report(done: int, total: int) -> None:
+            self._jobs.update(
+                JOB_KIND_INGEST, self.key,
+                bytes_done=done,
+                bytes_total=total,
+                progress_percent=min(int(done * 100 / total), 99) if total else 0,
+            )
+        return report
+
+    def is_cancelled(self) -> bool:
+        return self._jobs.is_cancelled(JOB_KIND_INGEST, self.key)
+
+    def touch(self) -> None:
+        """Renew the job's lease while it waits or runs without reporting progress."""
+        self._jobs.update(JOB_KIND_INGEST, self.key)
+
+    def finish(self, status: str, **fields) -> None:
+        self._jobs.finish(JOB_KIND_INGEST, self.key, status, **fields)
+
+
+class UploadIngestService:
+    """Spools uploads to disk and extracts what is needed, off the event loop."""
+
+    async def spool(
+        self,
+        file: UploadFile,
+        dest_path: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """Stream an uploaded file to ``dest_path`` in chunks. Returns bytes written."""
+        def _copy() -> int:
+            file.file.seek(0)
+            total = file.size or 0
+            with open(dest_path, 'wb') as out:
+                return copy_stream(file.file, out, total, progress)
+
+        size = await run_in_ingest_pool(_copy)
+        logger.info(f"Spooled upload {file.filename} ({size} bytes) to {dest_path}")
+        return size
+
+    async def extract_iso(
+        self,
+        archive_path: str,
+        dest_dir: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        """Extract the ISO from an archive on the ingest pool."""
+        return await run_in_ingest_pool(extract_iso_from_archive, archive_path, dest_dir, progress)
+
+    async def extract_member(
+        self,
+        archive_path: str,
+        suffixes: tuple,
+        dest_dir: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        """Extract the largest member matching ``suffixes`` on the ingest pool."""
+        return await run_in_ingest_pool(extract_largest_member, archive_path, suffixes, dest_dir, progress)
+
+
+# Singleton instance
+_upload_ingest_service: Optional[UploadIngestService] = None
+
+
+def get_upload_ingest_service() -> UploadIngestService:
+    """Get the singleton UploadIngestService instance."""
+    global _upload_ingest_service
+    if _upload_ingest_service is None:
+        _upload_ingest_service = UploadIngestService()
+    return _upload_ingest_service
@@ -0,0 +1,120 @@
+# backend/cyroid/services/visibility_service.py
+"""
+Materialized tag-based visibility.
+
+A user can see a resource that has no tags, or one that shares at least one
+tag with the user's tag attributes. Resolving that from ``resource_tags`` on
+every list request meant two tag subqueries per call, growing with the number
+of tags and resources.
+
+The ``resource_visibility`` table holds the resolved grants (user, tagged
+resource). It is kept up to date incrementally: the grants of one resource
+are recomputed when its tags change, and the grants of one user when their
+tag attributes change. Visibility then becomes two indexed EXISTS lookups per
+row: "resource has no tags" or "user has a grant for it".
+"""
+import logging
+from uuid import UUID
+
+from sqlalchemy import delete, exists, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from cyroid.models.resource_tag import ResourceTag, ResourceVisibility
+from cyroid.models.user import UserAttribute
+
+logger = logging.getLogger(__name__)
+
+
+def _grants():
+    """SELECT (user_id, resource_type, resource_id) for every tag match."""
+    return (
+        select(UserAttribute.user_id, ResourceTag.resource_type, ResourceTag.resource_id)
+        .join(ResourceTag, ResourceTag.tag == UserAttribute.attribute_value)
+        .where(UserAttribute.attribute_type == 'tag')
+        .distinct()
+    )
+
+
+class VisibilityService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert_grants(self, query):
+        columns = ["user_id", "resource_type", "resource_id"]
+        if self.db.get_bind().dialect.name == "postgresql":
+            # A concurrent user/resource refresh may write the same grant
+            return pg_insert(ResourceVisibility).from_select(columns, query).on_conflict_do_nothing()
+        return insert(ResourceVisibility).from_select(columns, query)
+
+    def refresh_user(self, user_id: UUID) -> None:
+        """Recompute a user's grants after their tag attributes changed.
+
+        Runs in the caller's transaction; pending attribute changes are
+        flushed first.
+        """
+        self.db.flush()
+        self.db.execute(delete(ResourceVisibility).where(ResourceVisibility.user_id == user_id))
+        self.db.execute(self._insert_grants(_grants().where(UserAttribute.user_id == user_id)))
+
+    def refresh_resource(self, resource_type: str, resource_id: UUID) -> None:
+        """Recompute a resource's grants after its tags changed.
+
+        Runs in the caller's transaction; pending tag changes are flushed first.
+        """
+        self.db.flush()
+        self.db.execute(
+            delete(ResourceVisibility).where(
+                ResourceVisibility.resource_type == resource_type,
+                ResourceVisibility.resource_id == resource_id,
+            )
+        )
+        self.db.execute(
+            self._insert_grants(
+                _grants().where(
+                    ResourceTag.resource_type == resource_type,
+                    ResourceTag.resource_id == resource_id,
+                )
+            )
+        )
+
+    def rebuild(self) -> int:
+        """Recompute all grants from scratch.
+
+        Returns:
+            Number of grants written
+        """
+        self.db.execute(delete(ResourceVisibility))
+        self.db.execute(self._insert_grants(_grants()))
+        self.db.flush()
+        count = self.db.query(ResourceVisibility).count()
+        logger.info(f"Rebuilt resource visibility: {count} grants")
+        return count
+
+    @staticmethod
+    def visible_clause(resource_type: str, user_id: UUID, resource_id_column):
+        """SQL condition that a resource is visible to a (non-admin) user.
+
+        Args:
+            resource_type: Type of resource ('range', 'template', 'artifact')
+            user_id: User ID
+            resource_id_column: Column or value holding the resource ID
+
+        Returns:
+            Boolean SQL expression, for use in query filters
+        """
+        untagged = ~exists().where(
+            ResourceTag.resource_type == resource_type,
+            ResourceTag.resource_id == resource_id_column,
+        )
+        granted = exists().where(
+            ResourceVisibility.user_id == user_id,
+            ResourceVisibility.resource_type == resource_type,
+            ResourceVisibility.resource_id == resource_id_column,
+        )
+        return or_(untagged, granted)
+
+    def can_see(self, resource_type: str, resource_id: UUID, user_id: UUID) -> bool:
+        """Check tag-based visibility of one resource in a single query."""
+        clause = self.visible_clause(resource_type, user_id, literal(resource_id, ResourceTag.resource_id.type))
+        return bool(self.db.execute(select(clause)).scalar())
@@ -7,10 +7,17 @@ Each range gets a dedicated VyOS container that:
 - Has LAN interfaces (eth1, eth2, ...) for each network in the range
 - Handles NAT for internet-enabled networks
 - Enforces isolation via firewall rules
+
+Deployments describe the whole desired router configuration as a
+RouterConfig and apply it with one exec: the rendered script stages the
+firewall ruleset and DHCP configuration, validates both, and only then
+commits them (the ruleset in a single iptables-restore transaction).
 """
 import docker
 from docker.errors import APIError, NotFound, ImageNotFound
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
+import base64
 import logging
 import time
 import ipaddress
@@ -19,6 +26,192 @@ from cyroid.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Router filesystem paths used by the batched configuration
+DHCP_CONFIG_DIR = "/etc/dhcp"
+DHCP_LEASES_FILE = "/var/lib/dhcp/dhcpd.leases"
+DHCP_PID_FILE = "/var/run/dhcpd.pid"
+ROUTER_STATE_DIR = "/etc/cyroid"
+
+# iptables chains owned by the batched configuration (rebuilt on every apply)
+NAT_CHAIN = "CYROID_NAT"
+FORWARD_CHAIN = "CYROID_FORWARD"
+
+
+@dataclass
+class RouterInterface:
+    """Desired configuration of one router LAN interface."""
+    name: str  # eth1, eth2, ...
+    network_name: str
+    subnet: str
+    gateway: str
+    internet_enabled: bool = False
+    isolated: bool = False
+    dhcp_enabled: bool = False
+    dns_servers: Optional[str] = None
+    dns_search: Optional[str] = None
+
+
+@dataclass
+class RouterConfig:
+    """Desired configuration of a whole router."""
+    interfaces: List[RouterInterface] = field(default_factory=list)
+    outbound_interface: str = "eth0"
+
+
+@dataclass
+class RouterConfigResult:
+    """Outcome of applying a RouterConfig."""
+    success: bool
+    duration_ms: float
+    output: str = ""
+
+
+def _dhcp_safe_name(network_name: str) -> str:
+    return network_name.replace("-", "_").replace(" ", "_").lower()[:32]
+
+
+def _render_dhcp_subnet(
+    network_name: str,
+    subnet: str,
+    gateway: str,
+    dns_servers: Optional[str] = None,
+    dns_search: Optional[str] = None,
+    range_start: Optional[str] = None,
+    range_end: Optional[str] = None,
+    lease_time: int = 86400,
+) -> str:
+    """ISC dhcpd subnet declaration for a network."""
+    subnet_obj = ipaddress.ip_network(subnet, strict=False)
+    hosts = list(subnet_obj.hosts())
+
+    # Default DHCP range: .10 to .250 (avoiding gateway and reserved IPs)
+    if not range_start:
+        range_start = str(hosts[9]) if len(hosts) > 10 else str(hosts[1])
+    if not range_end:
+        range_end = str(hosts[min(249, len(hosts) - 2)]) if len(hosts) > 250 else str(hosts[-2])
+
+    if dns_servers:
+        dns_str = ", ".join(s.strip() for s in dns_servers.split(",") if s.strip())
+    else:
+        dns_str = "8.8.8.8, 8.8.4.4"
+
+    config_lines = [
+        f"# DHCP config for {network_name}",
+        f"subnet {subnet_obj.network_address} netmask {subnet_obj.netmask} {{",
+        f"    range {range_start} {range_end};",
+        f"    option routers {gateway};",
+        f"    option domain-name-servers {dns_str};",
+        f"    default-lease-time {lease_time};",
+        f"    max-lease-time {lease_time * 2};",
+    ]
+    if dns_search:
+        config_lines.append(f'    option domain-name "{dns_search}";')
+    config_lines.append("}")
+    return "\n".join(config_lines)
+
+
+def _dhcpd_restart_command(config_file: str, interfaces: List[str]) -> str:
+    """Shell that replaces the running dhcpd and returns once the new one is up.
+
+    pkill is followed by waiting for the old process to exit (so the new one
+    can bind), and dhcpd is started in daemon mode, which only returns after
+    it has read its configuration and opened its sockets.
+    """
+    return (
+        "pkill -x dhcpd 2>/dev/null; "
+        "for i in $(seq 1 50); do pgrep -x dhcpd >/dev/null || break; sleep 0.1; done; "
+        f"rm -f {DHCP_PID_FILE}; "
+        f"dhcpd -q -cf {config_file} -lf {DHCP_LEASES_FILE} -pf {DHCP_PID_FILE} {' '.join(interfaces)}"
+    ).rstrip()
+
+
+def render_router_rules(config: RouterConfig) -> str:
+    """iptables-restore ruleset for the NAT and isolation rules of a RouterConfig."""
+    nat = [f"-A {NAT_CHAIN} -s {i.subnet} -o {config.outbound_interface} -j MASQUERADE"
+           for i in config.interfaces if i.internet_enabled]
+    forward = []
+    for interface in config.interfaces:
+        if interface.isolated and not interface.internet_enabled:
+            forward.append(f"-A {FORWARD_CHAIN} -i {interface.name} -m state --state ESTABLISHED,RELATED -j ACCEPT")
+            forward.append(f"-A {FORWARD_CHAIN} -i {interface.name} -j DROP")
+    return "\n".join([
+        "*nat",
+        f":{NAT_CHAIN} - [0:0]",
+        *nat,
+        "COMMIT",
+        "*filter",
+        f":{FORWARD_CHAIN} - [0:0]",
+        *forward,
+        "COMMIT",
+        "",
+    ])
+
+
+def render_router_config(config: RouterConfig) -> str:
+    """Render a shell script that applies a RouterConfig in one pass.
+
+    The script stages and validates the ruleset and DHCP configuration
+    before changing anything, so a rejected configuration leaves the router
+    as it was. The ruleset is then committed with one iptables-restore
+    (atomic per table), interfaces are addressed, and dhcpd is restarted
+    once for all DHCP scopes.
+
+    Args:
+        config: Desired router configuration
+
+    Returns:
+        Bash script
+    """
+    def write(content: str, path: str) -> str:
+        encoded = base64.b64encode(content.encode()).decode()
+        return f"echo {encoded} | base64 -d > {path}"
+
+    rules_file = f"{ROUTER_STATE_DIR}/router.rules"
+    dhcp_file = f"{DHCP_CONFIG_DIR}/dhcpd.conf.combined"
+    dhcp_scopes = {
+        f"{DHCP_CONFIG_DIR}/dhcpd-{_dhcp_safe_name(i.network_name)}.conf": _render_dhcp_subnet(
+            i.network_name, i.subnet, i.gateway, dns_servers=i.dns_servers, dns_search=i.dns_search
+        )
+        for i in config.interfaces if i.dhcp_enabled
+    }
+    dhcp_interfaces = [i.name for i in config.interfaces if i.dhcp_enabled]
+
+    lines = [
+        "set -e",
+        f"mkdir -p {ROUTER_STATE_DIR} {DHCP_CONFIG_DIR} $(dirname {DHCP_LEASES_FILE})",
+        f"touch {DHCP_LEASES_FILE}",
+        "# Stage and validate",
+        write(render_router_rules(config), f"{rules_file}.new"),
+        f"iptables-restore --test --noflush < {rules_file}.new",
+    ]
+    if dhcp_scopes:
+        lines += [
+            write("\n".join(dhcp_scopes.values()) + "\n", f"{dhcp_file}.new"),
+            f"dhcpd -t -q -cf {dhcp_file}.new",
+        ]
+    lines += [
+        "# Commit",
+        f"iptables-restore --noflush < {rules_file}.new",
+        f"mv {rules_file}.new {rules_file}",
+        f"iptables -t nat -C POSTROUTING -j {NAT_CHAIN} 2>/dev/null || iptables -t nat -A POSTROUTING -j {NAT_CHAIN}",
+        f"iptables -C FORWARD -j {FORWARD_CHAIN} 2>/dev/null || iptables -I FORWARD -j {FORWARD_CHAIN}",
+    ]
+    for interface in config.interfaces:
+        prefix = interface.subnet.split("/")[1]
+        lines.append(f"ip addr replace {interface.gateway}/{prefix} dev {interface.name}")
+        lines.append(f"ip link set {interface.name} up")
+    lines.append(f"rm -f {DHCP_CONFIG_DIR}/dhcpd-*.conf")
+    if dhcp_scopes:
+        lines += [write(content, path) for path, content in dhcp_scopes.items()]
+        lines += [
+            f"mv {dhcp_file}.new {dhcp_file}",
+            _dhcpd_restart_command(dhcp_file, dhcp_interfaces),
+            "pgrep -x dhcpd >/dev/null",
+        ]
+    else:
+        lines += ["pkill -x dhcpd 2>/dev/null || true", f"rm -f {dhcp_file}"]
+    return "\n".join(lines) + "\n"
+
 
 class VyOSService:
     """Service for managing VyOS router containers."""
@@ -568,42 +761,108 @@ class VyOSService:
         the 2stacks/vyos image doesn't support 'show version' in the expected way.
         This check confirms the router is functionally ready for routing traffic.
 
+        Readiness is driven by the container's Docker events rather than
+        polling: a running container (or its start event) triggers one
+        readiness probe inside the router, and a die event fails the wait
+        immediately.
+
         Args:
             container_id: VyOS container ID
             timeout: Maximum wait time in seconds
-            check_interval: Time between checks in seconds
+            check_interval: Unused, kept for API compatibility
 
         Returns:
             True if router is ready
         """
-        elapsed = 0
-        while elapsed < timeout:
+        started = time.time()
+        deadline = started + timeout
+        # Subscribe before reading the status so a start in between is not missed
+        events = self.client.events(
+            decode=True,
+            since=int(started),
+            until=int(deadline) + 1,
+            filters={"type": "container", "container": container_id},
+        )
+        try:
             status = self.get_router_status(container_id)
-            if status == "running":
-                # Check routing capability (ip_forward + iptables)
-                # This works reliably with 2stacks/vyos image
-                try:
-                    exit_code, output = self.exec_shell_command(
-                        container_id,
-                        "cat /proc/sys/net/ipv4/ip_forward"
-                    )
-                    if exit_code == 0 and output.strip() == "1":
-                        exit_code2, _ = self.exec_shell_command(
-                            container_id,
-                            "iptables -L -n"
-                        )
-                        if exit_code2 == 0:
-                            logger.info(f"VyOS router {container_id[:12]} is ready")
-                            return True
-                except Exception:
-                    pass  # Router not ready yet
-
-            time.sleep(check_interval)
-            elapsed += check_interval
+            if status is None:
+                logger.warning(f"VyOS router {container_id[:12]} not found")
+                return False
+            if status == "running" and self._probe_router_ready(container_id, deadline):
+                return True
+
+            for event in events:
+                action = event.get("Action") or event.get("status")
+                if action == "start":
+                    if self._probe_router_ready(container_id, deadline):
+                        return True
+                elif action in ("die", "oom", "destroy"):
+                    logger.warning(f"VyOS router {container_id[:12]} exited while starting ({action})")
+                    return False
+        finally:
+            events.close()
 
         logger.warning(f"VyOS router {container_id[:12]} not ready after {timeout}s")
         return False
 
+    def _probe_router_ready(self, container_id: str, deadline: float) -> bool:
+        """Check routing capability (ip_forward + iptables) with one exec.
+
+        The check repeats inside the router until it passes or the deadline,
+        so early boot does not cost a round trip per attempt.
+        """
+        attempts = max(int((deadline - time.time()) / 0.2), 1)
+        try:
+            exit_code, _ = self.exec_shell_command(
+                container_id,
+                f"for i in $(seq 1 {attempts}); do "
+                "grep -qx 1 /proc/sys/net/ipv4/ip_forward && iptables -L -n >/dev/null 2>&1 && exit 0; "
+                "sleep 0.2; done; exit 1"
+            )
+        except Exception as e:
+            logger.debug(f"VyOS router {container_id[:12]} readiness probe failed: {e}")
+            return False
+        if exit_code == 0:
+            logger.info(f"VyOS router {container_id[:12]} is ready")
+            return True
+        return False
+
+    def apply_router_config(self, container_id: str, config: RouterConfig) -> RouterConfigResult:
+        """
+        Apply a router's whole desired configuration with a single exec.
+
+        Replaces the per-interface, per-rule and per-scope commands of a
+        deployment: interface addresses, NAT, isolation rules and DHCP are
+        rendered by render_router_config, validated and committed together.
+
+        Args:
+            container_id: Router container ID
+            config: Desired configuration of every LAN interface
+
+        Returns:
+            RouterConfigResult with the time the configuration took
+        """
+        script = render_router_config(config)
+        encoded = base64.b64encode(script.encode()).decode()
+        started = time.perf_counter()
+        try:
+            exit_code, output = self.exec_shell_command(container_id, f"echo {encoded} | base64 -d | bash")
+        except Exception as e:
+            exit_code, output = 1, str(e)
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if exit_code != 0:
+            logger.error(f"Router {container_id[:12]} rejected configuration after {duration_ms} ms: {output.strip()}")
+            return RouterConfigResult(success=False, duration_ms=duration_ms, output=output)
+
+        logger.info(
+            f"Configured router {container_id[:12]} in {duration_ms} ms "
+            f"({len(config.interfaces)} interfaces, "
+            f"{sum(i.internet_enabled for i in config.interfaces)} NAT, "
+            f"{sum(i.dhcp_enabled for i in config.interfaces)} DHCP)"
+        )
+        return RouterConfigResult(success=True, duration_ms=duration_ms, output=output)
+
     # Internet Access Methods (via iptables NAT)
 
     def configure_internet_nat(
@@ -705,56 +964,22 @@ class VyOSService:
             True if successful
         """
         try:
-            # Parse subnet to calculate DHCP range
-            subnet_obj = ipaddress.ip_network(subnet, strict=False)
-            hosts = list(subnet_obj.hosts())
-            netmask = str(subnet_obj.netmask)
-            network_addr = str(subnet_obj.network_address)
-
-            # Default DHCP range: .10 to .250 (avoiding gateway and reserved IPs)
-            if not range_start:
-                range_start = str(hosts[9]) if len(hosts) > 10 else str(hosts[1])
-            if not range_end:
-                range_end = str(hosts[min(249, len(hosts) - 2)]) if len(hosts) > 250 else str(hosts[-2])
-
-            # Sanitize network name for config file
-            safe_name = network_name.replace("-", "_").replace(" ", "_").lower()[:32]
-
-            # Build DNS servers string
-            if dns_servers:
-                dns_list = [s.strip() for s in dns_servers.split(",") if s.strip()]
-                dns_str = ", ".join(dns_list)
-            else:
-                dns_str = "8.8.8.8, 8.8.4.4"
-
-            # Build ISC dhcpd configuration
-            config_lines = [
-                f"# DHCP config for {network_name}",
-                f"subnet {network_addr} netmask {netmask} {{",
-                f"    range {range_start} {range_end};",
-                f"    option routers {gateway};",
-                f"    option domain-name-servers {dns_str};",
-                f"    default-lease-time {lease_time};",
-                f"    max-lease-time {lease_time * 2};",
-            ]
-
-            # Add DNS search domain if specified
-            if dns_search:
-                config_lines.append(f'    option domain-name "{dns_search}";')
-
-            config_lines.append("}")
-
-            # Determine interface for dhcpd
-            listen_interface = interface or ""
+            config_content = _render_dhcp_subnet(
+                network_name,
+                subnet,
+                gateway,
+                dns_servers=dns_servers,
+                dns_search=dns_search,
+                range_start=range_start,
+                range_end=range_end,
+                lease_time=lease_time,
+            )
 
             # Setup directories
             self.exec_shell_command(container_id, "mkdir -p /var/lib/dhcp /etc/dhcp && touch /var/lib/dhcp/dhcpd.leases")
 
             # Write config file using base64 to avoid shell escaping issues
-            config_file = f"/etc/dhcp/dhcpd-{safe_name}.conf"
-            config_content = "\n".join(config_lines)
-
-            import base64
+            config_file = f"/etc/dhcp/dhcpd-{_dhcp_safe_name(network_name)}.conf"
             config_b64 = base64.b64encode(config_content.encode()).decode()
 
             write_cmd = f"echo '{config_b64}' | base64 -d > {config_file}"
@@ -763,31 +988,21 @@ class VyOSService:
                 logger.error(f"Failed to write DHCP config: {output}")
                 return False
 
-            # Kill existing dhcpd and restart
-            self.exec_shell_command(container_id, "killall dhcpd 2>/dev/null || true")
-            time.sleep(1)
-
-            # Build combined config from all dhcpd config files
+            # Rebuild the combined config from all dhcpd config files and restart dhcpd;
+            # the restart returns once the new dhcpd is running or has failed
             self.exec_shell_command(container_id, "cat /etc/dhcp/dhcpd-*.conf 2>/dev/null > /etc/dhcp/dhcpd.conf.combined")
+            exit_code, output = self.exec_shell_command(
+                container_id,
+                _dhcpd_restart_command("/etc/dhcp/dhcpd.conf.combined", [interface] if interface else []),
+            )
 
-            # Start dhcpd with combined config using nohup to avoid zombie processes
-            # Use -f flag for foreground mode combined with nohup for proper daemonization
-            if listen_interface:
-                start_cmd = f"rm -f /var/run/dhcpd.pid; nohup dhcpd -f -cf /etc/dhcp/dhcpd.conf.combined -lf /var/lib/dhcp/dhcpd.leases {listen_interface} > /var/log/dhcpd.log 2>&1 &"
-            else:
-                start_cmd = "rm -f /var/run/dhcpd.pid; nohup dhcpd -f -cf /etc/dhcp/dhcpd.conf.combined -lf /var/lib/dhcp/dhcpd.leases > /var/log/dhcpd.log 2>&1 &"
-
-            exit_code, output = self.exec_shell_command(container_id, start_cmd)
-
-            # Verify dhcpd is running
-            time.sleep(2)
             check_code, check_output = self.exec_shell_command(container_id, "pgrep -x dhcpd")
 
-            if check_code != 0:
+            if exit_code != 0 or check_code != 0:
                 logger.error(f"dhcpd not running after configuration: {output}")
                 return False
 
-            logger.info(f"Configured DHCP server (dhcpd) for {network_name} ({subnet}), range {range_start}-{range_end}")
+            logger.info(f"Configured DHCP server (dhcpd) for {network_name} ({subnet})")
             return True
 
         except Exception as e:
@@ -812,8 +1027,7 @@ class VyOSService:
             True if successful
         """
         try:
-            # Sanitize network name
-            safe_name = network_name.replace("-", "_").replace(" ", "_").lower()[:32]
+            safe_name = _dhcp_safe_name(network_name)
 
             # Remove config file and restart dhcpd
             # Kill existing dhcpd
@@ -831,7 +1045,7 @@ class VyOSService:
                 # Start dhcpd with remaining configs
                 self.exec_shell_command(
                     container_id,
-                    "rm -f /var/run/dhcpd.pid; nohup dhcpd -f -cf /etc/dhcp/dhcpd.conf.combined -lf /var/lib/dhcp/dhcpd.leases > /var/log/dhcpd.log 2>&1 &"
+                    _dhcpd_restart_command("/etc/dhcp/dhcpd.conf.combined", [])
                 )
 
             logger.info(f"Removed DHCP server configuration for {network_name}")
@@ -13,6 +13,7 @@ dramatiq.set_broker(redis_broker)
 from .deployment import deploy_range_task, teardown_range_task
 from .vm_tasks import start_vm_task, stop_vm_task
 from .blueprint_export import export_blueprint_async
+from .image_jobs import pull_docker_image_task, build_docker_image_task
 
 __all__ = [
     'deploy_range_task',
@@ -20,4 +21,6 @@ __all__ = [
     'start_vm_task',
     'stop_vm_task',
     'export_blueprint_async',
+    'pull_docker_image_task',
+    'build_docker_image_task',
 ]
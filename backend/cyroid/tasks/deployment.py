@@ -21,6 +21,7 @@ from cyroid.models.router import RangeRouter, RouterStatus
 from cyroid.models.event_log import EventType
 from cyroid.config import get_settings
 from cyroid.services.event_service import EventService
+from cyroid.services.resource_ledger import ResourceLedger, host_capacity
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,7 @@ def deploy_range_task(range_id: str):
     logger.info(f"Starting DinD deployment for range {range_id}")
 
     db = get_session_local()()
+    ledger = ResourceLedger(db)
     try:
         from cyroid.services.range_deployment_service import get_range_deployment_service
         deployment_service = get_range_deployment_service()
@@ -43,6 +45,11 @@ def deploy_range_task(range_id: str):
             logger.error(f"Range {range_id} not found")
             return
 
+        # Deployments queued without going through the API's admission
+        # (instances, training events, blueprints) claim here; already
+        # admitted ones keep the reservation they hold
+        ledger.claim(UUID(range_id), host_capacity())
+
         # Count resources for event
         networks = db.query(Network).filter(Network.range_id == UUID(range_id)).all()
         vms = db.query(VM).filter(VM.range_id == UUID(range_id)).all()
@@ -102,6 +109,71 @@ def deploy_range_task(range_id: str):
             except Exception:
                 pass
     finally:
+        try:
+            ledger.release(UUID(range_id))
+        except Exception as e:
+            logger.error(f"Failed to release resource reservation for range {range_id}: {e}")
+        db.close()
+
+
+@dramatiq.actor(max_retries=3, min_backoff=1000)
+def reset_range_task(range_id: str):
+    """
+    Async task to reset a range's VMs to their pristine state.
+
+    Recreates only the VM containers inside the existing DinD, keeping its
+    networks and image cache. Falls back to a full teardown and redeploy if
+    the range's DinD is not running.
+    """
+    logger.info(f"Starting in-place reset for range {range_id}")
+
+    db = get_session_local()()
+    ledger = ResourceLedger(db)
+    try:
+        from cyroid.services.range_deployment_service import get_range_deployment_service
+        deployment_service = get_range_deployment_service()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            try:
+                result = loop.run_until_complete(
+                    deployment_service.reset_range(db, UUID(range_id))
+                )
+                logger.info(f"Range {range_id} reset in place: {result}")
+            except ValueError as e:
+                logger.info(f"In-place reset not possible for range {range_id} ({e}), redeploying")
+                try:
+                    loop.run_until_complete(deployment_service.destroy_range(db, UUID(range_id)))
+                except Exception as destroy_error:
+                    logger.warning(f"Failed to clean up range {range_id} before redeploy: {destroy_error}")
+                # A redeploy is admitted like any other deployment, once the
+                # old containers no longer count against the host
+                ledger.claim(UUID(range_id), host_capacity())
+                loop.run_until_complete(deployment_service.deploy_range(db, UUID(range_id)))
+        finally:
+            loop.close()
+
+    except Exception as e:
+        logger.error(f"Failed to reset range {range_id}: {e}")
+        range_obj = db.query(Range).filter(Range.id == UUID(range_id)).first()
+        if range_obj:
+            range_obj.status = RangeStatus.ERROR
+            range_obj.error_message = str(e)[:1000]
+            db.commit()
+            try:
+                EventService(db).log_event(
+                    range_id=UUID(range_id),
+                    event_type=EventType.DEPLOYMENT_FAILED,
+                    message=f"Reset failed: {str(e)[:500]}",
+                )
+            except Exception:
+                pass
+    finally:
+        try:
+            ledger.release(UUID(range_id))
+        except Exception as e:
+            logger.error(f"Failed to release resource reservation for range {range_id}: {e}")
         db.close()
 
 
@@ -195,10 +267,9 @@ def deploy_range_task_legacy(range_id: str):
                 # Connect traefik to this network for VNC/web console routing
                 docker.connect_traefik_to_network(docker_network_id)
 
-                # Connect VyOS router to this network
+                # Connect VyOS router to this network; it is configured once all are attached
                 if router and router.container_id and router.status == RouterStatus.RUNNING:
-                    interface_name = f"eth{interface_num}"
-                    network.vyos_interface = interface_name
+                    network.vyos_interface = f"eth{interface_num}"
 
                     # Router gets the gateway IP on this network
                     vyos.connect_to_network(
@@ -207,47 +278,47 @@ def deploy_range_task_legacy(range_id: str):
                         network.gateway
                     )
 
-                    # Configure the interface on VyOS
-                    subnet_bits = network.subnet.split('/')[1]
-                    vyos.configure_interface(
-                        router.container_id,
-                        interface_name,
-                        f"{network.gateway}/{subnet_bits}",
-                        description=network.name
-                    )
-
-                    # Configure NAT if internet is enabled
-                    if network.internet_enabled:
-                        rule_num = interface_num * 10
-                        vyos.configure_nat_outbound(
-                            router.container_id,
-                            rule_num,
-                            network.subnet
-                        )
-
-                    # Configure firewall for isolation
-                    if network.is_isolated and not network.internet_enabled:
-                        vyos.configure_firewall_isolated(
-                            router.container_id,
-                            interface_name
-                        )
-
-                    # Configure DHCP server if enabled
-                    if network.dhcp_enabled:
-                        vyos.configure_dhcp_server(
-                            container_id=router.container_id,
-                            network_name=network.name,
-                            subnet=network.subnet,
-                            gateway=network.gateway,
-                            dns_servers=network.dns_servers,
-                            dns_search=network.dns_search
-                        )
-
                     interface_num += 1
                     db.commit()
 
                 logger.info(f"Provisioned network {network.name} (isolated={network.is_isolated}, internet={network.internet_enabled}, dhcp={network.dhcp_enabled})")
 
+        # Configure interfaces, NAT, isolation and DHCP on the router in one transaction
+        if router and router.container_id and router.status == RouterStatus.RUNNING:
+            from cyroid.services.vyos_service import RouterConfig, RouterInterface
+            router_config = RouterConfig(interfaces=[
+                RouterInterface(
+                    name=network.vyos_interface,
+                    network_name=network.name,
+                    subnet=network.subnet,
+                    gateway=network.gateway,
+                    internet_enabled=network.internet_enabled,
+                    isolated=network.is_isolated,
+                    dhcp_enabled=network.dhcp_enabled,
+                    dns_servers=network.dns_servers,
+                    dns_search=network.dns_search,
+                )
+                for network in networks if network.vyos_interface
+            ])
+            result = vyos.apply_router_config(router.container_id, router_config)
+            if not result.success:
+                router.status = RouterStatus.ERROR
+                router.error_message = f"Router configuration failed: {result.output.strip()}"[:500]
+                db.commit()
+            EventService(db).log_event(
+                range_id=UUID(range_id),
+                event_type=EventType.ROUTER_CREATED,
+                message=(
+                    f"Router configured in {result.duration_ms:.0f} ms"
+                    if result.success else "Router configuration failed"
+                ),
+                extra_data=json.dumps({
+                    "duration_ms": result.duration_ms,
+                    "interfaces": len(router_config.interfaces),
+                    "success": result.success,
+                }),
+            )
+
         # Step 2: Create and start all VMs
         vms = db.query(VM).filter(VM.range_id == UUID(range_id)).all()
         for vm in vms:
@@ -0,0 +1,419 @@
+# backend/cyroid/tasks/image_jobs.py
+"""
+Docker image pull and build tasks.
+
+These run on the Dramatiq worker rather than as FastAPI background tasks, so
+a pull or build keeps going across API restarts. Progress is reported through
+the shared ImageJobRegistry, which every API worker reads from.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict
+
+import dramatiq
+
+from cyroid.database import get_session_local
+from cyroid.models.base_image import BaseImage
+from cyroid.services.docker_service import get_docker_service
+from cyroid.services.image_job_registry import (
+    JOB_KIND_BUILD,
+    JOB_KIND_PULL,
+    ImageJobRegistry,
+    get_image_job_registry,
+    image_job_key,
+)
+from cyroid.services.registry_service import get_registry_service
+
+logger = logging.getLogger(__name__)
+
+# Minimum interval between progress writes to Redis; Docker emits many
+# progress lines per second per layer during a pull.
+PROGRESS_FLUSH_INTERVAL = 0.5
+
+BUILD_STEP_PATTERN = re.compile(r"Step (\d+)/(\d+)")
+
+
+def _record_base_image(image: str, image_id: str, size_bytes: int) -> None:
+    """Create a BaseImage record for a pulled image if one doesn't exist."""
+    try:
+        SessionLocal = get_session_local()
+        db = SessionLocal()
+        try:
+            existing = db.query(BaseImage).filter(
+                BaseImage.docker_image_tag == image
+            ).first()
+
+            if not existing:
+                image_name = image.split("/")[-1].split(":")[0]
+                base_image = BaseImage(
+                    name=image_name,
+                    description=f"Container image pulled from registry: {image}",
+                    image_type="container",
+                    docker_image_id=image_id,
+                    docker_image_tag=image,
+                    os_type="linux",  # Default, can be updated later
+                    vm_type="container",
+                    size_bytes=size_bytes,
+                    is_global=True,
+                )
+                db.add(base_image)
+                db.commit()
+                logger.info(f"Created BaseImage record for {image}")
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning(f"Failed to create BaseImage record for {image}: {e}")
+
+
+def create_base_image_for_build(full_tag: str, image_id: str, image_project_name: str) -> None:
+    """
+    Create or update a BaseImage record after a successful Docker build.
+
+    Args:
+        full_tag: The full Docker image tag (e.g., cyroid/kali-attack:latest)
+        image_id: The Docker image ID (sha256 hash)
+        image_project_name: The Dockerfile project directory name (e.g., kali-attack)
+    """
+    try:
+        SessionLocal = get_session_local()
+        db = SessionLocal()
+        try:
+            existing = db.query(BaseImage).filter(
+                BaseImage.docker_image_tag == full_tag
+            ).first()
+
+            if existing:
+                existing.docker_image_id = image_id
+                existing.image_project_name = image_project_name
+                db.commit()
+                logger.info(f"Updated BaseImage record for {full_tag} with project_name={image_project_name}")
+            else:
+                display_name = full_tag.split("/")[-1].split(":")[0]
+                base_image = BaseImage(
+                    name=display_name,
+                    description=f"Container image built from Dockerfile: {image_project_name}",
+                    image_type="container",
+                    docker_image_id=image_id,
+                    docker_image_tag=full_tag,
+                    image_project_name=image_project_name,
+                    os_type="linux",  # Default, can be updated later
+                    vm_type="container",
+                    is_global=True,
+                )
+                db.add(base_image)
+                db.commit()
+                logger.info(f"Created BaseImage record for {full_tag} with project_name={image_project_name}")
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning(f"Failed to create/update BaseImage record for {full_tag}: {e}")
+
+
+def _push_to_registry(image: str) -> bool:
+    """Push an image to the local registry and clean it up on the host.
+
+    Returns:
+        False if the registry is not healthy and the push was skipped.
+
+    Raises:
+        RegistryPushError: If the push fails.
+    """
+    registry = get_registry_service()
+    loop = asyncio.new_event_loop()
+    try:
+        if not loop.run_until_complete(registry.is_healthy()):
+            return False
+        loop.run_until_complete(registry.push_and_cleanup(image))
+        return True
+    finally:
+        loop.close()
+
+
+@dramatiq.actor(max_retries=0, time_limit=3600000)  # 1 hour timeout, no retries
+def pull_docker_image_task(image: str):
+    """Pull a Docker image on the host with per-layer progress tracking."""
+    jobs = get_image_job_registry()
+    key = image_job_key(image)
+    # The registry push reports no progress; keep the job's lease alive through it
+    with jobs.heartbeat(JOB_KIND_PULL, key):
+        _pull_docker_image(jobs, image, key)
+
+
+def _pull_docker_image(jobs: ImageJobRegistry, image: str, key: str) -> None:
+    """Body of pull_docker_image_task."""
+    jobs.update(JOB_KIND_PULL, key, status="pulling")
+
+    try:
+        client = get_docker_service().client
+
+        layers: Dict[str, Dict[str, Any]] = {}
+        dirty_layers: Dict[str, Dict[str, Any]] = {}
+        last_flush = 0.0
+
+        for line in client.api.pull(image, stream=True, decode=True):
+            if "id" not in line or "progressDetail" not in line:
+                if "status" in line:
+                    logger.debug(f"Docker pull status: {line.get('status')}")
+                continue
+
+            layer_id = line["id"]
+            progress_detail = line.get("progressDetail", {})
+            status_text = line.get("status", "")
+            previous_status = layers.get(layer_id, {}).get("status")
+
+            if progress_detail:
+                layers[layer_id] = {
+                    "current": progress_detail.get("current", 0),
+                    "total": progress_detail.get("total", 0),
+                    "status": status_text,
+                }
+            elif status_text in ("Pull complete", "Already exists"):
+                layers[layer_id] = {"current": 1, "total": 1, "status": status_text}
+            else:
+                continue
+            dirty_layers[layer_id] = layers[layer_id]
+
+            # Flush on layer status transitions, otherwise throttle writes
+            now = time.monotonic()
+            if previous_status == status_text and now - last_flush < PROGRESS_FLUSH_INTERVAL:
+                continue
+            last_flush = now
+
+            if jobs.is_cancelled(JOB_KIND_PULL, key):
+                jobs.finish(JOB_KIND_PULL, key, "cancelled")
+                return
+
+            total_bytes = sum(l.get("total", 0) for l in layers.values())
+            current_bytes = sum(l.get("current", 0) for l in layers.values())
+            completed_layers = sum(
+                1 for l in layers.values() if l.get("status") in ("Pull complete", "Already exists")
+            )
+            progress = int((current_bytes / total_bytes) * 100) if total_bytes > 0 else 0
+
+            jobs.update_layers(JOB_KIND_PULL, key, dirty_layers)
+            dirty_layers = {}
+            jobs.update(
+                JOB_KIND_PULL, key,
+                progress_percent=min(progress, 99),  # Don't show 100 until verified complete
+                current_layer=layer_id,
+                layers_total=len(layers),
+                layers_completed=completed_layers,
+            )
+
+        jobs.update_layers(JOB_KIND_PULL, key, dirty_layers)
+
+        try:
+            pulled_image = client.images.get(image)
+        except Exception:
+            jobs.finish(JOB_KIND_PULL, key, "completed", progress_percent=100)
+            return
+
+        image_id = pulled_image.id
+        size_bytes = pulled_image.attrs.get("Size", 0)
+        jobs.update(
+            JOB_KIND_PULL, key,
+            progress_percent=100,
+            image_id=image_id,
+            size_bytes=size_bytes,
+            layers_completed=len(layers),
+        )
+
+        # Auto-create BaseImage record for the Image Library
+        _record_base_image(image, image_id, size_bytes)
+
+        # Auto-push to local registry and cleanup host Docker
+        jobs.update(JOB_KIND_PULL, key, status="pushing_to_registry")
+        try:
+            pushed = _push_to_registry(image)
+        except Exception as e:
+            logger.error(f"Failed to push {image} to registry: {e}")
+            jobs.finish(
+                JOB_KIND_PULL, key, "failed",
+                pushed_to_registry=False,
+                registry_error=str(e),
+                error=f"Registry push failed: {e}",
+            )
+            return
+
+        if not pushed:
+            logger.warning(f"Registry not healthy, skipping push for {image}")
+            jobs.finish(
+                JOB_KIND_PULL, key, "completed",
+                pushed_to_registry=False,
+                registry_error="Registry not healthy",
+            )
+            return
+
+        logger.info(f"Pushed {image} to registry and cleaned up host")
+        jobs.finish(JOB_KIND_PULL, key, "completed", pushed_to_registry=True)
+
+    except Exception as e:
+        logger.error(f"Failed to pull Docker image {image}: {e}")
+        jobs.finish(JOB_KIND_PULL, key, "failed", error=str(e))
+
+
+@dramatiq.actor(max_retries=0, time_limit=3600000)  # 1 hour timeout, no retries
+def build_docker_image_task(build_key: str, image_name: str, image_path: str, tag: str, no_cache: bool):
+    """Build a Docker image from a project directory with step progress tracking."""
+    jobs = get_image_job_registry()
+    # Long build steps and the registry push report no progress; keep the lease alive
+    with jobs.heartbeat(JOB_KIND_BUILD, build_key):
+        _build_docker_image(jobs, build_key, image_name, image_path, tag, no_cache)
+
+
+def _build_docker_image(
+    jobs: ImageJobRegistry, build_key: str, image_name: str, image_path: str, tag: str, no_cache: bool
+) -> None:
+    """Body of build_docker_image_task."""
+    full_tag = f"cyroid/{image_name}:{tag}"
+    logs: list = []
+
+    def append_log(line: str) -> None:
+        logs.append(line)
+        del logs[:-100]  # Keep last 100 lines
+
+    jobs.update(JOB_KIND_BUILD, build_key, status="building")
+
+    try:
+        client = get_docker_service().client
+        logger.info(f"Building Docker image {full_tag} from {image_path}")
+
+        build_output = client.api.build(
+            path=image_path,
+            tag=full_tag,
+            rm=True,  # Remove intermediate containers
+            nocache=no_cache,
+            decode=True,
+        )
+
+        image_id = None
+        last_flush = 0.0
+        for chunk in build_output:
+            if "stream" in chunk:
+                stream_line = chunk["stream"].strip()
+                if not stream_line:
+                    continue
+                append_log(stream_line)
+
+                match = BUILD_STEP_PATTERN.match(stream_line)
+                now = time.monotonic()
+                if not match and now - last_flush < PROGRESS_FLUSH_INTERVAL:
+                    continue
+                last_flush = now
+
+                if jobs.is_cancelled(JOB_KIND_BUILD, build_key):
+                    jobs.finish(
+                        JOB_KIND_BUILD, build_key, "cancelled",
+                        current_step_name="Build cancelled by user",
+                        logs=logs,
+                    )
+                    return
+
+                fields: Dict[str, Any] = {"logs": logs}
+                if match:
+                    current_step = int(match.group(1))
+                    total_steps = int(match.group(2))
+                    fields.update({
+                        "current_step": current_step,
+                        "total_steps": total_steps,
+                        "progress_percent": min(int((current_step / total_steps) * 100), 99),
+                        "current_step_name": stream_line,
+                    })
+                jobs.update(JOB_KIND_BUILD, build_key, **fields)
+
+            elif "error" in chunk:
+                error_msg = chunk.get("error", "Unknown build error")
+                logger.error(f"Docker build failed: {error_msg}")
+                jobs.finish(
+                    JOB_KIND_BUILD, build_key, "failed",
+                    error=error_msg,
+                    current_step_name=f"Error: {error_msg}",
+                    logs=logs,
+                )
+                return
+
+            elif "message" in chunk:
+                # Docker returns parse errors and other messages in 'message' key
+                msg = chunk.get("message", "")
+                if "error" in msg.lower() or "unknown instruction" in msg.lower():
+                    logger.error(f"Docker build failed: {msg}")
+                    jobs.finish(
+                        JOB_KIND_BUILD, build_key, "failed",
+                        error=msg,
+                        current_step_name=f"Error: {msg}",
+                        logs=logs,
+                    )
+                    return
+                append_log(msg)
+
+            elif "aux" in chunk:
+                # Build complete - aux contains the image ID
+                image_id = chunk.get("aux", {}).get("ID", "")
+                break
+
+        if not image_id:
+            # No aux message, verify the image exists
+            try:
+                image_id = client.images.get(full_tag).id
+            except Exception as e:
+                logger.error(f"Build verification failed for {full_tag}: {e}")
+                jobs.finish(
+                    JOB_KIND_BUILD, build_key, "failed",
+                    error=f"Build failed - image not found: {e}",
+                    current_step_name="Error: Build failed - image not created",
+                    logs=logs,
+                )
+                return
+
+        logger.info(f"Docker build completed: {full_tag} ({image_id})")
+        jobs.update(
+            JOB_KIND_BUILD, build_key,
+            progress_percent=100,
+            image_id=image_id,
+            current_step_name="Pushing to registry...",
+            logs=logs,
+        )
+
+        # Create/update BaseImage record with image_project_name
+        create_base_image_for_build(full_tag, image_id, image_name)
+
+        # Auto-push to local registry and cleanup host Docker
+        try:
+            pushed = _push_to_registry(full_tag)
+        except Exception as e:
+            logger.error(f"Failed to push {full_tag} to registry: {e}")
+            jobs.finish(
+                JOB_KIND_BUILD, build_key, "failed",
+                pushed_to_registry=False,
+                error=f"Registry push failed: {e}",
+                current_step_name=f"Error: Registry push failed - {e}",
+            )
+            return
+
+        if not pushed:
+            logger.warning(f"Registry not healthy, skipping push for {full_tag}")
+            jobs.finish(
+                JOB_KIND_BUILD, build_key, "failed",
+                pushed_to_registry=False,
+                error="Registry not healthy - image built but not pushed",
+                current_step_name="Error: Registry not healthy",
+            )
+            return
+
+        logger.info(f"Pushed {full_tag} to registry and cleaned up host")
+        jobs.finish(
+            JOB_KIND_BUILD, build_key, "completed",
+            pushed_to_registry=True,
+            current_step_name="Build complete and pushed to registry!",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to build Docker image {image_name}: {e}")
+        jobs.finish(
+            JOB_KIND_BUILD, build_key, "failed",
+            error=str(e),
+            current_step_name=f"Error: {str(e)}",
+            logs=logs,
+        )
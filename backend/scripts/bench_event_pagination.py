@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark OFFSET vs keyset (cursor) paging of range event logs.
+
+Seeds a multi-million-row event_logs table spread over a number of ranges,
+then times fetching pages at increasing depth in one busy range with both
+strategies.
+
+Usage:
+    python scripts/bench_event_pagination.py [--database-url URL] [--rows N] [--ranges N]
+
+Without --database-url a temporary SQLite file is used. Point it at a
+scratch PostgreSQL database to measure the production planner; the tables
+are created there and dropped afterwards.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import cyroid.models  # noqa: F401 - configure all mappers
+from cyroid.models.base import Base
+from cyroid.models.event_log import EventLog, EventType
+from cyroid.models.range import Range
+from cyroid.models.user import User
+from cyroid.services.event_service import EventService, encode_event_cursor
+
+PAGE_SIZE = 100
+BATCH_SIZE = 50_000
+EVENT_TYPES = list(EventType)
+
+
+def seed(db, rows: int, ranges: int):
+    user = User(id=uuid.uuid4(), username="bench", email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    range_ids = [uuid.uuid4() for _ in range(ranges)]
+    db.execute(insert(Range), [
+        {"id": range_id, "name": f"bench-{i}", "created_by": user.id, "hidden_vm_ids": []}
+        for i, range_id in enumerate(range_ids)
+    ])
+
+    # Half of the events belong to the first ("busy") range
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    written = 0
+    while written < rows:
+        batch = []
+        for i in range(written, min(written + BATCH_SIZE, rows)):
+            batch.append({
+                "id": uuid.uuid4(),
+                "range_id": range_ids[0] if i % 2 == 0 else range_ids[1 + i % (ranges - 1)],
+                "created_at": start + timedelta(milliseconds=i * 10),
+                "updated_at": start,
+                "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+                "message": f"event {i}",
+            })
+        db.execute(insert(EventLog), batch)
+        written += len(batch)
+        db.commit()
+        print(f"  seeded {written}/{rows}", end="\r", flush=True)
+    print()
+    return range_ids[0]
+
+
+def timed(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--ranges", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = None
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        engine = create_engine(f"sqlite:///{tmp.name}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(engine)()
+
+    try:
+        print(f"Seeding {args.rows} events over {args.ranges} ranges...")
+        busy_range = seed(db, args.rows, args.ranges)
+        service = EventService(db)
+        busy_events = service.count_events(busy_range)
+
+        print(f"Busy range has {busy_events} events; page size {PAGE_SIZE}")
+        print(f"{'page depth':>12}{'offset ms':>12}{'cursor ms':>12}")
+        for depth in (0, 100, 1_000, (busy_events // PAGE_SIZE) - 1):
+            offset = depth * PAGE_SIZE
+
+            # Walk to the cursor for this depth with OFFSET once (not timed)
+            cursor = None
+            if depth:
+                previous, _ = service.get_events(busy_range, PAGE_SIZE, offset - PAGE_SIZE, include_total=False)
+                cursor = encode_event_cursor(previous[-1])
+
+            def offset_page():
+                return service.get_events(busy_range, PAGE_SIZE, offset)
+
+            def cursor_page():
+                return service.get_events_page(busy_range, PAGE_SIZE, cursor)
+
+            assert [e.id for e in offset_page()[0]] == [e.id for e in cursor_page()[0]]
+            db.expunge_all()
+            print(f"{depth:>12}{timed(offset_page):>12.2f}{timed(cursor_page):>12.2f}")
+    finally:
+        db.close()
+        if args.database_url:
+            Base.metadata.drop_all(engine)
+        elif tmp:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
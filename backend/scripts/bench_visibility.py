@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark tag-visibility filtering of range lists.
+
+Compares the previous per-request ResourceTag subqueries with the
+materialized resource_visibility grants, on a synthetic data set
+(10k ranges and 1k users by default).
+
+Usage:
+    python scripts/bench_visibility.py [--database-url URL] [--resources N] [--users N]
+
+Without --database-url an in-memory SQLite database is used. Point it at a
+scratch PostgreSQL database to measure the production planner; the tables
+are created there and dropped afterwards.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import cyroid.models  # noqa: F401 - configure all mappers
+from cyroid.models.base import Base
+from cyroid.models.range import Range
+from cyroid.models.resource_tag import ResourceTag
+from cyroid.models.user import User, UserAttribute
+from cyroid.services.visibility_service import VisibilityService
+
+TAG_COUNT = 50
+
+
+def legacy_filter(query, db, user_tags):
+    """The subquery-based filter used before grants were materialized."""
+    tagged_resource_ids = db.query(ResourceTag.resource_id).filter(
+        ResourceTag.resource_type == 'range'
+    ).distinct()
+
+    if not user_tags:
+        return query.filter(~Range.id.in_(tagged_resource_ids))
+
+    matching_resource_ids = db.query(ResourceTag.resource_id).filter(
+        ResourceTag.resource_type == 'range',
+        ResourceTag.tag.in_(user_tags)
+    ).distinct()
+
+    return query.filter(
+        or_(
+            ~Range.id.in_(tagged_resource_ids),
+            Range.id.in_(matching_resource_ids)
+        )
+    )
+
+
+def populate(db, resources: int, users: int, rng: random.Random):
+    tags = [f"team-{i}" for i in range(TAG_COUNT)]
+    user_rows, attr_rows = [], []
+    for i in range(users):
+        user_id = uuid.uuid4()
+        user_rows.append({"id": user_id, "username": f"user{i}", "email": f"user{i}@example.com",
+                          "hashed_password": "x"})
+        for tag in rng.sample(tags, rng.randint(0, 3)):
+            attr_rows.append({"id": uuid.uuid4(), "user_id": user_id,
+                              "attribute_type": "tag", "attribute_value": tag})
+    db.execute(insert(User), user_rows)
+    db.execute(insert(UserAttribute), attr_rows)
+
+    owner_id = user_rows[0]["id"]
+    range_rows, tag_rows = [], []
+    for i in range(resources):
+        range_id = uuid.uuid4()
+        range_rows.append({"id": range_id, "name": f"range{i}", "created_by": owner_id, "hidden_vm_ids": []})
+        # About a third of ranges are public (untagged)
+        for tag in rng.sample(tags, rng.choice([0, 1, 1, 2])):
+            tag_rows.append({"id": uuid.uuid4(), "resource_type": "range",
+                             "resource_id": range_id, "tag": tag})
+    db.execute(insert(Range), range_rows)
+    db.execute(insert(ResourceTag), tag_rows)
+
+    started = time.perf_counter()
+    grants = VisibilityService(db).rebuild()
+    db.commit()
+    return [row["id"] for row in user_rows], grants, time.perf_counter() - started
+
+
+def measure(fn, samples):
+    timings = []
+    for args in samples:
+        started = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--resources", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(engine)()
+    rng = random.Random(args.seed)
+
+    try:
+        print(f"Populating {args.resources} ranges and {args.users} users...")
+        user_ids, grants, rebuild_seconds = populate(db, args.resources, args.users, rng)
+        print(f"Materialized {grants} grants in {rebuild_seconds:.2f}s")
+
+        sampled = rng.sample(user_ids, min(args.samples, len(user_ids)))
+        tags_by_user = {
+            user_id: [a.attribute_value for a in db.query(UserAttribute).filter(
+                UserAttribute.user_id == user_id, UserAttribute.attribute_type == "tag")]
+            for user_id in sampled
+        }
+
+        def run_legacy(user_id):
+            return {r.id for r in legacy_filter(db.query(Range.id), db, tags_by_user[user_id]).all()}
+
+        def run_materialized(user_id):
+            clause = VisibilityService.visible_clause('range', user_id, Range.id)
+            return {r.id for r in db.query(Range.id).filter(clause).all()}
+
+        def run_unfiltered(user_id):
+            return {r.id for r in db.query(Range.id).all()}
+
+        mismatches = sum(1 for user_id in sampled if run_legacy(user_id) != run_materialized(user_id))
+
+        unfiltered = measure(run_unfiltered, [(u,) for u in sampled])
+        legacy = measure(run_legacy, [(u,) for u in sampled])
+        materialized = measure(run_materialized, [(u,) for u in sampled])
+
+        print(f"Results identical for {len(sampled) - mismatches}/{len(sampled)} users")
+        print(f"{'filter':<14}{'median ms':>12}{'p95 ms':>10}")
+        print(f"{'none (admin)':<14}{unfiltered[0]:>12.2f}{unfiltered[1]:>10.2f}")
+        print(f"{'subqueries':<14}{legacy[0]:>12.2f}{legacy[1]:>10.2f}")
+        print(f"{'materialized':<14}{materialized[0]:>12.2f}{materialized[1]:>10.2f}")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+        if args.database_url:
+            Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,9 @@
 """Conftest for unit tests - minimal fixtures without app imports."""
 import pytest
 from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 
 # Override parent conftest by not importing the app
@@ -14,3 +17,208 @@ def mock_docker_service():
     mock_service = MagicMock()
     mock_service.get_range_client_sync.return_value = MagicMock()
     return mock_service
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis-py API used by services.
+
+    Expiry is recorded but not enforced; tests that care about expiry delete
+    keys explicitly to simulate it.
+    """
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.published = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value, ex=ttl)
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self.store.pop(key, None) is not None:
+                removed += 1
+            self.ttls.pop(key, None)
+        return removed
+
+    def exists(self, *keys):
+        return sum(1 for key in keys if key in self.store)
+
+    def expire(self, key, ttl):
+        if key in self.store:
+            self.ttls[key] = ttl
+            return True
+        return False
+
+    def incr(self, key, amount=1):
+        self.store[key] = str(int(self.store.get(key, 0)) + amount)
+        return int(self.store[key])
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        h = self.store.setdefault(key, {})
+        if field is not None:
+            h[field] = value
+        h.update(mapping or {})
+        return len(mapping or {}) + (1 if field is not None else 0)
+
+    def hget(self, key, field):
+        return self.store.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.store.get(key, {}))
+
+    def hdel(self, key, *fields):
+        h = self.store.get(key, {})
+        return sum(1 for field in fields if h.pop(field, None) is not None)
+
+    def hincrby(self, key, field, amount=1):
+        h = self.store.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def sadd(self, key, *members):
+        s = self.store.setdefault(key, set())
+        before = len(s)
+        s.update(members)
+        return len(s) - before
+
+    def srem(self, key, *members):
+        s = self.store.get(key, set())
+        before = len(s)
+        s.difference_update(members)
+        return before - len(s)
+
+    def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    def rpush(self, key, *values):
+        items = self.store.setdefault(key, [])
+        items.extend(values)
+        return len(items)
+
+    def lrange(self, key, start, end):
+        return list(self.store.get(key, [])[start:None if end == -1 else end + 1])
+
+    def ltrim(self, key, start, end):
+        if key in self.store:
+            self.store[key] = self.lrange(key, start, end)
+        return True
+
+    def zadd(self, key, mapping):
+        z = self.store.setdefault(key, {})
+        added = sum(1 for member in mapping if member not in z)
+        z.update(mapping)
+        return added
+
+    def zrem(self, key, *members):
+        z = self.store.get(key, {})
+        return sum(1 for member in members if z.pop(member, None) is not None)
+
+    def zcard(self, key):
+        return len(self.store.get(key, {}))
+
+    def zremrangebyscore(self, key, min_score, max_score):
+        z = self.store.get(key, {})
+        low = float(min_score)
+        high = float(max_score)
+        doomed = [member for member, score in z.items() if low <= score <= high]
+        return self.zrem(key, *doomed)
+
+    def zpopmin(self, key, count=1):
+        z = self.store.get(key, {})
+        popped = sorted(z.items(), key=lambda item: item[1])[:count]
+        self.zrem(key, *(member for member, _ in popped))
+        return popped
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues FakeRedis calls and runs them on execute()."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [method(*args, **kwargs) for method, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis stand-in for services that share state through Redis."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite database with every table.
+
+    StaticPool keeps one connection, so every session (and thread) sees the
+    same database.
+    """
+    import cyroid.models  # noqa: F401 - configure all mappers
+    from cyroid.models.base import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Session factory for services that open their own sessions."""
+    return sessionmaker(db_engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    """A session on the in-memory database."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Factory adding a user with role and tag attributes to ``db`` (flushed, not committed)."""
+    from cyroid.models.user import User, UserAttribute
+
+    def make(name="user", roles=(), tags=(), **fields):
+        user = User(**{"username": name, "email": f"{name}@example.com", "hashed_password": "x", **fields})
+        for role in roles:
+            user.attributes.append(UserAttribute(attribute_type="role", attribute_value=role))
+        for tag in tags:
+            user.attributes.append(UserAttribute(attribute_type="tag", attribute_value=tag))
+        db.add(user)
+        db.flush()
+        return user
+    return make
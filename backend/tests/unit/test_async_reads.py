@@ -0,0 +1,119 @@
+# backend/tests/unit/test_async_reads.py
+"""Tests for the async read paths against a SQLite file shared with a sync session."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import cyroid.models  # noqa: F401 - configure all mappers
+from cyroid.database import async_database_url
+from cyroid.models.base import Base
+from cyroid.models.event_log import EventLog, EventType
+from cyroid.models.notification import Notification, NotificationType
+from cyroid.models.range import Range
+from cyroid.models.user import User, UserAttribute
+from cyroid.services.event_service import AsyncEventService, EventService
+from cyroid.services.notification_service import AsyncNotificationService, NotificationService
+from cyroid.services.principal_cache import PrincipalCache
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cyroid.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(engine)()
+
+    user = User(username="owner", email="owner@example.com", hashed_password="x")
+    user.attributes.append(UserAttribute(attribute_type="role", attribute_value="engineer"))
+    db.add(user)
+    db.flush()
+    range_obj = Range(name="r", created_by=user.id)
+    db.add(range_obj)
+    db.flush()
+    db.execute(insert(EventLog), [
+        {"id": uuid.uuid4(), "range_id": range_obj.id, "created_at": T0 + timedelta(seconds=i // 2),
+         "updated_at": T0, "event_type": EventType.VM_STARTED, "message": f"event {i}"}
+        for i in range(25)
+    ])
+    notifications = NotificationService(db)
+    for title, scope in [
+        ("direct", {"user_id": user.id}),
+        ("role", {"target_role": "engineer"}),
+        ("range", {"resource_type": "range", "resource_id": range_obj.id}),
+        ("other role", {"target_role": "admin"}),
+    ]:
+        notification = notifications.create_notification(NotificationType.INFO, title, "m", broadcast=False, **scope)
+        if title == "role":
+            notifications.mark_as_read([notification.id], user)
+    db.commit()
+    yield db, user.id, range_obj.id
+    db.close()
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_db(seeded):
+    db = seeded[0]
+    engine = create_async_engine(async_database_url(str(db.get_bind().url)))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql://u:p@db:5432/cyroid") == "postgresql+asyncpg://u:p@db:5432/cyroid"
+    assert async_database_url("postgresql+psycopg2://u:p@db/cyroid") == "postgresql+asyncpg://u:p@db/cyroid"
+    assert async_database_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@db/cyroid")
+
+
+@pytest.mark.asyncio
+async def test_async_event_pages_match_sync(seeded, async_db):
+    db, _, range_id = seeded
+    sync_service, async_service = EventService(db), AsyncEventService(async_db)
+
+    cursor = async_cursor = None
+    while True:
+        events, cursor = sync_service.get_events_page(range_id, limit=10, cursor=cursor)
+        async_events, async_cursor = await async_service.get_events_page(range_id, limit=10, cursor=async_cursor)
+        assert [e.id for e in async_events] == [e.id for e in events]
+        assert async_cursor == cursor
+        if cursor is None:
+            break
+
+    assert await async_service.count_events(range_id) == 25
+    events, total = await async_service.get_events(range_id, limit=5, offset=20)
+    assert total == 25 and len(events) == 5
+
+
+@pytest.mark.asyncio
+async def test_async_user_and_notifications_match_sync(seeded, async_db):
+    db, user_id, _ = seeded
+
+    user = await PrincipalCache(ttl=0).load_user_async(async_db, user_id)
+    assert user.roles == ["engineer"]
+
+    entries, total, unread = await AsyncNotificationService(async_db).get_user_notifications(user)
+    expected = NotificationService(db).get_user_notifications(db.get(User, user_id))
+    assert [e.notification.title for e in entries] == [e.notification.title for e in expected[0]]
+    assert {e.notification.title for e in entries} == {"direct", "role", "range"}
+    assert (total, unread) == (3, 2) == expected[1:]
+    assert await AsyncNotificationService(async_db).get_unread_count(user) == 2
+
+    unread_only, total, unread = await AsyncNotificationService(async_db).get_user_notifications(
+        user, unread_only=True
+    )
+    assert {e.notification.title for e in unread_only} == {"direct", "range"}
+    assert (total, unread) == (2, 2)
+
+    hidden = db.query(Notification).filter(Notification.title == "other role").one()
+    assert await AsyncNotificationService(async_db).get_user_notification(user, hidden.id) is None
+    assert await AsyncNotificationService(async_db).get_user_notification(user, entries[0].notification_id)
@@ -0,0 +1,101 @@
+# backend/tests/unit/test_catalog_index.py
+"""Tests for the cached catalog search index."""
+import json
+import os
+
+import pytest
+
+from cyroid.services.catalog_index import CatalogIndex, CatalogIndexCache
+
+
+ITEMS = [
+    {"id": "web-lab", "type": "blueprint", "name": "Web Lab", "description": "Apache and MySQL targets", "tags": ["web", "beginner"]},
+    {"id": "ad-lab", "type": "blueprint", "name": "AD Lab", "description": "Active Directory domain", "tags": ["windows", ""]},
+    {"id": "kali", "type": "image", "name": "Kali Linux", "description": "Attacker workstation", "tags": ["linux"]},
+    {"id": "phish", "type": "scenario", "name": "Phishing Drill", "description": "Mail-based web attack", "tags": ["web"]},
+]
+
+
+@pytest.fixture
+def index():
+    return CatalogIndex({"catalog": {"name": "test"}, "items": ITEMS})
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+class TestCatalogIndex:
+    def test_no_filters_returns_all_in_index_order(self, index):
+        assert ids(index.search()) == ["web-lab", "ad-lab", "kali", "phish"]
+
+    def test_get_by_id(self, index):
+        assert index.get("kali")["name"] == "Kali Linux"
+        assert index.get("missing") is None
+
+    def test_type_filter(self, index):
+        assert ids(index.search(item_type="blueprint")) == ["web-lab", "ad-lab"]
+        assert index.search(item_type="content") == []
+
+    def test_tags_match_any(self, index):
+        assert ids(index.search(tags=["linux", "windows"])) == ["ad-lab", "kali"]
+
+    def test_search_is_case_insensitive_substring(self, index):
+        # Prefix of a token, and a fragment inside a token ("sql" in "mysql")
+        assert ids(index.search(search="apa")) == ["web-lab"]
+        assert ids(index.search(search="SQL")) == ["web-lab"]
+        # Multi-word queries must match as a contiguous substring
+        assert ids(index.search(search="web lab")) == ["web-lab"]
+        assert index.search(search="lab web") == []
+        # Non-alphanumeric queries fall back to a scan
+        assert ids(index.search(search="-")) == ["phish"]
+
+    def test_filters_combine(self, index):
+        assert ids(index.search(item_type="scenario", search="web", tags=["web"])) == ["phish"]
+        assert index.search(item_type="image", tags=["web"]) == []
+
+    def test_matches_linear_scan(self, index):
+        for query in ["lab", "a", "attack", "directory domain", "mail-based", "zzz"]:
+            expected = [
+                item["id"] for item in ITEMS
+                if query in item["name"].lower() or query in item["description"].lower()
+            ]
+            assert ids(index.search(search=query)) == expected, query
+
+
+class TestCatalogIndexCache:
+    def _write(self, path, items):
+        path.write_text(json.dumps({"catalog": {}, "items": items}))
+
+    def test_reuses_index_until_file_changes(self, tmp_path):
+        index_path = tmp_path / "index.json"
+        self._write(index_path, ITEMS[:2])
+        cache = CatalogIndexCache()
+
+        first = cache.get("src", index_path)
+        assert cache.get("src", index_path) is first
+        assert cache.builds == 1
+
+        self._write(index_path, ITEMS)
+        # Force a distinct mtime even on coarse-grained filesystems
+        st = os.stat(index_path)
+        os.utime(index_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        second = cache.get("src", index_path)
+        assert second is not first
+        assert len(second) == 4
+        assert cache.builds == 2
+
+    def test_invalidate_forces_rebuild(self, tmp_path):
+        index_path = tmp_path / "index.json"
+        self._write(index_path, ITEMS)
+        cache = CatalogIndexCache()
+
+        first = cache.get("src", index_path)
+        cache.invalidate("src")
+        assert cache.get("src", index_path) is not first
+
+    def test_missing_index_raises(self, tmp_path):
+        cache = CatalogIndexCache()
+        with pytest.raises(FileNotFoundError):
+            cache.get("src", tmp_path / "index.json")
@@ -0,0 +1,194 @@
+# backend/tests/unit/test_catalog_sync.py
+"""Tests for conditional catalog sync against a local bare git repo and HTTP server."""
+import json
+import subprocess
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from cyroid.models.catalog import CatalogSourceType, CatalogSyncStatus
+from cyroid.services.catalog_service import CatalogService
+from cyroid.services.catalog_sync_scheduler import CatalogSyncScheduler
+
+
+def _index(*ids):
+    return {"catalog": {"name": "test"}, "items": [{"id": i, "type": "blueprint", "name": i} for i in ids]}
+
+
+@pytest.fixture
+def service(tmp_path):
+    svc = CatalogService(MagicMock())
+    svc.settings = SimpleNamespace(
+        catalog_storage_dir=str(tmp_path / "catalogs"),
+        catalog_sync_timeout=30,
+    )
+    return svc
+
+
+def _source(source_type, url, branch="main"):
+    return SimpleNamespace(
+        id=uuid4(), name="test", source_type=source_type, url=url, branch=branch,
+        sync_status=CatalogSyncStatus.IDLE, error_message=None, item_count=0,
+    )
+
+
+# ---- git ----
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def bare_repo(tmp_path):
+    """A bare repo on branch main plus a work tree to push commits from."""
+    bare = tmp_path / "catalog.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "--bare", "-b", "main", str(bare))
+    _git(tmp_path, "init", "-b", "main", str(work))
+    _git(work, "config", "user.email", "test@example.com")
+    _git(work, "config", "user.name", "test")
+    _git(work, "remote", "add", "origin", str(bare))
+
+    def commit(index):
+        (work / "index.json").write_text(json.dumps(index))
+        _git(work, "add", "index.json")
+        _git(work, "commit", "-m", "update")
+        _git(work, "push", "origin", "main")
+
+    commit(_index("a"))
+    return SimpleNamespace(url=f"file://{bare}", commit=commit)
+
+
+def test_git_sync_clones_then_skips_unchanged(service, bare_repo):
+    source = _source(CatalogSourceType.GIT, bare_repo.url)
+
+    first = service.sync_source_with_stats(source)
+    assert first.changed is True
+    assert first.item_count == 1
+    assert first.bytes_transferred > 0
+    assert source.sync_status == CatalogSyncStatus.IDLE
+
+    second = service.sync_source_with_stats(source)
+    assert second.changed is False
+    assert second.item_count == 1
+
+    bare_repo.commit(_index("a", "b"))
+    third = service.sync_source_with_stats(source)
+    assert third.changed is True
+    assert third.item_count == 2
+    assert service.list_items(source)[1].id == "b"
+
+    assert service.get_sync_stats(source)["item_count"] == 2
+
+
+def test_git_sync_failure_is_recorded(service, tmp_path):
+    source = _source(CatalogSourceType.GIT, f"file://{tmp_path}/missing.git")
+
+    with pytest.raises(RuntimeError):
+        service.sync_source_with_stats(source)
+
+    assert source.sync_status == CatalogSyncStatus.ERROR
+    assert "git clone failed" in service.get_sync_stats(source)["error"]
+
+
+# ---- http ----
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    body = b""
+    etag = '"v1"'
+    last_modified = formatdate(usegmt=True)
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_catalog():
+    handler = type("Handler", (_CatalogHandler,), {"requests": []})
+    handler.body = json.dumps(_index("a", "b")).encode()
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield SimpleNamespace(url=f"http://127.0.0.1:{server.server_port}", handler=handler)
+    server.shutdown()
+
+
+def test_http_sync_uses_conditional_requests(service, http_catalog):
+    source = _source(CatalogSourceType.HTTP, http_catalog.url)
+
+    first = service.sync_source_with_stats(source)
+    assert first.changed is True
+    assert first.bytes_transferred == len(http_catalog.handler.body)
+    assert first.item_count == 2
+    assert "If-None-Match" not in http_catalog.handler.requests[0]
+
+    second = service.sync_source_with_stats(source)
+    assert second.changed is False
+    assert second.bytes_transferred == 0
+    assert second.item_count == 2
+    assert http_catalog.handler.requests[1]["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" in http_catalog.handler.requests[1]
+
+    http_catalog.handler.etag = '"v2"'
+    http_catalog.handler.body = json.dumps(_index("a", "b", "c")).encode()
+    third = service.sync_source_with_stats(source)
+    assert third.changed is True
+    assert third.item_count == 3
+
+
+# ---- scheduler ----
+
+def test_scheduler_syncs_concurrently_and_isolates_failures(service, bare_repo, http_catalog, tmp_path):
+    sources = {
+        s.id: s for s in (
+            _source(CatalogSourceType.GIT, bare_repo.url),
+            _source(CatalogSourceType.HTTP, http_catalog.url),
+            _source(CatalogSourceType.GIT, f"file://{tmp_path}/missing.git"),
+        )
+    }
+
+    # Each worker thread looks up the source it was handed by pool.map
+    handed_out = {}
+    real_sync_one = CatalogSyncScheduler._sync_one
+
+    def sync_one(self, source_id):
+        handed_out[threading.get_ident()] = source_id
+        return real_sync_one(self, source_id)
+
+    def session_factory():
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.side_effect = (
+            lambda: sources[handed_out[threading.get_ident()]]
+        )
+        return db
+
+    scheduler = CatalogSyncScheduler(session_factory=session_factory, max_workers=3, timeout=30)
+    with patch.object(CatalogSyncScheduler, "_sync_one", sync_one), \
+            patch("cyroid.services.catalog_service.get_settings", return_value=service.settings):
+        results = scheduler.sync_all(list(sources))
+
+    assert [r.source_id for r in results] == [str(i) for i in sources]
+    assert [r.item_count for r in results[:2]] == [1, 2]
+    assert results[2].error and "git clone failed" in results[2].error
+    assert scheduler.last_run["sources"] == 3
+    assert scheduler.last_run["failed"] == 1
+    assert scheduler.last_run["changed"] == 2
@@ -0,0 +1,194 @@
+# backend/tests/unit/test_container_stats_collector.py
+"""Tests for the streaming container stats collector."""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import requests
+import urllib3
+
+from cyroid.services.container_stats_collector import AGGREGATE_BUCKET_SECONDS, ContainerStatsCollector
+from cyroid.services.docker_service import summarize_container_stats
+
+MB = 1024 * 1024
+
+
+def _raw(n, memory_mb=100, first=False):
+    """A streamed stats document; CPU usage grows 10% of system time per sample."""
+    cpu = {"cpu_usage": {"total_usage": 100 * n}, "system_cpu_usage": 1000 * n}
+    return {
+        "cpu_stats": cpu,
+        "precpu_stats": {} if first else {"cpu_usage": {"total_usage": 100 * (n - 1)}, "system_cpu_usage": 1000 * (n - 1)},
+        "memory_stats": {"usage": memory_mb * MB, "limit": 1000 * MB},
+        "networks": {"eth0": {"rx_bytes": n, "tx_bytes": 2 * n}},
+    }
+
+
+class FakeContainer:
+    def __init__(self, memory_mb, interval=0.005):
+        self.memory_mb = memory_mb
+        self.interval = interval
+        self.closed = threading.Event()
+
+    def stats(self, stream, decode):
+        assert stream and decode
+        n = 1
+        try:
+            while True:
+                yield _raw(n, self.memory_mb, first=n == 1)
+                n += 1
+                time.sleep(self.interval)
+        finally:
+            self.closed.set()
+
+
+def _client(containers):
+    client = MagicMock()
+    client.containers.get.side_effect = lambda cid: containers[cid]
+    return client
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_summarize_first_streamed_sample_has_no_cpu():
+    assert summarize_container_stats(_raw(1, first=True))["cpu_percent"] == 0.0
+    assert summarize_container_stats(_raw(5))["cpu_percent"] == 10.0
+    assert summarize_container_stats(_raw(5))["memory_percent"] == 10.0
+
+
+def test_reads_come_from_the_buffer(fake_redis):
+    containers = {f"c{i}": FakeContainer(memory_mb=100 * (i + 1)) for i in range(20)}
+    client = _client(containers)
+    collector = ContainerStatsCollector(history=50, idle_timeout=60, redis_client=fake_redis)
+
+    range_stats = collector.for_range("r1", None, containers, client_factory=lambda: client)
+    _wait_for(lambda: all(len(range_stats.history(cid)) == 50 for cid in containers))
+
+    started = time.perf_counter()
+    for _ in range(100):
+        for cid in containers:
+            collector.for_range("r1", None, [cid], client_factory=lambda: client).latest(cid)
+    per_read_ms = (time.perf_counter() - started) * 1000 / 2000
+    assert per_read_ms < 1
+
+    # One stream per container however often it is read; the ring buffer is bounded
+    assert client.containers.get.call_count == 20
+    assert collector.stats() == {"ranges": 1, "streams": 20}
+    assert len(range_stats.history("c0")) == 50
+    assert range_stats.latest("c0")["cpu_percent"] == 10.0
+    collector.stop_all()
+
+
+def test_range_aggregate(fake_redis):
+    containers = {"a": FakeContainer(memory_mb=100), "b": FakeContainer(memory_mb=300)}
+    collector = ContainerStatsCollector(history=10, idle_timeout=60, redis_client=fake_redis)
+    range_stats = collector.for_range("r1", None, containers, client_factory=lambda: _client(containers))
+    _wait_for(lambda: all(range_stats.latest(cid) for cid in containers))
+
+    totals = range_stats.aggregate(["a", "b", "not-running"])
+    assert totals["containers_reporting"] == 2
+    assert totals["memory_mb"] == 400.0
+    assert totals["memory_limit_mb"] == 2000.0
+    assert totals["history"][-1]["memory_mb"] == 400.0
+    assert all(point["timestamp"] % AGGREGATE_BUCKET_SECONDS == 0 for point in totals["history"])
+    collector.stop_all()
+
+
+def test_streams_close_when_nobody_reads(fake_redis):
+    containers = {"a": FakeContainer(memory_mb=100)}
+    collector = ContainerStatsCollector(history=10, idle_timeout=0.2, redis_client=fake_redis)
+    range_stats = collector.for_range("r1", None, containers, client_factory=lambda: _client(containers))
+    _wait_for(lambda: range_stats.latest("a"))
+
+    _wait_for(lambda: range_stats.streaming == 0)
+    assert containers["a"].closed.is_set()
+
+    # The next read starts streaming again; idle ranges are dropped meanwhile
+    collector.for_range("r2", None, [], client_factory=lambda: _client(containers))
+    assert collector.stats()["ranges"] == 1
+    range_stats = collector.for_range("r1", None, containers, client_factory=lambda: _client(containers))
+    assert range_stats.streaming == 1
+    collector.stop_all()
+
+
+def test_workers_share_one_stream_per_container(fake_redis):
+    containers = {"a": FakeContainer(memory_mb=100), "b": FakeContainer(memory_mb=300)}
+    client = _client(containers)
+    workers = [ContainerStatsCollector(history=10, idle_timeout=60, redis_client=fake_redis) for _ in range(4)]
+
+    ranges = [worker.for_range("r1", None, containers, client_factory=lambda: client) for worker in workers]
+    _wait_for(lambda: all(range_stats.latest(cid) for range_stats in ranges for cid in containers))
+
+    # One stream per container across the workers, and every worker serves its samples
+    assert client.containers.get.call_count == 2
+    assert sum(worker.stats()["streams"] for worker in workers) == 2
+    assert {range_stats.aggregate(containers)["memory_mb"] for range_stats in ranges} == {400.0}
+
+    # When the owner goes away, the next read on another worker takes the stream over
+    owner = next(worker for worker in workers if worker.stats()["streams"])
+    owner.stop_all()
+    _wait_for(lambda: all(container.closed.is_set() for container in containers.values()))
+    other = next(worker for worker in workers if worker is not owner)
+    _wait_for(lambda: other.for_range("r1", None, containers, client_factory=lambda: client).streaming == 2)
+    for worker in workers:
+        worker.stop_all()
+
+
+class SilentContainer:
+    """A stream that sends one sample, then only read timeouts."""
+
+    def __init__(self, wrapped=False):
+        self.connects = 0
+        self.wrapped = wrapped
+
+    def stats(self, stream, decode):
+        self.connects += 1
+        if self.connects == 1:
+            yield _raw(1, first=True)
+        time.sleep(0.01)
+        timeout = urllib3.exceptions.ReadTimeoutError(None, "/stats", "Read timed out.")
+        # requests reports a read timeout inside a chunked body as a ConnectionError
+        raise requests.exceptions.ConnectionError(timeout) if self.wrapped else timeout
+
+
+def test_stop_does_not_wait_for_a_sample(fake_redis):
+    container = SilentContainer()
+    collector = ContainerStatsCollector(history=10, idle_timeout=60, redis_client=fake_redis)
+    range_stats = collector.for_range("r1", None, ["a"], client_factory=lambda: _client({"a": container}))
+    _wait_for(lambda: container.connects > 2)
+    assert range_stats.latest("a")["memory_mb"] == 100.0
+
+    collector.stop_all()
+    _wait_for(lambda: range_stats.streaming == 0)
+    assert not fake_redis.exists("stats:r1:owner:a")
+
+
+def test_wrapped_read_timeout_reconnects(fake_redis):
+    container = SilentContainer(wrapped=True)
+    collector = ContainerStatsCollector(history=10, idle_timeout=60, redis_client=fake_redis)
+    collector.for_range("r1", None, ["a"], client_factory=lambda: _client({"a": container}))
+
+    _wait_for(lambda: container.connects > 2)
+    collector.stop_all()
+
+
+def test_unreachable_daemon_backs_off(fake_redis):
+    client = MagicMock()
+    client.containers.get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+    collector = ContainerStatsCollector(history=10, idle_timeout=60, redis_client=fake_redis)
+    range_stats = collector.for_range("r1", None, ["a"], client_factory=lambda: client)
+
+    time.sleep(0.2)
+    assert client.containers.get.call_count == 1
+    assert range_stats.streaming == 1
+
+    # Stopping interrupts the back-off wait
+    started = time.monotonic()
+    collector.stop_all()
+    _wait_for(lambda: range_stats.streaming == 0, timeout=1)
+    assert time.monotonic() - started < 1
@@ -0,0 +1,89 @@
+# backend/tests/unit/test_content_render_cache.py
+"""Tests for the per-revision content render cache and ETag helpers."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from cyroid.services.content_render_cache import (
+    RENDER_HTML,
+    RENDER_WALKTHROUGH,
+    ContentRenderCache,
+    content_etag,
+    content_revision,
+    etag_matches,
+)
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+T1 = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def test_renders_once_per_revision():
+    cache = ContentRenderCache()
+    content_id = uuid4()
+    render = MagicMock(return_value={"phases": []})
+    revision = content_revision(T0, "1.0")
+
+    for _ in range(100):
+        assert cache.get_or_render(RENDER_WALKTHROUGH, content_id, revision, render) == {"phases": []}
+
+    render.assert_called_once()
+    assert cache.stats()["hits"] == 99
+
+
+def test_new_revision_replaces_old_render():
+    cache = ContentRenderCache()
+    content_id = uuid4()
+
+    cache.get_or_render(RENDER_HTML, content_id, content_revision(T0, "1.0"), lambda: "old")
+    assert cache.get_or_render(RENDER_HTML, content_id, content_revision(T1, "1.0"), lambda: "new") == "new"
+    assert cache.stats()["entries"] == 1
+
+
+def test_kinds_are_cached_separately_and_invalidated_together():
+    cache = ContentRenderCache()
+    content_id = uuid4()
+    revision = content_revision(T0, "1.0")
+
+    cache.get_or_render(RENDER_HTML, content_id, revision, lambda: "<p>")
+    cache.get_or_render(RENDER_WALKTHROUGH, content_id, revision, lambda: {})
+    assert cache.stats()["entries"] == 2
+
+    cache.invalidate(content_id)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    cache = ContentRenderCache(max_entries=2)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    revision = content_revision(T0, "1.0")
+
+    cache.get_or_render(RENDER_HTML, a, revision, lambda: "a")
+    cache.get_or_render(RENDER_HTML, b, revision, lambda: "b")
+    cache.get_or_render(RENDER_HTML, a, revision, lambda: "a")  # a is now most recent
+    cache.get_or_render(RENDER_HTML, c, revision, lambda: "c")  # evicts b
+
+    render_b = MagicMock(return_value="b")
+    cache.get_or_render(RENDER_HTML, b, revision, render_b)
+    render_b.assert_called_once()
+
+
+def test_etag_changes_with_revision_and_kind():
+    content_id = uuid4()
+    etag = content_etag(RENDER_WALKTHROUGH, content_id, content_revision(T0, "1.0"))
+
+    assert etag.startswith('W/"')
+    assert etag == content_etag(RENDER_WALKTHROUGH, content_id, content_revision(T0, "1.0"))
+    assert etag != content_etag(RENDER_WALKTHROUGH, content_id, content_revision(T1, "1.0"))
+    assert etag != content_etag(RENDER_WALKTHROUGH, content_id, content_revision(T0, "1.1"))
+    assert etag != content_etag(RENDER_HTML, content_id, content_revision(T0, "1.0"))
+
+
+def test_etag_matching():
+    etag = 'W/"abc"'
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"other", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
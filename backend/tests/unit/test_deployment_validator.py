@@ -0,0 +1,139 @@
+# backend/tests/unit/test_deployment_validator.py
+"""Tests for batched pre-deployment validation and its shared host fact cache."""
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+
+from cyroid.models.base_image import BaseImage
+from cyroid.models.network import Network
+from cyroid.models.range import Range
+from cyroid.models.resource_reservation import ResourceReservation
+from cyroid.models.vm import VM
+from cyroid.services.deployment_validator import DeploymentValidator, HostFacts
+
+LOCAL_IMAGES = [
+    SimpleNamespace(id="sha256:" + "a" * 64, tags=["ubuntu:22.04"]),
+    SimpleNamespace(id="sha256:" + "b" * 64, tags=["kali:latest", "kali:2024.1"]),
+]
+
+
+@pytest.fixture
+def docker(tmp_path, monkeypatch):
+    gb = 1024 ** 3
+    monkeypatch.setattr(shutil, "disk_usage", lambda path: shutil._ntuple_diskusage(500 * gb, 400 * gb, 100 * gb))
+    docker = MagicMock()
+    docker.client.images.list.return_value = LOCAL_IMAGES
+    docker.client.images.get.side_effect = Exception("No such image")
+    docker.client.info.return_value = {"DockerRootDir": str(tmp_path)}
+    return docker
+
+
+def _image(db, tag):
+    image = BaseImage(name=tag, image_type="container", docker_image_tag=tag, os_type="linux", vm_type="container")
+    db.add(image)
+    db.flush()
+    return image
+
+
+def _ranges(db, owner, count, tags):
+    images = [_image(db, tag) for tag in tags]
+    range_ids = []
+    for i in range(count):
+        range_obj = Range(name=f"lab {i}", created_by=owner.id)
+        db.add(range_obj)
+        db.flush()
+        network = Network(range_id=range_obj.id, name="lan", subnet="10.0.1.0/24", gateway="10.0.1.1")
+        db.add(network)
+        db.flush()
+        for n, image in enumerate(images):
+            db.add(VM(range_id=range_obj.id, network_id=network.id, base_image_id=image.id, hostname=f"vm{n}",
+                      ip_address=f"10.0.1.{10 + n}", cpu=1, ram_mb=512, disk_gb=1))
+        range_ids.append(range_obj.id)
+    db.flush()
+    return range_ids
+
+
+@pytest.mark.asyncio
+async def test_batch_resolves_host_facts_once(db, docker, make_user):
+    range_ids = _ranges(db, make_user("owner"), 50, ["ubuntu:22.04", "kali:latest", "missing:1.0"])
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        batch = await DeploymentValidator(db, docker, HostFacts(ttl=30)).validate_ranges(range_ids)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    # Ranges, disk reserved by other deployments, VMs, networks, base images - however many ranges
+    assert len(statements) == 5
+    docker.client.images.list.assert_called_once()
+    docker.client.info.assert_called_once()
+    docker.client.images.get.assert_called_once_with("missing:1.0")
+
+    assert len(batch.ranges) == 50 and not batch.valid
+    for validation in batch.ranges.values():
+        assert [e.message for e in validation.errors] == [
+            "VM 'vm2': Docker image 'missing:1.0' not found. Sync from Image Cache."
+        ]
+        assert validation.duration_ms >= 0
+    assert batch.duration_ms >= max(v.duration_ms for v in batch.ranges.values())
+    # Each range fits on its own, but not all 50 together
+    [combined] = batch.results
+    assert not combined.valid
+    assert combined.message.startswith("50 ranges combined: Insufficient disk space")
+    assert (combined.details["required_gb"], combined.details["available_gb"]) == (180.0, 100.0)
+
+
+@pytest.mark.asyncio
+async def test_host_facts_are_shared_until_expiry(db, docker, make_user):
+    [range_id] = _ranges(db, make_user("owner"), 1, ["ubuntu:22.04", "sha256:" + "b" * 64, "b" * 12])
+    facts = HostFacts(ttl=30)
+
+    for _ in range(3):
+        validation = await DeploymentValidator(db, docker, facts).validate_range(range_id)
+        assert validation.valid and validation.duration_ms > 0
+    docker.client.images.list.assert_called_once()
+    docker.client.info.assert_called_once()
+    docker.client.images.get.assert_not_called()
+
+    # A fresh pull is seen immediately: misses are always checked live
+    docker.client.images.get.side_effect = None
+    db.add(VM(range_id=range_id, network_id=db.query(Network).one().id, base_image_id=_image(db, "alpine").id,
+              hostname="new", ip_address="10.0.1.99", cpu=1, ram_mb=512, disk_gb=1))
+    db.flush()
+    assert (await DeploymentValidator(db, docker, facts).validate_range(range_id)).valid
+
+    facts.clear()
+    await DeploymentValidator(db, docker, facts).validate_range(range_id)
+    assert docker.client.images.list.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_range_in_batch(db, docker, make_user):
+    [range_id] = _ranges(db, make_user("owner"), 1, ["ubuntu:22.04"])
+    unknown = uuid.uuid4()
+
+    batch = await DeploymentValidator(db, docker, HostFacts(ttl=30)).validate_ranges([range_id, unknown])
+
+    assert batch.ranges[range_id].valid
+    assert [e.message for e in batch.ranges[unknown].errors] == ["Range not found"]
+    assert batch.results == [] and not batch.valid
+
+
+@pytest.mark.asyncio
+async def test_disk_reserved_by_other_deployments_is_not_free(db, docker, make_user):
+    [range_id, other] = _ranges(db, make_user("owner"), 2, ["ubuntu:22.04"])
+    db.add(ResourceReservation(range_id=other, disk_gb=95, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)))
+    db.flush()
+
+    validation = await DeploymentValidator(db, docker, HostFacts(ttl=30)).validate_range(range_id)
+
+    [error] = validation.errors
+    assert error.message.startswith("Insufficient disk space: 5.0 GB available after 95.0 GB reserved")
+    assert error.details["reserved_gb"] == 95.0
@@ -0,0 +1,140 @@
+# backend/tests/unit/test_dind_client_pool.py
+"""Tests for the pooled, probed range DinD Docker clients."""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docker.errors import DockerException
+
+from cyroid.services.dind_client_pool import DinDClientPool
+from cyroid.services.dind_service import DinDService
+
+OLD_URL = "tcp://172.30.1.5:2375"
+NEW_URL = "tcp://172.30.1.9:2375"
+
+
+class FakeDaemons:
+    """Docker daemons by URL; a URL absent from ``up`` refuses connections."""
+
+    def __init__(self, *up):
+        self.up = set(up)
+        self.created = []
+        self.pings = 0
+
+    def client(self, base_url, timeout, max_pool_size):
+        if base_url not in self.up:
+            raise DockerException(f"connection refused: {base_url}")
+        client = MagicMock()
+        client.base_url, client.connect_timeout, client.max_pool_size = base_url, timeout, max_pool_size
+        client.api.base_url = base_url.replace("tcp://", "http://")
+        client.api.hooks = {"response": []}
+        client.api.get.side_effect = lambda url, timeout: self._ping(base_url, timeout)
+        self.created.append(client)
+        return client
+
+    def _ping(self, base_url, timeout):
+        self.pings += 1
+        assert timeout == 3
+        if base_url not in self.up:
+            raise ConnectionError("read timed out")
+        return MagicMock(status_code=200)
+
+
+def _pool(daemons, resolver=None, **kwargs):
+    options = dict(timeout=60, pool_size=4, idle_timeout=600, probe_interval=30, probe_timeout=3)
+    options.update(kwargs)
+    return DinDClientPool(resolver=resolver, client_factory=daemons.client, **options)
+
+
+def test_clients_are_reused_per_timeout_class():
+    daemons = FakeDaemons(OLD_URL)
+    pool = _pool(daemons)
+
+    client = pool.get("r1", OLD_URL)
+    assert pool.get("r1", OLD_URL) is client
+    # Connected with the short probe timeout, then switched to the call timeout
+    assert (client.connect_timeout, client.api.timeout, client.max_pool_size) == (3, 60, 4)
+    assert daemons.pings == 0
+
+    transfer = pool.get("r1", OLD_URL, timeout=600)
+    assert transfer is not client and transfer.api.timeout == 600
+    assert pool.stats()["clients"] == 2
+
+
+def test_dead_daemon_is_reresolved_to_new_endpoint():
+    daemons = FakeDaemons(OLD_URL)
+    resolver = MagicMock(return_value=NEW_URL)
+    pool = _pool(daemons, resolver=resolver, probe_interval=0)
+    stale = pool.get("r1", OLD_URL)
+
+    # The DinD container restarted on a new IP
+    daemons.up = {NEW_URL}
+    client = pool.get("r1", OLD_URL)
+    assert client is not stale and client.base_url == NEW_URL
+    stale.close.assert_called_once()
+    resolver.assert_called_once_with("r1")
+
+    # Callers still holding the old URL keep the new endpoint
+    assert pool.get("r1", OLD_URL).base_url == NEW_URL
+    stats = pool.stats()["per_range"][0]
+    assert (stats["docker_url"], stats["reresolved"], stats["probe_failures"]) == (NEW_URL, 1, 1)
+
+
+def test_unreachable_daemon_fails_fast():
+    daemons = FakeDaemons(OLD_URL)
+    pool = _pool(daemons, resolver=lambda range_id: None, probe_interval=0)
+    pool.get("r1", OLD_URL)
+    daemons.up = set()
+
+    started = time.monotonic()
+    with pytest.raises(DockerException):
+        pool.get("r1", OLD_URL)
+    assert time.monotonic() - started < 1
+    assert pool.stats()["clients"] == 0
+
+    # It recovers once the daemon is back
+    daemons.up = {OLD_URL}
+    assert pool.get("r1", OLD_URL).base_url == OLD_URL
+
+
+def test_idle_ranges_are_evicted():
+    daemons = FakeDaemons(OLD_URL, NEW_URL)
+    pool = _pool(daemons, idle_timeout=0.05)
+    idle = pool.get("r1", OLD_URL)
+    time.sleep(0.1)
+
+    pool.get("r2", NEW_URL)
+    idle.close.assert_called_once()
+    stats = pool.stats()
+    assert (stats["ranges"], stats["evicted"]) == (1, 1)
+
+
+def test_latency_is_recorded_per_range():
+    daemons = FakeDaemons(OLD_URL)
+    pool = _pool(daemons)
+    hook = pool.get("r1", OLD_URL).api.hooks["response"][0]
+    for ms in range(1, 101):
+        hook(SimpleNamespace(elapsed=timedelta(milliseconds=ms), status_code=200))
+    hook(SimpleNamespace(elapsed=timedelta(milliseconds=500), status_code=500))
+
+    stats = pool.stats()["per_range"][0]
+    assert (stats["requests"], stats["errors"], stats["max_ms"]) == (101, 1, 500.0)
+    assert stats["p95_ms"] == 96.0
+    assert stats["avg_ms"] == pytest.approx((5050 + 500) / 101, abs=0.01)
+
+
+def test_container_lookup_skips_label_query_once_known():
+    host = MagicMock()
+    container = MagicMock(id="abc123", status="running")
+    container.attrs = {"NetworkSettings": {"Networks": {"cyroid-ranges": {"IPAddress": "172.30.1.9"}}}}
+    host.containers.list.return_value = [container]
+    host.containers.get.return_value = container
+    with patch("docker.from_env", return_value=host):
+        service = DinDService()
+
+    assert service._resolve_docker_url("r1") == "tcp://172.30.1.9:2375"
+    assert service._find_container_by_range_id("r1") is container
+    assert host.containers.list.call_count == 1
+    host.containers.get.assert_called_with("abc123")
@@ -0,0 +1,94 @@
+# backend/tests/unit/test_docker_executor.py
+"""Tests for off-loop Docker SDK execution and event-loop lag measurement."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cyroid.services.docker_executor import DockerExecutor, DockerOperationTimeout, LoopLagMonitor
+from cyroid.services.registry_service import RegistryService
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_catches_blocking_calls():
+    executor = DockerExecutor(workers=2)
+
+    async with LoopLagMonitor(interval=0.01) as off_loop:
+        assert await executor.run(lambda: time.sleep(0.3) or "done", op="commit") == "done"
+    async with LoopLagMonitor(interval=0.01) as on_loop:
+        await asyncio.sleep(0.02)
+        time.sleep(0.3)
+        await asyncio.sleep(0.02)
+
+    assert off_loop.stats()["max_ms"] < 100
+    assert on_loop.stats()["max_ms"] >= 250
+    stats = executor.stats()["operations"]["commit"]
+    assert stats["calls"] == 1 and stats["avg_ms"] >= 300
+
+
+@pytest.mark.asyncio
+async def test_timeout_runs_cancel_hook_and_frees_worker():
+    executor = DockerExecutor(workers=1)
+    release = threading.Event()
+
+    with pytest.raises(DockerOperationTimeout, match="'image_load' timed out"):
+        await executor.run(release.wait, 5, op="image_load", timeout=0.05, on_cancel=release.set)
+
+    # The hook unblocked the call, so the worker is free again
+    assert await executor.run(lambda: 42, op="ping") == 42
+    stats = executor.stats()
+    assert (stats["abandoned"], stats["running"], stats["queued"]) == (0, 0, 0)
+    assert stats["operations"]["image_load"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_call_never_runs():
+    executor = DockerExecutor(workers=1)
+    release = threading.Event()
+    ran = []
+
+    busy = asyncio.ensure_future(executor.run(release.wait, 5, op="pull"))
+    queued = asyncio.ensure_future(executor.run(lambda: ran.append(1), op="tag"))
+    await asyncio.sleep(0.05)
+    assert executor.stats()["queued"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await busy
+    await asyncio.sleep(0.05)
+
+    assert ran == []
+    stats = executor.stats()
+    assert (stats["queued"], stats["abandoned"]) == (0, 0)
+    assert stats["operations"]["tag"]["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_push_keeps_loop_responsive(fake_redis):
+    def push(tag, stream, decode):
+        for n in range(5):
+            time.sleep(0.05)
+            yield {"status": "Pushing" if n < 4 else "Pushed"}
+
+    docker_client = MagicMock()
+    docker_client.images.push.side_effect = push
+    with patch("docker.from_env", return_value=docker_client):
+        registry = RegistryService()
+        registry._redis = fake_redis
+        progress = []
+        loop_thread = threading.get_ident()
+
+        def record(status, percent):
+            progress.append((status, percent, threading.get_ident() == loop_thread))
+
+        async with LoopLagMonitor(interval=0.01) as lag:
+            assert await registry.push_image("cyroid/kali:latest", record)
+            await asyncio.sleep(0.01)
+
+    assert lag.stats()["max_ms"] < 100
+    assert progress[-1] == ("Push complete", 100, True)
+    assert all(on_loop for _, _, on_loop in progress)
@@ -0,0 +1,101 @@
+# backend/tests/unit/test_event_pagination.py
+"""Tests for keyset pagination of event logs against an in-memory database."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, text
+
+from cyroid.models.event_log import EventLog, EventType
+from cyroid.models.range import Range
+from cyroid.services.event_service import EventService, decode_event_cursor
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def range_ids(db, make_user):
+    user = make_user("owner")
+    ranges = [Range(name=f"r{i}", created_by=user.id) for i in range(2)]
+    db.add_all(ranges)
+    db.flush()
+
+    rows = []
+    for range_obj in ranges:
+        for i in range(57):
+            rows.append({
+                "id": uuid.uuid4(),
+                "range_id": range_obj.id,
+                # Several events share a timestamp; id breaks the tie
+                "created_at": T0 + timedelta(seconds=i // 3),
+                "updated_at": T0,
+                "event_type": EventType.VM_STARTED if i % 2 else EventType.VM_STOPPED,
+                "message": f"event {i}",
+            })
+    db.execute(insert(EventLog), rows)
+    db.commit()
+    return [r.id for r in ranges]
+
+
+def test_cursor_pages_cover_all_events_in_order(db, range_ids):
+    service = EventService(db)
+    seen, cursor = [], None
+    while True:
+        events, cursor = service.get_events_page(range_ids[0], limit=10, cursor=cursor)
+        seen.extend(events)
+        if cursor is None:
+            break
+
+    assert len(seen) == 57
+    assert len({e.id for e in seen}) == 57
+    assert all(e.range_id == range_ids[0] for e in seen)
+    keys = [(e.created_at, e.id) for e in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    # Same order as OFFSET paging
+    offset_events, total = service.get_events(range_ids[0], limit=57)
+    assert total == 57
+    assert [e.id for e in offset_events] == [e.id for e in seen]
+
+
+def test_cursor_respects_event_type_filter(db, range_ids):
+    service = EventService(db)
+    first, cursor = service.get_events_page(range_ids[0], limit=20, event_types=[EventType.VM_STARTED])
+    rest, last_cursor = service.get_events_page(
+        range_ids[0], limit=20, cursor=cursor, event_types=[EventType.VM_STARTED]
+    )
+
+    assert len(first) + len(rest) == 28
+    assert last_cursor is None
+    assert {e.event_type for e in first + rest} == {EventType.VM_STARTED}
+    assert service.count_events(range_ids[0], [EventType.VM_STARTED]) == 28
+
+
+def test_last_full_page_has_no_cursor(db, range_ids):
+    events, cursor = EventService(db).get_events_page(range_ids[0], limit=57)
+    assert len(events) == 57
+    assert cursor is None
+
+
+def test_malformed_cursor_is_rejected(db, range_ids):
+    with pytest.raises(ValueError):
+        EventService(db).get_events_page(range_ids[0], cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_event_cursor("")
+
+
+def test_page_query_seeks_on_composite_index(db, range_ids):
+    _, cursor = EventService(db).get_events_page(range_ids[0], limit=5)
+    created_at, event_id = decode_event_cursor(cursor)
+
+    plan = db.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM event_logs "
+            "WHERE range_id = :r AND (created_at, id) < (:c, :i) "
+            "ORDER BY created_at DESC, id DESC LIMIT 6"
+        ),
+        {"r": range_ids[0].hex, "c": created_at, "i": event_id.hex},
+    ).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_event_logs_range_created" in detail
+    assert "TEMP B-TREE" not in detail  # no sort step
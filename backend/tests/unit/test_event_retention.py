@@ -0,0 +1,104 @@
+# backend/tests/unit/test_event_retention.py
+"""Tests for event log retention and daily rollups against an in-memory database."""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from cyroid.models.event_log import EventLog, EventLogRollup, EventType
+from cyroid.models.range import Range
+from cyroid.services.event_retention_service import EventRetentionService, parse_retention_overrides
+from cyroid.services.event_service import EventService
+
+NOW = datetime(2026, 6, 30, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def range_id(db, make_user):
+    range_obj = Range(name="r", created_by=make_user("owner").id)
+    db.add(range_obj)
+    db.commit()
+    return range_obj.id
+
+
+def _add_events(session_factory, range_id, event_type, count, age_days):
+    db = session_factory()
+    created_at = NOW - timedelta(days=age_days)
+    db.execute(insert(EventLog), [
+        {"id": uuid.uuid4(), "range_id": range_id, "event_type": event_type,
+         "message": "m", "created_at": created_at, "updated_at": created_at}
+        for _ in range(count)
+    ])
+    db.commit()
+    db.close()
+
+
+def _remaining(session_factory):
+    db = session_factory()
+    try:
+        return {(e.event_type, (NOW.date() - e.created_at.date()).days) for e in db.query(EventLog)}
+    finally:
+        db.close()
+
+
+def test_prunes_expired_events_in_batches_and_rolls_them_up(session_factory, range_id):
+    _add_events(session_factory, range_id, EventType.VM_STARTED, 12, age_days=40)
+    _add_events(session_factory, range_id, EventType.VM_STARTED, 3, age_days=5)
+    _add_events(session_factory, range_id, EventType.VM_ERROR, 4, age_days=40)
+
+    service = EventRetentionService(session_factory, retention_days=30, overrides={}, batch_size=5)
+    result = service.prune(now=NOW)
+
+    assert result["pruned"] == 16
+    assert result["batches"] == 4
+    assert _remaining(session_factory) == {(EventType.VM_STARTED, 5)}
+
+    db = session_factory()
+    rollups = {(r.event_type, r.day): r.count for r in db.query(EventLogRollup)}
+    db.close()
+    day = (NOW - timedelta(days=40)).date()
+    assert rollups == {("vm_started", day): 12, ("vm_error", day): 4}
+
+
+def test_per_type_overrides(session_factory, range_id):
+    _add_events(session_factory, range_id, EventType.DEPLOYMENT_STEP, 2, age_days=10)
+    _add_events(session_factory, range_id, EventType.VM_ERROR, 2, age_days=200)
+    _add_events(session_factory, range_id, EventType.VM_STARTED, 2, age_days=200)
+
+    overrides = parse_retention_overrides("deployment_step=7, VM_ERROR=0")
+    assert overrides == {EventType.DEPLOYMENT_STEP: 7, EventType.VM_ERROR: 0}
+
+    EventRetentionService(session_factory, retention_days=90, overrides=overrides).prune(now=NOW)
+    # vm_error is kept forever, the others expired
+    assert _remaining(session_factory) == {(EventType.VM_ERROR, 200)}
+
+
+def test_invalid_override_is_rejected():
+    with pytest.raises(ValueError):
+        parse_retention_overrides("not_an_event=5")
+
+
+def test_repeated_runs_accumulate_rollups_and_daily_counts(session_factory, range_id):
+    service = EventRetentionService(session_factory, retention_days=30, overrides={}, batch_size=2)
+    _add_events(session_factory, range_id, EventType.VM_STOPPED, 3, age_days=40)
+    service.prune(now=NOW)
+    # Late arrivals for an already rolled-up day are added to its count
+    _add_events(session_factory, range_id, EventType.VM_STOPPED, 2, age_days=40)
+    service.prune(now=NOW, max_batches=1)
+    assert service.last_run["batches"] == 1
+    service.prune(now=NOW)
+    _add_events(session_factory, range_id, EventType.VM_STOPPED, 1, age_days=1)
+
+    db = session_factory()
+    counts = EventService(db).get_daily_counts(range_id)
+    db.close()
+    assert counts == [
+        {"day": (NOW - timedelta(days=40)).date(), "event_type": "vm_stopped", "count": 5},
+        {"day": (NOW - timedelta(days=1)).date(), "event_type": "vm_stopped", "count": 1},
+    ]
+
+    db = session_factory()
+    recent = EventService(db).get_daily_counts(range_id, since=date(2026, 6, 1))
+    db.close()
+    assert [c["count"] for c in recent] == [1]
@@ -0,0 +1,138 @@
+# backend/tests/unit/test_image_conversion_service.py
+"""Tests for the qemu-img conversion runner."""
+import asyncio
+import os
+import stat
+
+import pytest
+
+from cyroid.services import image_conversion_service
+from cyroid.services.image_conversion_service import ConversionCancelled, ImageConversionRunner
+
+# Stand-in for qemu-img: prints -p style progress, then writes the output file.
+# The last argument is the output path.
+FAKE_QEMU_IMG = """#!/bin/sh
+for arg; do out="$arg"; done
+for p in 10.00 50.00 100.00; do
+    printf '    (%s/100%%)\\r' "$p"
+    sleep ${FAKE_QEMU_DELAY:-0}
+done
+echo converted > "$out"
+"""
+
+
+@pytest.fixture
+def fake_qemu_img(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "qemu-img"
+    script.write_text(FAKE_QEMU_IMG)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+def test_convert_reports_progress_and_renames_into_place(tmp_path, fake_qemu_img, fake_redis):
+    source = tmp_path / "disk.vmdk"
+    source.write_bytes(b"vmdk")
+    dest = tmp_path / "disk.qcow2"
+    reports = []
+
+    result = asyncio.run(ImageConversionRunner(max_concurrent=1, redis_client=fake_redis).convert(
+        source, dest, "vmdk", progress=lambda done, total: reports.append(done),
+    ))
+
+    assert result == dest
+    assert dest.read_text().strip() == "converted"
+    assert not (tmp_path / "disk.qcow2.partial").exists()
+    assert reports[-1] == 100
+    assert not fake_redis.exists("conversion:slot:0")
+
+
+def test_failed_conversion_leaves_no_partial(tmp_path, fake_qemu_img, fake_redis):
+    fake_qemu_img.write_text("#!/bin/sh\nfor arg; do out=\"$arg\"; done\necho x > \"$out\"\necho boom >&2\nexit 1\n")
+    source = tmp_path / "disk.vdi"
+    source.write_bytes(b"vdi")
+    dest = tmp_path / "disk.qcow2"
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(ImageConversionRunner(max_concurrent=1, redis_client=fake_redis).convert(source, dest, "vdi"))
+
+    assert not dest.exists()
+    assert not (tmp_path / "disk.qcow2.partial").exists()
+
+
+def test_cancel_stops_conversion(tmp_path, fake_qemu_img, monkeypatch, fake_redis):
+    monkeypatch.setenv("FAKE_QEMU_DELAY", "0.3")
+    source = tmp_path / "disk.vmdk"
+    source.write_bytes(b"vmdk")
+    dest = tmp_path / "disk.qcow2"
+
+    calls = iter([False, True])  # Admitted, then cancelled mid-run
+
+    with pytest.raises(ConversionCancelled):
+        asyncio.run(ImageConversionRunner(max_concurrent=1, redis_client=fake_redis).convert(
+            source, dest, "vmdk", is_cancelled=lambda: next(calls, True),
+        ))
+
+    assert not dest.exists()
+    assert not fake_redis.exists("conversion:slot:0")
+
+
+def test_cancel_while_queued_does_not_wait_for_a_slot(tmp_path, fake_qemu_img, monkeypatch, fake_redis):
+    monkeypatch.setattr(image_conversion_service, "SLOT_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(image_conversion_service, "HEARTBEAT_INTERVAL", 0.0)
+    fake_redis.set("conversion:slot:0", "another-worker")
+    source = tmp_path / "disk.vmdk"
+    source.write_bytes(b"vmdk")
+    cancelled = False
+    beats = 0
+
+    def heartbeat():
+        nonlocal beats, cancelled
+        beats += 1
+        cancelled = beats >= 3
+
+    with pytest.raises(ConversionCancelled, match="queued"):
+        asyncio.run(ImageConversionRunner(max_concurrent=1, redis_client=fake_redis).convert(
+            source, tmp_path / "disk.qcow2", "vmdk", is_cancelled=lambda: cancelled, heartbeat=heartbeat,
+        ))
+
+    # The job lease was renewed while queued, and the other holder's slot is untouched
+    assert beats == 3
+    assert fake_redis.get("conversion:slot:0") == "another-worker"
+
+
+def test_concurrency_is_limited_across_workers(tmp_path, fake_qemu_img, monkeypatch, fake_redis):
+    monkeypatch.setenv("FAKE_QEMU_DELAY", "0.05")
+    monkeypatch.setattr(image_conversion_service, "SLOT_POLL_INTERVAL", 0.01)
+    # Two API workers sharing one Redis
+    runners = [ImageConversionRunner(max_concurrent=2, redis_client=fake_redis) for _ in range(2)]
+    peak = 0
+
+    def track(_done, _total):
+        nonlocal peak
+        peak = max(peak, sum(runner.running for runner in runners))
+
+    async def run_all():
+        jobs = []
+        for i in range(6):
+            source = tmp_path / f"disk{i}.vmdk"
+            source.write_bytes(b"vmdk")
+            jobs.append(runners[i % 2].convert(source, tmp_path / f"disk{i}.qcow2", "vmdk", progress=track))
+        await asyncio.gather(*jobs)
+
+    asyncio.run(run_all())
+
+    assert peak == 2
+    assert runners[0].stats() == {"max_concurrent": 2, "running": 0, "waiting": 0, "host_running": 0}
+
+
+def test_slots_derived_from_disk_bandwidth(monkeypatch):
+    from cyroid.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "conversion_disk_bandwidth_mbps", 600)
+    monkeypatch.setattr(settings, "conversion_job_bandwidth_mbps", 150)
+
+    assert ImageConversionRunner().max_concurrent == 4
@@ -0,0 +1,111 @@
+# backend/tests/unit/test_image_job_registry.py
+"""Tests for the shared Docker image pull/build job registry."""
+import time
+
+import pytest
+
+from cyroid.services.image_job_registry import (
+    ImageJobRegistry,
+    JOB_KIND_BUILD,
+    JOB_KIND_PULL,
+    image_job_key,
+)
+
+
+@pytest.fixture
+def registry(fake_redis):
+    return ImageJobRegistry(redis_client=fake_redis)
+
+
+def test_image_job_key_normalizes_reference():
+    assert image_job_key("library/nginx:latest") == "library_nginx_latest"
+
+
+def test_claim_deduplicates_concurrent_requests(registry):
+    """A second request for the same image attaches instead of starting a new job."""
+    assert registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"}) is True
+    assert registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"}) is False
+
+    # Different job kinds and keys are independent
+    assert registry.claim(JOB_KIND_BUILD, "nginx_latest", {}) is True
+    assert registry.claim(JOB_KIND_PULL, "redis_7", {"image": "redis:7"}) is True
+
+
+def test_visible_from_another_registry_instance(fake_redis):
+    """State is shared through Redis, not held by the process that claimed it."""
+    api_worker_a = ImageJobRegistry(redis_client=fake_redis)
+    api_worker_b = ImageJobRegistry(redis_client=fake_redis)
+
+    api_worker_a.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    api_worker_a.update(JOB_KIND_PULL, "nginx_latest", status="pulling", progress_percent=42)
+
+    job = api_worker_b.get(JOB_KIND_PULL, "nginx_latest")
+    assert job["status"] == "pulling"
+    assert job["progress_percent"] == 42
+    assert job["image"] == "nginx:latest"
+
+
+def test_layer_progress_is_returned(registry):
+    registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    registry.update_layers(JOB_KIND_PULL, "nginx_latest", {
+        "b": {"current": 10, "total": 100, "status": "Downloading"},
+        "a": {"current": 1, "total": 1, "status": "Pull complete"},
+    })
+
+    job = registry.get(JOB_KIND_PULL, "nginx_latest", include_layers=True)
+    assert [layer["id"] for layer in job["layers"]] == ["a", "b"]
+    assert job["layers"][1]["current"] == 10
+
+
+def test_finish_releases_claim(registry):
+    registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    registry.finish(JOB_KIND_PULL, "nginx_latest", "completed", progress_percent=100)
+
+    assert registry.get(JOB_KIND_PULL, "nginx_latest")["status"] == "completed"
+    assert registry.list(JOB_KIND_PULL) == []
+    assert registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"}) is True
+
+
+def test_cancel_flag(registry):
+    registry.claim(JOB_KIND_BUILD, "kali_latest", {})
+    assert registry.is_cancelled(JOB_KIND_BUILD, "kali_latest") is False
+
+    registry.request_cancel(JOB_KIND_BUILD, "kali_latest")
+    assert registry.is_cancelled(JOB_KIND_BUILD, "kali_latest") is True
+
+
+def test_expired_lease_reports_interrupted_job(registry, fake_redis):
+    """A job whose worker died (lease expired) is reported failed and can be retried."""
+    registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    registry.update(JOB_KIND_PULL, "nginx_latest", status="pulling")
+    fake_redis.delete(registry._lease_key(JOB_KIND_PULL, "nginx_latest"))
+
+    job = registry.get(JOB_KIND_PULL, "nginx_latest")
+    assert job["status"] == "failed"
+    assert "interrupted" in job["error"]
+    assert registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"}) is True
+
+
+def test_list_prunes_expired_documents(registry, fake_redis):
+    registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    registry.claim(JOB_KIND_PULL, "redis_7", {"image": "redis:7"})
+    fake_redis.delete(registry._doc_key(JOB_KIND_PULL, "redis_7"))
+
+    jobs = registry.list(JOB_KIND_PULL)
+    assert [job["key"] for job in jobs] == ["nginx_latest"]
+    assert fake_redis.smembers("image_jobs:pull") == {"nginx_latest"}
+
+
+def test_heartbeat_renews_only_its_own_lease(registry, fake_redis):
+    """A long push with no progress updates keeps its lease; a successor's lease is left alone."""
+    lease_key = registry._lease_key(JOB_KIND_PULL, "nginx_latest")
+    registry.claim(JOB_KIND_PULL, "nginx_latest", {"image": "nginx:latest"})
+    with registry.heartbeat(JOB_KIND_PULL, "nginx_latest", interval=0.01):
+        fake_redis.ttls[lease_key] = 1
+        time.sleep(0.05)
+        assert fake_redis.ttls[lease_key] == 120
+
+        # Another job took the key: the heartbeat stops renewing
+        fake_redis.set(lease_key, "someone-else", ex=5)
+        time.sleep(0.05)
+        assert fake_redis.ttls[lease_key] == 5
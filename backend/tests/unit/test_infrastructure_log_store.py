@@ -0,0 +1,164 @@
+# backend/tests/unit/test_infrastructure_log_store.py
+"""Tests for the indexed infrastructure log store."""
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cyroid.services import infrastructure_log_store
+from cyroid.services.infrastructure_log_store import InfrastructureLogStore, ServiceLogBuffer
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+LEVELS = ["INFO", "DEBUG", "WARNING", "INFO", "ERROR"]
+
+
+def _line(n):
+    """One line per second; every fifth is an error and every 1000th mentions a job."""
+    ts = (START + timedelta(seconds=n)).strftime("%Y-%m-%dT%H:%M:%S.%f") + "123Z"
+    job = f" job-{n}" if n % 1000 == 0 else ""
+    return f"{ts} {LEVELS[n % 5]} request {n}{job}"
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_indexed_queries_without_rereading():
+    buffer = ServiceLogBuffer("api", capacity=20000)
+    buffer.ingest(_line(n) for n in range(26000))
+
+    # Bounded: the oldest lines were evicted, and sequence numbers keep counting
+    assert buffer.stats()["lines"] == 20000
+    latest = buffer.query(limit=3)
+    assert [r.seq for r in latest.records] == [25997, 25998, 25999]
+    assert latest.has_more
+
+    started = time.perf_counter()
+    errors = buffer.query(level="error", limit=10)
+    window = buffer.query(since=START + timedelta(seconds=22000), until=START + timedelta(seconds=22009))
+    warnings = buffer.query(level="warning", since=START + timedelta(seconds=25990))
+    jobs = buffer.query(search="JOB-2", limit=2)
+    older = buffer.query(before=latest.records[0].cursor, limit=2)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert all(r.level == "ERROR" for r in errors.records)
+    assert errors.records[-1].message == "ERROR request 25999"
+    assert [r.seq for r in window.records] == list(range(22000, 22010))
+    assert window.total == 10 and not window.has_more
+    assert {r.level for r in warnings.records} == {"WARN", "ERROR"}
+    assert warnings.total == 4
+    assert [r.message for r in jobs.records] == ["INFO request 24000 job-24000", "INFO request 25000 job-25000"]
+    assert jobs.total == 6 and jobs.has_more
+    assert [r.seq for r in older.records] == [25995, 25996]
+    assert elapsed_ms < 200
+
+
+class FakeContainer:
+    """Serves a backfill, then a followed stream that ends like a container restart."""
+
+    def __init__(self, backfill, streamed):
+        self.backfill = backfill
+        self.streamed = streamed
+        self.calls = []
+        self.released = threading.Event()
+
+    def logs(self, **kwargs):
+        self.calls.append(kwargs)
+        if not kwargs.get("stream"):
+            return "\n".join(self.backfill).encode()
+        if len(self.calls) > 2:
+            self.released.wait(5)
+            return iter(())
+        data = "\n".join(self.streamed).encode() + b"\n"
+        # Chunks do not line up with lines
+        return iter([data[:50], data[50:51], data[51:]])
+
+
+def test_follower_backfills_once_then_streams(monkeypatch):
+    monkeypatch.setattr(infrastructure_log_store, "FOLLOW_RETRY_SECONDS", 0.05)
+    container = FakeContainer([_line(n) for n in range(5)], [_line(4), _line(5), _line(6)])
+    store = InfrastructureLogStore(capacity=100)
+    buffer = store.service("worker", lambda: container, wait=5)
+
+    _wait_for(lambda: buffer.stats()["lines"] == 7)
+    assert [r.message for r in buffer.query().records][-3:] == [
+        "ERROR request 4", "INFO request 5", "DEBUG request 6",
+    ]
+    assert container.calls[0] == {"tail": 100, "timestamps": True}
+    assert container.calls[1]["follow"] and container.calls[1]["since"] == int((START + timedelta(seconds=4)).timestamp())
+
+    # Later reads come from the buffer; the follower resumes after the last line
+    assert store.service("worker", lambda: container) is buffer
+    _wait_for(lambda: len(container.calls) == 3)
+    assert container.calls[2]["since"] == int((START + timedelta(seconds=6)).timestamp())
+    container.released.set()
+    store.stop_all()
+
+
+def test_cursor_pages_the_same_on_every_worker():
+    """Each API worker has its own buffer; a cursor from one must page correctly on another."""
+    # Five lines share one timestamp, so the cursor needs its tiebreak
+    ts = (START + timedelta(seconds=49, microseconds=500000)).strftime("%Y-%m-%dT%H:%M:%S.%f") + "000Z"
+    lines = [_line(n) for n in range(50)] + [f"{ts} INFO burst {n}" for n in range(5)]
+    lines += [_line(n) for n in range(50, 60)]
+    first = ServiceLogBuffer("api", capacity=1000)
+    first.ingest(lines)
+    # A worker that started later, with older lines already evicted and different sequence numbers
+    second = ServiceLogBuffer("api", capacity=20)
+    second.ingest(["noise"] * 3)
+    second.ingest(lines[40:])
+
+    page = first.query(limit=12)
+    assert page.records[0].message == "INFO burst 3"
+    cursor = page.records[0].cursor
+
+    older = second.query(before=cursor, limit=2)
+    assert [r.message for r in older.records] == ["INFO burst 1", "INFO burst 2"]
+    assert [r.cursor for r in older.records] == [r.cursor for r in first.query(before=cursor, limit=2).records]
+    assert older.records[0].seq != first.query(before=cursor, limit=2).records[0].seq
+
+    with pytest.raises(ValueError):
+        first.query(before="not-a-cursor")
+
+
+def test_idle_buffers_stop_following(monkeypatch):
+    monkeypatch.setattr(infrastructure_log_store, "FOLLOW_RETRY_SECONDS", 0.01)
+    store = InfrastructureLogStore(capacity=100, idle_seconds=0.05)
+    locator_calls = []
+
+    def locator():
+        locator_calls.append(1)
+        return None
+
+    worker = store.service("worker", locator, wait=1)
+    _wait_for(lambda: not worker._thread.is_alive())
+    calls = len(locator_calls)
+
+    # The next use of the store drops the idle buffer; asking for it again follows afresh
+    store.service("api", lambda: None, wait=1)
+    assert "worker" not in store.stats()
+    again = store.service("worker", locator, wait=1)
+    assert again is not worker
+    assert len(locator_calls) > calls
+    store.stop_all()
+
+
+@pytest.mark.asyncio
+async def test_live_tail_subscribers_get_new_lines():
+    buffer = ServiceLogBuffer("api", capacity=100)
+    queue = buffer.subscribe()
+
+    await asyncio.get_running_loop().run_in_executor(None, buffer.ingest, [_line(1), _line(2)])
+    records = await asyncio.wait_for(queue.get(), timeout=1)
+    assert [r.seq for r in records] == [0, 1]
+
+    buffer.unsubscribe(queue)
+    buffer.ingest([_line(3)])
+    await asyncio.sleep(0.05)
+    assert queue.empty()
+    assert buffer.stats()["subscribers"] == 0
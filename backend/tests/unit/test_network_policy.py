@@ -0,0 +1,172 @@
+# backend/tests/unit/test_network_policy.py
+"""Tests for live network policy updates, running the generated script against a fake iptables."""
+import os
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cyroid.services.network_policy_service import (
+    NetworkPolicy,
+    NetworkPolicyService,
+    build_script,
+    isolation_rules,
+    parse_changes,
+)
+
+FAKE_IPTABLES = """#!/bin/sh
+# Minimal iptables: rules are stored one per line as "<table> <rule>"
+table=filter
+if [ "$1" = "-t" ]; then table=$2; shift 2; fi
+verb=$1; shift
+line="$table $*"
+case "$verb" in
+  -C) grep -qxF -- "$line" "$RULES" ;;
+  -A) echo "$line" >> "$RULES" ;;
+  -I) { echo "$line"; cat "$RULES"; } > "$RULES.tmp" && mv "$RULES.tmp" "$RULES" ;;
+  -D) grep -qxF -- "$line" "$RULES" || exit 1
+      awk -v l="$line" 'done || $0 != l { print; next } { done = 1 }' "$RULES" > "$RULES.tmp"
+      mv "$RULES.tmp" "$RULES" ;;
+esac
+"""
+
+NETWORK_ID = "abcdef1234567890"
+BRIDGE = "br-abcdef123456"
+
+
+@pytest.fixture
+def dind(tmp_path):
+    """A fake DinD container whose exec_run runs scripts against a fake iptables."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    iptables = bin_dir / "iptables"
+    iptables.write_text(FAKE_IPTABLES)
+    iptables.chmod(0o755)
+    rules = tmp_path / "rules"
+    rules.write_text("")
+
+    def exec_run(cmd, privileged=False):
+        env = {**os.environ, "PATH": f"{bin_dir}:{os.environ['PATH']}", "RULES": str(rules)}
+        proc = subprocess.run(cmd, env=env, capture_output=True)
+        return proc.returncode, proc.stdout + proc.stderr
+
+    container = MagicMock()
+    container.id = "dind-1"
+    container.exec_run.side_effect = exec_run
+    return SimpleNamespace(container=container, rules=rules)
+
+
+@pytest.fixture
+def service(dind):
+    dind_service = MagicMock()
+    dind_service.host_client.containers.get.return_value = dind.container
+    dind_service._get_outbound_interface.return_value = "eth1"
+    with patch("cyroid.services.dind_service.get_dind_service", return_value=dind_service):
+        yield NetworkPolicyService(), dind_service
+
+
+def _policy(internet=False, isolated=False, dhcp=False):
+    return NetworkPolicy(internet_enabled=internet, is_isolated=isolated, dhcp_enabled=dhcp)
+
+
+def _apply(svc, policy):
+    return svc.apply_policy("range-1", "dind-1", "lan", NETWORK_ID, policy)
+
+
+def test_enable_internet_adds_rules_in_one_exec(service, dind):
+    svc, _ = service
+
+    change = _apply(svc, _policy(internet=True))
+
+    assert change.applied
+    assert f"FORWARD -i {BRIDGE} -o eth1 -j ACCEPT" in change.added
+    assert "-t nat POSTROUTING -o eth1 -j MASQUERADE" in change.added
+    assert change.removed == []
+    assert dind.container.exec_run.call_count == 1
+    assert f"filter FORWARD -i {BRIDGE} -o eth1 -j ACCEPT" in dind.rules.read_text()
+
+
+def test_reapplying_same_policy_changes_nothing(service, dind):
+    svc, _ = service
+    _apply(svc, _policy(internet=True, isolated=True))
+
+    change = _apply(svc, _policy(internet=True, isolated=True))
+
+    assert change.applied
+    assert change.added == [] and change.removed == []
+
+
+def test_delta_removes_per_network_rules_but_keeps_shared_ones(service, dind):
+    svc, _ = service
+    _apply(svc, _policy(internet=True))
+
+    change = _apply(svc, _policy(internet=False, isolated=True))
+
+    assert change.removed == [f"FORWARD -i {BRIDGE} -o eth1 -j ACCEPT"]
+    assert change.added == isolation_rules(BRIDGE)
+    assert "MASQUERADE" in dind.rules.read_text()
+
+
+def test_isolation_drops_are_inserted_ahead_of_accepts(service, dind):
+    svc, _ = service
+    dind.rules.write_text("filter FORWARD -i br-other -o br-+ -j ACCEPT\n")
+
+    _apply(svc, _policy(isolated=True))
+
+    lines = dind.rules.read_text().splitlines()
+    assert lines[-1] == "filter FORWARD -i br-other -o br-+ -j ACCEPT"
+    assert all(line.startswith("filter FORWARD") and line.endswith("-j DROP") for line in lines[:-1])
+
+    change = _apply(svc, _policy(isolated=False))
+    assert change.removed == isolation_rules(BRIDGE)
+    assert dind.rules.read_text().splitlines() == lines[-1:]
+
+
+def test_recreated_network_uses_its_new_bridge(service, dind):
+    svc, _ = service
+    _apply(svc, _policy(internet=True))
+
+    change = svc.apply_policy("range-1", "dind-1", "lan", "0123456789abcdef", _policy(internet=True))
+
+    assert change.added == ["FORWARD -i br-0123456789ab -o eth1 -j ACCEPT"]
+
+
+def test_topology_is_resolved_once_per_container(service, dind):
+    svc, dind_service = service
+
+    for internet in (True, False, True):
+        _apply(svc, _policy(internet=internet))
+    assert dind_service._get_outbound_interface.call_count == 1
+    # One exec per change; the outbound interface lookup is mocked
+    assert dind.container.exec_run.call_count == 3
+
+    # A redeployed range gets a new DinD container and is re-resolved
+    new_container = MagicMock(id="dind-2")
+    new_container.exec_run.return_value = (0, b"")
+    dind_service.host_client.containers.get.return_value = new_container
+    svc.apply_policy("range-1", "dind-2", "lan", NETWORK_ID, _policy())
+    assert dind_service._get_outbound_interface.call_count == 2
+
+
+def test_missing_container_returns_none(service):
+    svc, dind_service = service
+    dind_service.host_client.containers.get.side_effect = Exception("not found")
+    dind_service._find_container_by_range_id.return_value = None
+
+    assert _apply(svc, _policy(internet=True)) is None
+
+
+def test_failed_rule_is_reported(tmp_path):
+    iptables = tmp_path / "iptables"
+    iptables.write_text("#!/bin/sh\nexit 1\n")
+    iptables.chmod(0o755)
+
+    script = build_script(["FORWARD -i br-x -o eth0 -j ACCEPT"], [])
+    proc = subprocess.run(
+        ["sh", "-c", script], capture_output=True,
+        env={**os.environ, "PATH": f"{tmp_path}:{os.environ['PATH']}"},
+    )
+
+    assert proc.returncode != 0
+    assert parse_changes(proc.stdout.decode()) == ([], [])
@@ -0,0 +1,142 @@
+# backend/tests/unit/test_notification_inbox.py
+"""Tests for notification inbox fan-out and unread counters against an in-memory database."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from cyroid.models.event import EventParticipant, TrainingEvent
+from cyroid.models.notification import Notification, NotificationCounter, NotificationType
+from cyroid.models.range import Range
+from cyroid.models.user import User, UserAttribute
+from cyroid.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def role_user(make_user):
+    def make(name, role="engineer"):
+        return make_user(name, roles=[role])
+    return make
+
+
+def _notify(db, title, **scope):
+    return NotificationService(db).create_notification(NotificationType.INFO, title, "m", broadcast=False, **scope)
+
+
+def _titles(db, user, **kwargs):
+    entries, total, unread = NotificationService(db).get_user_notifications(user, **kwargs)
+    return sorted(e.notification.title for e in entries), total, unread
+
+
+def test_delivers_to_each_scope(db, role_user):
+    owner, assignee, participant, outsider = (role_user(n) for n in ("owner", "assignee", "participant", "outsider"))
+    admin = role_user("admin", role="admin")
+    range_obj = Range(name="r", created_by=owner.id, assigned_to_user_id=assignee.id)
+    training = TrainingEvent(name="e", created_by_id=owner.id, start_datetime=datetime(2026, 1, 1))
+    db.add_all([range_obj, training])
+    db.flush()
+    db.add(EventParticipant(event_id=training.id, user_id=participant.id, role="student"))
+    db.flush()
+
+    _notify(db, "direct", user_id=outsider.id)
+    _notify(db, "admins", target_role="admin")
+    _notify(db, "range", resource_type="range", resource_id=range_obj.id)
+    _notify(db, "event", resource_type="event", resource_id=training.id)
+    _notify(db, "range+admins", resource_type="range", resource_id=range_obj.id, target_role="admin")
+
+    assert _titles(db, owner)[0] == ["range", "range+admins"]
+    assert _titles(db, assignee)[0] == ["range", "range+admins"]
+    assert _titles(db, participant)[0] == ["event"]
+    assert _titles(db, outsider)[0] == ["direct"]
+    assert _titles(db, admin)[0] == ["admins", "range+admins"]
+
+
+def test_read_state_and_counters_are_per_user(db, role_user):
+    alice, bob = role_user("alice"), role_user("bob")
+    first = _notify(db, "first", target_role="engineer")
+    _notify(db, "second", target_role="engineer")
+    service = NotificationService(db)
+
+    assert service.mark_as_read([first.id], alice) == 1
+    assert service.mark_as_read([first.id], alice) == 0  # already read
+    assert _titles(db, alice) == (["first", "second"], 2, 1)
+    assert _titles(db, alice, unread_only=True) == (["second"], 1, 1)
+    assert _titles(db, bob) == (["first", "second"], 2, 2)
+
+    assert service.mark_all_as_read(bob) == 2
+    assert service.get_unread_count(bob) == 0
+    assert service.get_unread_count(alice) == 1
+
+
+def test_role_fan_out_is_one_statement_per_step(db, role_user):
+    owner = role_user("owner")
+    db.execute(insert(User), [
+        {"id": uuid.uuid4(), "username": f"s{i}", "email": f"s{i}@example.com", "hashed_password": "x"}
+        for i in range(500)
+    ])
+    students = [u.id for u in db.query(User).filter(User.username.like("s%"))]
+    db.execute(insert(UserAttribute), [
+        {"user_id": user_id, "attribute_type": "role", "attribute_value": "student"} for user_id in students
+    ])
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        _notify(db, "class starts", target_role="student")
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    # Notification insert, inbox fan-out, missing counters, counter update
+    assert len(statements) == 4
+    assert db.query(NotificationCounter).filter(NotificationCounter.unread == 1).count() == 500
+    assert _titles(db, owner)[1] == 0
+
+
+def test_delete_old_notifications_recounts(db, role_user):
+    user = role_user("user")
+    old = _notify(db, "old", user_id=user.id)
+    _notify(db, "new", user_id=user.id)
+    db.query(Notification).filter(Notification.id == old.id).update(
+        {"created_at": datetime.utcnow() - timedelta(days=60)}
+    )
+
+    service = NotificationService(db)
+    assert service.delete_old_notifications(days=30) == 1
+    assert _titles(db, user) == (["new"], 1, 1)
+
+    # Maintained counters match a full recount
+    before = {(c.user_id, c.unread, c.total) for c in db.query(NotificationCounter)}
+    service.recount()
+    db.expire_all()
+    assert {(c.user_id, c.unread, c.total) for c in db.query(NotificationCounter)} == before
+
+
+def test_new_role_assignment_and_participation_receive_recent_notifications(db, role_user):
+    owner, late = role_user("owner"), role_user("late", role="student")
+    range_obj = Range(name="r", created_by=owner.id)
+    training = TrainingEvent(name="e", created_by_id=owner.id, start_datetime=datetime(2026, 1, 1))
+    db.add_all([range_obj, training])
+    db.flush()
+    _notify(db, "admins", target_role="admin")
+    _notify(db, "range", resource_type="range", resource_id=range_obj.id)
+    _notify(db, "event", resource_type="event", resource_id=training.id)
+    stale = _notify(db, "stale admins", target_role="admin")
+    db.query(Notification).filter(Notification.id == stale.id).update(
+        {"created_at": datetime.utcnow() - timedelta(days=60)}
+    )
+    db.commit()
+    assert _titles(db, late) == ([], 0, 0)
+
+    # Granted in one transaction, delivered before it commits
+    db.add(UserAttribute(user_id=late.id, attribute_type="role", attribute_value="admin"))
+    range_obj.assigned_to_user_id = late.id
+    db.add(EventParticipant(event_id=training.id, user_id=late.id, role="student"))
+    db.commit()
+
+    assert _titles(db, late) == (["admins", "event", "range"], 3, 3)
+    # Already-delivered entries are not duplicated by a later grant
+    db.add(UserAttribute(user_id=owner.id, attribute_type="role", attribute_value="admin"))
+    db.commit()
+    assert _titles(db, owner) == (["admins", "range"], 2, 2)
@@ -0,0 +1,136 @@
+# backend/tests/unit/test_notification_push.py
+"""Tests for pushing notifications to their recipients' WebSocket connections."""
+import json
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from cyroid.models.notification import NotificationType
+from cyroid.models.user import User, UserAttribute
+from cyroid.services.event_broadcaster import NOTIFICATIONS_CHANNEL, ConnectionManager
+from cyroid.services.notification_service import NotificationService
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def send_text(self, text):
+        self.received.append((time.perf_counter(), json.loads(text)))
+
+
+class BrokenWebSocket:
+    async def send_text(self, text):
+        raise RuntimeError("connection reset")
+
+
+def _users(db, count, role):
+    rows = [{"id": uuid.uuid4(), "username": f"{role}{i}", "email": f"{role}{i}@example.com", "hashed_password": "x"}
+            for i in range(count)]
+    db.execute(insert(User), rows)
+    db.execute(insert(UserAttribute), [
+        {"user_id": row["id"], "attribute_type": "role", "attribute_value": role} for row in rows
+    ])
+    return [str(row["id"]) for row in rows]
+
+
+async def _connect(manager, user_ids, per_user=1):
+    sockets = {}
+    for user_id in user_ids:
+        for n in range(per_user):
+            connection_id = f"{user_id}:{n}"
+            sockets[connection_id] = FakeWebSocket()
+            await manager.connect(connection_id, sockets[connection_id])
+            manager.register_user(connection_id, user_id)
+    return sockets
+
+
+def test_push_is_published_on_commit_only(db, fake_redis):
+    students = _users(db, 3, "student")
+    db.commit()
+    service = NotificationService(db, redis_client=fake_redis)
+
+    service.create_notification(NotificationType.INFO, "rolled back", "m", target_role="student")
+    db.rollback()
+    db.commit()
+    assert fake_redis.published == []
+
+    service.create_notification(NotificationType.INFO, "quiet", "m", target_role="student", broadcast=False)
+    notification = service.create_notification(NotificationType.INFO, "class starts", "m", target_role="student")
+    assert fake_redis.published == []
+    db.commit()
+
+    [(channel, message)] = fake_redis.published
+    push = json.loads(message)
+    assert channel == NOTIFICATIONS_CHANNEL
+    assert sorted(push["recipients"]) == sorted(students)
+    assert push["notification"]["id"] == str(notification.id)
+    assert push["notification"]["title"] == "class starts"
+
+
+@pytest.mark.asyncio
+async def test_push_reaches_only_targeted_connections(db, fake_redis):
+    students = _users(db, 2, "student")
+    others = _users(db, 2, "engineer")
+    NotificationService(db, redis_client=fake_redis).create_notification(
+        NotificationType.INFO, "exam", "m", target_role="student"
+    )
+    db.commit()
+
+    manager = ConnectionManager()
+    sockets = await _connect(manager, students + others, per_user=2)
+    await manager.connect("broken", BrokenWebSocket())
+    manager.register_user("broken", students[0])
+    await manager.disconnect(f"{students[1]}:1")
+
+    [(channel, message)] = fake_redis.published
+    await manager._route_message(channel, message)
+
+    got = {cid for cid, ws in sockets.items() if ws.received}
+    assert got == {f"{students[0]}:0", f"{students[0]}:1", f"{students[1]}:0"}
+    payload = sockets[f"{students[0]}:0"].received[0][1]
+    assert payload["type"] == "notification" and payload["title"] == "exam"
+    assert manager.push_stats()["deliveries"] == 3
+    assert manager.push_stats()["failures"] == 1
+
+    # Disconnecting drops the user once their last connection is gone
+    for connection_id in [f"{students[0]}:0", f"{students[0]}:1", "broken"]:
+        await manager.disconnect(connection_id)
+    assert students[0] not in manager._user_connections
+    assert await manager.route_notification("not json") == 0
+
+
+@pytest.mark.asyncio
+async def test_fan_out_cost_with_many_users(db, fake_redis):
+    """One push to 5,000 of 20,000 connected users: latency and cost per delivery."""
+    students = _users(db, 5000, "student")
+    others = [str(uuid.uuid4()) for _ in range(15000)]
+
+    started = time.perf_counter()
+    NotificationService(db, redis_client=fake_redis).create_notification(
+        NotificationType.INFO, "class starts", "m", target_role="student"
+    )
+    db.commit()
+    publish_ms = (time.perf_counter() - started) * 1000
+
+    manager = ConnectionManager()
+    sockets = await _connect(manager, students + others)
+    [(channel, message)] = fake_redis.published
+
+    started = time.perf_counter()
+    await manager._route_message(channel, message)
+    latencies = sorted((ws.received[0][0] - started) * 1000 for ws in sockets.values() if ws.received)
+    fan_out_ms = (time.perf_counter() - started) * 1000
+
+    assert len(latencies) == 5000
+    assert manager.push_stats()["deliveries"] == 5000
+    assert not any(sockets[f"{user_id}:0"].received for user_id in others[:100])
+
+    p99_ms = latencies[int(len(latencies) * 0.99)]
+    # Generous bounds: creating is one insert-select, fan-out is a dict lookup
+    # and one send per recipient connection
+    assert publish_ms < 2000
+    assert fan_out_ms < 2000
+    assert p99_ms <= fan_out_ms
@@ -0,0 +1,88 @@
+# backend/tests/unit/test_principal_cache.py
+"""Tests for the shared authenticated-user cache against an in-memory database."""
+import pytest
+from sqlalchemy import event
+
+from cyroid.models.user import User, UserAttribute
+from cyroid.services.principal_cache import PrincipalCache
+
+
+@pytest.fixture
+def user_id(db, make_user):
+    user = make_user("alice", roles=["admin"], tags=["blue-team"], is_active=True, is_approved=True,
+                     hashed_password="hash")
+    db.commit()
+    return user.id
+
+
+@pytest.fixture
+def statements(db_engine):
+    executed = []
+    event.listen(db_engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: executed.append(stmt))
+    return executed
+
+
+def test_hit_needs_no_query(session_factory, user_id, fake_redis, statements):
+    cache = PrincipalCache(redis_client=fake_redis, ttl=30, max_entries=10)
+    cache.load_user(session_factory(), user_id)
+    statements.clear()
+
+    db = session_factory()
+    user = cache.load_user(db, user_id)
+
+    assert statements == []
+    assert user.username == "alice"
+    assert user.is_admin and user.tags == ["blue-team"]
+    assert user in db
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cached_user_can_be_modified(session_factory, user_id, fake_redis):
+    cache = PrincipalCache(redis_client=fake_redis, ttl=30, max_entries=10)
+    cache.load_user(session_factory(), user_id)
+
+    db = session_factory()
+    user = cache.load_user(db, user_id)
+    assert user.hashed_password == "hash"  # not cached; loaded on access
+    user.password_reset_required = True
+    db.commit()
+
+    assert session_factory().get(User, user_id).password_reset_required is True
+    assert "hash" not in fake_redis.get(f"principal:{user_id}")
+
+
+def test_invalidate_reloads_changes(session_factory, user_id, fake_redis):
+    cache = PrincipalCache(redis_client=fake_redis, ttl=30, max_entries=10)
+    cache.load_user(session_factory(), user_id)
+
+    db = session_factory()
+    db.query(UserAttribute).filter(UserAttribute.attribute_value == "admin").delete()
+    db.commit()
+    cache.invalidate(user_id)
+
+    assert cache.load_user(session_factory(), user_id).is_admin is False
+
+
+def test_entries_are_capped(session_factory, fake_redis):
+    db = session_factory()
+    users = [User(username=f"u{i}", email=f"u{i}@example.com", hashed_password="x") for i in range(3)]
+    db.add_all(users)
+    db.commit()
+
+    cache = PrincipalCache(redis_client=fake_redis, ttl=30, max_entries=2)
+    for user in users:
+        cache.load_user(session_factory(), user.id)
+
+    assert cache.stats()["entries"] == 2
+    assert fake_redis.get(f"principal:{users[0].id}") is None
+
+
+def test_redis_failure_falls_back_to_database(session_factory, user_id):
+    class BrokenRedis:
+        def __getattr__(self, name):
+            raise ConnectionError("redis down")
+
+    cache = PrincipalCache(redis_client=BrokenRedis(), ttl=30, max_entries=10)
+    assert cache.load_user(session_factory(), user_id).username == "alice"
@@ -0,0 +1,151 @@
+# backend/tests/unit/test_range_reset.py
+"""Unit tests for in-place range reset using mocks."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from cyroid.models.range import RangeStatus
+from cyroid.models.vm import VMStatus
+
+
+def _vm(hostname, container_id):
+    return SimpleNamespace(
+        id=uuid4(), hostname=hostname, container_id=container_id,
+        status=VMStatus.RUNNING, error_message=None,
+    )
+
+
+@pytest.fixture
+def deployed_range():
+    range_obj = SimpleNamespace(
+        id=uuid4(), name="lab", status=RangeStatus.RUNNING,
+        dind_container_id="dind-1", dind_docker_url="tcp://172.30.1.5:2375",
+        error_message=None, started_at=None,
+    )
+    vms = [_vm("web", "c-web"), _vm("db", "c-db")]
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = range_obj
+    db.query.return_value.filter.return_value.all.return_value = vms
+    return SimpleNamespace(range=range_obj, vms=vms, db=db)
+
+
+def _service(dind_status="running"):
+    from cyroid.services.range_deployment_service import RangeDeploymentService
+
+    docker_service = MagicMock()
+    docker_service.remove_range_container_dind = AsyncMock(return_value=True)
+    dind_service = MagicMock()
+    dind_service.get_container_info = AsyncMock(
+        return_value={"status": dind_status} if dind_status else None
+    )
+    dind_service.create_range_container = AsyncMock()
+    return RangeDeploymentService(docker_service=docker_service, dind_service=dind_service)
+
+
+@pytest.mark.asyncio
+@patch("cyroid.services.range_deployment_service.EventService")
+async def test_reset_recreates_only_vm_containers(mock_events, deployed_range):
+    service = _service()
+
+    async def recreate(db, range_obj, vm, docker_url, event_service):
+        vm.container_id = f"new-{vm.hostname}"
+        vm.status = VMStatus.RUNNING
+        return True
+
+    with patch.object(service, "_create_vm_container", side_effect=recreate) as create_vm:
+        result = await service.reset_range(deployed_range.db, deployed_range.range.id)
+
+    removed = [c.kwargs["container_id"] for c in service.docker_service.remove_range_container_dind.call_args_list]
+    assert removed == ["c-web", "c-db"]
+    assert create_vm.call_count == 2
+    assert [vm.container_id for vm in deployed_range.vms] == ["new-web", "new-db"]
+
+    # The DinD container, its networks and images are left alone
+    service.dind_service.create_range_container.assert_not_called()
+    service.dind_service.setup_vnc_port_forwarding.assert_not_called()
+    service.docker_service.create_range_network_dind.assert_not_called()
+    service.docker_service.pull_image_to_dind.assert_not_called()
+
+    assert deployed_range.range.status == RangeStatus.RUNNING
+    assert result["vms_reset"] == 2
+    assert result["failed_vms"] == []
+
+
+@pytest.mark.asyncio
+@patch("cyroid.services.range_deployment_service.EventService")
+async def test_reset_reports_vm_failures(mock_events, deployed_range):
+    service = _service()
+
+    with patch.object(service, "_create_vm_container", side_effect=[True, RuntimeError("boom")]):
+        result = await service.reset_range(deployed_range.db, deployed_range.range.id)
+
+    assert result["failed_vms"] == ["db"]
+    assert deployed_range.vms[1].status == VMStatus.ERROR
+    assert deployed_range.range.status == RangeStatus.RUNNING
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dind_status", [None, "exited"])
+async def test_reset_requires_running_dind(dind_status, deployed_range):
+    service = _service(dind_status)
+
+    with pytest.raises(ValueError):
+        await service.reset_range(deployed_range.db, deployed_range.range.id)
+
+    service.docker_service.remove_range_container_dind.assert_not_called()
+
+
+def _blueprint_config(**vm_overrides):
+    from cyroid.schemas.blueprint import BlueprintConfig
+
+    vm = {"hostname": "web", "ip_address": "10.0.1.10", "network_name": "lan",
+          "base_image_id": str(uuid4()), "cpu": 2, "ram_mb": 2048, "disk_gb": 20}
+    vm.update(vm_overrides)
+    return BlueprintConfig.model_validate({
+        "networks": [{"name": "lan", "subnet": "10.0.1.0/24", "gateway": "10.0.1.1",
+                      "is_isolated": True, "internet_enabled": True}],
+        "vms": [vm],
+    })
+
+
+def _deployed_db(range_obj, config):
+    from cyroid.models import VM, Network
+
+    net_config, vm_config = config.networks[0], config.vms[0]
+    network = SimpleNamespace(
+        id=uuid4(), name=net_config.name, subnet=net_config.subnet, gateway=net_config.gateway,
+        is_isolated=net_config.is_isolated, internet_enabled=net_config.internet_enabled,
+        dhcp_enabled=net_config.dhcp_enabled,
+    )
+    vm = SimpleNamespace(
+        hostname=vm_config.hostname, network_id=network.id, ip_address=vm_config.ip_address,
+        base_image_id=vm_config.base_image_id, golden_image_id=None, snapshot_id=None,
+        cpu=vm_config.cpu, ram_mb=vm_config.ram_mb, disk_gb=vm_config.disk_gb,
+        position_x=vm_config.position_x, position_y=vm_config.position_y,
+    )
+    rows = {Network: [network], VM: [vm]}
+    db = MagicMock()
+    db.query.side_effect = lambda model: MagicMock(**{"filter.return_value.all.return_value": rows[model]})
+    return db, network, vm
+
+
+@pytest.mark.parametrize("change", [
+    None,
+    ("vm", "disk_gb", 40),
+    ("network", "gateway", "10.0.1.254"),
+    ("network", "is_isolated", False),
+    ("network", "internet_enabled", False),
+    ("network", "dhcp_enabled", True),
+])
+def test_reset_in_place_only_when_every_recreated_field_matches(deployed_range, change):
+    from cyroid.api.instances import _can_reset_in_place
+
+    config = _blueprint_config()
+    db, network, vm = _deployed_db(deployed_range.range, config)
+    if change:
+        target, field, value = change
+        setattr(network if target == "network" else vm, field, value)
+
+    assert _can_reset_in_place(db, deployed_range.range, config, "10.0", 0) is (change is None)
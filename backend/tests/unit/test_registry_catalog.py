@@ -0,0 +1,170 @@
+# backend/tests/unit/test_registry_catalog.py
+"""Tests for the paginated, concurrent and cached registry catalog crawl."""
+import asyncio
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cyroid.services.registry_catalog import RegistryCatalog
+from cyroid.services.registry_service import RegistryService
+
+
+class FakeRegistryAPI:
+    """Registry v2 API over httpx.MockTransport, paginating like the real registry."""
+
+    def __init__(self, repos, tags=("latest",), layers=None, latency=0.0):
+        self.repos = sorted(repos)
+        self.tags = list(tags)
+        self.layers = layers or (lambda repo: [(f"sha256:{repo}-layer", 1000)])
+        self.latency = latency
+        self.broken = set()  # Repositories whose tag list is not JSON
+        self.requests = Counter()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _digest(self, repo, tag):
+        return f"sha256:{repo}-{tag}"
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return self._route(request)
+        finally:
+            self.in_flight -= 1
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        params = request.url.params
+        if path == "/v2/":
+            self.requests["health"] += 1
+            return httpx.Response(200, json={})
+        if path == "/v2/_catalog":
+            self.requests["catalog"] += 1
+            n = int(params["n"])
+            start = self.repos.index(params["last"]) + 1 if "last" in params else 0
+            page = self.repos[start:start + n]
+            headers = {}
+            if start + n < len(self.repos):
+                headers["Link"] = f'</v2/_catalog?last={page[-1]}&n={n}>; rel="next"'
+            return httpx.Response(200, json={"repositories": page}, headers=headers)
+        if path.endswith("/tags/list"):
+            repo = path[len("/v2/"):-len("/tags/list")]
+            self.requests["tags"] += 1
+            if repo in self.broken:
+                return httpx.Response(200, content=b"<html>proxy error</html>")
+            return httpx.Response(200, json={"name": repo, "tags": self.tags})
+        repo, _, ref = path[len("/v2/"):].rpartition("/manifests/")
+        if request.method == "HEAD":
+            self.requests["head"] += 1
+            return httpx.Response(200, headers={"Docker-Content-Digest": self._digest(repo, ref)})
+        self.requests["manifest"] += 1
+        layers = [{"digest": digest, "size": size} for digest, size in self.layers(repo)]
+        return httpx.Response(200, json={
+            "schemaVersion": 2,
+            "config": {"digest": f"sha256:{repo}-config", "size": 10},
+            "layers": layers,
+        })
+
+
+def _registry(api: FakeRegistryAPI, redis_client, **catalog_kwargs) -> RegistryService:
+    registry = RegistryService()
+    registry._redis = redis_client
+    registry.catalog = RegistryCatalog(registry, **catalog_kwargs)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle))
+
+    async def get_client():
+        return client
+
+    registry._get_http_client = get_client
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_crawl_follows_pagination_with_bounded_concurrency(fake_redis):
+    api = FakeRegistryAPI([f"repo{n:04d}" for n in range(2000)], latency=0.001)
+    registry = _registry(api, fake_redis, concurrency=32, page_size=500, max_age=60)
+
+    images = await registry.list_images()
+
+    assert len(images) == 2000 and images[0] == {"name": "repo0000", "tags": ["latest"], "size_bytes": 1010}
+    assert api.requests["catalog"] == 4
+    assert 1 < api.peak <= 32
+
+    # Served from the cached crawl: no crawl requests, well under a second
+    def crawl_requests():
+        return sum(count for kind, count in api.requests.items() if kind != "health")
+
+    before = crawl_requests()
+    started = time.monotonic()
+    for _ in range(10):
+        assert len(await registry.list_images()) == 2000
+    stats = await registry.get_stats()
+    assert time.monotonic() - started < 1.0
+    assert crawl_requests() == before
+    assert (stats["image_count"], stats["tag_count"]) == (2000, 2000)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_crawl_and_invalidation_recrawls(fake_redis):
+    api = FakeRegistryAPI(["cyroid/kali", "cyroid/ubuntu"], tags=("latest", "v1"),
+                          layers=lambda repo: [("sha256:shared-base", 5000), (f"sha256:{repo}-top", 100)],
+                          latency=0.01)
+    registry = _registry(api, fake_redis, concurrency=4, page_size=100, max_age=60)
+
+    first, second = await asyncio.gather(registry.list_images(), registry.list_images())
+    assert first == second and api.requests["catalog"] == 1
+    stats = await registry.get_stats()
+    # Shared base layer and per-repo config/top layers counted once each
+    assert stats["size_bytes"] == 5000 + 2 * (100 + 10)
+
+    # A push or delete invalidates the snapshot; manifests are not re-fetched by digest
+    manifests = api.requests["manifest"]
+    registry.catalog.invalidate()
+    await registry.list_images()
+    assert api.requests["catalog"] == 2
+    assert api.requests["manifest"] == manifests
+
+
+@pytest.mark.asyncio
+async def test_unreachable_registry_serves_last_snapshot(fake_redis):
+    api = FakeRegistryAPI(["cyroid/kali"])
+    registry = _registry(api, fake_redis, concurrency=4, page_size=100, max_age=0)
+    assert [image["name"] for image in await registry.list_images()] == ["cyroid/kali"]
+
+    async def unreachable():
+        raise httpx.ConnectError("registry down")
+
+    with patch.object(registry.catalog, "_crawl", side_effect=unreachable):
+        assert [image["name"] for image in await registry.list_images()] == ["cyroid/kali"]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers(fake_redis):
+    api = FakeRegistryAPI(["cyroid/kali"])
+    pushing, listing = _registry(api, fake_redis, max_age=60), _registry(api, fake_redis, max_age=60)
+    await listing.list_images()
+    await pushing.list_images()
+    assert api.requests["catalog"] == 2
+
+    # A push on one worker makes the other worker's next listing crawl again
+    pushing.catalog.invalidate()
+    api.repos.append("cyroid/new")
+    assert [image["name"] for image in await listing.list_images()] == ["cyroid/kali", "cyroid/new"]
+    assert api.requests["catalog"] == 3
+
+
+@pytest.mark.asyncio
+async def test_malformed_tag_list_is_counted_not_raised(fake_redis):
+    api = FakeRegistryAPI(["cyroid/broken", "cyroid/kali"])
+    api.broken.add("cyroid/broken")
+    registry = _registry(api, fake_redis, concurrency=4, page_size=100, max_age=60)
+
+    images = await registry.list_images()
+
+    assert [(image["name"], image["tags"]) for image in images] == [("cyroid/broken", []), ("cyroid/kali", ["latest"])]
+    assert registry.catalog.snapshot.errors == 1
@@ -0,0 +1,219 @@
+# backend/tests/unit/test_registry_retention.py
+"""Tests for registry retention: marking, grace period, window, shared digests and GC."""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cyroid.models.base_image import BaseImage
+from cyroid.services import registry_retention_service
+from cyroid.services.registry_retention_service import (
+    GC_DIRTY_KEY,
+    GC_RUNNING_KEY,
+    PUSH_LEASES_KEY,
+    REPORT_KEY,
+    RegistryRetentionService,
+    in_window,
+    normalize_tag,
+    parse_window,
+    registry_push_lease,
+)
+
+NIGHT = datetime(2026, 6, 30, 3, tzinfo=timezone.utc)
+NOON = datetime(2026, 6, 30, 12, tzinfo=timezone.utc)
+
+
+class FakeRegistry:
+    """Registry API stand-in: tags map to digests per repository."""
+
+    def __init__(self, tags):
+        self.tags = dict(tags)
+        self.deleted = []
+        self.container = MagicMock(id="registry")
+        sizes = iter([b"3000\t/var/lib/registry\n", b"1000\t/var/lib/registry\n"])
+        self.container.exec_run.side_effect = lambda cmd: (0, next(sizes))
+        self.gc_seconds = 0
+        self.gc_done = threading.Event()
+        self.docker = MagicMock()
+        self.docker.containers.list.return_value = [self.container]
+        self.docker.api.exec_create.return_value = {"Id": "gc-exec"}
+        self.docker.api.exec_start.side_effect = self._exec_start
+        self.docker.api.exec_inspect.side_effect = lambda exec_id: {
+            "Running": not self.gc_done.is_set(), "ExitCode": 0 if self.gc_done.is_set() else None,
+        }
+
+    def _exec_start(self, exec_id):
+        time.sleep(self.gc_seconds)
+        self.gc_done.set()
+        return b"ok"
+
+    async def list_images(self, refresh=False):
+        repos = {}
+        for tag in self.tags:
+            name, version = tag.rsplit(":", 1)
+            repos.setdefault(name, []).append(version)
+        return [{"name": name, "tags": tags} for name, tags in repos.items()]
+
+    async def get_manifest_digest(self, tag):
+        return self.tags.get(tag)
+
+    async def delete_image(self, tag):
+        repo = tag.rsplit(":", 1)[0]
+        digest = self.tags[tag]
+        for other in [t for t, d in self.tags.items() if d == digest and t.rsplit(":", 1)[0] == repo]:
+            del self.tags[other]
+        self.deleted.append(tag)
+        return True
+
+    def _get_docker_client(self):
+        return self.docker
+
+
+@pytest.fixture
+def session_factory(session_factory, db):
+    """The shared session factory, with one Library image referencing cyroid/kali:latest."""
+    db.add(BaseImage(name="kali", image_type="container", os_type="linux", vm_type="container",
+                     docker_image_tag="cyroid/kali:latest"))
+    db.commit()
+    return session_factory
+
+
+def _service(session_factory, fake_redis, registry, **kwargs):
+    return RegistryRetentionService(
+        session_factory=session_factory, redis_client=fake_redis, registry=registry,
+        retention_days=7, window="02:00-05:00", **kwargs,
+    )
+
+
+def test_tag_and_window_parsing():
+    assert normalize_tag("nginx") == "nginx:latest"
+    assert normalize_tag("ghcr.io/jongodb/cyroid-dind:latest") == "jongodb/cyroid-dind:latest"
+    assert normalize_tag("localhost:5000/cyroid/kali:v2") == "cyroid/kali:v2"
+    window = parse_window("22:00-04:00")
+    assert in_window(window, NIGHT) and not in_window(window, NOON)
+    assert parse_window("") is None and in_window(None, NOON)
+
+
+@pytest.mark.asyncio
+async def test_unreferenced_tags_wait_out_grace_period_and_window(session_factory, fake_redis):
+    registry = FakeRegistry({
+        "cyroid/kali:latest": "sha256:a",
+        "cyroid-snapshot:dc01": "sha256:b",
+        "2stacks/vyos:1.2.0-rc11": "sha256:c",
+    })
+    service = _service(session_factory, fake_redis, registry)
+
+    first = await service.run(now=NIGHT - timedelta(days=8))
+    assert (first["referenced"], first["pending"], first["deleted"]) == (2, 1, [])
+
+    # Expired, but outside the maintenance window: nothing deleted yet
+    midday = await service.run(now=NOON)
+    assert midday["deleted"] == [] and midday["gc_skipped_reason"] == "outside maintenance window"
+
+    night = await service.run(now=NIGHT)
+    assert night["deleted"] == ["cyroid-snapshot:dc01"]
+    assert registry.deleted == ["cyroid-snapshot:dc01"]
+    assert night["gc_ran"] and night["bytes_reclaimed"] == 2000 * 1024
+    gc_cmd = registry.docker.api.exec_create.call_args.args[1]
+    assert gc_cmd[:3] == ["registry", "garbage-collect", "--delete-untagged"]
+    assert json.loads(fake_redis.get(REPORT_KEY))["deleted"] == ["cyroid-snapshot:dc01"]
+    assert not fake_redis.exists(GC_RUNNING_KEY)
+
+
+@pytest.mark.asyncio
+async def test_shared_digest_keep_globs_and_dry_run(session_factory, fake_redis):
+    registry = FakeRegistry({
+        "cyroid/kali:latest": "sha256:a",
+        "cyroid/kali:old": "sha256:a",  # Same manifest as a Library tag
+        "mirror/tool:1": "sha256:m",
+        "scratch/tmp:1": "sha256:s",
+    })
+    service = _service(session_factory, fake_redis, registry, keep="mirror/*")
+    await service.run(now=NIGHT - timedelta(days=8))
+
+    dry = await service.run(now=NIGHT, dry_run=True)
+    assert dry["deleted"] == ["scratch/tmp:1"] and registry.deleted == []
+    assert dry["kept_shared"] == ["cyroid/kali:old"] and not dry["gc_ran"]
+
+    report = await service.run(now=NIGHT)
+    assert registry.deleted == ["scratch/tmp:1"]
+    assert "cyroid/kali:latest" in registry.tags and "mirror/tool:1" in registry.tags
+    assert report["gc_ran"]
+
+
+@pytest.mark.asyncio
+async def test_gc_waits_for_pushes_and_manual_deletes(session_factory, fake_redis):
+    registry = FakeRegistry({"cyroid/kali:latest": "sha256:a"})
+    service = _service(session_factory, fake_redis, registry)
+
+    quiet = await service.run(now=NIGHT)
+    assert not quiet["gc_ran"] and quiet["gc_skipped_reason"] == "nothing deleted"
+
+    # A manifest deleted through the API leaves blobs for the next GC, unless a push is uploading
+    fake_redis.set(GC_DIRTY_KEY, "1")
+    with registry_push_lease(fake_redis, ttl=60):
+        busy = await service.run(now=NIGHT)
+    assert not busy["gc_ran"] and busy["gc_skipped_reason"] == "push in progress"
+    assert fake_redis.zcard(PUSH_LEASES_KEY) == 0
+
+    done = await service.run(now=NIGHT)
+    assert done["gc_ran"] and not fake_redis.exists(GC_DIRTY_KEY)
+
+
+def test_push_lease_refused_while_gc_runs(fake_redis):
+    fake_redis.set(GC_RUNNING_KEY, "1")
+    with pytest.raises(TimeoutError):
+        with registry_push_lease(fake_redis, ttl=60, max_wait=0.01):
+            pass
+    assert fake_redis.zcard(PUSH_LEASES_KEY) == 0
+
+
+def test_api_push_holds_a_push_lease(fake_redis):
+    from cyroid.api import registry as registry_api
+    from cyroid.services.registry_service import RegistryService
+
+    registry = RegistryService()
+    registry._redis = fake_redis
+    registry.image_exists = AsyncMock(return_value=True)
+    leases_during_push = []
+
+    def push(tag, stream, decode):
+        leases_during_push.append(fake_redis.zcard(PUSH_LEASES_KEY))
+        return iter([{"id": "layer", "status": "Pushed"}])
+
+    docker_client = MagicMock()
+    docker_client.images.push.side_effect = push
+    registry_api._active_registry_pushes["op"] = {}
+    with patch.object(registry_api, "get_registry_service", return_value=registry), \
+            patch.object(registry_api.docker, "from_env", return_value=docker_client):
+        registry_api._run_registry_push("op", "cyroid/kali:latest")
+
+    assert registry_api._active_registry_pushes.pop("op")["status"] == "completed"
+    assert leases_during_push == [1] and fake_redis.zcard(PUSH_LEASES_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_gc_flag_outlives_a_pass_that_stopped_waiting(session_factory, fake_redis, monkeypatch):
+    from cyroid.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "registry_gc_timeout", 1)
+    monkeypatch.setattr(registry_retention_service, "GC_EXEC_POLL", 0.05)
+    registry = FakeRegistry({"cyroid/kali:latest": "sha256:a"})
+    registry.gc_seconds = 1.5
+    service = _service(session_factory, fake_redis, registry)
+    fake_redis.set(GC_DIRTY_KEY, "1")
+
+    timed_out = await service.run(now=NIGHT)
+    assert timed_out["error"] and not timed_out["gc_ran"]
+    # The exec is still deleting blobs: pushes keep waiting and the next pass does not start another
+    assert fake_redis.exists(GC_RUNNING_KEY)
+    again = await service.run(now=NIGHT)
+    assert again["gc_skipped_reason"] == "garbage collection still running"
+    assert registry.docker.api.exec_create.call_count == 1
+
+    await asyncio.wait_for(service._gc_watch, timeout=5)
+    assert registry.gc_done.is_set() and not fake_redis.exists(GC_RUNNING_KEY)
@@ -0,0 +1,146 @@
+# backend/tests/unit/test_resource_ledger.py
+"""Tests for the deployment resource reservation ledger."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cyroid.models.network import Network
+from cyroid.models.range import Range, RangeStatus
+from cyroid.models.resource_reservation import ResourceReservation
+from cyroid.models.user import User
+from cyroid.models.vm import VM
+from cyroid.services.resource_ledger import HostCapacity, InsufficientResourcesError, ResourceLedger
+
+
+@pytest.fixture(autouse=True)
+def owner(db, make_user):
+    user = make_user("owner")
+    db.commit()
+    return user
+
+
+def _range(db, name, vms, status=RangeStatus.DRAFT):
+    """A range with ``vms`` VMs of 10 GB disk, 2048 MB RAM and 2 vCPUs each."""
+    owner = db.query(User).one()
+    range_obj = Range(name=name, created_by=owner.id, status=status)
+    db.add(range_obj)
+    db.flush()
+    network = Network(range_id=range_obj.id, name="lan", subnet="10.0.1.0/24", gateway="10.0.1.1")
+    db.add(network)
+    db.flush()
+    for n in range(vms):
+        db.add(VM(range_id=range_obj.id, network_id=network.id, hostname=f"vm{n}", ip_address=f"10.0.1.{10 + n}",
+                  cpu=2, ram_mb=2048, disk_gb=10))
+    db.commit()
+    return range_obj.id
+
+
+def test_concurrent_claims_share_free_disk(db):
+    capacity = HostCapacity(disk_gb=100)
+    ledger = ResourceLedger(db)
+    ranges = [_range(db, f"lab {i}", vms=3) for i in range(4)]  # 36 GB each with buffer
+
+    ledger.claim(ranges[0], capacity)
+    ledger.claim(ranges[1], capacity)
+    with pytest.raises(InsufficientResourcesError) as exc:
+        ledger.claim(ranges[2], capacity)
+    assert exc.value.shortfalls == [{"resource": "disk_gb", "requested": 36.0, "available": 28.0}]
+    assert db.query(ResourceReservation).count() == 2
+
+    # Claiming again is a no-op for a range that already holds a reservation
+    ledger.claim(ranges[0], capacity)
+    assert ledger.reserved().disk_gb == 72.0
+
+    # Completion or failure releases the reservation for the next deployment
+    assert ledger.release(ranges[0])
+    assert not ledger.release(ranges[0])
+    ledger.claim(ranges[2], capacity)
+    assert ledger.reserved().disk_gb == 72.0
+
+
+def test_running_ranges_count_against_ram_vcpu_and_dind(db):
+    _range(db, "running", vms=4, status=RangeStatus.RUNNING)  # 8192 MB, 8 vCPUs, 1 DinD
+    _range(db, "stopped", vms=4, status=RangeStatus.STOPPED)
+    new = _range(db, "new", vms=2)
+    ledger = ResourceLedger(db)
+
+    with pytest.raises(InsufficientResourcesError) as exc:
+        ledger.claim(new, HostCapacity(ram_mb=10000, vcpus=10, dind=1))
+    assert [s["resource"] for s in exc.value.shortfalls] == ["ram_mb", "vcpus", "dind"]
+
+    reservation = ledger.claim(new, HostCapacity(ram_mb=12288, vcpus=12, dind=2))
+    assert (reservation.ram_mb, reservation.vcpus, reservation.dind) == (4096, 4, 1)
+
+    snapshot = ledger.snapshot(HostCapacity(ram_mb=12288))
+    assert snapshot["committed"] == {"disk_gb": 0.0, "ram_mb": 8192, "vcpus": 8, "dind": 1}
+    assert snapshot["reserved"]["ram_mb"] == 4096
+    assert [r["range_name"] for r in snapshot["reservations"]] == ["new"]
+
+
+def test_expired_reservations_stop_counting(db):
+    capacity = HostCapacity(disk_gb=50)
+    crashed, waiting = _range(db, "crashed", vms=3), _range(db, "waiting", vms=3)
+    ledger = ResourceLedger(db)
+    ledger.claim(crashed, capacity)
+    with pytest.raises(InsufficientResourcesError):
+        ledger.claim(waiting, capacity)
+
+    db.get(ResourceReservation, crashed).expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+    assert ledger.reserved().disk_gb == 0
+    ledger.claim(waiting, capacity)
+    assert db.get(ResourceReservation, crashed) is None
+
+
+def test_failed_dispatch_releases_the_claim(db, owner):
+    from fastapi import HTTPException
+
+    from cyroid.api.ranges import deploy_range
+
+    range_id = _range(db, "lab", vms=2, status=RangeStatus.STOPPED)
+    validator = MagicMock()
+    validator.return_value.validate_range = AsyncMock(return_value=SimpleNamespace(valid=True))
+    with patch("cyroid.api.ranges.get_docker_service"), \
+            patch("cyroid.services.deployment_validator.DeploymentValidator", validator), \
+            patch("cyroid.services.resource_ledger.host_capacity", return_value=HostCapacity(disk_gb=100)), \
+            patch("cyroid.tasks.deployment.deploy_range_task.send", side_effect=ConnectionError("broker down")):
+        with pytest.raises(HTTPException) as exc:
+            deploy_range(range_id, db, owner)
+
+    assert exc.value.status_code == 503
+    assert db.query(ResourceReservation).count() == 0
+    assert db.get(Range, range_id).status == RangeStatus.STOPPED
+
+
+def test_reset_fallback_redeploy_holds_a_claim(db, session_factory):
+    from cyroid.tasks.deployment import reset_range_task
+
+    range_id = _range(db, "lab", vms=2, status=RangeStatus.ERROR)
+    held_during_deploy = []
+
+    async def deploy_range(session, rid):
+        held_during_deploy.append(session_factory().get(ResourceReservation, rid) is not None)
+
+    service = MagicMock()
+    service.reset_range = AsyncMock(side_effect=ValueError("DinD not running"))
+    service.destroy_range = AsyncMock()
+    service.deploy_range = AsyncMock(side_effect=deploy_range)
+    with patch("cyroid.tasks.deployment.get_session_local", return_value=session_factory), \
+            patch("cyroid.tasks.deployment.host_capacity", return_value=HostCapacity(disk_gb=100)), \
+            patch("cyroid.services.range_deployment_service.get_range_deployment_service", return_value=service):
+        reset_range_task.fn(str(range_id))
+
+        assert held_during_deploy == [True]
+        db.expire_all()
+        assert db.query(ResourceReservation).count() == 0
+
+        # A redeploy that does not fit is not started
+        service.deploy_range.reset_mock()
+        with patch("cyroid.tasks.deployment.host_capacity", return_value=HostCapacity(disk_gb=5)):
+            reset_range_task.fn(str(range_id))
+    service.deploy_range.assert_not_called()
+    db.expire_all()
+    assert db.get(Range, range_id).status == RangeStatus.ERROR
+    assert db.query(ResourceReservation).count() == 0
@@ -0,0 +1,115 @@
+# backend/tests/unit/test_traefik_route_service.py
+"""Tests for the coalescing Traefik VNC route writer."""
+import threading
+import uuid
+
+import yaml
+
+from cyroid.services.traefik_route_service import KASM_AUTH_MIDDLEWARE, STRIP_PREFIX_MIDDLEWARE, TraefikRouteService
+
+
+def _mappings(vms, port=6901):
+    return {
+        str(uuid.uuid4()): {"proxy_host": "172.30.0.5", "proxy_port": 15000 + n, "original_port": port}
+        for n in range(vms)
+    }
+
+
+def _config(service):
+    return yaml.safe_load(service.route_file.read_text())["http"]
+
+
+def test_burst_of_changes_is_one_reload(tmp_path):
+    service = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=60)
+    range_ids = [str(uuid.uuid4()) for _ in range(30)]
+    for range_id in range_ids:
+        assert service.generate_vnc_routes(range_id, _mappings(2)) == str(service.route_file)
+    assert not service.route_file.exists()
+
+    assert service.flush()
+    config = _config(service)
+    assert len(config["routers"]) == 120  # http + https per VM
+    assert len(config["services"]) == 60
+    # The compact route set shares its middlewares
+    assert set(config["middlewares"]) == {STRIP_PREFIX_MIDDLEWARE, KASM_AUTH_MIDDLEWARE}
+
+    stats = service.stats()
+    assert (stats["changes"], stats["flushes"], stats["reloads"], stats["reloads_total"]) == (30, 1, 1, 1)
+    assert (stats["ranges"], stats["routers"]) == (30, 120)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".vnc-routes.json", ".vnc-routes.lock", "vnc-routes.yml"]
+
+
+def test_unchanged_routes_do_not_reload(tmp_path):
+    service = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=60)
+    keep, drop = str(uuid.uuid4()), str(uuid.uuid4())
+    mappings = _mappings(1, port=8006)
+    service.generate_vnc_routes(keep, mappings)
+    service.generate_vnc_routes(drop, _mappings(1))
+    assert service.flush()
+
+    service.generate_vnc_routes(keep, mappings)
+    assert not service.flush()
+
+    assert service.remove_vnc_routes(drop)
+    assert service.routes_for_range(drop) is None
+    assert service.flush()
+    config = _config(service)
+    assert len(config["routers"]) == 2
+    assert set(config["middlewares"]) == {STRIP_PREFIX_MIDDLEWARE}
+    assert service.stats()["reloads"] == 2
+
+
+def test_processes_share_the_route_file(tmp_path):
+    api = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=60)
+    worker = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=60)
+    r1, r2 = str(uuid.uuid4()), str(uuid.uuid4())
+
+    worker.generate_vnc_routes(r1, _mappings(1))
+    worker.flush()
+    api.generate_vnc_routes(r2, _mappings(1))
+    api.flush()
+
+    assert len(_config(api)["services"]) == 2
+    assert api.routes_for_range(r1) is not None
+    assert worker.stats()["reloads_total"] == 2
+
+
+def test_per_range_files_are_adopted(tmp_path):
+    legacy = {"http": {
+        "routers": {"vnc-dind-old": {"rule": "PathPrefix(`/vnc/old`)", "service": "vnc-dind-old"}},
+        "services": {"vnc-dind-old": {"loadBalancer": {"servers": [{"url": "http://10.0.0.2:1"}]}}},
+        "middlewares": {},
+    }}
+    (tmp_path / "range-0badc0de.yml").write_text(yaml.dump(legacy))
+    service = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=60)
+
+    service.generate_vnc_routes(str(uuid.uuid4()), _mappings(1))
+    service.flush()
+
+    assert "vnc-dind-old" in _config(service)["routers"]
+    assert not (tmp_path / "range-0badc0de.yml").exists()
+    assert service.routes_for_range("0badc0de-0000")["routers"]
+
+
+def test_readers_never_see_a_partial_file(tmp_path):
+    service = TraefikRouteService(routes_dir=str(tmp_path), flush_delay=0.01)
+    service.generate_vnc_routes(str(uuid.uuid4()), _mappings(1))
+    service.flush()
+    done = threading.Event()
+    errors = []
+
+    def read():
+        while not done.is_set():
+            try:
+                assert _config(service)["routers"]
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for n in range(10):
+        service.generate_vnc_routes(str(uuid.uuid4()), _mappings(5))
+        service.flush()
+    done.set()
+    reader.join()
+    assert errors == []
@@ -0,0 +1,149 @@
+# backend/tests/unit/test_upload_ingest_service.py
+"""Tests for streaming upload ingest and selective archive extraction."""
+import asyncio
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from cyroid.services.upload_ingest_service import (
+    UploadIngestService,
+    copy_stream,
+    extract_iso_from_archive,
+    extract_largest_member,
+)
+
+
+def _make_tar(path, members, mode="w"):
+    with tarfile.open(path, mode) as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def test_copy_stream_reports_progress():
+    reports = []
+    src = io.BytesIO(b"x" * (3 * 1024 * 1024 + 10))
+    dest = io.BytesIO()
+
+    copied = copy_stream(src, dest, total=len(src.getvalue()), progress=lambda d, t: reports.append((d, t)))
+
+    assert copied == len(src.getvalue())
+    assert dest.getvalue() == src.getvalue()
+    assert reports[-1] == (copied, copied)
+
+
+@pytest.mark.parametrize("suffix,mode", [(".tar", "w"), (".tar.gz", "w:gz"), (".ova", "w")])
+def test_tar_extracts_only_largest_matching_member(tmp_path, suffix, mode):
+    archive = tmp_path / f"image{suffix}"
+    _make_tar(archive, {
+        "image.ovf": b"<ovf/>",
+        "disk-small.vmdk": b"s" * 10,
+        "sub/disk-main.vmdk": b"m" * 1000,
+    }, mode)
+
+    out = extract_largest_member(str(archive), (".vmdk",), str(tmp_path))
+
+    assert os.path.basename(out) == "disk-main.vmdk"
+    assert open(out, "rb").read() == b"m" * 1000
+    # Nothing else was written to the extraction directory
+    assert os.listdir(os.path.dirname(out)) == ["disk-main.vmdk"]
+
+
+def test_tar_member_paths_cannot_escape(tmp_path):
+    archive = tmp_path / "evil.tar"
+    _make_tar(archive, {"../../escape.iso": b"iso"})
+
+    out = extract_iso_from_archive(str(archive), str(tmp_path))
+
+    assert os.path.dirname(out).startswith(str(tmp_path))
+    assert not (tmp_path.parent.parent / "escape.iso").exists()
+
+
+def test_zip_extracts_iso(tmp_path):
+    archive = tmp_path / "windows.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("README.txt", "hello")
+        zf.writestr("media/win.iso", b"i" * 100)
+
+    out = extract_iso_from_archive(str(archive), str(tmp_path))
+
+    assert os.path.basename(out) == "win.iso"
+    assert os.path.getsize(out) == 100
+
+
+def test_zip_with_unsupported_method_falls_back_to_7z(tmp_path, monkeypatch):
+    """zipfile cannot read Deflate64 members; those archives go through 7z as before."""
+    archive = tmp_path / "windows.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("media/win.iso", b"i" * 100)
+
+    def unsupported(*args, **kwargs):
+        raise NotImplementedError("That compression method is not supported")
+
+    extract_with_7z = MagicMock(return_value="/extracted/win.iso")
+    monkeypatch.setattr(zipfile.ZipFile, "open", unsupported)
+    monkeypatch.setattr("cyroid.services.upload_ingest_service._extract_with_7z", extract_with_7z)
+
+    assert extract_iso_from_archive(str(archive), str(tmp_path)) == "/extracted/win.iso"
+    assert extract_with_7z.call_args.args[1] == (".iso",)
+
+
+def test_7z_stderr_cannot_block_extraction(tmp_path, monkeypatch):
+    """A failing 7z that writes far more than a pipe buffer to stderr still returns."""
+    fake_7z = tmp_path / "bin" / "7z"
+    fake_7z.parent.mkdir()
+    fake_7z.write_text(
+        "#!/bin/sh\n"
+        "if [ \"$1\" = l ]; then printf 'Path = disk.iso\\nSize = 10\\n\\n'; exit 0; fi\n"
+        "head -c 1000000 /dev/zero | tr '\\0' e >&2\n"
+        "echo 'ERROR: Data Error' >&2\n"
+        "exit 2\n"
+    )
+    fake_7z.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{fake_7z.parent}{os.pathsep}{os.environ['PATH']}")
+    archive = tmp_path / "bundle.7z"
+    archive.write_bytes(b"7z")
+
+    with pytest.raises(RuntimeError, match="Data Error"):
+        extract_iso_from_archive(str(archive), str(tmp_path))
+
+
+def test_single_file_compression(tmp_path):
+    archive = tmp_path / "distro.iso.gz"
+    with gzip.open(archive, "wb") as f:
+        f.write(b"d" * 5000)
+
+    out = extract_iso_from_archive(str(archive), str(tmp_path))
+
+    assert os.path.basename(out) == "distro.iso"
+    assert open(out, "rb").read() == b"d" * 5000
+
+
+def test_missing_member_raises_and_cleans_up(tmp_path):
+    archive = tmp_path / "empty.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("README.txt", "no iso here")
+
+    with pytest.raises(ValueError):
+        extract_iso_from_archive(str(archive), str(tmp_path))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["empty.zip"]
+
+
+def test_spool_streams_upload_to_disk(tmp_path):
+    upload = MagicMock()
+    upload.filename = "disk.qcow2"
+    upload.file = io.BytesIO(b"q" * (2 * 1024 * 1024))
+    upload.size = 2 * 1024 * 1024
+    dest = tmp_path / "spooled.qcow2"
+
+    size = asyncio.run(UploadIngestService().spool(upload, str(dest)))
+
+    assert size == upload.size
+    assert dest.stat().st_size == upload.size
@@ -0,0 +1,125 @@
+# backend/tests/unit/test_visibility_service.py
+"""Tests for materialized tag visibility against an in-memory database."""
+import random
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from cyroid.api.deps import check_resource_access, filter_by_visibility
+from cyroid.models.range import Range
+from cyroid.models.resource_tag import ResourceTag
+from cyroid.models.user import UserAttribute
+from cyroid.services.visibility_service import VisibilityService
+
+
+@pytest.fixture
+def tagged_user(db, make_user):
+    """make_user with the user's visibility tags materialized."""
+    def make(name, tags=(), roles=("engineer",)):
+        created = make_user(name, roles=roles, tags=tags)
+        VisibilityService(db).refresh_user(created.id)
+        return created
+    return make
+
+
+def _range(db, owner, name, tags=()):
+    range_obj = Range(name=name, created_by=owner.id)
+    db.add(range_obj)
+    db.flush()
+    for tag in tags:
+        db.add(ResourceTag(resource_type="range", resource_id=range_obj.id, tag=tag))
+    VisibilityService(db).refresh_resource("range", range_obj.id)
+    return range_obj
+
+
+def _visible(db, user):
+    return {r.name for r in filter_by_visibility(db.query(Range), "range", user, db, Range).all()}
+
+
+def test_untagged_and_matching_resources_are_visible(db, tagged_user):
+    owner = tagged_user("owner")
+    red = tagged_user("red", tags=["red"])
+    _range(db, owner, "public")
+    _range(db, owner, "red-only", tags=["red"])
+    _range(db, owner, "blue-only", tags=["blue"])
+    _range(db, owner, "both", tags=["red", "blue"])
+
+    assert _visible(db, red) == {"public", "red-only", "both"}
+    assert _visible(db, owner) == {"public"}
+
+
+def test_tag_changes_are_maintained_incrementally(db, tagged_user):
+    owner = tagged_user("owner")
+    user = tagged_user("user")
+    blue = _range(db, owner, "blue", tags=["blue"])
+    assert _visible(db, user) == set()
+
+    # User gains the tag
+    db.add(UserAttribute(user_id=user.id, attribute_type="tag", attribute_value="blue"))
+    VisibilityService(db).refresh_user(user.id)
+    db.expire(user)
+    assert _visible(db, user) == {"blue"}
+
+    # Resource gets a second tag, then loses the matching one
+    db.add(ResourceTag(resource_type="range", resource_id=blue.id, tag="green"))
+    db.query(ResourceTag).filter(ResourceTag.tag == "blue").delete()
+    VisibilityService(db).refresh_resource("range", blue.id)
+    assert _visible(db, user) == set()
+
+
+def test_check_resource_access(db, tagged_user):
+    owner = tagged_user("owner")
+    red = tagged_user("red", tags=["red"])
+    red_range = _range(db, owner, "red", tags=["red"])
+    blue_range = _range(db, owner, "blue", tags=["blue"])
+
+    assert check_resource_access("range", red_range.id, red, db)
+    with pytest.raises(HTTPException) as exc:
+        check_resource_access("range", blue_range.id, red, db)
+    assert exc.value.status_code == 403
+    assert check_resource_access("range", blue_range.id, owner, db, owner_id=owner.id)
+
+
+def test_matches_tag_semantics_on_random_data(db, tagged_user):
+    rng = random.Random(7)
+    tags = ["t1", "t2", "t3", "t4", "t5"]
+    owner = tagged_user("owner")
+    users = [tagged_user(f"u{i}", tags=rng.sample(tags, rng.randint(0, 2))) for i in range(15)]
+    ranges = [_range(db, owner, f"r{i}", tags=rng.sample(tags, rng.randint(0, 2))) for i in range(40)]
+
+    # Incremental changes in both directions
+    for user in users[:5]:
+        db.query(UserAttribute).filter(
+            UserAttribute.user_id == user.id, UserAttribute.attribute_type == "tag"
+        ).delete()
+        db.add(UserAttribute(user_id=user.id, attribute_type="tag", attribute_value=rng.choice(tags)))
+        VisibilityService(db).refresh_user(user.id)
+    for range_obj in ranges[:10]:
+        db.query(ResourceTag).filter(ResourceTag.resource_id == range_obj.id).delete()
+        db.add(ResourceTag(resource_type="range", resource_id=range_obj.id, tag=rng.choice(tags)))
+        VisibilityService(db).refresh_resource("range", range_obj.id)
+    db.expire_all()
+
+    range_tags = {}
+    for tag in db.query(ResourceTag).all():
+        range_tags.setdefault(tag.resource_id, set()).add(tag.tag)
+    for user in users:
+        expected = {
+            r.name for r in ranges
+            if not range_tags.get(r.id) or range_tags[r.id] & set(user.tags)
+        }
+        assert _visible(db, user) == expected
+
+    # A full rebuild produces the same grants
+    count = VisibilityService(db).rebuild()
+    assert count == sum(
+        1 for u in users for r in ranges if range_tags.get(r.id, set()) & set(u.tags)
+    )
+
+
+def test_admin_sees_everything(db, tagged_user):
+    owner = tagged_user("owner")
+    admin = SimpleNamespace(is_admin=True)
+    _range(db, owner, "blue", tags=["blue"])
+    assert _visible(db, admin) == {"blue"}
@@ -0,0 +1,170 @@
+# backend/tests/unit/test_vyos_router_config.py
+"""Tests for batched VyOS router configuration and event-driven readiness."""
+import os
+import shlex
+import stat
+import subprocess
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cyroid.services import vyos_service
+from cyroid.services.vyos_service import RouterConfig, RouterInterface, VyOSService
+
+STUBS = {
+    "iptables-restore": 'echo "iptables-restore $*" >> "$LOG"; cat >> "$LOG"\n'
+                        '[ "$1" = "--test" ] && [ -n "$REJECT_RULES" ] && exit 1; exit 0',
+    "iptables": 'echo "iptables $*" >> "$LOG"; case "$*" in *" -C "*) exit 1;; esac',
+    "ip": 'echo "ip $*" >> "$LOG"',
+    "dhcpd": 'echo "dhcpd $*" >> "$LOG"; [ "$1" = "-t" ] || touch "$STATE/dhcpd.running"',
+    "pgrep": '[ -e "$STATE/dhcpd.running" ]',
+    "pkill": 'rm -f "$STATE/dhcpd.running"',
+}
+
+
+class StandInRouter:
+    """A router container whose execs run locally against stub network tools."""
+
+    def __init__(self, tmp_path, status="running", **env):
+        self.status = status
+        self.execs = []
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        for name, body in STUBS.items():
+            path = bin_dir / name
+            path.write_text(f"#!/bin/bash\n{body}\n")
+            path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        self.log = tmp_path / "router.log"
+        self.log.touch()
+        self.env = {
+            **os.environ,
+            "PATH": f"{bin_dir}:{os.environ['PATH']}",
+            "LOG": str(self.log),
+            "STATE": str(tmp_path),
+            **env,
+        }
+
+    def exec_run(self, cmd, user=None, demux=False):
+        self.execs.append(cmd)
+        proc = subprocess.run(shlex.split(cmd), capture_output=True, env=self.env, timeout=30)
+        return MagicMock(exit_code=proc.returncode, output=(proc.stdout, proc.stderr))
+
+
+@pytest.fixture
+def router_paths(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    monkeypatch.setattr(vyos_service, "DHCP_CONFIG_DIR", str(root / "etc/dhcp"))
+    monkeypatch.setattr(vyos_service, "DHCP_LEASES_FILE", str(root / "var/lib/dhcp/dhcpd.leases"))
+    monkeypatch.setattr(vyos_service, "DHCP_PID_FILE", str(root / "dhcpd.pid"))
+    monkeypatch.setattr(vyos_service, "ROUTER_STATE_DIR", str(root / "etc/cyroid"))
+    return root
+
+
+def _service(container):
+    client = MagicMock()
+    client.containers.get.return_value = container
+    with patch("docker.from_env", return_value=client):
+        return VyOSService()
+
+
+CONFIG = RouterConfig(interfaces=[
+    RouterInterface("eth1", "corp-lan", "10.0.1.0/24", "10.0.1.1", internet_enabled=True, dhcp_enabled=True,
+                    dns_servers="10.0.1.5", dns_search="corp.local"),
+    RouterInterface("eth2", "dmz", "10.0.2.0/24", "10.0.2.1", isolated=True),
+    RouterInterface("eth3", "lab", "10.0.3.0/24", "10.0.3.1", dhcp_enabled=True),
+])
+
+
+def test_whole_config_applied_in_one_exec(tmp_path, router_paths):
+    router = StandInRouter(tmp_path)
+    result = _service(router).apply_router_config("router1", CONFIG)
+
+    assert result.success, result.output
+    assert result.duration_ms > 0
+    assert len(router.execs) == 1
+
+    log = router.log.read_text()
+    # Validated before the single ruleset commit
+    assert log.index("iptables-restore --test --noflush") < log.index("iptables-restore --noflush")
+    assert log.count("iptables-restore --noflush") == 1
+    assert "-A CYROID_NAT -s 10.0.1.0/24 -o eth0 -j MASQUERADE" in log
+    assert "-A CYROID_FORWARD -i eth2 -j DROP" in log
+    assert "10.0.2.0/24 -o eth0" not in log
+    assert [line for line in log.splitlines() if line.startswith("ip addr")] == [
+        "ip addr replace 10.0.1.1/24 dev eth1",
+        "ip addr replace 10.0.2.1/24 dev eth2",
+        "ip addr replace 10.0.3.1/24 dev eth3",
+    ]
+    dhcpd_starts = [line for line in log.splitlines() if line.startswith("dhcpd -q")]
+    assert len(dhcpd_starts) == 1 and dhcpd_starts[0].endswith("eth1 eth3")
+
+    dhcp_dir = router_paths / "etc/dhcp"
+    assert sorted(p.name for p in dhcp_dir.glob("dhcpd-*.conf")) == ["dhcpd-corp_lan.conf", "dhcpd-lab.conf"]
+    combined = (dhcp_dir / "dhcpd.conf.combined").read_text()
+    assert 'option domain-name "corp.local";' in combined
+    assert "range 10.0.3.10 10.0.3.250;" in combined
+
+
+def test_rejected_config_changes_nothing(tmp_path, router_paths):
+    router = StandInRouter(tmp_path, REJECT_RULES="1")
+    result = _service(router).apply_router_config("router1", CONFIG)
+
+    assert not result.success
+    log = router.log.read_text()
+    assert "iptables-restore --test" in log
+    assert "iptables-restore --noflush" not in log
+    assert "ip addr" not in log and "dhcpd" not in log
+
+
+class FakeEvents:
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            if callable(event):
+                event = event()
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+def _event_service(container, events):
+    service = _service(container)
+    service.client.events.return_value = events
+    return service
+
+
+def test_ready_on_start_event_without_polling():
+    container = MagicMock(status="created")
+    container.exec_run.return_value = MagicMock(exit_code=0, output=(b"", b""))
+
+    def started():
+        container.status = "running"
+        return {"Action": "start"}
+
+    events = FakeEvents([{"Action": "create"}, started])
+    service = _event_service(container, events)
+
+    begin = time.monotonic()
+    assert service.wait_for_router_ready("router1", timeout=60)
+    assert time.monotonic() - begin < 1
+    # One in-router probe, after the start event
+    assert container.exec_run.call_count == 1
+    assert events.closed
+    kwargs = service.client.events.call_args.kwargs
+    assert kwargs["filters"] == {"type": "container", "container": "router1"}
+    assert kwargs["until"] - kwargs["since"] >= 60
+
+
+def test_router_dying_fails_fast():
+    container = MagicMock(status="created")
+    service = _event_service(container, FakeEvents([{"Action": "start"}, {"Action": "die"}]))
+    container.exec_run.return_value = MagicMock(exit_code=1, output=(b"", b""))
+
+    begin = time.monotonic()
+    assert not service.wait_for_router_ready("router1", timeout=60)
+    assert time.monotonic() - begin < 1
@@ -643,12 +643,20 @@ export interface DockerPullStatus {
   progress_percent?: number
   layers_total?: number
   layers_completed?: number
+  layers?: DockerPullLayer[]
   error?: string
   image_id?: string
   size_bytes?: number
   message?: string
 }
 
+export interface DockerPullLayer {
+  id: string
+  current: number
+  total: number
+  status: string
+}
+
 export interface DockerPullResponse {
   status: string
   image: string